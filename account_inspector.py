@@ -0,0 +1,232 @@
+"""
+Bulk mint inspector
+Loads mint accounts and their metadata PDAs for many mints in one
+getMultipleAccounts call and decodes the SPL mint layout locally.
+Also resolves the owner wallets of token accounts the same way.
+"""
+import httpx
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from config import SOLANA_RPC_URL
+from metadata_fetcher import (
+    get_metadata_pda, metadata_cache, fetch_multiple_accounts, MAX_ACCOUNTS_PER_REQUEST
+)
+from rate_limit import get_bucket
+from ttl_cache import TTLCache
+
+# SPL Token mint account layout (82 bytes, Token-2022 extensions come after)
+MINT_ACCOUNT_SIZE = 82
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
+
+# Token-2022 accounts with extensions: base account padded to 165 bytes,
+# then one account type byte (1 = mint, 2 = token account)
+TOKEN_2022_ACCOUNT_TYPE_OFFSET = 165
+TOKEN_2022_MINT_TYPE = 1
+
+# SPL token account layout: mint (32) then owner wallet (32)
+TOKEN_ACCOUNT_OWNER_OFFSET = 32
+TOKEN_ACCOUNT_SIZE = 165
+
+# Decoded mint accounts are reused by all analyzers of the same scan
+mint_info_cache = TTLCache(ttl=30.0, maxsize=20000)
+
+
+@dataclass
+class MintAccountInfo:
+    """Decoded SPL mint account"""
+    mint: str
+    mint_authority: Optional[str]
+    freeze_authority: Optional[str]
+    supply: int  # Raw supply (base units)
+    decimals: int
+    is_initialized: bool
+    has_metadata: bool
+    slot: int
+
+    @property
+    def ui_supply(self) -> float:
+        """Supply in token units (same as getTokenSupply uiAmount)"""
+        return self.supply / (10 ** self.decimals)
+
+
+def is_mint_account(data: bytes, owner: Optional[str]) -> bool:
+    """Whether an account is an SPL mint (owned by Token or Token-2022, mint layout)"""
+    if not data:
+        return False
+    if owner == TOKEN_PROGRAM_ID:
+        # Token accounts of the legacy program are 165 bytes, mints exactly 82
+        return len(data) == MINT_ACCOUNT_SIZE
+    if owner == TOKEN_2022_PROGRAM_ID:
+        if len(data) == MINT_ACCOUNT_SIZE:
+            return True
+        return (len(data) > TOKEN_2022_ACCOUNT_TYPE_OFFSET
+                and data[TOKEN_2022_ACCOUNT_TYPE_OFFSET] == TOKEN_2022_MINT_TYPE)
+    return False
+
+
+def decode_mint_account(data: bytes, owner: Optional[str]) -> Optional[Dict]:
+    """
+    Decode the 82-byte SPL mint layout (None if the account is not a mint)
+
+    mint_authority: COption<Pubkey> (4 + 32)
+    supply: u64
+    decimals: u8
+    is_initialized: bool
+    freeze_authority: COption<Pubkey> (4 + 32)
+    """
+    from solders.pubkey import Pubkey
+
+    if not is_mint_account(data, owner):
+        return None
+
+    mint_authority = None
+    if int.from_bytes(data[0:4], 'little') == 1:
+        mint_authority = str(Pubkey.from_bytes(data[4:36]))
+
+    supply = int.from_bytes(data[36:44], 'little')
+    decimals = data[44]
+    is_initialized = data[45] == 1
+
+    freeze_authority = None
+    if int.from_bytes(data[46:50], 'little') == 1:
+        freeze_authority = str(Pubkey.from_bytes(data[50:82]))
+
+    return {
+        'mint_authority': mint_authority,
+        'freeze_authority': freeze_authority,
+        'supply': supply,
+        'decimals': decimals,
+        'is_initialized': is_initialized
+    }
+
+
+def decode_token_account_owner(data: bytes, owner: Optional[str]) -> Optional[str]:
+    """Owner wallet of an SPL token account (None if the account is not a token account)"""
+    from solders.pubkey import Pubkey
+
+    if not data or owner not in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID):
+        return None
+    if len(data) < TOKEN_ACCOUNT_SIZE:
+        return None
+
+    start = TOKEN_ACCOUNT_OWNER_OFFSET
+    return str(Pubkey.from_bytes(data[start:start + 32]))
+
+
+def fetch_token_account_owners(client: httpx.Client, rpc_url: str,
+                               token_accounts: List[str]) -> Dict[str, str]:
+    """
+    Owner wallet of each token account (getMultipleAccounts, 100 per request)
+
+    Accounts that do not exist or are not token accounts are left out.
+    """
+    owners = {}
+    addresses = list(dict.fromkeys(token_accounts))
+
+    for i in range(0, len(addresses), MAX_ACCOUNTS_PER_REQUEST):
+        chunk = addresses[i:i + MAX_ACCOUNTS_PER_REQUEST]
+        accounts, _ = fetch_multiple_accounts(client, rpc_url, chunk, with_owner=True)
+        if accounts is None:
+            continue
+
+        for address, account in zip(chunk, accounts):
+            data, program = account or (None, None)
+            wallet = decode_token_account_owner(data, program)
+            if wallet:
+                owners[address] = wallet
+
+    return owners
+
+
+def holders_by_owner(accounts: List[Dict], owners: Dict[str, str]) -> List[Dict]:
+    """
+    Merge getTokenLargestAccounts entries into one holder per owner wallet
+
+    Returns [{"address": owner, "uiAmount": total}] sorted by balance.
+    Token accounts whose owner is unknown are kept under their own address.
+    """
+    balances: Dict[str, float] = {}
+    for account in accounts:
+        address = account.get("address")
+        if not address:
+            continue
+        wallet = owners.get(address, address)
+        balances[wallet] = balances.get(wallet, 0.0) + float(account.get("uiAmount") or 0)
+
+    return [
+        {"address": wallet, "uiAmount": balance}
+        for wallet, balance in sorted(balances.items(), key=lambda item: -item[1])
+    ]
+
+
+class AccountInspector:
+    """Loads mint + metadata accounts for many mints at once"""
+
+    def __init__(self, rpc_url: str = SOLANA_RPC_URL):
+        self.rpc_url = rpc_url
+        self.client = httpx.Client(timeout=30.0)
+
+    def inspect_mints(self, mint_addresses: List[str], use_cache: bool = True,
+                      budget: Optional[str] = None) -> Dict[str, MintAccountInfo]:
+        """
+        Inspect many mints
+
+        Each mint costs two keys (mint account + metadata PDA), so one request
+        covers 50 mints. Metadata accounts are stored in the shared metadata
+        cache so MetadataFetcher does not fetch them again.
+        Mints that do not exist or are not SPL mints are left out of the result.
+        With a budget, one token of that rate_limit bucket is taken per request.
+        """
+        results = {}
+        mints = list(dict.fromkeys(mint_addresses))
+
+        if use_cache:
+            results.update(mint_info_cache.get_many(mints))
+            mints = [m for m in mints if m not in results]
+
+        per_request = MAX_ACCOUNTS_PER_REQUEST // 2
+
+        for i in range(0, len(mints), per_request):
+            chunk = mints[i:i + per_request]
+
+            keys = []
+            for mint_address in chunk:
+                keys.append(mint_address)
+                keys.append(str(get_metadata_pda(mint_address)))
+
+            if budget:
+                get_bucket(budget).acquire()
+            accounts, slot = fetch_multiple_accounts(self.client, self.rpc_url, keys, with_owner=True)
+            if accounts is None:
+                continue
+
+            for j, mint_address in enumerate(chunk):
+                mint_data, mint_owner = accounts[2 * j] or (None, None)
+                metadata_data, _ = accounts[2 * j + 1] or (None, None)
+
+                metadata_cache.store(mint_address, metadata_data, slot)
+
+                decoded = decode_mint_account(mint_data, mint_owner)
+                if not decoded:
+                    continue
+
+                info = MintAccountInfo(
+                    mint=mint_address,
+                    has_metadata=metadata_data is not None,
+                    slot=slot,
+                    **decoded
+                )
+                mint_info_cache.set(mint_address, info)
+                results[mint_address] = info
+
+        return results
+
+    def inspect_mint(self, mint_address: str) -> Optional[MintAccountInfo]:
+        """Inspect a single mint (one request for mint + metadata)"""
+        return self.inspect_mints([mint_address]).get(mint_address)
+
+    def close(self):
+        """Close HTTP client"""
+        self.client.close()
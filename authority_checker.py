@@ -1,8 +1,9 @@
 """Check mint and freeze authority for tokens"""
 import httpx
-from typing import Optional
+from typing import Optional, Dict
 from dataclasses import dataclass
 from typing import List
+from account_inspector import AccountInspector, MintAccountInfo, mint_info_cache
 
 
 @dataclass
@@ -22,13 +23,42 @@ class AuthorityChecker:
     def __init__(self):
         self.rpc_url = "https://api.mainnet-beta.solana.com"
         self.client = httpx.Client(timeout=10.0)
+        self.inspector = AccountInspector(self.rpc_url)
 
-    def check_authority(self, mint_address: str) -> AuthorityAnalysis:
+    def check_authorities(self, mint_addresses: List[str]) -> Dict[str, AuthorityAnalysis]:
+        """Check many mints with one getMultipleAccounts call per 50 mints"""
+        mint_infos = self.inspector.inspect_mints(mint_addresses)
+
+        results = {}
+        for mint_address in mint_addresses:
+            mint_info = mint_infos.get(mint_address)
+            if mint_info:
+                results[mint_address] = self.analyze_mint_info(mint_info)
+            else:
+                results[mint_address] = self._check_authority_parsed(mint_address)
+
+        return results
+
+    def analyze_mint_info(self, mint_info: MintAccountInfo) -> AuthorityAnalysis:
+        """Build authority analysis from a decoded mint account"""
+        return self._build_analysis(mint_info.mint_authority, mint_info.freeze_authority)
+
+    def check_authority(self, mint_address: str, ctx=None) -> AuthorityAnalysis:
         """Check if mint and freeze authorities are renounced"""
-        
-        red_flags = []
-        risk_score = 0
 
+        # Reuse the mint account if it was already loaded for this scan,
+        # otherwise load mint + metadata PDA in one request
+        if ctx is not None:
+            mint_info = ctx.mint_info()
+        else:
+            mint_info = mint_info_cache.get(mint_address) or self.inspector.inspect_mint(mint_address)
+        if mint_info:
+            return self.analyze_mint_info(mint_info)
+
+        return self._check_authority_parsed(mint_address)
+
+    def _check_authority_parsed(self, mint_address: str) -> AuthorityAnalysis:
+        """Fallback: check authorities with a jsonParsed getAccountInfo call"""
         try:
             # Get mint account info via RPC
             payload = {
@@ -71,26 +101,7 @@ class AuthorityChecker:
             mint_authority = parsed_info.get("mintAuthority")
             freeze_authority = parsed_info.get("freezeAuthority")
 
-            # Check mint authority
-            mint_renounced = mint_authority is None
-            if not mint_renounced:
-                red_flags.append("[!!] DANGER: Mint Authority NOT renounced - Dev can create infinite tokens!")
-                risk_score += 40
-
-            # Check freeze authority  
-            freeze_renounced = freeze_authority is None
-            if not freeze_renounced:
-                red_flags.append("[!!] DANGER: Freeze Authority NOT renounced - Dev can freeze wallets!")
-                risk_score += 35
-
-            return AuthorityAnalysis(
-                mint_authority_renounced=mint_renounced,
-                freeze_authority_renounced=freeze_renounced,
-                mint_authority_address=mint_authority,
-                freeze_authority_address=freeze_authority,
-                risk_score=min(risk_score, 100),
-                red_flags=red_flags
-            )
+            return self._build_analysis(mint_authority, freeze_authority)
 
         except Exception as e:
             print(f"Authority check error: {e}")
@@ -103,6 +114,33 @@ class AuthorityChecker:
                 red_flags=["[!] Could not verify authority (RPC error)"]
             )
 
+    def _build_analysis(self, mint_authority: Optional[str], freeze_authority: Optional[str]) -> AuthorityAnalysis:
+        """Score mint and freeze authority status"""
+        red_flags = []
+        risk_score = 0
+
+        # Check mint authority
+        mint_renounced = mint_authority is None
+        if not mint_renounced:
+            red_flags.append("[!!] DANGER: Mint Authority NOT renounced - Dev can create infinite tokens!")
+            risk_score += 40
+
+        # Check freeze authority
+        freeze_renounced = freeze_authority is None
+        if not freeze_renounced:
+            red_flags.append("[!!] DANGER: Freeze Authority NOT renounced - Dev can freeze wallets!")
+            risk_score += 35
+
+        return AuthorityAnalysis(
+            mint_authority_renounced=mint_renounced,
+            freeze_authority_renounced=freeze_renounced,
+            mint_authority_address=mint_authority,
+            freeze_authority_address=freeze_authority,
+            risk_score=min(risk_score, 100),
+            red_flags=red_flags
+        )
+
     def close(self):
-        """Close HTTP client"""
+        """Close HTTP clients"""
         self.client.close()
+        self.inspector.close()
@@ -2,11 +2,31 @@
 Batch analyze all tokens from a creator
 """
 import httpx
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional
 from dataclasses import dataclass
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
+from account_inspector import AccountInspector
+from config import ML_FEATURE_MAX_AGE
+from liquidity_analyzer import LiquidityAnalyzer, prefetch_dexscreener_pairs
+from creator_checker import CreatorChecker
+from social_checker import SocialChecker
+from wallet_analyzer import WalletAnalyzer
+from onchain_analyzer import OnChainAnalyzer
+from sniper_detector import SniperDetector
+from volume_analyzer import VolumeAnalyzer
+from insightx_api import InsightXAPI
+from scan_context import ScanContext
+from pump_dump_detector import PumpDumpDetector
+from rate_limit import get_bucket
+from risk_batch import analyses_to_row, build_batch, score_batch
+from ml_module.predictor import get_predictor
+
+# Default number of tokens scanned in parallel in deep batch mode
+DEFAULT_BATCH_WORKERS = 8
 
 
 @dataclass
@@ -19,6 +39,10 @@ class BatchResult:
     risk_score: int
     is_rugged: bool
     red_flags_count: int
+    risk_level: Optional[str] = None  # Set by deep batch mode (full scan)
+    error: Optional[str] = None
+    score_row: Optional[tuple] = None  # Deep batch mode: analyzer outputs, scored together at the end
+    ml_score: Optional[int] = None  # Deep batch mode: ML score from a stored feature snapshot
 
 
 class BatchAnalyzer:
@@ -31,6 +55,12 @@ class BatchAnalyzer:
             'Referer': 'https://pump.fun/'
         }
         self.client = httpx.Client(timeout=60.0, headers=headers, follow_redirects=True)
+        self.inspector = AccountInspector()
+
+        # Per-thread analyzers for deep batch mode (httpx clients are not shared across workers)
+        self._worker_state = threading.local()
+        self._worker_analyzers = []
+        self._worker_lock = threading.Lock()
 
     def get_creator_tokens(self, creator_address: str) -> List[Dict]:
         """Get all tokens created by a wallet"""
@@ -59,6 +89,9 @@ class BatchAnalyzer:
 
         console.print(f"[green]Found {len(tokens)} tokens! Analyzing...[/green]\n")
 
+        # Load mint + metadata accounts for all tokens (50 mints per RPC call)
+        mint_infos = self.inspector.inspect_mints([t.get("mint") for t in tokens if t.get("mint")])
+
         results = []
 
         with Progress(
@@ -94,6 +127,12 @@ class BatchAnalyzer:
                     risk_score = max(risk_score, 90)
                     red_flags += 1
 
+                # Authorities not renounced (decoded from the mint account)
+                mint_info = mint_infos.get(mint)
+                if mint_info and (mint_info.mint_authority or mint_info.freeze_authority):
+                    risk_score = max(risk_score, 75)
+                    red_flags += 1
+
                 results.append(BatchResult(
                     mint=mint,
                     name=name,
@@ -108,6 +147,267 @@ class BatchAnalyzer:
 
         return results
 
+    def analyze_creator_batch_deep(self, creator_address: str, console: Console,
+                                   workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """
+        Run the full scan for every token of a creator
+
+        Tokens are scanned by a bounded worker pool. Work shared by all tokens
+        is done once up front: creator history (same creator for every coin),
+        mint + metadata accounts (50 mints per RPC call) and DexScreener pairs
+        (30 mints per request). The prefetched data is handed to each scan
+        through its ScanContext, so it stays valid however long the run takes.
+        Every upstream call takes tokens from the shared rate_limit buckets.
+        """
+        console.print(f"\n[cyan]Fetching all tokens from creator {creator_address[:8]}...[/cyan]")
+
+        tokens = [t for t in self.get_creator_tokens(creator_address) if t.get("mint")]
+
+        if not tokens:
+            console.print("[red]No tokens found for this creator[/red]")
+            return []
+
+        console.print(f"[green]Found {len(tokens)} tokens! Running full scans with {workers} workers...[/green]\n")
+
+        mints = [t["mint"] for t in tokens]
+
+        # Shared data for all scans
+        creator_checker = CreatorChecker()
+        try:
+            creator_analysis = creator_checker.analyze_creator(creator_address)
+        finally:
+            creator_checker.close()
+
+        mint_infos = self.inspector.inspect_mints(mints, budget="rpc")
+        pairs = prefetch_dexscreener_pairs(mints, budget="dexscreener")
+
+        results = []
+
+        # Worker analyzers are closed even if a scan raises or the run is interrupted
+        try:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                console=console,
+            ) as progress:
+
+                task = progress.add_task(f"Scanning {len(tokens)} tokens...", total=len(tokens))
+
+                with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                    futures = {
+                        pool.submit(
+                            self._deep_scan_token, token, creator_address, creator_analysis,
+                            pairs.get(token["mint"]), mint_infos.get(token["mint"])
+                        ): token
+                        for token in tokens
+                    }
+
+                    for future in as_completed(futures):
+                        result = future.result()
+                        results.append(result)
+                        progress.update(task, advance=1, description=f"Scanned {result.symbol[:10]}")
+        finally:
+            self._close_worker_analyzers()
+
+        # Score all scanned tokens in one vectorized pass
+        scanned = [r for r in results if r.score_row is not None]
+        if scanned:
+            batch = build_batch([r.score_row for r in scanned])
+            scores = score_batch(batch)
+            for i, result in enumerate(scanned):
+                result.risk_score = int(scores["overall_risk_score"][i])
+                result.risk_level = str(scores["risk_level"][i])
+                result.red_flags_count = int(batch["red_flags_count"][i])
+                result.score_row = None
+
+        # ML scores for tokens with a recent stored feature snapshot, in one
+        # predict call (older snapshots would score a token that has moved on)
+        predictor = get_predictor()
+        if predictor is not None:
+            try:
+                predictions = predictor.predict_stored_batch((r.mint for r in results), max_age=ML_FEATURE_MAX_AGE)
+                for result in results:
+                    prediction = predictions.get(result.mint)
+                    if prediction is not None:
+                        result.ml_score = prediction.ml_score
+            except Exception as e:
+                console.print(f"[yellow]ML prediction skipped: {e}[/yellow]")
+
+        # Keep pump.fun order (newest first) for display
+        order = {mint: i for i, mint in enumerate(mints)}
+        results.sort(key=lambda r: order.get(r.mint, 0))
+
+        return results
+
+    def _get_worker_analyzers(self) -> Dict:
+        """Get analyzers owned by the current worker thread"""
+        analyzers = getattr(self._worker_state, "analyzers", None)
+
+        if analyzers is None:
+            analyzers = {
+                "liquidity": LiquidityAnalyzer(),
+                "social": SocialChecker(),
+                "wallet": WalletAnalyzer(),
+                "onchain": OnChainAnalyzer(),
+                "sniper": SniperDetector(),
+                "volume": VolumeAnalyzer(),
+                "insightx": InsightXAPI(),
+                "pump_dump": PumpDumpDetector(),
+            }
+            self._worker_state.analyzers = analyzers
+            with self._worker_lock:
+                self._worker_analyzers.append(analyzers)
+
+        return analyzers
+
+    def _close_worker_analyzers(self):
+        """Close analyzers created by worker threads"""
+        with self._worker_lock:
+            for analyzers in self._worker_analyzers:
+                for name, analyzer in analyzers.items():
+                    if hasattr(analyzer, "close"):
+                        try:
+                            analyzer.close()
+                        except Exception:
+                            pass
+            self._worker_analyzers = []
+
+        self._worker_state = threading.local()
+
+    def _deep_scan_token(self, token: Dict, creator_address: str, creator_analysis,
+                         pairs: Optional[list] = None, mint_info=None) -> BatchResult:
+        """
+        Full scan of one token (runs in a worker thread)
+
+        pairs / mint_info come from the batch prefetch; when missing they are
+        fetched by the context as in a single scan.
+        """
+        mint = token.get("mint", "")
+        name = token.get("name", "Unknown")
+        symbol = token.get("symbol", "???")
+        market_cap = token.get("usd_market_cap", 0) or 0
+
+        ctx = ScanContext(mint)
+        if pairs is not None:
+            ctx.seed("pairs", pairs)
+        else:
+            get_bucket("dexscreener").acquire()
+        if mint_info is not None:
+            ctx.seed("mint_info", mint_info)
+
+        try:
+            a = self._get_worker_analyzers()
+
+            token_data = a["liquidity"].get_token_data(mint, ctx)
+
+            if not token_data:
+                # Not listed on DexScreener: dead token
+                return BatchResult(
+                    mint=mint,
+                    name=name,
+                    symbol=symbol,
+                    market_cap=market_cap,
+                    risk_score=100,
+                    is_rugged=market_cap < 100,
+                    red_flags_count=1,
+                    risk_level="EXTREME",
+                    error="No market data"
+                )
+
+            liquidity_analysis = a["liquidity"].analyze_liquidity(mint, ctx)
+            social_analysis = a["social"].analyze_social(token_data)
+
+            wallet_analysis = None
+            try:
+                get_bucket("pumpfun").acquire()
+                holder_response = a["wallet"].client.get(
+                    f"https://frontend-api.pump.fun/coins/{mint}/holders",
+                    timeout=10.0
+                )
+                if holder_response.status_code == 200:
+                    holders_data = holder_response.json()
+                    if holders_data and len(holders_data) > 0:
+                        wallet_analysis = a["wallet"].analyze_holders(holders_data, creator_address, mint)
+            except Exception:
+                pass
+
+            sniper_analysis = None
+            try:
+                get_bucket("rpc").acquire(2)
+                sniper_analysis = a["sniper"].analyze_snipers(mint, token_data.get("created_timestamp"), ctx)
+            except Exception:
+                pass
+
+            volume_analysis = None
+            try:
+                volume_analysis = a["volume"].analyze_volume(token_data, liquidity_analysis.liquidity_usd)
+            except Exception:
+                pass
+
+            distribution_metrics = None
+            try:
+                get_bucket("insightx").acquire()
+                distribution_metrics = a["insightx"].get_distribution_metrics(mint, network="sol")
+            except Exception:
+                pass
+
+            pump_dump_analysis = None
+            try:
+                get_bucket("dexscreener").acquire()
+                pump_dump_analysis = a["pump_dump"].analyze_pump_dump(mint, token_data)
+            except Exception:
+                pass
+
+            onchain_data = None
+            try:
+                get_bucket("rpc").acquire(8)
+                onchain_data = a["onchain"].get_token_holders(mint, ctx)
+            except Exception:
+                pass
+
+            score_row = analyses_to_row(
+                None,  # distribution_analysis
+                creator_analysis,
+                liquidity_analysis,
+                social_analysis,
+                wallet_analysis,
+                sniper_analysis,
+                volume_analysis,
+                distribution_metrics,
+                onchain_data,
+                pump_dump_analysis
+            )
+
+            market_cap = liquidity_analysis.market_cap_usd or market_cap
+
+            return BatchResult(
+                mint=mint,
+                name=name,
+                symbol=symbol,
+                market_cap=market_cap,
+                risk_score=0,
+                is_rugged=market_cap < 100,
+                red_flags_count=0,
+                score_row=score_row
+            )
+
+        except Exception as e:
+            return BatchResult(
+                mint=mint,
+                name=name,
+                symbol=symbol,
+                market_cap=market_cap,
+                risk_score=0,
+                is_rugged=market_cap < 100,
+                red_flags_count=0,
+                error=str(e)
+            )
+
+        finally:
+            ctx.close()
+
     def display_batch_results(self, results: List[BatchResult], console: Console):
         """Display batch analysis results"""
 
@@ -154,6 +454,14 @@ class BatchAnalyzer:
         detail_table.add_column("Market Cap", justify="right")
         detail_table.add_column("Status", justify="center")
 
+        deep_mode = any(r.risk_level for r in results)
+        if deep_mode:
+            detail_table.add_column("Risk", justify="right")
+
+        ml_mode = any(r.ml_score is not None for r in results)
+        if ml_mode:
+            detail_table.add_column("ML", justify="right")
+
         for i, result in enumerate(results, 1):
             mcap_str = f"${result.market_cap:,.0f}" if result.market_cap > 0 else "$0"
 
@@ -167,17 +475,34 @@ class BatchAnalyzer:
                 status = "[green][OK] Active[/green]"
                 mcap_color = "green"
 
-            detail_table.add_row(
+            row = [
                 str(i),
                 result.name[:20],
                 result.symbol[:10],
                 f"[{mcap_color}]{mcap_str}[/{mcap_color}]",
                 status
-            )
+            ]
+
+            if deep_mode:
+                if result.risk_level:
+                    risk_color = "red" if result.risk_score >= 50 else "yellow" if result.risk_score >= 25 else "green"
+                    row.append(f"[{risk_color}]{result.risk_score}/100 {result.risk_level}[/{risk_color}]")
+                else:
+                    row.append("[dim]error[/dim]")
+
+            if ml_mode:
+                if result.ml_score is not None:
+                    ml_color = "green" if result.ml_score >= 70 else "yellow" if result.ml_score >= 30 else "red"
+                    row.append(f"[{ml_color}]{result.ml_score}/100[/{ml_color}]")
+                else:
+                    row.append("[dim]-[/dim]")
+
+            detail_table.add_row(*row)
 
         console.print(detail_table)
         console.print("\n" + "=" * 60, style="bold")
 
     def close(self):
-        """Close HTTP client"""
+        """Close HTTP clients"""
         self.client.close()
+        self.inspector.close()
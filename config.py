@@ -16,10 +16,20 @@ if HELIUS_API_KEY:
 else:
     SOLANA_RPC_URL = "https://api.mainnet-beta.solana.com"  # Public RPC (rate limited)
 
+# Websocket endpoint for subscriptions (live pump.fun ingestion)
+SOLANA_WS_URL = os.getenv("SOLANA_WS_URL") or SOLANA_RPC_URL.replace("https://", "wss://", 1)
+
 # API URLs
 SOLSCAN_API_URL = "https://api.solscan.io"
 DEXSCREENER_API_URL = "https://api.dexscreener.com/latest/dex"
 
+# Key the Discord / Telegram bots send to change the watchlist API.
+# Without it, only requests from this machine may change the watchlist
+WATCHLIST_API_TOKEN = os.getenv("WATCHLIST_API_TOKEN", "")
+
+# Seconds a stored ML feature snapshot is reused by scans before re-extraction
+ML_FEATURE_MAX_AGE = float(os.getenv("ML_FEATURE_MAX_AGE", "300"))
+
 # pump.fun program ID
 PUMPFUN_PROGRAM_ID = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
 
@@ -4,6 +4,11 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
 from config import SOLANA_RPC_URL, PUMPFUN_PROGRAM_ID
+from creator_index import get_creator_index, CreatorRecord, IndexedToken
+
+# pump.fun user-created-coins paging
+CREATOR_COINS_PAGE_SIZE = 50
+CREATOR_COINS_MAX_PAGES = 20
 
 
 @dataclass
@@ -62,46 +67,126 @@ class CreatorChecker:
         except Exception:
             return []
 
+    def _get_creator_tokens_page(self, creator_address: str, offset: int, limit: int) -> Optional[List[Dict]]:
+        """Get one page of a creator's coins, newest first (None on API error)"""
+        try:
+            # Newest first: the incremental refresh stops at the first page
+            # with nothing newer than the index
+            response = self.client.get(
+                f"https://frontend-api.pump.fun/coins/user-created-coins/{creator_address}",
+                params={"offset": offset, "limit": limit, "includeNsfw": "true",
+                        "sort": "created_timestamp", "order": "DESC"},
+                timeout=10.0
+            )
+
+            if response.status_code == 200:
+                return response.json() or []
+            return None
+        except Exception:
+            return None
+
+    def refresh_creator(self, creator_address: str, record: Optional[CreatorRecord] = None) -> Optional[CreatorRecord]:
+        """
+        Refresh a creator in the reputation index
+
+        Incremental refresh only pages through coins until a page has nothing
+        newer than the newest indexed coin. A full refresh (first time, or once
+        a day) re-fetches and re-classifies every coin.
+        """
+        full_refresh = record is None or record.needs_full_refresh()
+        newest_known = None if full_refresh else record.newest_created_timestamp
+
+        fetched = []
+        for page in range(CREATOR_COINS_MAX_PAGES):
+            coins = self._get_creator_tokens_page(
+                creator_address,
+                offset=page * CREATOR_COINS_PAGE_SIZE,
+                limit=CREATOR_COINS_PAGE_SIZE
+            )
+
+            if coins is None:
+                if page == 0:
+                    # pump.fun unreachable: keep serving what we have
+                    return record
+                break
+
+            fetched.extend(coins)
+
+            if len(coins) < CREATOR_COINS_PAGE_SIZE:
+                break
+
+            if newest_known is not None and not any(
+                (coin.get("created_timestamp") or 0) > newest_known for coin in coins
+            ):
+                break
+
+        tokens = []
+        for token_data in fetched:
+            indexed = self._classify_token(token_data)
+            if indexed:
+                tokens.append(indexed)
+
+        return get_creator_index().upsert_tokens(creator_address, tokens, full_refresh=full_refresh)
+
     def analyze_creator(self, creator_address: str) -> CreatorAnalysis:
         """Analyze creator's token history for rug patterns"""
 
-        tokens = self.get_creator_tokens(creator_address)
-        token_history = []
-        potential_rugs = 0
-        active_tokens = 0
-        red_flags = []
+        record = get_creator_index().get_record(creator_address)
+
+        if record is None or not record.is_fresh():
+            record = self.refresh_creator(creator_address, record)
 
-        for token_data in tokens:
-            try:
-                # Parse token info
-                mint = token_data.get("mint", "")
-                name = token_data.get("name")
-                symbol = token_data.get("symbol")
-                market_cap = token_data.get("usd_market_cap", 0)
-
-                # Check if token looks abandoned/rugged
-                is_rug = self._is_potential_rug(token_data)
-                is_active = market_cap > 1000  # Consider active if > $1k mcap
-
-                if is_rug:
-                    potential_rugs += 1
-                if is_active:
-                    active_tokens += 1
-
-                token_history.append(TokenHistory(
-                    mint=mint,
-                    name=name,
-                    symbol=symbol,
-                    created_at=None,  # Would parse from timestamp
-                    final_market_cap=market_cap,
-                    still_active=is_active,
-                    potential_rug=is_rug
-                ))
-            except Exception:
-                continue
+        if record is None:
+            return self._build_analysis(0, 0, 0, [])
+
+        token_history = [
+            TokenHistory(
+                mint=token.mint,
+                name=token.name,
+                symbol=token.symbol,
+                created_at=datetime.fromtimestamp(token.created_timestamp / 1000) if token.created_timestamp else None,
+                final_market_cap=token.market_cap,
+                still_active=token.still_active,
+                potential_rug=token.potential_rug
+            )
+            for token in record.latest_tokens
+        ]
+
+        return self._build_analysis(
+            record.total_tokens,
+            record.potential_rugs,
+            record.active_tokens,
+            token_history
+        )
+
+    def _classify_token(self, token_data: Dict) -> Optional[IndexedToken]:
+        """Classify one pump.fun coin for the index"""
+        try:
+            # Parse token info
+            mint = token_data.get("mint")
+            if not mint:
+                return None
+
+            market_cap = token_data.get("usd_market_cap", 0) or 0
+
+            return IndexedToken(
+                mint=mint,
+                name=token_data.get("name"),
+                symbol=token_data.get("symbol"),
+                created_timestamp=token_data.get("created_timestamp"),
+                market_cap=market_cap,
+                still_active=market_cap > 1000,  # Consider active if > $1k mcap
+                potential_rug=self._is_potential_rug(token_data)  # Check if token looks abandoned/rugged
+            )
+        except Exception:
+            return None
+
+    def _build_analysis(self, total_tokens: int, potential_rugs: int, active_tokens: int,
+                        token_history: List[TokenHistory]) -> CreatorAnalysis:
+        """Score a creator from its aggregated history"""
+        red_flags = []
 
         # Calculate metrics
-        total_tokens = len(token_history)
         rug_percentage = (potential_rugs / total_tokens * 100) if total_tokens > 0 else 0
 
         # Determine risk score (ENHANCED)
@@ -0,0 +1,271 @@
+"""
+Persistent creator reputation index
+Stores per-creator token history and rug counts so creator checks do not
+re-download and re-classify a serial launcher's full coin list on every scan
+"""
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, Optional
+import os
+
+DATA_DIR = os.getenv("DATA_DIR", ".")
+CREATOR_DB_FILE = os.path.join(DATA_DIR, "creators.db")
+
+# Answer from the index without touching pump.fun for this long
+CREATOR_REFRESH_INTERVAL = 10 * 60
+# Re-classify every known coin (market caps move) at most this often
+CREATOR_FULL_REFRESH_INTERVAL = 24 * 3600
+# Number of latest tokens kept in memory for CreatorAnalysis.token_history
+HISTORY_SIZE = 10
+
+
+@dataclass
+class IndexedToken:
+    """One coin of a creator as stored in the index"""
+    mint: str
+    name: Optional[str]
+    symbol: Optional[str]
+    created_timestamp: Optional[int]  # Milliseconds, as returned by pump.fun
+    market_cap: float
+    still_active: bool
+    potential_rug: bool
+
+
+@dataclass
+class CreatorRecord:
+    """Aggregated reputation of one creator"""
+    creator: str
+    total_tokens: int = 0
+    potential_rugs: int = 0
+    active_tokens: int = 0
+    newest_created_timestamp: Optional[int] = None
+    last_refresh: float = 0
+    last_full_refresh: float = 0
+    latest_tokens: List[IndexedToken] = field(default_factory=list)
+
+    def is_fresh(self, now: float = None) -> bool:
+        """True if the record can be served without refreshing"""
+        now = now or time.time()
+        return now - self.last_refresh < CREATOR_REFRESH_INTERVAL
+
+    def needs_full_refresh(self, now: float = None) -> bool:
+        """True if all coins should be re-fetched and re-classified"""
+        now = now or time.time()
+        return now - self.last_full_refresh >= CREATOR_FULL_REFRESH_INTERVAL
+
+
+class CreatorIndex:
+    """SQLite-backed creator index with an in-memory record cache"""
+
+    def __init__(self, db_file: str = CREATOR_DB_FILE):
+        self.db_file = db_file
+        self.lock = Lock()
+        self.records: Dict[str, CreatorRecord] = {}
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_db(self):
+        """Initialize database with tables"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS creators (
+                    creator TEXT PRIMARY KEY,
+                    total_tokens INTEGER NOT NULL DEFAULT 0,
+                    potential_rugs INTEGER NOT NULL DEFAULT 0,
+                    active_tokens INTEGER NOT NULL DEFAULT 0,
+                    newest_created_timestamp INTEGER,
+                    last_refresh REAL NOT NULL DEFAULT 0,
+                    last_full_refresh REAL NOT NULL DEFAULT 0
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS creator_tokens (
+                    creator TEXT NOT NULL,
+                    mint TEXT NOT NULL,
+                    name TEXT,
+                    symbol TEXT,
+                    created_timestamp INTEGER,
+                    market_cap REAL,
+                    still_active INTEGER NOT NULL,
+                    potential_rug INTEGER NOT NULL,
+                    PRIMARY KEY (creator, mint)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_creator_tokens_created
+                ON creator_tokens(creator, created_timestamp DESC)
+            ''')
+
+            conn.commit()
+            conn.close()
+
+    def get_record(self, creator: str) -> Optional[CreatorRecord]:
+        """Get a creator record (memory first, then SQLite)"""
+        with self.lock:
+            record = self.records.get(creator)
+
+        # Another process may have refreshed this creator in the meantime
+        if record is None or not record.is_fresh():
+            loaded = self._load_record(creator)
+            if loaded:
+                record = loaded
+                with self.lock:
+                    self.records[creator] = record
+
+        return record
+
+    def has_token(self, creator: str, mint: str) -> bool:
+        """Check if a coin is already indexed for a creator"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT 1 FROM creator_tokens WHERE creator = ? AND mint = ?',
+                (creator, mint)
+            ).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+
+    def upsert_tokens(self, creator: str, tokens: List[IndexedToken], refreshed: bool = True,
+                      full_refresh: bool = False) -> CreatorRecord:
+        """Insert or update coins of a creator and recompute its counters"""
+        now = time.time()
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                cursor = conn.cursor()
+
+                cursor.executemany('''
+                    INSERT INTO creator_tokens
+                    (creator, mint, name, symbol, created_timestamp, market_cap, still_active, potential_rug)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(creator, mint) DO UPDATE SET
+                        name = excluded.name,
+                        symbol = excluded.symbol,
+                        created_timestamp = COALESCE(excluded.created_timestamp, created_timestamp),
+                        market_cap = excluded.market_cap,
+                        still_active = excluded.still_active,
+                        potential_rug = excluded.potential_rug
+                ''', [
+                    (creator, t.mint, t.name, t.symbol, t.created_timestamp, t.market_cap,
+                     int(t.still_active), int(t.potential_rug))
+                    for t in tokens
+                ])
+
+                total, rugs, active, newest = cursor.execute('''
+                    SELECT COUNT(*), COALESCE(SUM(potential_rug), 0),
+                           COALESCE(SUM(still_active), 0), MAX(created_timestamp)
+                    FROM creator_tokens
+                    WHERE creator = ?
+                ''', (creator,)).fetchone()
+
+                row = cursor.execute(
+                    'SELECT last_refresh, last_full_refresh FROM creators WHERE creator = ?',
+                    (creator,)
+                ).fetchone()
+                last_refresh, last_full_refresh = row if row else (0, 0)
+
+                if refreshed:
+                    last_refresh = now
+                if full_refresh:
+                    last_full_refresh = now
+
+                cursor.execute('''
+                    INSERT INTO creators
+                    (creator, total_tokens, potential_rugs, active_tokens,
+                     newest_created_timestamp, last_refresh, last_full_refresh)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(creator) DO UPDATE SET
+                        total_tokens = excluded.total_tokens,
+                        potential_rugs = excluded.potential_rugs,
+                        active_tokens = excluded.active_tokens,
+                        newest_created_timestamp = excluded.newest_created_timestamp,
+                        last_refresh = excluded.last_refresh,
+                        last_full_refresh = excluded.last_full_refresh
+                ''', (creator, total, rugs, active, newest, last_refresh, last_full_refresh))
+
+                conn.commit()
+            finally:
+                conn.close()
+
+            # Drop memory copy, next read reloads aggregated state
+            self.records.pop(creator, None)
+
+        return self.get_record(creator)
+
+    def _load_record(self, creator: str) -> Optional[CreatorRecord]:
+        """Load a creator record and its latest tokens from SQLite"""
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('''
+                    SELECT total_tokens, potential_rugs, active_tokens,
+                           newest_created_timestamp, last_refresh, last_full_refresh
+                    FROM creators
+                    WHERE creator = ?
+                ''', (creator,)).fetchone()
+
+                if not row:
+                    return None
+
+                token_rows = conn.execute('''
+                    SELECT mint, name, symbol, created_timestamp, market_cap, still_active, potential_rug
+                    FROM creator_tokens
+                    WHERE creator = ?
+                    ORDER BY created_timestamp DESC
+                    LIMIT ?
+                ''', (creator, HISTORY_SIZE)).fetchall()
+            finally:
+                conn.close()
+
+            return CreatorRecord(
+                creator=creator,
+                total_tokens=row[0],
+                potential_rugs=row[1],
+                active_tokens=row[2],
+                newest_created_timestamp=row[3],
+                last_refresh=row[4],
+                last_full_refresh=row[5],
+                latest_tokens=[
+                    IndexedToken(
+                        mint=r[0],
+                        name=r[1],
+                        symbol=r[2],
+                        created_timestamp=r[3],
+                        market_cap=r[4] or 0,
+                        still_active=bool(r[5]),
+                        potential_rug=bool(r[6])
+                    )
+                    for r in token_rows
+                ]
+            )
+
+        except Exception as e:
+            print(f"[CREATOR INDEX] Error loading {creator[:8]}: {e}")
+            return None
+
+
+_creator_index: Optional[CreatorIndex] = None
+_creator_index_lock = Lock()
+
+
+def get_creator_index() -> CreatorIndex:
+    """Process-wide creator index (opened on first use)"""
+    global _creator_index
+    if _creator_index is None:
+        with _creator_index_lock:
+            if _creator_index is None:
+                _creator_index = CreatorIndex()
+    return _creator_index
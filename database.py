@@ -3,198 +3,588 @@ Database for storing scan history and statistics
 """
 import sqlite3
 import json
-from datetime import datetime
-from threading import Lock
+import atexit
+import queue
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
 import os
 
+try:
+    import zstandard
+    USE_ZSTD = True
+except ImportError:
+    USE_ZSTD = False
+
 # Use /data directory on Render (persistent disk), otherwise use current directory
 DATA_DIR = os.getenv("DATA_DIR", ".")
 DB_FILE = os.path.join(DATA_DIR, "scans.db")
 
+# Deferred scan logging: the writer commits up to this many scans per transaction...
+WRITE_BATCH_SIZE = 100
+# ...and waits at most this long (seconds) before committing a partial batch
+WRITE_FLUSH_INTERVAL = 0.5
+# A batch whose transaction fails (e.g. database locked) is retried this many
+# times, with a growing delay, before its scans are written one by one
+WRITE_RETRIES = 3
+WRITE_RETRY_DELAY = 0.5
+
+# Full scan results: keep at most this many per token, none older than this many days
+RESULTS_PER_TOKEN = 20
+RESULT_RETENTION_DAYS = 30
+# Age-based pruning runs at most this often (seconds)
+RESULT_PRUNE_INTERVAL = 3600
+
+# Statements are kept constant so sqlite3's per-connection statement cache reuses them
+INSERT_SCAN_SQL = '''
+    INSERT INTO scans
+    (timestamp, token_address, token_name, token_symbol,
+     risk_score, risk_level, ai_score, source, user_agent, ip_address)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Rollups are updated in the same transaction as the scan insert
+UPSERT_COUNTER_SQL = '''
+    INSERT INTO scan_counters (dimension, key, count)
+    VALUES (?, ?, ?)
+    ON CONFLICT(dimension, key) DO UPDATE SET count = count + excluded.count
+'''
+
+UPSERT_TOKEN_COUNT_SQL = '''
+    INSERT INTO token_scan_counts (token_address, token_name, token_symbol, count)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(token_address) DO UPDATE SET
+        token_name = COALESCE(excluded.token_name, token_name),
+        token_symbol = COALESCE(excluded.token_symbol, token_symbol),
+        count = count + excluded.count
+'''
+
+UPSERT_BUCKET_SQL = '''
+    INSERT INTO scan_buckets (period, bucket, count)
+    VALUES (?, ?, ?)
+    ON CONFLICT(period, bucket) DO UPDATE SET count = count + excluded.count
+'''
+
+TOTAL_SCANS_SQL = "SELECT count FROM scan_counters WHERE dimension = 'total' AND key = ''"
+
+COUNTERS_SQL = 'SELECT key, count FROM scan_counters WHERE dimension = ?'
+
+TOP_TOKENS_SQL = '''
+    SELECT token_address, token_name, token_symbol, count
+    FROM token_scan_counts
+    ORDER BY count DESC
+    LIMIT 10
+'''
+
+SCAN_BUCKETS_SQL = '''
+    SELECT bucket, count
+    FROM scan_buckets
+    WHERE period = ?
+    ORDER BY bucket DESC
+    LIMIT ?
+'''
+
+# Timestamps are ISO strings, so buckets are prefixes: "YYYY-MM-DDTHH" and "YYYY-MM-DD"
+BUCKET_PERIODS = {
+    'hour': 13,
+    'day': 10,
+}
+
+INSERT_RESULT_SQL = '''
+    INSERT OR REPLACE INTO scan_results (token_address, timestamp, codec, data)
+    VALUES (?, ?, ?, ?)
+'''
+
+# Served straight from the (token_address, timestamp) primary key
+LATEST_RESULT_SQL = '''
+    SELECT timestamp, codec, data
+    FROM scan_results
+    WHERE token_address = ?
+    ORDER BY timestamp DESC
+    LIMIT 1
+'''
+
+RESULT_HISTORY_SQL = '''
+    SELECT timestamp, codec, data
+    FROM scan_results
+    WHERE token_address = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+'''
+
+PRUNE_TOKEN_RESULTS_SQL = '''
+    DELETE FROM scan_results
+    WHERE token_address = ? AND timestamp < (
+        SELECT timestamp FROM scan_results
+        WHERE token_address = ?
+        ORDER BY timestamp DESC
+        LIMIT 1 OFFSET ?
+    )
+'''
+
+PRUNE_OLD_RESULTS_SQL = 'DELETE FROM scan_results WHERE timestamp < ?'
+
+RECENT_SCANS_SQL = '''
+    SELECT timestamp, token_address, token_name, token_symbol,
+           risk_score, risk_level, ai_score, source
+    FROM scans
+    ORDER BY timestamp DESC
+    LIMIT ?
+'''
+
+CHECK_SCANNED_SQL = 'SELECT 1 FROM scans WHERE token_address = ? LIMIT 1'
+
+# Queue marker that stops the writer thread
+_STOP = object()
+
+
+def encode_result(result: dict):
+    """Serialize and compress a scan result. Returns (codec, blob)"""
+    raw = json.dumps(result, separators=(',', ':'), default=str).encode('utf-8')
+
+    if USE_ZSTD:
+        return 'zstd', zstandard.ZstdCompressor(level=3).compress(raw)
+    return 'zlib', zlib.compress(raw, 6)
+
+
+def decode_result(codec: str, blob: bytes):
+    """Decompress and parse a stored scan result"""
+    if codec == 'zstd':
+        if not USE_ZSTD:
+            print("Error decoding scan result: zstandard is not installed")
+            return None
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        raw = zlib.decompress(blob)
+
+    return json.loads(raw)
+
+
 class ScanDatabase:
-    def __init__(self):
-        self.lock = Lock()
+    """
+    Scan history store
+
+    Each thread keeps its own connection (WAL mode, synchronous=NORMAL), so
+    readers never wait for the writer. add_scan only queues the row; a
+    background writer inserts queued scans in batches, one transaction each.
+    """
+
+    def __init__(self, db_file: str = DB_FILE):
+        self.db_file = db_file
+        self._local = threading.local()
+        # Every thread's connection, closed by close(). A connection opened
+        # before the last close() is replaced on next use
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        self._generation = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._last_result_prune = 0
         self._init_db()
+        atexit.register(self.close)
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the connection owned by the current thread"""
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None or self._local.generation != self._generation:
+            # check_same_thread=False only so close() can close it; the
+            # connection is still used by its own thread alone
+            conn = sqlite3.connect(self.db_file, timeout=30.0, cached_statements=64,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._conns_lock:
+                self._conns.append(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+
+        return conn
 
     def _init_db(self):
         """Initialize database with tables"""
-        with self.lock:
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-
-            # Create scans table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS scans (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    token_address TEXT NOT NULL,
-                    token_name TEXT,
-                    token_symbol TEXT,
-                    risk_score INTEGER,
-                    risk_level TEXT,
-                    ai_score INTEGER,
-                    source TEXT NOT NULL,
-                    user_agent TEXT,
-                    ip_address TEXT
-                )
+        conn = self._get_conn()
+        cursor = conn.cursor()
+
+        # Create scans table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                token_address TEXT NOT NULL,
+                token_name TEXT,
+                token_symbol TEXT,
+                risk_score INTEGER,
+                risk_level TEXT,
+                ai_score INTEGER,
+                source TEXT NOT NULL,
+                user_agent TEXT,
+                ip_address TEXT
+            )
+        ''')
+
+        # Create index for faster queries
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_timestamp ON scans(timestamp)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_token ON scans(token_address)
+        ''')
+
+        # Rollup tables for /api/stats
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scan_counters (
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, key)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS token_scan_counts (
+                token_address TEXT PRIMARY KEY,
+                token_name TEXT,
+                token_symbol TEXT,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_token_scan_counts_count ON token_scan_counts(count DESC)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scan_buckets (
+                period TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (period, bucket)
+            )
+        ''')
+
+        # Full scan results, clustered by (token, time) so "latest for mint" is one seek
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scan_results (
+                token_address TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (token_address, timestamp)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scan_results_timestamp ON scan_results(timestamp)
+        ''')
+
+        conn.commit()
+
+        self._backfill_rollups(conn)
+
+    def _backfill_rollups(self, conn: sqlite3.Connection):
+        """Build rollups from existing scans (databases created before rollups existed)"""
+        with conn:
+            # BEGIN IMMEDIATE so two workers starting together do not both backfill
+            conn.execute('BEGIN IMMEDIATE')
+
+            has_total = conn.execute(TOTAL_SCANS_SQL).fetchone()
+            if has_total is not None:
+                return
+
+            conn.execute('''
+                INSERT INTO scan_counters (dimension, key, count)
+                SELECT 'total', '', COUNT(*) FROM scans
             ''')
-
-            # Create index for faster queries
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_timestamp ON scans(timestamp)
+            conn.execute('''
+                INSERT INTO scan_counters (dimension, key, count)
+                SELECT 'source', source, COUNT(*) FROM scans GROUP BY source
             ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_token ON scans(token_address)
+            conn.execute('''
+                INSERT INTO scan_counters (dimension, key, count)
+                SELECT 'risk_level', risk_level, COUNT(*) FROM scans
+                WHERE risk_level IS NOT NULL
+                GROUP BY risk_level
             ''')
+            conn.execute('''
+                INSERT INTO token_scan_counts (token_address, token_name, token_symbol, count)
+                SELECT token_address, MAX(token_name), MAX(token_symbol), COUNT(*) FROM scans
+                GROUP BY token_address
+            ''')
+            for period, length in BUCKET_PERIODS.items():
+                conn.execute('''
+                    INSERT INTO scan_buckets (period, bucket, count)
+                    SELECT ?, substr(timestamp, 1, ?), COUNT(*) FROM scans
+                    GROUP BY substr(timestamp, 1, ?)
+                ''', (period, length, length))
+
+    def _update_rollups(self, conn: sqlite3.Connection, rows):
+        """Add scan rows to the rollup tables (caller owns the transaction)"""
+        counters = {('total', ''): 0}
+        tokens = {}
+        buckets = {}
+
+        for row in rows:
+            timestamp, token_address, token_name, token_symbol = row[0], row[1], row[2], row[3]
+            risk_level, source = row[5], row[7]
+
+            counters[('total', '')] += 1
+            counters[('source', source)] = counters.get(('source', source), 0) + 1
+            if risk_level is not None:
+                counters[('risk_level', risk_level)] = counters.get(('risk_level', risk_level), 0) + 1
+
+            name, symbol, count = tokens.get(token_address, (None, None, 0))
+            tokens[token_address] = (token_name or name, token_symbol or symbol, count + 1)
+
+            for period, length in BUCKET_PERIODS.items():
+                key = (period, timestamp[:length])
+                buckets[key] = buckets.get(key, 0) + 1
+
+        conn.executemany(UPSERT_COUNTER_SQL, [(d, k, c) for (d, k), c in counters.items()])
+        conn.executemany(UPSERT_TOKEN_COUNT_SQL, [(t, n, s, c) for t, (n, s, c) in tokens.items()])
+        conn.executemany(UPSERT_BUCKET_SQL, [(p, b, c) for (p, b), c in buckets.items()])
+
+    def _start_writer(self):
+        """Start the background writer thread on first use"""
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="scan-db-writer", daemon=True)
+                self._writer.start()
+
+    def _writer_loop(self):
+        """Drain the scan queue, committing one batch per transaction"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            stop = False
+
+            # Collect more rows until the batch is full or the queue stays empty
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self._queue.get(timeout=WRITE_FLUSH_INTERVAL)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write_batch(batch)
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if stop:
+                self._queue.task_done()
+                return
+
+    def _write_batch(self, items):
+        """
+        Insert queued (scan row, result) items in a single transaction
+
+        A failing transaction is retried; if it keeps failing the items are
+        written one transaction each, so only the rows that fail themselves
+        are lost.
+        """
+        error = None
+        for attempt in range(WRITE_RETRIES):
+            try:
+                self._insert_items(items)
+                return
+            except sqlite3.OperationalError as e:
+                # Locked / busy database: worth waiting for
+                error = e
+                time.sleep(WRITE_RETRY_DELAY * (attempt + 1))
+            except Exception as e:
+                error = e
+                break
 
-            conn.commit()
-            conn.close()
+        if len(items) == 1:
+            print(f"Error adding scan to database: {error}")
+            return
 
-    def add_scan(self, token_address, token_name=None, token_symbol=None,
-                 risk_score=None, risk_level=None, ai_score=None,
-                 source="web", user_agent=None, ip_address=None):
-        """Add a scan to the database"""
-        with self.lock:
+        print(f"Error adding {len(items)} scans to database ({error}), writing them one by one")
+        for item in items:
             try:
-                conn = sqlite3.connect(DB_FILE)
-                cursor = conn.cursor()
-
-                cursor.execute('''
-                    INSERT INTO scans
-                    (timestamp, token_address, token_name, token_symbol,
-                     risk_score, risk_level, ai_score, source, user_agent, ip_address)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    datetime.now().isoformat(),
-                    token_address,
-                    token_name,
-                    token_symbol,
-                    risk_score,
-                    risk_level,
-                    ai_score,
-                    source,
-                    user_agent,
-                    ip_address
-                ))
-
-                conn.commit()
-                scan_id = cursor.lastrowid
-                conn.close()
-
-                return scan_id
+                self._insert_items([item])
             except Exception as e:
-                print(f"Error adding scan to database: {e}")
-                return None
-
-    def get_total_scans(self):
-        """Get total number of scans"""
-        with self.lock:
+                print(f"Error adding scan of {item[0][1]} to database: {e}")
+
+    def _insert_items(self, items):
+        """Insert (scan row, result) items in one transaction (raises on failure)"""
+        rows = [row for row, result in items]
+        results = []
+        for row, result in items:
+            if result is None:
+                continue
+            # A result that cannot be encoded loses only its blob, not the batch
             try:
-                conn = sqlite3.connect(DB_FILE)
-                cursor = conn.cursor()
+                results.append((row[1], row[0]) + encode_result(result))
+            except Exception as e:
+                print(f"Error encoding scan result of {row[1]}: {e}")
 
-                cursor.execute('SELECT COUNT(*) FROM scans')
-                total = cursor.fetchone()[0]
+        conn = self._get_conn()
+        with conn:
+            conn.executemany(INSERT_SCAN_SQL, rows)
+            self._update_rollups(conn, rows)
+            if results:
+                self._store_results(conn, results)
 
-                conn.close()
-                return total
-            except Exception as e:
-                print(f"Error getting total scans: {e}")
-                return 0
+    def _store_results(self, conn: sqlite3.Connection, results):
+        """Insert encoded results and apply the retention policy (caller owns the transaction)"""
+        conn.executemany(INSERT_RESULT_SQL, results)
 
-    def get_scans_by_source(self):
-        """Get scan counts by source"""
-        with self.lock:
-            try:
-                conn = sqlite3.connect(DB_FILE)
-                cursor = conn.cursor()
+        for token_address in {r[0] for r in results}:
+            conn.execute(PRUNE_TOKEN_RESULTS_SQL, (token_address, token_address, RESULTS_PER_TOKEN - 1))
 
-                cursor.execute('''
-                    SELECT source, COUNT(*) as count
-                    FROM scans
-                    GROUP BY source
-                ''')
+        now = time.time()
+        if now - self._last_result_prune >= RESULT_PRUNE_INTERVAL:
+            self._last_result_prune = now
+            cutoff = (datetime.now() - timedelta(days=RESULT_RETENTION_DAYS)).isoformat()
+            conn.execute(PRUNE_OLD_RESULTS_SQL, (cutoff,))
 
-                results = {row[0]: row[1] for row in cursor.fetchall()}
+    def add_scan(self, token_address, token_name=None, token_symbol=None,
+                 risk_score=None, risk_level=None, ai_score=None,
+                 source="web", user_agent=None, ip_address=None, result=None, wait=False):
+        """
+        Add a scan to the database
+
+        By default the scan is queued for the background writer and None is
+        returned. With wait=True the row is written immediately and its id
+        is returned. If `result` (the full analysis JSON) is given it is
+        stored compressed in scan_results under the same timestamp.
+        """
+        row = (
+            datetime.now().isoformat(),
+            token_address,
+            token_name,
+            token_symbol,
+            risk_score,
+            risk_level,
+            ai_score,
+            source,
+            user_agent,
+            ip_address
+        )
+
+        if not wait:
+            self._start_writer()
+            self._queue.put((row, result))
+            return None
+
+        try:
+            conn = self._get_conn()
+            with conn:
+                cursor = conn.execute(INSERT_SCAN_SQL, row)
+                self._update_rollups(conn, [row])
+                if result is not None:
+                    self._store_results(conn, [(token_address, row[0]) + encode_result(result)])
+            return cursor.lastrowid
+        except Exception as e:
+            print(f"Error adding scan to database: {e}")
+            return None
+
+    def flush(self):
+        """Block until all queued scans are written"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Write pending scans, stop the writer thread and close all connections"""
+        with self._writer_lock:
+            writer = self._writer
+            self._writer = None
+
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join()
+
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._generation += 1
+        for conn in conns:
+            try:
                 conn.close()
+            except sqlite3.Error:
+                pass
 
-                return results
-            except Exception as e:
-                print(f"Error getting scans by source: {e}")
-                return {}
+    def get_total_scans(self):
+        """Get total number of scans"""
+        try:
+            row = self._get_conn().execute(TOTAL_SCANS_SQL).fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Error getting total scans: {e}")
+            return 0
+
+    def get_scans_by_source(self):
+        """Get scan counts by source"""
+        try:
+            cursor = self._get_conn().execute(COUNTERS_SQL, ('source',))
+            return {row[0]: row[1] for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"Error getting scans by source: {e}")
+            return {}
+
+    def get_scan_buckets(self, period='hour', limit=24):
+        """Get scan counts per hour or day, newest first"""
+        if period not in BUCKET_PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+
+        try:
+            cursor = self._get_conn().execute(SCAN_BUCKETS_SQL, (period, limit))
+            return [{'bucket': row[0], 'count': row[1]} for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error getting scan buckets: {e}")
+            return []
 
     def get_recent_scans(self, limit=10):
         """Get recent scans"""
-        with self.lock:
-            try:
-                conn = sqlite3.connect(DB_FILE)
-                cursor = conn.cursor()
-
-                cursor.execute('''
-                    SELECT timestamp, token_address, token_name, token_symbol,
-                           risk_score, risk_level, ai_score, source
-                    FROM scans
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (limit,))
-
-                scans = []
-                for row in cursor.fetchall():
-                    scans.append({
-                        'timestamp': row[0],
-                        'token_address': row[1],
-                        'token_name': row[2],
-                        'token_symbol': row[3],
-                        'risk_score': row[4],
-                        'risk_level': row[5],
-                        'ai_score': row[6],
-                        'source': row[7]
-                    })
-
-                conn.close()
-                return scans
-            except Exception as e:
-                print(f"Error getting recent scans: {e}")
-                return []
+        try:
+            cursor = self._get_conn().execute(RECENT_SCANS_SQL, (limit,))
+
+            scans = []
+            for row in cursor.fetchall():
+                scans.append({
+                    'timestamp': row[0],
+                    'token_address': row[1],
+                    'token_name': row[2],
+                    'token_symbol': row[3],
+                    'risk_score': row[4],
+                    'risk_level': row[5],
+                    'ai_score': row[6],
+                    'source': row[7]
+                })
+
+            return scans
+        except Exception as e:
+            print(f"Error getting recent scans: {e}")
+            return []
 
     def get_stats(self):
-        """Get comprehensive statistics"""
-        with self.lock:
-            try:
-                conn = sqlite3.connect(DB_FILE)
-                cursor = conn.cursor()
+        """Get comprehensive statistics (reads rollups, independent of history size)"""
+        try:
+            conn = self._get_conn()
+
+            # Read all counters from one snapshot
+            with conn:
+                conn.execute('BEGIN')
 
                 # Total scans
-                cursor.execute('SELECT COUNT(*) FROM scans')
-                total_scans = cursor.fetchone()[0]
+                row = conn.execute(TOTAL_SCANS_SQL).fetchone()
+                total_scans = row[0] if row else 0
 
                 # Scans by source
-                cursor.execute('''
-                    SELECT source, COUNT(*) as count
-                    FROM scans
-                    GROUP BY source
-                ''')
-                by_source = {row[0]: row[1] for row in cursor.fetchall()}
+                by_source = {row[0]: row[1] for row in conn.execute(COUNTERS_SQL, ('source',)).fetchall()}
 
                 # Scans by risk level
-                cursor.execute('''
-                    SELECT risk_level, COUNT(*) as count
-                    FROM scans
-                    WHERE risk_level IS NOT NULL
-                    GROUP BY risk_level
-                ''')
-                by_risk = {row[0]: row[1] for row in cursor.fetchall()}
+                by_risk = {row[0]: row[1] for row in conn.execute(COUNTERS_SQL, ('risk_level',)).fetchall()}
 
                 # Most scanned tokens
-                cursor.execute('''
-                    SELECT token_address, token_name, token_symbol, COUNT(*) as count
-                    FROM scans
-                    GROUP BY token_address
-                    ORDER BY count DESC
-                    LIMIT 10
-                ''')
                 top_tokens = []
-                for row in cursor.fetchall():
+                for row in conn.execute(TOP_TOKENS_SQL).fetchall():
                     top_tokens.append({
                         'address': row[0],
                         'name': row[1],
@@ -202,42 +592,72 @@ class ScanDatabase:
                         'scan_count': row[3]
                     })
 
-                conn.close()
+            return {
+                'total_scans': total_scans,
+                'by_source': by_source,
+                'by_risk_level': by_risk,
+                'top_tokens': top_tokens
+            }
+        except Exception as e:
+            print(f"Error getting stats: {e}")
+            return {
+                'total_scans': 0,
+                'by_source': {},
+                'by_risk_level': {},
+                'top_tokens': []
+            }
+
+    def get_latest_result(self, token_address, max_age=None):
+        """
+        Get the most recent full scan result for a token
+
+        Returns {'timestamp': ..., 'result': {...}} or None. With max_age
+        (seconds), older results are ignored.
+        """
+        try:
+            row = self._get_conn().execute(LATEST_RESULT_SQL, (token_address,)).fetchone()
+            if not row:
+                return None
 
-                return {
-                    'total_scans': total_scans,
-                    'by_source': by_source,
-                    'by_risk_level': by_risk,
-                    'top_tokens': top_tokens
-                }
-            except Exception as e:
-                print(f"Error getting stats: {e}")
-                return {
-                    'total_scans': 0,
-                    'by_source': {},
-                    'by_risk_level': {},
-                    'top_tokens': []
-                }
+            timestamp, codec, blob = row
+            if max_age is not None:
+                age = (datetime.now() - datetime.fromisoformat(timestamp)).total_seconds()
+                if age > max_age:
+                    return None
 
-    def check_if_scanned(self, token_address):
-        """Check if a token has been scanned before"""
-        with self.lock:
-            try:
-                conn = sqlite3.connect(DB_FILE)
-                cursor = conn.cursor()
+            result = decode_result(codec, blob)
+            if result is None:
+                return None
 
-                cursor.execute('''
-                    SELECT COUNT(*) FROM scans
-                    WHERE token_address = ?
-                ''', (token_address,))
+            return {'timestamp': timestamp, 'result': result}
+        except Exception as e:
+            print(f"Error getting latest result: {e}")
+            return None
 
-                count = cursor.fetchone()[0]
-                conn.close()
+    def get_result_history(self, token_address, limit=10):
+        """Get past full scan results for a token, newest first"""
+        try:
+            cursor = self._get_conn().execute(RESULT_HISTORY_SQL, (token_address, limit))
 
-                return count > 0
-            except Exception as e:
-                print(f"Error checking if scanned: {e}")
-                return False
+            history = []
+            for timestamp, codec, blob in cursor.fetchall():
+                result = decode_result(codec, blob)
+                if result is not None:
+                    history.append({'timestamp': timestamp, 'result': result})
+
+            return history
+        except Exception as e:
+            print(f"Error getting result history: {e}")
+            return []
+
+    def check_if_scanned(self, token_address):
+        """Check if a token has been scanned before"""
+        try:
+            row = self._get_conn().execute(CHECK_SCANNED_SQL, (token_address,)).fetchone()
+            return row is not None
+        except Exception as e:
+            print(f"Error checking if scanned: {e}")
+            return False
 
 # Global database instance
 db = ScanDatabase()
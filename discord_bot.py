@@ -17,6 +17,7 @@ load_dotenv()
 # Configuration
 DISCORD_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 API_URL = os.getenv("API_URL", "http://localhost:5000")
+WATCHLIST_HEADERS = {"X-API-Key": os.getenv("WATCHLIST_API_TOKEN", "")}
 
 # Bot setup
 intents = discord.Intents.default()
@@ -675,6 +676,52 @@ async def stats(interaction: discord.Interaction):
     except Exception as e:
         await interaction.followup.send(f"❌ Error: {str(e)}")
 
+@bot.tree.command(name="watch", description="👀 Get alerts in this channel when a token's score changes")
+@app_commands.describe(token_address="The Solana token mint address to watch")
+async def watch(interaction: discord.Interaction, token_address: str):
+    """Add a token to this channel's watchlist"""
+    if len(token_address) < 32 or len(token_address) > 44:
+        await interaction.response.send_message("❌ Invalid Solana address format")
+        return
+
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(f"{API_URL}/api/watchlist", headers=WATCHLIST_HEADERS, json={
+                "mint_address": token_address,
+                "platform": "discord",
+                "channel_id": str(interaction.channel_id)
+            })
+
+        if response.status_code == 200:
+            await interaction.response.send_message(
+                f"👀 Watching `{token_address[:8]}...{token_address[-8:]}` - score changes will be posted here"
+            )
+        else:
+            await interaction.response.send_message(f"❌ {response.json().get('error', 'Failed to watch token')}")
+
+    except Exception as e:
+        await interaction.response.send_message(f"❌ Error: {str(e)}")
+
+@bot.tree.command(name="unwatch", description="🔕 Stop score alerts for a token in this channel")
+@app_commands.describe(token_address="The Solana token mint address to stop watching")
+async def unwatch(interaction: discord.Interaction, token_address: str):
+    """Remove a token from this channel's watchlist"""
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.request("DELETE", f"{API_URL}/api/watchlist", headers=WATCHLIST_HEADERS, json={
+                "mint_address": token_address,
+                "platform": "discord",
+                "channel_id": str(interaction.channel_id)
+            })
+
+        if response.status_code == 200:
+            await interaction.response.send_message(f"🔕 Stopped watching `{token_address[:8]}...{token_address[-8:]}`")
+        else:
+            await interaction.response.send_message(f"❌ {response.json().get('error', 'Failed to unwatch token')}")
+
+    except Exception as e:
+        await interaction.response.send_message(f"❌ Error: {str(e)}")
+
 @bot.tree.command(name="help", description="❓ Show help and commands")
 async def help_command(interaction: discord.Interaction):
     """Show help"""
@@ -690,6 +737,12 @@ async def help_command(interaction: discord.Interaction):
         inline=False
     )
 
+    embed.add_field(
+        name="/watch <token_address>",
+        value="👀 Post score changes of a token in this channel (`/unwatch` to stop)",
+        inline=False
+    )
+
     embed.add_field(
         name="/stats",
         value="📊 View scanner statistics",
@@ -0,0 +1,163 @@
+"""
+Recent selling activity of top holders
+Fetches the recent signatures of all top holders in one JSON-RPC batch
+(concurrent single requests if the RPC rejects batches) and compares them
+with the mint's own signatures, so whale dumping and coordinated exits are
+computed in one pass
+"""
+import time
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+# Only activity in this window counts as "recent" (seconds)
+SELLING_WINDOW = 3600
+# Signatures fetched per holder
+HOLDER_SIGNATURES_LIMIT = 20
+# Signatures fetched for the mint when no scan context provides them
+MINT_SIGNATURES_LIMIT = 1000
+# Recent transactions needed to flag a holder as selling when the mint's
+# signatures could not be loaded
+MIN_RECENT_TXS = 3
+# Fallback concurrency when batch requests are not supported
+MAX_PARALLEL_REQUESTS = 10
+
+
+@dataclass
+class HolderActivity:
+    """Recent activity of one holder"""
+    address: str
+    recent_tx_count: int  # Transactions in the window
+    recent_token_tx_count: int  # ...of which also touch the mint
+    has_sold_recently: bool
+    sell_percentage: Optional[float] = None  # Share of the balance sold (snapshot deltas only)
+
+
+@dataclass
+class SellingActivity:
+    """Selling activity of the top holders"""
+    holders: Dict[str, HolderActivity] = field(default_factory=dict)
+    holders_selling_count: int = 0
+    whale_dumping_detected: bool = False  # One of the top 3 is selling
+    coordinated_exit_detected: bool = False  # 3+ top holders selling in the same window
+
+
+def fetch_signatures_batch(client: httpx.Client, rpc_url: str, addresses: List[str],
+                           limit: int = HOLDER_SIGNATURES_LIMIT,
+                           limits: Optional[Dict[str, int]] = None) -> Dict[str, List[Dict]]:
+    """
+    getSignaturesForAddress for many addresses in one JSON-RPC batch request
+
+    `limits` overrides the page size per address. Addresses whose call failed
+    are left out of the result.
+    """
+    if not addresses:
+        return {}
+
+    limits = limits or {}
+    payload = [
+        {
+            "jsonrpc": "2.0",
+            "id": i,
+            "method": "getSignaturesForAddress",
+            "params": [address, {"limit": limits.get(address, limit)}]
+        }
+        for i, address in enumerate(addresses)
+    ]
+
+    try:
+        response = client.post(rpc_url, json=payload, timeout=15.0)
+
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, list):
+                results = {}
+                for item in data:
+                    index = item.get("id")
+                    if isinstance(index, int) and 0 <= index < len(addresses) and "result" in item:
+                        results[addresses[index]] = item["result"] or []
+                return results
+
+        print(f"[HOLDER ACTIVITY] Batch request not supported ({response.status_code}), using parallel requests")
+
+    except Exception as e:
+        print(f"[HOLDER ACTIVITY] Batch request error: {e}")
+
+    # Fallback: one request per address, in parallel
+    def fetch(request):
+        try:
+            single = client.post(rpc_url, json=request, timeout=5.0)
+            if single.status_code == 200:
+                return single.json().get("result")
+        except Exception:
+            pass
+        return None
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_REQUESTS, len(payload))) as pool:
+        for address, result in zip(addresses, pool.map(fetch, payload)):
+            if result is not None:
+                results[address] = result
+
+    return results
+
+
+def analyze_selling_activity(client: httpx.Client, rpc_url: str, mint_address: str,
+                             holder_addresses: List[str], ctx=None,
+                             window: int = SELLING_WINDOW) -> SellingActivity:
+    """
+    Detect recent selling by the given holders (ordered by balance, largest first)
+
+    A holder is selling when one of its transactions in the window also
+    touches the mint (a trade of this token). If the mint's signatures could
+    not be loaded, MIN_RECENT_TXS+ transactions in the window count instead.
+    """
+    addresses = list(dict.fromkeys(a for a in holder_addresses if a))
+    if not addresses:
+        return SellingActivity()
+
+    limits = {}
+    if ctx is not None:
+        mint_signatures = ctx.signatures()
+    else:
+        # Same batch also fetches the mint's own signatures
+        limits[mint_address] = MINT_SIGNATURES_LIMIT
+        mint_signatures = None
+
+    batch = addresses + ([mint_address] if mint_signatures is None else [])
+    signatures = fetch_signatures_batch(client, rpc_url, batch, limits=limits)
+
+    if mint_signatures is None:
+        mint_signatures = signatures.get(mint_address, [])
+
+    mint_signature_set: Set[str] = {s.get("signature") for s in mint_signatures if s.get("signature")}
+
+    now = time.time()
+    activity = SellingActivity()
+
+    for address in addresses:
+        recent = [
+            sig for sig in signatures.get(address, [])
+            if sig.get("blockTime") and (now - sig["blockTime"]) < window
+        ]
+        token_txs = sum(1 for sig in recent if sig.get("signature") in mint_signature_set)
+
+        if mint_signature_set:
+            has_sold_recently = token_txs > 0
+        else:
+            has_sold_recently = len(recent) >= MIN_RECENT_TXS
+
+        activity.holders[address] = HolderActivity(
+            address=address,
+            recent_tx_count=len(recent),
+            recent_token_tx_count=token_txs,
+            has_sold_recently=has_sold_recently
+        )
+
+    selling = [a for a in addresses if activity.holders[a].has_sold_recently]
+    activity.holders_selling_count = len(selling)
+    activity.whale_dumping_detected = any(activity.holders[a].has_sold_recently for a in addresses[:3])
+    activity.coordinated_exit_detected = len(selling) >= 3
+
+    return activity
@@ -0,0 +1,375 @@
+"""
+Holder snapshot poller
+Records the largest holders (token accounts merged per owner wallet) of
+watched and recently scanned mints every few minutes, so holder balance
+changes can be read from stored snapshots instead of per-holder RPC calls
+at scan time
+
+Run standalone: python holder_snapshots.py
+"""
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from solders.pubkey import Pubkey
+
+from account_inspector import fetch_token_account_owners, holders_by_owner
+from config import SOLANA_RPC_URL
+from holder_activity import HolderActivity, SellingActivity, SELLING_WINDOW
+
+DATA_DIR = os.getenv("DATA_DIR", ".")
+SNAPSHOT_DB_FILE = os.path.join(DATA_DIR, "holder_snapshots.db")
+# Recently scanned mints are read from the scan history
+SCANS_DB_FILE = os.path.join(DATA_DIR, "scans.db")
+
+# Poll every N seconds
+SNAPSHOT_INTERVAL = int(os.getenv("HOLDER_SNAPSHOT_INTERVAL", "300"))
+# Mints scanned within this many seconds are polled
+RECENT_SCAN_WINDOW = 6 * 3600
+# Snapshots older than this are deleted (seconds)
+SNAPSHOT_RETENTION = 48 * 3600
+# Parallel getTokenLargestAccounts calls per poll
+POLL_WORKERS = 4
+
+# A holder whose balance dropped by more than this share is selling (%)
+SELLING_DROP_PERCENTAGE = 10
+
+
+@dataclass
+class HolderSnapshot:
+    """Largest holders of a mint at one point in time"""
+    mint: str
+    snapshot_time: float
+    addresses: List[str]  # Owner wallets
+    balances: List[float]  # uiAmount, same order as addresses
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.addresses, self.balances))
+
+
+@dataclass
+class HolderDelta:
+    """Balance change of one holder between two snapshots"""
+    address: str
+    old_balance: float
+    new_balance: float
+
+    @property
+    def change_percentage(self) -> float:
+        """Change relative to the old balance (negative = sold)"""
+        if self.old_balance <= 0:
+            return 0.0
+        return (self.new_balance - self.old_balance) / self.old_balance * 100
+
+
+def pack_snapshot(addresses: List[str], balances: List[float]) -> Tuple[bytes, bytes]:
+    """Pack addresses as concatenated 32-byte keys and balances as float64 array"""
+    address_blob = b"".join(bytes(Pubkey.from_string(a)) for a in addresses)
+    balance_blob = array("d", balances).tobytes()
+    return address_blob, balance_blob
+
+
+def unpack_snapshot(address_blob: bytes, balance_blob: bytes) -> Tuple[List[str], List[float]]:
+    """Inverse of pack_snapshot"""
+    addresses = [
+        str(Pubkey.from_bytes(address_blob[i:i + 32]))
+        for i in range(0, len(address_blob), 32)
+    ]
+    balances = array("d")
+    balances.frombytes(balance_blob)
+    return addresses, balances.tolist()
+
+
+class HolderSnapshotStore:
+    """SQLite store of packed holder snapshots"""
+
+    def __init__(self, db_file: str = SNAPSHOT_DB_FILE):
+        self.db_file = db_file
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_db(self):
+        """Initialize database with tables"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS holder_snapshots (
+                        mint TEXT NOT NULL,
+                        snapshot_time REAL NOT NULL,
+                        addresses BLOB NOT NULL,
+                        balances BLOB NOT NULL,
+                        PRIMARY KEY (mint, snapshot_time)
+                    ) WITHOUT ROWID
+                ''')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS watched_mints (
+                        mint TEXT PRIMARY KEY,
+                        added_at REAL NOT NULL
+                    )
+                ''')
+        finally:
+            conn.close()
+
+    def watch(self, mint: str):
+        """Poll a mint regardless of scan history"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR IGNORE INTO watched_mints (mint, added_at) VALUES (?, ?)',
+                    (mint, time.time())
+                )
+        finally:
+            conn.close()
+
+    def unwatch(self, mint: str):
+        """Stop polling a watched mint"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM watched_mints WHERE mint = ?', (mint,))
+        finally:
+            conn.close()
+
+    def get_watched_mints(self) -> List[str]:
+        conn = self._connect()
+        try:
+            return [row[0] for row in conn.execute('SELECT mint FROM watched_mints')]
+        finally:
+            conn.close()
+
+    def add_snapshot(self, mint: str, accounts: List[Dict], snapshot_time: float = None):
+        """Store holders keyed by owner wallet (ScanContext.largest_holders / holders_by_owner)"""
+        snapshot_time = snapshot_time or time.time()
+        addresses = []
+        balances = []
+        for account in accounts:
+            address = account.get("address")
+            if address:
+                addresses.append(address)
+                balances.append(float(account.get("uiAmount") or 0))
+
+        address_blob, balance_blob = pack_snapshot(addresses, balances)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO holder_snapshots (mint, snapshot_time, addresses, balances) '
+                    'VALUES (?, ?, ?, ?)',
+                    (mint, snapshot_time, address_blob, balance_blob)
+                )
+        finally:
+            conn.close()
+
+    def get_snapshots(self, mint: str, since: float) -> List[HolderSnapshot]:
+        """Snapshots of a mint taken after `since`, oldest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT snapshot_time, addresses, balances FROM holder_snapshots '
+                'WHERE mint = ? AND snapshot_time >= ? ORDER BY snapshot_time',
+                (mint, since)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        snapshots = []
+        for snapshot_time, address_blob, balance_blob in rows:
+            addresses, balances = unpack_snapshot(address_blob, balance_blob)
+            snapshots.append(HolderSnapshot(mint, snapshot_time, addresses, balances))
+        return snapshots
+
+    def get_deltas(self, mint: str, window: int = 3600) -> Optional[Dict[str, HolderDelta]]:
+        """
+        Balance change per holder between the oldest and newest snapshot in the window
+
+        Returns None when fewer than two snapshots exist in the window.
+        Only holders present in both snapshots get a delta: a holder missing
+        from one of them is outside the top list there, and its balance is
+        unknown rather than zero.
+        """
+        snapshots = self.get_snapshots(mint, time.time() - window)
+        if len(snapshots) < 2:
+            return None
+
+        old = snapshots[0].as_dict()
+        new = snapshots[-1].as_dict()
+
+        deltas = {}
+        for address, new_balance in new.items():
+            if address in old:
+                deltas[address] = HolderDelta(
+                    address=address,
+                    old_balance=old[address],
+                    new_balance=new_balance
+                )
+        return deltas
+
+    def prune(self, retention: int = SNAPSHOT_RETENTION):
+        """Delete old snapshots"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM holder_snapshots WHERE snapshot_time < ?', (time.time() - retention,))
+        finally:
+            conn.close()
+
+
+def selling_from_snapshots(mint: str, holder_addresses: List[str], store: HolderSnapshotStore = None,
+                           window: int = SELLING_WINDOW) -> Optional[SellingActivity]:
+    """
+    Selling activity of the given holders (largest first) from stored snapshots
+
+    A holder is selling when its balance dropped by more than
+    SELLING_DROP_PERCENTAGE in the window. Returns None without snapshot
+    history, so callers can fall back to analyze_selling_activity.
+    """
+    deltas = (store or snapshot_store).get_deltas(mint, window)
+    if deltas is None:
+        return None
+
+    addresses = list(dict.fromkeys(a for a in holder_addresses if a))
+    activity = SellingActivity()
+
+    for address in addresses:
+        delta = deltas.get(address)
+        sold = -delta.change_percentage if delta else 0.0
+        activity.holders[address] = HolderActivity(
+            address=address,
+            recent_tx_count=0,
+            recent_token_tx_count=0,
+            has_sold_recently=sold > SELLING_DROP_PERCENTAGE,
+            sell_percentage=sold if sold > SELLING_DROP_PERCENTAGE else None
+        )
+
+    selling = [a for a in addresses if activity.holders[a].has_sold_recently]
+    activity.holders_selling_count = len(selling)
+    activity.whale_dumping_detected = any(activity.holders[a].has_sold_recently for a in addresses[:3])
+    activity.coordinated_exit_detected = len(selling) >= 3
+
+    return activity
+
+
+def get_recently_scanned_mints(window: int = RECENT_SCAN_WINDOW) -> List[str]:
+    """Mints scanned in the last `window` seconds (from the scan history)"""
+    if not os.path.exists(SCANS_DB_FILE):
+        return []
+
+    from datetime import datetime, timedelta
+
+    cutoff = (datetime.now() - timedelta(seconds=window)).isoformat()
+    try:
+        conn = sqlite3.connect(SCANS_DB_FILE, timeout=30.0)
+        try:
+            rows = conn.execute(
+                'SELECT DISTINCT token_address FROM scans WHERE timestamp >= ?', (cutoff,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+    except Exception as e:
+        print(f"[SNAPSHOTS] Error reading scan history: {e}")
+        return []
+
+
+class HolderSnapshotPoller:
+    """Background thread that snapshots watched and recently scanned mints"""
+
+    def __init__(self, store: HolderSnapshotStore = None, rpc_url: str = SOLANA_RPC_URL,
+                 interval: int = SNAPSHOT_INTERVAL):
+        self.store = store or snapshot_store
+        self.rpc_url = rpc_url
+        self.interval = interval
+        self.client = httpx.Client(timeout=30.0)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _fetch_largest_holders(self, mint: str) -> Optional[List[Dict]]:
+        """getTokenLargestAccounts merged per owner wallet (two RPC calls)"""
+        try:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getTokenLargestAccounts",
+                "params": [mint]
+            }
+            response = self.client.post(self.rpc_url, json=payload)
+            if response.status_code != 200:
+                return None
+            accounts = response.json().get("result", {}).get("value")
+            if accounts is None:
+                return None
+
+            owners = fetch_token_account_owners(
+                self.client, self.rpc_url, [a.get("address") for a in accounts if a.get("address")]
+            )
+            return holders_by_owner(accounts, owners)
+        except Exception:
+            return None
+
+    def poll_once(self) -> int:
+        """Snapshot every tracked mint once. Returns number of snapshots stored"""
+        mints = sorted(set(self.store.get_watched_mints()) | set(get_recently_scanned_mints()))
+        if not mints:
+            return 0
+
+        now = time.time()
+        stored = 0
+
+        with ThreadPoolExecutor(max_workers=POLL_WORKERS) as pool:
+            for mint, holders in zip(mints, pool.map(self._fetch_largest_holders, mints)):
+                if holders is None:
+                    continue
+                try:
+                    self.store.add_snapshot(mint, holders, now)
+                    stored += 1
+                except Exception as e:
+                    print(f"[SNAPSHOTS] Error storing snapshot for {mint[:8]}: {e}")
+
+        self.store.prune()
+        return stored
+
+    def run(self):
+        """Poll until stopped"""
+        while not self._stop.is_set():
+            started = time.time()
+            stored = self.poll_once()
+            print(f"[SNAPSHOTS] Stored {stored} snapshots in {time.time() - started:.1f}s")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Run the poller in a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="holder-snapshots", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.client.close()
+
+
+# Global store shared by analyzers in this process
+snapshot_store = HolderSnapshotStore()
+
+
+if __name__ == "__main__":
+    poller = HolderSnapshotPoller()
+    try:
+        poller.run()
+    except KeyboardInterrupt:
+        poller.stop()
@@ -6,10 +6,81 @@ except ImportError:
     import httpx
     USE_CLOUDSCRAPER = False
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 from dataclasses import dataclass
 from config import RISK_THRESHOLDS
 from metadata_fetcher import MetadataFetcher
+from rate_limit import get_bucket
+from ttl_cache import TTLCache
+
+# Raw DexScreener pairs per mint, shared by every analyzer in the process
+dexscreener_pairs_cache = TTLCache(ttl=30.0, maxsize=5000)
+
+# DexScreener /tokens endpoint accepts up to 30 comma-separated addresses
+DEXSCREENER_BATCH_SIZE = 30
+
+
+def fetch_dexscreener_pairs(mint_address: str) -> Optional[list]:
+    """Get DexScreener pairs for a mint (cached). None on API error"""
+    pairs = dexscreener_pairs_cache.get(mint_address)
+    if pairs is not None:
+        return pairs
+
+    import httpx
+    with httpx.Client(timeout=30.0, follow_redirects=True) as client:
+        response = client.get(f"https://api.dexscreener.com/latest/dex/tokens/{mint_address}")
+
+    if response.status_code != 200:
+        return None
+
+    data = response.json()
+    pairs = (data or {}).get('pairs') or []
+    dexscreener_pairs_cache.set(mint_address, pairs)
+    return pairs
+
+
+def prefetch_dexscreener_pairs(mint_addresses: List[str], budget: Optional[str] = None) -> Dict[str, list]:
+    """
+    Load DexScreener pairs for many mints, 30 per request
+
+    Args:
+        mint_addresses: Mints to load
+        budget: rate_limit bucket to take one token from per request (None = no limit)
+
+    Returns:
+        Mint -> pairs for every mint loaded or found in the cache (mints
+        whose request failed are left out). Pass them to the scans through
+        ScanContext.seed("pairs", ...): the shared cache expires quickly
+    """
+    import httpx
+
+    mints = list(dict.fromkeys(mint_addresses))
+    loaded = dexscreener_pairs_cache.get_many(mints)
+    missing = [m for m in mints if m not in loaded]
+
+    with httpx.Client(timeout=30.0, follow_redirects=True) as client:
+        for i in range(0, len(missing), DEXSCREENER_BATCH_SIZE):
+            chunk = missing[i:i + DEXSCREENER_BATCH_SIZE]
+            if budget:
+                get_bucket(budget).acquire()
+            try:
+                response = client.get(f"https://api.dexscreener.com/latest/dex/tokens/{','.join(chunk)}")
+                if response.status_code != 200:
+                    continue
+
+                pairs_by_mint = {mint: [] for mint in chunk}
+                for pair in (response.json() or {}).get('pairs') or []:
+                    base_address = pair.get('baseToken', {}).get('address')
+                    if base_address in pairs_by_mint:
+                        pairs_by_mint[base_address].append(pair)
+
+                for mint, pairs in pairs_by_mint.items():
+                    dexscreener_pairs_cache.set(mint, pairs)
+                loaded.update(pairs_by_mint)
+            except Exception as e:
+                print(f"DexScreener batch fetch failed: {e}")
+
+    return loaded
 
 
 @dataclass
@@ -48,16 +119,28 @@ class LiquidityAnalyzer:
         # Initialize blockchain metadata fetcher
         self.metadata_fetcher = MetadataFetcher()
 
-    def get_token_data(self, mint_address: str) -> Optional[dict]:
-        """Fetch token data from DexScreener API with blockchain metadata fallback"""
+    def get_token_data(self, mint_address: str, ctx=None) -> Optional[dict]:
+        """
+        Fetch token data from DexScreener API with blockchain metadata fallback
+
+        With a ScanContext, pairs and metadata come from the context and the
+        merged result is built once per scan.
+        """
+        if ctx is not None:
+            return ctx.memo("token_data", lambda: self._build_token_data(mint_address, ctx))
+
+        return self._build_token_data(mint_address)
+
+    def _build_token_data(self, mint_address: str, ctx=None) -> Optional[dict]:
+        """Merge DexScreener market data with blockchain metadata"""
         # Get market data from DexScreener
-        dex_data = self._get_from_dexscreener(mint_address)
+        dex_data = self._get_from_dexscreener(mint_address, ctx)
 
         if not dex_data:
             return None
 
         # Enrich with blockchain metadata (twitter, telegram, website, description)
-        blockchain_metadata = self._get_blockchain_metadata(mint_address)
+        blockchain_metadata = self._get_blockchain_metadata(mint_address, ctx)
 
         if blockchain_metadata:
             # Merge: Prioritize blockchain for social data (instant & accurate)
@@ -72,18 +155,14 @@ class LiquidityAnalyzer:
 
         return dex_data
 
-    def _get_from_dexscreener(self, mint_address: str) -> Optional[dict]:
+    def _get_from_dexscreener(self, mint_address: str, ctx=None) -> Optional[dict]:
         """Fallback: Get data from DexScreener API"""
         try:
-            import httpx
-            client = httpx.Client(timeout=30.0, follow_redirects=True)
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{mint_address}"
-            response = client.get(url)
-
-            if response.status_code == 200:
-                data = response.json()
-                if data and 'pairs' in data and len(data['pairs']) > 0:
-                    pair = data['pairs'][0]  # Use first pair
+            pairs = ctx.pairs() if ctx is not None else fetch_dexscreener_pairs(mint_address)
+
+            if pairs is not None:
+                if len(pairs) > 0:
+                    pair = pairs[0]  # Use first pair
                     dex_id = pair.get('dexId', '').lower()
 
                     # Check if on Raydium or PumpSwap (pump.fun's DEX)
@@ -147,7 +226,6 @@ class LiquidityAnalyzer:
                     # Extract creation timestamp
                     created_at = pair.get('pairCreatedAt')  # Unix timestamp in milliseconds
 
-                    client.close()
                     return {
                         'mint': mint_address,
                         'name': pair.get('baseToken', {}).get('name', 'Unknown'),
@@ -178,16 +256,18 @@ class LiquidityAnalyzer:
                         'description': '',
                         'created_timestamp': created_at
                     }
-            client.close()
             return None
         except Exception as e:
             print(f"DexScreener fallback failed: {e}")
             return None
 
-    def _get_blockchain_metadata(self, mint_address: str) -> Optional[dict]:
+    def _get_blockchain_metadata(self, mint_address: str, ctx=None) -> Optional[dict]:
         """Get token metadata directly from Solana blockchain + IPFS"""
         try:
-            metadata = self.metadata_fetcher.get_metadata(mint_address)
+            if ctx is not None:
+                metadata = ctx.metadata()
+            else:
+                metadata = self.metadata_fetcher.get_metadata(mint_address)
 
             if metadata:
                 print(f"[DEBUG] Blockchain metadata found: twitter={metadata.get('twitter')}, telegram={metadata.get('telegram')}, website={metadata.get('website')}")
@@ -201,10 +281,10 @@ class LiquidityAnalyzer:
             # Return None so scan continues with DexScreener data only
             return None
 
-    def analyze_liquidity(self, mint_address: str) -> LiquidityAnalysis:
+    def analyze_liquidity(self, mint_address: str, ctx=None) -> LiquidityAnalysis:
         """Analyze token liquidity metrics"""
 
-        token_data = self.get_token_data(mint_address)
+        token_data = self.get_token_data(mint_address, ctx)
 
         if not token_data:
             return LiquidityAnalysis(
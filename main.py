@@ -23,9 +23,10 @@ from wallet_analyzer import WalletAnalyzer
 from onchain_analyzer import OnChainAnalyzer
 from sniper_detector import SniperDetector
 from volume_analyzer import VolumeAnalyzer
-from batch_analyzer import BatchAnalyzer
+from batch_analyzer import BatchAnalyzer, DEFAULT_BATCH_WORKERS
 from risk_scorer import RiskScorer
 from insightx_api import InsightXAPI
+from scan_context import ScanContext
 from pump_dump_detector import PumpDumpDetector  # NEW
 
 console = Console(force_terminal=True, legacy_windows=False)
@@ -58,6 +59,9 @@ def analyze_token(mint_address: str):
     insightx = InsightXAPI()
     pump_dump_detector = PumpDumpDetector()  # NEW
 
+    # Upstream data shared by all analyzers of this scan
+    ctx = ScanContext(mint_address)
+
     try:
         with Progress(
             SpinnerColumn(),
@@ -67,7 +71,9 @@ def analyze_token(mint_address: str):
 
             # Fetch basic token data
             task1 = progress.add_task("Fetching token data...", total=None)
-            token_data = liq_analyzer.get_token_data(mint_address)
+            # Load mint + metadata accounts in one request (reused by all analyzers)
+            ctx.mint_info()
+            token_data = liq_analyzer.get_token_data(mint_address, ctx)
 
             if not token_data:
                 console.print("[red][X] Error: Could not fetch token data. Check the mint address.[/red]")
@@ -80,7 +86,7 @@ def analyze_token(mint_address: str):
 
             # Run all analyses
             task2 = progress.add_task("Analyzing liquidity...", total=None)
-            liquidity_analysis = liq_analyzer.analyze_liquidity(mint_address)
+            liquidity_analysis = liq_analyzer.analyze_liquidity(mint_address, ctx)
             progress.update(task2, completed=True)
 
             task3 = progress.add_task("Checking creator history...", total=None)
@@ -117,7 +123,7 @@ def analyze_token(mint_address: str):
             sniper_analysis = None
             try:
                 token_creation_time = token_data.get("created_timestamp")
-                sniper_analysis = sniper_detector.analyze_snipers(mint_address, token_creation_time)
+                sniper_analysis = sniper_detector.analyze_snipers(mint_address, token_creation_time, ctx)
             except Exception:
                 pass
             progress.update(task6, completed=True)
@@ -163,7 +169,7 @@ def analyze_token(mint_address: str):
         onchain_data = None
         try:
             console.print("\n[yellow]Fetching holder data from blockchain...[/yellow]")
-            onchain_data = onchain_analyzer.get_token_holders(mint_address)
+            onchain_data = onchain_analyzer.get_token_holders(mint_address, ctx)
         except Exception:
             pass
 
@@ -196,6 +202,7 @@ def analyze_token(mint_address: str):
         sniper_detector.close()
         insightx.close()
         pump_dump_detector.close()  # NEW
+        ctx.close()
 
 
 def display_results(token_data, liquidity_analysis, creator_analysis, social_analysis, wallet_analysis, risk_report, onchain_data=None, sniper_analysis=None, volume_analysis=None, distribution_metrics=None, scanner_results=None, insightx_sniper_metrics=None, insightx_cluster_metrics=None, pump_dump_analysis=None):
@@ -714,12 +721,15 @@ def _generate_rug_summary(risk_report, liquidity_analysis, creator_analysis, soc
     return "\n".join(lines)
 
 
-def analyze_creator_batch(creator_address: str):
+def analyze_creator_batch(creator_address: str, deep: bool = False, workers: int = DEFAULT_BATCH_WORKERS):
     """Analyze all tokens from a creator"""
     batch_analyzer = BatchAnalyzer()
 
     try:
-        results = batch_analyzer.analyze_creator_batch(creator_address, console)
+        if deep:
+            results = batch_analyzer.analyze_creator_batch_deep(creator_address, console, workers=workers)
+        else:
+            results = batch_analyzer.analyze_creator_batch(creator_address, console)
 
         if results:
             batch_analyzer.display_batch_results(results, console)
@@ -737,7 +747,19 @@ def main():
     # Check for batch mode
     if len(sys.argv) >= 3 and sys.argv[1] == "--batch":
         creator_address = sys.argv[2]
-        console.print("[cyan]Running in BATCH MODE - Analyzing all tokens from creator...[/cyan]\n")
+        deep = "--deep" in sys.argv[3:]
+        workers = DEFAULT_BATCH_WORKERS
+        if "--workers" in sys.argv[3:]:
+            try:
+                workers = int(sys.argv[sys.argv.index("--workers") + 1])
+            except (IndexError, ValueError):
+                console.print("[red][X] Error: --workers expects a number[/red]")
+                sys.exit(1)
+
+        if deep:
+            console.print(f"[cyan]Running in DEEP BATCH MODE - Full scan of every token ({workers} workers)...[/cyan]\n")
+        else:
+            console.print("[cyan]Running in BATCH MODE - Analyzing all tokens from creator...[/cyan]\n")
 
         # Validate address
         if len(creator_address) < 32 or len(creator_address) > 44:
@@ -745,7 +767,7 @@ def main():
             sys.exit(1)
 
         try:
-            analyze_creator_batch(creator_address)
+            analyze_creator_batch(creator_address, deep=deep, workers=workers)
         except KeyboardInterrupt:
             console.print("\n\n[yellow]Analysis interrupted by user[/yellow]")
             sys.exit(0)
@@ -758,6 +780,7 @@ def main():
         console.print("[yellow]Usage:[/yellow]")
         console.print("  Single token:  python main.py <token_mint_address>")
         console.print("  Batch mode:    python main.py --batch <creator_address>")
+        console.print("  Deep batch:    python main.py --batch <creator_address> --deep [--workers N]")
         console.print("\n[yellow]Examples:[/yellow]")
         console.print("  python main.py 7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr")
         console.print("  python main.py --batch Ah8zY3gfWEd1tkBAZgMKPTGSvxJbfVJJvbP8G5y3pump")
@@ -1,62 +1,282 @@
 """Fetch token metadata directly from Solana blockchain + IPFS"""
+import base64
+import hashlib
+import time
 import httpx
-from typing import Optional, Dict
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
+from typing import Optional, Dict, List
 from solders.pubkey import Pubkey
 from solana.rpc.api import Client
 
+# Metaplex Token Metadata Program ID
+METADATA_PROGRAM_ID = Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s")
+
+# getMultipleAccounts accepts at most 100 keys per request
+MAX_ACCOUNTS_PER_REQUEST = 100
+
+# Re-read a cached metadata account once it was observed this many slots ago (~1h)
+METADATA_MAX_SLOT_AGE = 9000
+
+# Average slot time, used to advance the slot clock between RPC responses
+SLOT_SECONDS = 0.4
+
+# Entries kept per cache (least recently used are evicted)
+METADATA_CACHE_SIZE = 20000
+URI_JSON_CACHE_SIZE = 20000
+
+
+@lru_cache(maxsize=65536)
+def get_metadata_pda(mint_address: str) -> Pubkey:
+    """Calculate metadata PDA (Program Derived Address), memoized per mint"""
+    mint_pubkey = Pubkey.from_string(mint_address)
+
+    # PDA derivation: [b"metadata", metadata_program_id, mint_pubkey]
+    seeds = [
+        b"metadata",
+        bytes(METADATA_PROGRAM_ID),
+        bytes(mint_pubkey)
+    ]
+
+    pda, bump = Pubkey.find_program_address(seeds, METADATA_PROGRAM_ID)
+    return pda
+
+
+def parse_metadata_account(data: bytes) -> Optional[Dict]:
+    """Parse on-chain metadata structure (name, symbol, uri)"""
+    try:
+        # Skip first byte (key = 4 for Metadata account)
+        offset = 1
+
+        # Update authority (32 bytes)
+        offset += 32
+
+        # Mint (32 bytes)
+        offset += 32
+
+        # Name (variable length string with 4-byte length prefix)
+        name_len = int.from_bytes(data[offset:offset+4], 'little')
+        offset += 4
+        name = data[offset:offset+name_len].decode('utf-8', errors='ignore')
+        offset += name_len
+
+        # Symbol (variable length string)
+        symbol_len = int.from_bytes(data[offset:offset+4], 'little')
+        offset += 4
+        symbol = data[offset:offset+symbol_len].decode('utf-8', errors='ignore')
+        offset += symbol_len
+
+        # URI (variable length string)
+        uri_len = int.from_bytes(data[offset:offset+4], 'little')
+        offset += 4
+        uri = data[offset:offset+uri_len].decode('utf-8', errors='ignore')
+
+        return {
+            'name': name,
+            'symbol': symbol,
+            'uri': uri
+        }
+
+    except Exception as e:
+        print(f"[DEBUG] Parse metadata error: {e}")
+        return None
+
+
+def fetch_multiple_accounts(client: httpx.Client, rpc_url: str, addresses: List[str], with_owner: bool = False):
+    """
+    Fetch raw data for up to 100 accounts. Returns (list of bytes or None, slot)
+
+    With with_owner=True each found account is a (bytes, owner program) tuple
+    """
+    try:
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getMultipleAccounts",
+            "params": [
+                addresses,
+                {"encoding": "base64"}
+            ]
+        }
+
+        response = client.post(rpc_url, json=payload)
+
+        if response.status_code != 200:
+            print(f"[DEBUG] getMultipleAccounts returned {response.status_code}")
+            return None, 0
+
+        result = response.json().get("result")
+        if not result:
+            return None, 0
+
+        slot = result.get("context", {}).get("slot", 0)
+
+        accounts = []
+        for account in result.get("value", []):
+            if account and account.get("data"):
+                data = base64.b64decode(account["data"][0])
+                accounts.append((data, account.get("owner")) if with_owner else data)
+            else:
+                accounts.append(None)
+
+        return accounts, slot
+
+    except Exception as e:
+        print(f"[DEBUG] getMultipleAccounts error: {e}")
+        return None, 0
+
+
+@dataclass
+class MetadataCacheEntry:
+    """Cached metadata for one mint"""
+    pda: str
+    slot: int  # Slot at which the metadata account data was last observed
+    data_hash: Optional[str]  # sha256 of the raw account data (None = no account)
+    onchain: Optional[Dict]  # Parsed name / symbol / uri
+    resolved: Optional[Dict] = None  # JSON fetched from the URI
+
+
+class MetadataCache:
+    """
+    Metadata cache keyed by mint
+
+    Entries stay valid until the chain has advanced METADATA_MAX_SLOT_AGE slots
+    past the slot they were read at. The current slot is the latest slot seen
+    in an RPC response, advanced by the wall clock (SLOT_SECONDS per slot), so
+    entries that only get hits still expire. A stale entry whose account data
+    hash is unchanged keeps its parsed fields and resolved JSON, so only a
+    changed account is parsed again. Resolved URI JSON is stored by URI, which
+    is content-addressed for IPFS/Arweave. Both maps are LRU-bounded.
+    """
+
+    def __init__(self, max_slot_age: int = METADATA_MAX_SLOT_AGE,
+                 maxsize: int = METADATA_CACHE_SIZE, uri_maxsize: int = URI_JSON_CACHE_SIZE):
+        self.lock = Lock()
+        self.max_slot_age = max_slot_age
+        self.maxsize = maxsize
+        self.uri_maxsize = uri_maxsize
+        self.entries: "OrderedDict[str, MetadataCacheEntry]" = OrderedDict()
+        self.uri_json: "OrderedDict[str, Dict]" = OrderedDict()
+        self.latest_slot = 0
+        self.latest_slot_at = time.monotonic()
+
+    def observe_slot(self, slot: int):
+        """Record the most recent slot seen in an RPC response"""
+        with self.lock:
+            if slot and slot > self._current_slot():
+                self.latest_slot = slot
+                self.latest_slot_at = time.monotonic()
+
+    def _current_slot(self) -> int:
+        """Estimated current slot (caller holds the lock)"""
+        return self.latest_slot + int((time.monotonic() - self.latest_slot_at) / SLOT_SECONDS)
+
+    def current_slot(self) -> int:
+        with self.lock:
+            return self._current_slot()
+
+    def get(self, mint_address: str) -> Optional[MetadataCacheEntry]:
+        """Get entry for a mint if it is still fresh"""
+        with self.lock:
+            entry = self.entries.get(mint_address)
+            if entry and self._current_slot() - entry.slot <= self.max_slot_age:
+                self.entries.move_to_end(mint_address)
+                return entry
+            return None
+
+    def get_any(self, mint_address: str) -> Optional[MetadataCacheEntry]:
+        """Get entry for a mint even if it is stale"""
+        with self.lock:
+            return self.entries.get(mint_address)
+
+    @staticmethod
+    def _put(cache: OrderedDict, key: str, value, maxsize: int):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+    def store(self, mint_address: str, data: Optional[bytes], slot: int) -> MetadataCacheEntry:
+        """Store raw metadata account data observed at `slot`"""
+        self.observe_slot(slot)
+        data_hash = hashlib.sha256(data).hexdigest() if data is not None else None
+
+        with self.lock:
+            entry = self.entries.get(mint_address)
+            if entry and entry.data_hash == data_hash:
+                # Account unchanged since last read: keep parsed + resolved data
+                entry.slot = max(entry.slot, slot)
+                self.entries.move_to_end(mint_address)
+                return entry
+
+        onchain = parse_metadata_account(data) if data is not None else None
+        entry = MetadataCacheEntry(
+            pda=str(get_metadata_pda(mint_address)),
+            slot=slot,
+            data_hash=data_hash,
+            onchain=onchain
+        )
+
+        with self.lock:
+            self._put(self.entries, mint_address, entry, self.maxsize)
+        return entry
+
+    def get_uri_json(self, uri: str) -> Optional[Dict]:
+        """Get resolved JSON for a URI"""
+        with self.lock:
+            json_data = self.uri_json.get(uri)
+            if json_data is not None:
+                self.uri_json.move_to_end(uri)
+            return json_data
+
+    def store_uri_json(self, uri: str, json_data: Dict):
+        """Store resolved JSON for a URI"""
+        with self.lock:
+            self._put(self.uri_json, uri, json_data, self.uri_maxsize)
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self.lock:
+            self.entries.clear()
+            self.uri_json.clear()
+
+
+# Global cache shared by all fetchers in this process
+metadata_cache = MetadataCache()
+
 
 class MetadataFetcher:
     """Fetches token metadata from Solana blockchain and IPFS"""
 
-    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com"):
+    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com", cache: MetadataCache = None):
         self.rpc_url = rpc_url
         self.client = Client(rpc_url)
         self.http_client = httpx.Client(timeout=15.0, follow_redirects=True)
+        self.cache = cache if cache is not None else metadata_cache
 
     def get_metadata(self, mint_address: str) -> Optional[Dict]:
         """Get token metadata from blockchain + IPFS"""
         try:
-            # Get metadata account PDA (Program Derived Address)
-            metadata_pda = self._get_metadata_pda(mint_address)
-
-            # Fetch account data from blockchain
-            response = self.client.get_account_info(metadata_pda)
+            entry = self.cache.get(mint_address)
 
-            if not response.value:
-                print(f"[DEBUG] No metadata account found for {mint_address}")
-                return None
+            if entry is None:
+                # Get metadata account PDA (Program Derived Address)
+                metadata_pda = self._get_metadata_pda(mint_address)
 
-            account_data = response.value.data
+                # Fetch account data from blockchain
+                response = self.client.get_account_info(metadata_pda)
+                slot = response.context.slot
 
-            # Parse metadata structure
-            metadata = self._parse_metadata(account_data)
+                account_data = response.value.data if response.value else None
+                entry = self.cache.store(mint_address, account_data, slot)
 
-            if not metadata:
+            if entry.data_hash is None:
+                print(f"[DEBUG] No metadata account found for {mint_address}")
                 return None
 
-            # Fetch JSON from URI (usually IPFS)
-            uri = metadata.get('uri', '').strip().rstrip('\x00')
-
-            if uri:
-                json_data = self._fetch_uri(uri)
-                if json_data:
-                    # Extract social links
-                    return {
-                        'name': metadata.get('name', '').strip().rstrip('\x00'),
-                        'symbol': metadata.get('symbol', '').strip().rstrip('\x00'),
-                        'uri': uri,
-                        'twitter': json_data.get('twitter'),
-                        'telegram': json_data.get('telegram'),
-                        'website': json_data.get('website'),
-                        'description': json_data.get('description', ''),
-                        'image': json_data.get('image')
-                    }
-                else:
-                    # IPFS failed but we still have on-chain metadata
-                    print(f"[DEBUG] Could not fetch IPFS data, returning on-chain metadata only")
-                    return metadata
-
-            return metadata
+            return self._build_metadata(entry)
 
         except Exception as e:
             print(f"[DEBUG] Metadata fetch error: {e}")
@@ -64,62 +284,79 @@ class MetadataFetcher:
             traceback.print_exc()
             return None
 
-    def _get_metadata_pda(self, mint_address: str) -> Pubkey:
-        """Calculate metadata PDA (Program Derived Address)"""
-        # Metaplex Token Metadata Program ID
-        METADATA_PROGRAM_ID = Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s")
+    def prefetch(self, mint_addresses: List[str], resolve_uris: bool = False) -> int:
+        """
+        Load metadata accounts for many mints with getMultipleAccounts
 
-        mint_pubkey = Pubkey.from_string(mint_address)
+        Only mints without a fresh cache entry are requested.
+        Returns number of accounts fetched.
+        """
+        missing = [m for m in dict.fromkeys(mint_addresses) if self.cache.get(m) is None]
+        fetched = 0
 
-        # PDA derivation: [b"metadata", metadata_program_id, mint_pubkey]
-        seeds = [
-            b"metadata",
-            bytes(METADATA_PROGRAM_ID),
-            bytes(mint_pubkey)
-        ]
+        for i in range(0, len(missing), MAX_ACCOUNTS_PER_REQUEST):
+            chunk = missing[i:i + MAX_ACCOUNTS_PER_REQUEST]
+            accounts, slot = fetch_multiple_accounts(
+                self.http_client, self.rpc_url, [str(self._get_metadata_pda(m)) for m in chunk]
+            )
 
-        pda, bump = Pubkey.find_program_address(seeds, METADATA_PROGRAM_ID)
-        return pda
+            if accounts is None:
+                continue
 
-    def _parse_metadata(self, data: bytes) -> Optional[Dict]:
-        """Parse on-chain metadata structure"""
-        try:
-            # Skip first byte (key = 4 for Metadata account)
-            offset = 1
-
-            # Update authority (32 bytes)
-            offset += 32
-
-            # Mint (32 bytes)
-            offset += 32
-
-            # Name (variable length string with 4-byte length prefix)
-            name_len = int.from_bytes(data[offset:offset+4], 'little')
-            offset += 4
-            name = data[offset:offset+name_len].decode('utf-8', errors='ignore')
-            offset += name_len
-
-            # Symbol (variable length string)
-            symbol_len = int.from_bytes(data[offset:offset+4], 'little')
-            offset += 4
-            symbol = data[offset:offset+symbol_len].decode('utf-8', errors='ignore')
-            offset += symbol_len
-
-            # URI (variable length string)
-            uri_len = int.from_bytes(data[offset:offset+4], 'little')
-            offset += 4
-            uri = data[offset:offset+uri_len].decode('utf-8', errors='ignore')
-
-            return {
-                'name': name,
-                'symbol': symbol,
-                'uri': uri
-            }
+            for mint_address, account_data in zip(chunk, accounts):
+                entry = self.cache.store(mint_address, account_data, slot)
+                fetched += 1
 
-        except Exception as e:
-            print(f"[DEBUG] Parse metadata error: {e}")
+                if resolve_uris and entry.onchain:
+                    self._build_metadata(entry)
+
+        return fetched
+
+    def _build_metadata(self, entry: MetadataCacheEntry) -> Optional[Dict]:
+        """Build metadata dict from a cache entry, resolving the URI if needed"""
+        metadata = entry.onchain
+
+        if not metadata:
             return None
 
+        # Fetch JSON from URI (usually IPFS)
+        uri = metadata.get('uri', '').strip().rstrip('\x00')
+
+        if uri:
+            json_data = entry.resolved or self.cache.get_uri_json(uri)
+            if json_data is None:
+                json_data = self._fetch_uri(uri)
+                if json_data:
+                    self.cache.store_uri_json(uri, json_data)
+            entry.resolved = json_data
+
+            if json_data:
+                # Extract social links
+                return {
+                    'name': metadata.get('name', '').strip().rstrip('\x00'),
+                    'symbol': metadata.get('symbol', '').strip().rstrip('\x00'),
+                    'uri': uri,
+                    'twitter': json_data.get('twitter'),
+                    'telegram': json_data.get('telegram'),
+                    'website': json_data.get('website'),
+                    'description': json_data.get('description', ''),
+                    'image': json_data.get('image')
+                }
+            else:
+                # IPFS failed but we still have on-chain metadata
+                print(f"[DEBUG] Could not fetch IPFS data, returning on-chain metadata only")
+                return dict(metadata)
+
+        return dict(metadata)
+
+    def _get_metadata_pda(self, mint_address: str) -> Pubkey:
+        """Calculate metadata PDA (Program Derived Address)"""
+        return get_metadata_pda(mint_address)
+
+    def _parse_metadata(self, data: bytes) -> Optional[Dict]:
+        """Parse on-chain metadata structure"""
+        return parse_metadata_account(data)
+
     def _fetch_uri(self, uri: str) -> Optional[Dict]:
         """Fetch JSON metadata from URI (IPFS or Arweave)"""
         try:
@@ -0,0 +1,58 @@
+"""
+Microbenchmark: scikit-learn predict_proba vs the vectorized tree engine
+Run: python ml_module/bench_tree_engine.py [model.pkl] [scaler.pkl]
+"""
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from model_artifact import ModelArtifact
+
+MODELS_DIR = Path(__file__).parent / "models"
+BATCH_SIZES = (1, 10, 100, 1000, 2000, 5000, 10000)
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    model_path = Path(sys.argv[1]) if len(sys.argv) > 1 else MODELS_DIR / "random_forest_latest.pkl"
+    scaler_path = Path(sys.argv[2]) if len(sys.argv) > 2 else MODELS_DIR / "scaler_latest.pkl"
+
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    artifact = ModelArtifact.from_sklearn(model, scaler)
+
+    print(f"Model: {type(model).__name__}, {artifact.meta['n_trees']} trees, "
+          f"{artifact.n_features_in_} features")
+    print(f"{'rows':>7} {'sklearn ms':>11} {'engine ms':>10} {'speedup':>8}  parity")
+
+    rng = np.random.default_rng(0)
+    n_features = artifact.n_features_in_
+    for n in BATCH_SIZES:
+        raw = rng.normal(size=(n, n_features)) * rng.choice([0, 1, 10, 1000], size=(n, n_features))
+        X = scaler.transform(raw)
+        repeat = 3 if n >= 1000 else 20
+
+        sklearn_ms = best_of(lambda: model.predict_proba(X), repeat)
+        engine_ms = best_of(lambda: artifact.predict_proba(X), repeat)
+        same = np.allclose(artifact.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+
+        print(f"{n:>7} {sklearn_ms:>11.2f} {engine_ms:>10.2f} {sklearn_ms / engine_ms:>7.1f}x  "
+              f"{'OK' if same else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
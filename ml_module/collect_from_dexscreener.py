@@ -7,17 +7,21 @@ Critères :
 
 import asyncio
 import httpx
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 
+from dataset_store import DatasetStore, save_labeled
+from token_discovery import Candidate, DexScreenerSearch, discover
+
 console = Console()
 
+# Recherche par différentes queries (toutes les paires Solana sont gardées)
+SEARCH_QUERIES = ["pump", "solana pump", "pump.fun"]
+
 
 class DexScreenerCollector:
     """Collecte automatique de tokens depuis DexScreener"""
@@ -26,8 +30,7 @@ class DexScreenerCollector:
         self.dataset_dir = Path(__file__).parent / "dataset"
         self.dataset_dir.mkdir(exist_ok=True)
 
-        self.rugs_file = self.dataset_dir / "rugs.json"
-        self.success_file = self.dataset_dir / "success.json"
+        self.store = DatasetStore(self.dataset_dir)
 
         self.client = httpx.AsyncClient(timeout=30.0)
 
@@ -74,57 +77,6 @@ class DexScreenerCollector:
 
         return all_tokens[:limit]
 
-    async def search_tokens_by_criteria(self, max_pages: int = 10) -> list:
-        """Recherche tokens en parcourant plusieurs pages"""
-        console.print("[cyan]Recherche de tokens sur DexScreener...\n")
-
-        all_tokens = []
-
-        # Recherche par différentes queries
-        queries = ["pump", "solana pump", "pump.fun"]
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("Recherche en cours...", total=len(queries))
-
-            for query in queries:
-                try:
-                    response = await self.client.get(
-                        f"https://api.dexscreener.com/latest/dex/search",
-                        params={"q": query}
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        pairs = data.get("pairs", [])
-
-                        # Filtrer Solana + Pump.fun
-                        for pair in pairs:
-                            if pair.get("chainId") == "solana":
-                                all_tokens.append(pair)
-
-                        progress.update(task, advance=1)
-
-                    await asyncio.sleep(1)  # Rate limiting
-
-                except Exception as e:
-                    console.print(f"[yellow]Erreur pour '{query}': {e}")
-                    progress.update(task, advance=1)
-
-        # Dédupliquer
-        unique_tokens = {}
-        for token in all_tokens:
-            addr = token.get("baseToken", {}).get("address")
-            if addr and addr not in unique_tokens:
-                unique_tokens[addr] = token
-
-        console.print(f"[green]✓ {len(unique_tokens)} tokens uniques trouvés\n")
-        return list(unique_tokens.values())
-
     def classify_token(self, pair: dict) -> str:
         """Classifie un token en RUG, SUCCESS ou SKIP"""
 
@@ -173,6 +125,15 @@ class DexScreenerCollector:
             "collected_at": datetime.now().isoformat()
         }
 
+    def label_candidate(self, candidate: Candidate):
+        """Classe une paire découverte : ("rugs" | "success", token) ou None"""
+        classification = self.classify_token(candidate.pair)
+        if classification == "RUG":
+            return "rugs", self.format_token_data(candidate.pair, "RUG")
+        if classification == "SUCCESS":
+            return "success", self.format_token_data(candidate.pair, "SUCCESS")
+        return None
+
     async def collect_and_classify(self, max_tokens: int = 200) -> dict:
         """Collecte et classifie les tokens"""
 
@@ -188,39 +149,22 @@ class DexScreenerCollector:
             border_style="cyan"
         ))
 
-        # Récupérer tokens
-        tokens = await self.search_tokens_by_criteria()
+        # Recherche concurrente de toutes les queries (rythme fixé par rate_limit)
+        console.print("[cyan]Recherche de tokens sur DexScreener...\n")
+        with console.status("Recherche et classification..."):
+            results, stats = await discover(
+                [DexScreenerSearch(SEARCH_QUERIES, dex_filter=None)], self.label_candidate,
+                store=self.store, client=self.client
+            )
 
-        if not tokens:
+        if not stats.discovered and not stats.known:
             console.print("[red]Aucun token trouvé !")
             return {"rugs": [], "success": []}
 
-        # Classifier
-        console.print("[cyan]Classification des tokens...\n")
-
-        rugs = []
-        successes = []
-        skipped = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("Analyse...", total=len(tokens))
+        console.print(f"[green]✓ {stats.discovered} nouveaux tokens uniques trouvés "
+                      f"({stats.known} déjà dans le dataset)\n")
 
-            for pair in tokens:
-                classification = self.classify_token(pair)
-
-                if classification == "RUG":
-                    rugs.append(self.format_token_data(pair, "RUG"))
-                elif classification == "SUCCESS":
-                    successes.append(self.format_token_data(pair, "SUCCESS"))
-                else:
-                    skipped += 1
-
-                progress.update(task, advance=1)
+        rugs, successes, skipped = results["rugs"], results["success"], stats.skipped
 
         # Afficher résultats
         console.print(f"\n[bold cyan]Résultats de la Classification :[/]")
@@ -230,50 +174,21 @@ class DexScreenerCollector:
 
         return {"rugs": rugs, "success": successes}
 
-    def load_existing_datasets(self) -> dict:
-        """Charge les datasets existants"""
-        existing = {"rugs": [], "success": []}
-
-        if self.rugs_file.exists():
-            with open(self.rugs_file) as f:
-                existing["rugs"] = json.load(f)
-
-        if self.success_file.exists():
-            with open(self.success_file) as f:
-                existing["success"] = json.load(f)
-
-        return existing
-
     def merge_and_save(self, new_data: dict):
         """Fusionne avec les données existantes et sauvegarde"""
 
-        # Charger existants
-        existing = self.load_existing_datasets()
-
         console.print("[cyan]Fusion avec les données existantes...\n")
 
-        # Merger les rugs (éviter doublons)
-        existing_rug_mints = {t.get("mint") for t in existing["rugs"] if t.get("mint")}
-        new_rugs = [t for t in new_data["rugs"] if t.get("mint") not in existing_rug_mints]
-
-        all_rugs = existing["rugs"] + new_rugs
-
-        # Merger les success
-        existing_success_mints = {t.get("mint") for t in existing["success"] if t.get("mint")}
-        new_successes = [t for t in new_data["success"] if t.get("mint") not in existing_success_mints]
-
-        all_successes = existing["success"] + new_successes
-
-        # Sauvegarder
-        with open(self.rugs_file, "w") as f:
-            json.dump(all_rugs, f, indent=2)
-
-        with open(self.success_file, "w") as f:
-            json.dump(all_successes, f, indent=2)
+        # Ajout incrémental : seuls les mints absents de l'index sont écrits
+        before = {name: self.store.count(name) for name in ("rugs", "success")}
+        added = save_labeled(new_data, self.store)
+        new_rugs, new_successes = added["rugs"], added["success"]
+        total_rugs = before["rugs"] + len(new_rugs)
+        total_successes = before["success"] + len(new_successes)
 
         console.print("[bold green]✓ Fichiers sauvegardés !")
-        console.print(f"  [red]rugs.json : {len(existing['rugs'])} → {len(all_rugs)} (+{len(new_rugs)})")
-        console.print(f"  [green]success.json : {len(existing['success'])} → {len(all_successes)} (+{len(new_successes)})")
+        console.print(f"  [red]rugs.jsonl : {before['rugs']} → {total_rugs} (+{len(new_rugs)})")
+        console.print(f"  [green]success.jsonl : {before['success']} → {total_successes} (+{len(new_successes)})")
 
         # Afficher échantillons
         if new_rugs:
@@ -9,15 +9,16 @@ Critères :
 
 import asyncio
 import httpx
-import json
 from datetime import datetime
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 
+from dataset_store import DatasetStore, save_labeled
+from token_discovery import ENRICH_BATCH, Candidate, PumpFunListing, discover
+
 console = Console()
 
 
@@ -28,8 +29,7 @@ class PumpSwapCollector:
         self.dataset_dir = Path(__file__).parent / "dataset"
         self.dataset_dir.mkdir(exist_ok=True)
 
-        self.rugs_file = self.dataset_dir / "rugs.json"
-        self.success_file = self.dataset_dir / "success.json"
+        self.store = DatasetStore(self.dataset_dir)
 
         self.client = httpx.AsyncClient(timeout=30.0)
 
@@ -41,93 +41,24 @@ class PumpSwapCollector:
         self.rug_age_hours_max = 48
         self.rug_price_drop_min = 80  # -80%
 
-    async def fetch_pump_fun_tokens(self, limit: int = 200) -> list:
-        """
-        Récupère les tokens directement depuis l'API Pump.fun
-        Ces tokens sont TOUS sur PumpSwap (bonding curve)
-        """
-        console.print("[cyan]Récupération des tokens depuis Pump.fun API...")
-
-        all_tokens = []
-        batch_size = 50
-        offset = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task(f"Fetching tokens...", total=limit)
-
-            while len(all_tokens) < limit:
-                try:
-                    # API Pump.fun
-                    response = await self.client.get(
-                        "https://frontend-api-v2.pump.fun/coins",
-                        params={
-                            "offset": offset,
-                            "limit": batch_size,
-                            "sort": "created_timestamp",
-                            "order": "DESC"
-                        }
-                    )
-
-                    if response.status_code != 200:
-                        console.print(f"[yellow]Erreur API : {response.status_code}")
-                        break
-
-                    batch = response.json()
-
-                    if not batch:
-                        break
-
-                    all_tokens.extend(batch)
-                    offset += batch_size
-
-                    progress.update(task, completed=len(all_tokens))
-
-                    await asyncio.sleep(0.5)  # Rate limiting
-
-                except Exception as e:
-                    console.print(f"[red]Erreur : {e}")
-                    break
-
-        console.print(f"[green]✓ {len(all_tokens)} tokens Pump.fun récupérés\n")
-        return all_tokens[:limit]
-
-    async def get_token_market_data(self, mint: str) -> dict:
-        """Récupère les données de marché depuis DexScreener"""
-        try:
-            response = await self.client.get(
-                f"https://api.dexscreener.com/latest/dex/tokens/{mint}"
-            )
+    def market_data_from_pair(self, pair: dict) -> dict:
+        """Données de marché de la première paire DexScreener (généralement PumpSwap)"""
+        if not pair:
+            return None
 
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get("pairs", [])
-
-                if pairs:
-                    # Prendre la première paire (généralement PumpSwap)
-                    pair = pairs[0]
-
-                    # Vérifier que c'est bien PumpSwap
-                    dex_id = pair.get("dexId", "").lower()
-                    if "pump" in dex_id or "pumpswap" in dex_id:
-                        return {
-                            "market_cap": float(pair.get("marketCap", 0) or 0),
-                            "price_change_24h": float(pair.get("priceChange", {}).get("h24", 0) or 0),
-                            "price_change_6h": float(pair.get("priceChange", {}).get("h6", 0) or 0),
-                            "liquidity": float(pair.get("liquidity", {}).get("usd", 0) or 0),
-                            "url": pair.get("url", ""),
-                            "on_pumpswap": True
-                        }
-
-        except:
-            pass
+        # Vérifier que c'est bien PumpSwap
+        dex_id = str(pair.get("dexId", "")).lower()
+        if "pump" not in dex_id:
+            return None
 
-        return None
+        return {
+            "market_cap": float(pair.get("marketCap", 0) or 0),
+            "price_change_24h": float((pair.get("priceChange") or {}).get("h24", 0) or 0),
+            "price_change_6h": float((pair.get("priceChange") or {}).get("h6", 0) or 0),
+            "liquidity": float((pair.get("liquidity") or {}).get("usd", 0) or 0),
+            "url": pair.get("url", ""),
+            "on_pumpswap": True
+        }
 
     def classify_token(self, token: dict, market_data: dict) -> str:
         """Classifie le token en RUG, SUCCESS ou SKIP"""
@@ -175,6 +106,19 @@ class PumpSwapCollector:
             "collected_at": datetime.now().isoformat()
         }
 
+    def label_candidate(self, candidate: Candidate):
+        """Classe un token Pump.fun d'après sa paire : ("rugs" | "success", token) ou None"""
+        market_data = self.market_data_from_pair(candidate.pair)
+        if not market_data:
+            return None
+
+        classification = self.classify_token(candidate.token, market_data)
+        if classification == "RUG":
+            return "rugs", self.format_token_data(candidate.token, market_data, "RUG")
+        if classification == "SUCCESS":
+            return "success", self.format_token_data(candidate.token, market_data, "SUCCESS")
+        return None
+
     async def collect_and_classify(self, max_tokens: int = 200) -> dict:
         """Collecte et classifie les tokens PumpSwap"""
 
@@ -192,53 +136,24 @@ class PumpSwapCollector:
             border_style="cyan"
         ))
 
-        # Récupérer tokens depuis Pump.fun
-        tokens = await self.fetch_pump_fun_tokens(limit=max_tokens)
+        # Pages Pump.fun récupérées en parallèle ; les données de marché
+        # DexScreener sont demandées par lots de ENRICH_BATCH tokens
+        console.print("[cyan]Récupération des tokens depuis Pump.fun API et analyse des données de marché...")
+        with console.status("Récupération et analyse..."):
+            results, stats = await discover(
+                [PumpFunListing(max_tokens=max_tokens)], self.label_candidate,
+                store=self.store, enrich=True, client=self.client
+            )
 
-        if not tokens:
+        if not stats.discovered and not stats.known:
             console.print("[red]Aucun token trouvé !")
             return {"rugs": [], "success": []}
 
-        # Analyser chaque token
-        console.print("[cyan]Analyse des tokens (vérification market data)...\n")
-
-        rugs = []
-        successes = []
-        skipped = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("Analyse...", total=len(tokens))
-
-            for token in tokens:
-                mint = token.get("mint")
-                if not mint:
-                    progress.update(task, advance=1)
-                    continue
-
-                # Récupérer données de marché
-                market_data = await self.get_token_market_data(mint)
-
-                if market_data and market_data.get("on_pumpswap"):
-                    # Classifier
-                    classification = self.classify_token(token, market_data)
-
-                    if classification == "RUG":
-                        rugs.append(self.format_token_data(token, market_data, "RUG"))
-                    elif classification == "SUCCESS":
-                        successes.append(self.format_token_data(token, market_data, "SUCCESS"))
-                    else:
-                        skipped += 1
-                else:
-                    skipped += 1
-
-                progress.update(task, advance=1)
-                await asyncio.sleep(0.3)  # Rate limiting DexScreener
+        console.print(f"[green]✓ {stats.discovered} nouveaux tokens Pump.fun analysés "
+                      f"({stats.known} déjà dans le dataset)\n")
+
+        rugs, successes = results["rugs"], results["success"]
+        skipped = stats.skipped + stats.no_market_data
 
         # Afficher résultats
         console.print(f"\n[bold cyan]Résultats de la Classification :[/]")
@@ -248,50 +163,21 @@ class PumpSwapCollector:
 
         return {"rugs": rugs, "success": successes}
 
-    def load_existing_datasets(self) -> dict:
-        """Charge les datasets existants"""
-        existing = {"rugs": [], "success": []}
-
-        if self.rugs_file.exists():
-            with open(self.rugs_file) as f:
-                existing["rugs"] = json.load(f)
-
-        if self.success_file.exists():
-            with open(self.success_file) as f:
-                existing["success"] = json.load(f)
-
-        return existing
-
     def merge_and_save(self, new_data: dict):
         """Fusionne avec les données existantes et sauvegarde"""
 
-        # Charger existants
-        existing = self.load_existing_datasets()
-
         console.print("[cyan]Fusion avec les données existantes...\n")
 
-        # Merger les rugs (éviter doublons)
-        existing_rug_mints = {t.get("mint") for t in existing["rugs"] if t.get("mint")}
-        new_rugs = [t for t in new_data["rugs"] if t.get("mint") not in existing_rug_mints]
-
-        all_rugs = existing["rugs"] + new_rugs
-
-        # Merger les success
-        existing_success_mints = {t.get("mint") for t in existing["success"] if t.get("mint")}
-        new_successes = [t for t in new_data["success"] if t.get("mint") not in existing_success_mints]
-
-        all_successes = existing["success"] + new_successes
-
-        # Sauvegarder
-        with open(self.rugs_file, "w") as f:
-            json.dump(all_rugs, f, indent=2)
-
-        with open(self.success_file, "w") as f:
-            json.dump(all_successes, f, indent=2)
+        # Ajout incrémental : seuls les mints absents de l'index sont écrits
+        before = {name: self.store.count(name) for name in ("rugs", "success")}
+        added = save_labeled(new_data, self.store)
+        new_rugs, new_successes = added["rugs"], added["success"]
+        total_rugs = before["rugs"] + len(new_rugs)
+        total_successes = before["success"] + len(new_successes)
 
         console.print("[bold green]✓ Fichiers sauvegardés !")
-        console.print(f"  [red]rugs.json : {len(existing['rugs'])} → {len(all_rugs)} (+{len(new_rugs)})")
-        console.print(f"  [green]success.json : {len(existing['success'])} → {len(all_successes)} (+{len(new_successes)})")
+        console.print(f"  [red]rugs.jsonl : {before['rugs']} → {total_rugs} (+{len(new_rugs)})")
+        console.print(f"  [green]success.jsonl : {before['success']} → {total_successes} (+{len(new_successes)})")
 
         # Afficher échantillons
         if new_rugs:
@@ -306,9 +192,9 @@ class PumpSwapCollector:
 
         # Afficher statistiques finales
         console.print(f"\n[bold cyan]Dataset Final :[/]")
-        console.print(f"  Total RUGS : {len(all_rugs)}")
-        console.print(f"  Total SUCCESS : {len(all_successes)}")
-        console.print(f"  Total : {len(all_rugs) + len(all_successes)} tokens")
+        console.print(f"  Total RUGS : {total_rugs}")
+        console.print(f"  Total SUCCESS : {total_successes}")
+        console.print(f"  Total : {total_rugs + total_successes} tokens")
 
     async def run(self):
         """Exécute la collecte complète"""
@@ -321,8 +207,8 @@ class PumpSwapCollector:
             default=200
         )
 
-        console.print(f"\n[yellow]ℹ️  Cela prendra environ {max_tokens * 0.5 // 60:.0f} minutes")
-        console.print(f"[dim](~0.5 seconde par token pour éviter rate limits)\n")
+        console.print(f"\n[yellow]ℹ️  Environ {max_tokens // 50 + max_tokens // ENRICH_BATCH + 2} requêtes")
+        console.print(f"[dim](données de marché demandées par lots de {ENRICH_BATCH} tokens)\n")
 
         if not Confirm.ask("Continuer ?"):
             console.print("[yellow]Annulé")
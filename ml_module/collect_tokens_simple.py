@@ -5,16 +5,25 @@ Collecte tokens PumpSwap depuis DexScreener API
 
 import asyncio
 import httpx
-import json
 from datetime import datetime
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 
+from dataset_store import DatasetStore, save_labeled
+from token_discovery import Candidate, DexScreenerSearch, discover
+
 console = Console()
 
+# Différentes recherches pour couvrir plus de tokens
+SEARCH_QUERIES = [
+    "pump",
+    "pump.fun",
+    "pumpswap",
+    "sol pump"
+]
+
 
 class SimpleCollector:
     """Collecteur simple utilisant seulement DexScreener"""
@@ -23,8 +32,7 @@ class SimpleCollector:
         self.dataset_dir = Path(__file__).parent / "dataset"
         self.dataset_dir.mkdir(exist_ok=True)
 
-        self.rugs_file = self.dataset_dir / "rugs.json"
-        self.success_file = self.dataset_dir / "success.json"
+        self.store = DatasetStore(self.dataset_dir)
 
         self.client = httpx.AsyncClient(timeout=30.0)
 
@@ -36,57 +44,6 @@ class SimpleCollector:
         self.rug_age_hours_max = 48
         self.rug_price_drop_min = 80  # -80%
 
-    async def search_pumpswap_tokens(self) -> list:
-        """Recherche tokens PumpSwap sur DexScreener"""
-
-        console.print("[cyan]Recherche de tokens PumpSwap sur DexScreener...")
-
-        all_pairs = []
-
-        # Différentes recherches pour couvrir plus de tokens
-        search_queries = [
-            "pump",
-            "pump.fun",
-            "pumpswap",
-            "sol pump"
-        ]
-
-        for query in search_queries:
-            try:
-                response = await self.client.get(
-                    "https://api.dexscreener.com/latest/dex/search",
-                    params={"q": query}
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    pairs = data.get("pairs", [])
-
-                    # Filtrer: Solana + PumpSwap
-                    for pair in pairs:
-                        if pair.get("chainId") == "solana":
-                            dex_id = str(pair.get("dexId", "")).lower()
-                            # Vérifier que c'est bien PumpSwap
-                            if "pump" in dex_id:
-                                all_pairs.append(pair)
-
-                    console.print(f"[dim]  '{query}' → {len(pairs)} pairs trouvées")
-
-                await asyncio.sleep(1.5)  # Rate limiting
-
-            except Exception as e:
-                console.print(f"[yellow]Erreur recherche '{query}': {e}")
-
-        # Dédupliquer
-        unique_pairs = {}
-        for pair in all_pairs:
-            mint = pair.get("baseToken", {}).get("address")
-            if mint and mint not in unique_pairs:
-                unique_pairs[mint] = pair
-
-        console.print(f"[green]✓ {len(unique_pairs)} tokens PumpSwap uniques trouvés\n")
-        return list(unique_pairs.values())
-
     def classify_pair(self, pair: dict) -> str:
         """Classifie une paire en RUG, SUCCESS ou SKIP"""
 
@@ -134,6 +91,15 @@ class SimpleCollector:
             "collected_at": datetime.now().isoformat()
         }
 
+    def label_candidate(self, candidate: Candidate):
+        """Classe une paire découverte : ("rugs" | "success", token) ou None"""
+        classification = self.classify_pair(candidate.pair)
+        if classification == "RUG":
+            return "rugs", self.format_token(candidate.pair, "RUG")
+        if classification == "SUCCESS":
+            return "success", self.format_token(candidate.pair, "SUCCESS")
+        return None
+
     async def collect_and_classify(self) -> dict:
         """Collecte et classifie les tokens"""
 
@@ -149,40 +115,22 @@ class SimpleCollector:
             border_style="cyan"
         ))
 
-        # Rechercher tokens
-        pairs = await self.search_pumpswap_tokens()
+        # Recherche concurrente (rythme fixé par les budgets de rate_limit)
+        console.print("[cyan]Recherche de tokens PumpSwap sur DexScreener...")
+        with console.status("Recherche et classification..."):
+            results, stats = await discover(
+                [DexScreenerSearch(SEARCH_QUERIES)], self.label_candidate,
+                store=self.store, client=self.client
+            )
 
-        if not pairs:
+        if not stats.discovered and not stats.known:
             console.print("[red]Aucun token trouvé!")
             return {"rugs": [], "success": []}
 
-        # Classifier
-        console.print("[cyan]Classification des tokens...\n")
-
-        rugs = []
-        successes = []
-        skipped = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("Analyse...", total=len(pairs))
+        console.print(f"[green]✓ {stats.discovered} nouveaux tokens PumpSwap uniques "
+                      f"({stats.known} déjà dans le dataset)\n")
 
-            for pair in pairs:
-                classification = self.classify_pair(pair)
-
-                if classification == "RUG":
-                    rugs.append(self.format_token(pair, "RUG"))
-                elif classification == "SUCCESS":
-                    successes.append(self.format_token(pair, "SUCCESS"))
-                else:
-                    skipped += 1
-
-                progress.update(task, advance=1)
+        rugs, successes, skipped = results["rugs"], results["success"], stats.skipped
 
         # Résultats
         console.print(f"\n[bold cyan]Résultats :[/]")
@@ -192,49 +140,22 @@ class SimpleCollector:
 
         return {"rugs": rugs, "success": successes}
 
-    def load_existing(self) -> dict:
-        """Charge datasets existants"""
-        existing = {"rugs": [], "success": []}
-
-        if self.rugs_file.exists():
-            with open(self.rugs_file) as f:
-                existing["rugs"] = json.load(f)
-
-        if self.success_file.exists():
-            with open(self.success_file) as f:
-                existing["success"] = json.load(f)
-
-        return existing
-
     def save_results(self, new_data: dict):
         """Sauvegarde les résultats"""
 
-        # Charger existants
-        existing = self.load_existing()
-
         console.print("[cyan]Fusion avec données existantes...\n")
 
-        # Merger rugs (éviter doublons)
-        existing_rug_mints = {t.get("mint") for t in existing["rugs"] if t.get("mint")}
-        new_rugs = [t for t in new_data["rugs"] if t.get("mint") not in existing_rug_mints]
-        all_rugs = existing["rugs"] + new_rugs
-
-        # Merger success
-        existing_success_mints = {t.get("mint") for t in existing["success"] if t.get("mint")}
-        new_successes = [t for t in new_data["success"] if t.get("mint") not in existing_success_mints]
-        all_successes = existing["success"] + new_successes
-
-        # Sauvegarder
-        with open(self.rugs_file, "w") as f:
-            json.dump(all_rugs, f, indent=2)
-
-        with open(self.success_file, "w") as f:
-            json.dump(all_successes, f, indent=2)
+        # Ajout incrémental : seuls les mints absents de l'index sont écrits
+        before = {name: self.store.count(name) for name in ("rugs", "success")}
+        added = save_labeled(new_data, self.store)
+        new_rugs, new_successes = added["rugs"], added["success"]
+        total_rugs = before["rugs"] + len(new_rugs)
+        total_successes = before["success"] + len(new_successes)
 
         # Afficher
         console.print("[bold green]✓ Sauvegardé !")
-        console.print(f"  [red]rugs.json : {len(existing['rugs'])} → {len(all_rugs)} (+{len(new_rugs)})")
-        console.print(f"  [green]success.json : {len(existing['success'])} → {len(all_successes)} (+{len(new_successes)})")
+        console.print(f"  [red]rugs.jsonl : {before['rugs']} → {total_rugs} (+{len(new_rugs)})")
+        console.print(f"  [green]success.jsonl : {before['success']} → {total_successes} (+{len(new_successes)})")
 
         # Exemples
         if new_rugs:
@@ -249,9 +170,9 @@ class SimpleCollector:
 
         # Statistiques
         console.print(f"\n[bold cyan]Dataset Total :")
-        console.print(f"  RUGS : {len(all_rugs)}")
-        console.print(f"  SUCCESS : {len(all_successes)}")
-        console.print(f"  TOTAL : {len(all_rugs) + len(all_successes)}")
+        console.print(f"  RUGS : {total_rugs}")
+        console.print(f"  SUCCESS : {total_successes}")
+        console.print(f"  TOTAL : {total_rugs + total_successes}")
 
     async def run(self):
         """Exécution principale"""
@@ -7,16 +7,26 @@ RUG : Market cap < 20K
 
 import asyncio
 import httpx
-import json
 from datetime import datetime
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.panel import Panel
 from rich.prompt import Confirm
 
+from dataset_store import DatasetStore, save_labeled
+from token_discovery import Candidate, DexScreenerSearch, discover
+
 console = Console()
 
+# Recherches multiples pour couvrir un maximum de tokens
+SEARCH_QUERIES = [
+    "pump",
+    "pump.fun",
+    "pumpswap",
+    "sol pump",
+    "solana pump"
+]
+
 
 class SimpleCollectorV2:
     """Collecteur simplifié - seulement market cap"""
@@ -25,8 +35,7 @@ class SimpleCollectorV2:
         self.dataset_dir = Path(__file__).parent / "dataset"
         self.dataset_dir.mkdir(exist_ok=True)
 
-        self.rugs_file = self.dataset_dir / "rugs.json"
-        self.success_file = self.dataset_dir / "success.json"
+        self.store = DatasetStore(self.dataset_dir)
 
         self.client = httpx.AsyncClient(timeout=30.0)
 
@@ -34,58 +43,6 @@ class SimpleCollectorV2:
         self.success_mcap_min = 500_000  # 500K
         self.rug_mcap_max = 20_000       # 20K
 
-    async def search_pumpswap_tokens(self) -> list:
-        """Recherche tous les tokens PumpSwap sur DexScreener"""
-
-        console.print("[cyan]Recherche de TOUS les tokens PumpSwap sur DexScreener...")
-
-        all_pairs = []
-
-        # Recherches multiples pour couvrir un maximum de tokens
-        search_queries = [
-            "pump",
-            "pump.fun",
-            "pumpswap",
-            "sol pump",
-            "solana pump"
-        ]
-
-        for query in search_queries:
-            try:
-                response = await self.client.get(
-                    "https://api.dexscreener.com/latest/dex/search",
-                    params={"q": query}
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    pairs = data.get("pairs", [])
-
-                    # Filtrer: Solana + PumpSwap
-                    for pair in pairs:
-                        if pair.get("chainId") == "solana":
-                            dex_id = str(pair.get("dexId", "")).lower()
-                            # Vérifier que c'est bien PumpSwap
-                            if "pump" in dex_id:
-                                all_pairs.append(pair)
-
-                    console.print(f"[dim]  '{query}' → {len(pairs)} pairs")
-
-                await asyncio.sleep(1.5)  # Rate limiting
-
-            except Exception as e:
-                console.print(f"[yellow]Erreur '{query}': {e}")
-
-        # Dédupliquer
-        unique_pairs = {}
-        for pair in all_pairs:
-            mint = pair.get("baseToken", {}).get("address")
-            if mint and mint not in unique_pairs:
-                unique_pairs[mint] = pair
-
-        console.print(f"[green]✓ {len(unique_pairs)} tokens PumpSwap uniques trouvés\n")
-        return list(unique_pairs.values())
-
     def classify_pair(self, pair: dict) -> str:
         """
         Classifie une paire en RUG, SUCCESS ou SKIP
@@ -137,6 +94,15 @@ class SimpleCollectorV2:
             "collected_at": datetime.now().isoformat()
         }
 
+    def label_candidate(self, candidate: Candidate):
+        """Classe une paire découverte : ("rugs" | "success", token) ou None"""
+        classification = self.classify_pair(candidate.pair)
+        if classification == "RUG":
+            return "rugs", self.format_token(candidate.pair, "RUG")
+        if classification == "SUCCESS":
+            return "success", self.format_token(candidate.pair, "SUCCESS")
+        return None
+
     async def collect_and_classify(self) -> dict:
         """Collecte et classifie les tokens"""
 
@@ -152,92 +118,48 @@ class SimpleCollectorV2:
             border_style="cyan"
         ))
 
-        # Rechercher tous les tokens
-        pairs = await self.search_pumpswap_tokens()
+        # Recherche concurrente : toutes les requêtes partent en parallèle,
+        # le rythme est fixé par les budgets de rate_limit (plus de sleep fixe)
+        console.print("[cyan]Recherche de TOUS les tokens PumpSwap sur DexScreener...")
+        with console.status("Recherche et classification..."):
+            results, stats = await discover(
+                [DexScreenerSearch(SEARCH_QUERIES)], self.label_candidate,
+                store=self.store, client=self.client
+            )
 
-        if not pairs:
+        if not stats.discovered and not stats.known:
             console.print("[red]Aucun token trouvé!")
             return {"rugs": [], "success": []}
 
-        # Classifier
-        console.print("[cyan]Classification simple (market cap uniquement)...\n")
-
-        rugs = []
-        successes = []
-        skipped = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("Classification...", total=len(pairs))
+        console.print(f"[green]✓ {stats.discovered} nouveaux tokens PumpSwap uniques "
+                      f"({stats.known} déjà dans le dataset)\n")
 
-            for pair in pairs:
-                classification = self.classify_pair(pair)
-
-                if classification == "RUG":
-                    rugs.append(self.format_token(pair, "RUG"))
-                elif classification == "SUCCESS":
-                    successes.append(self.format_token(pair, "SUCCESS"))
-                else:
-                    skipped += 1
-
-                progress.update(task, advance=1)
+        rugs, successes = results["rugs"], results["success"]
 
         # Résultats
         console.print(f"\n[bold cyan]Résultats de la Classification :[/]")
         console.print(f"  [red]RUGS (< $20K) : {len(rugs)}")
         console.print(f"  [green]SUCCESS (> $500K) : {len(successes)}")
-        console.print(f"  [dim]Zone grise (ignorés) : {skipped}\n")
+        console.print(f"  [dim]Zone grise (ignorés) : {stats.skipped}\n")
 
         return {"rugs": rugs, "success": successes}
 
-    def load_existing(self) -> dict:
-        """Charge datasets existants"""
-        existing = {"rugs": [], "success": []}
-
-        if self.rugs_file.exists():
-            with open(self.rugs_file) as f:
-                existing["rugs"] = json.load(f)
-
-        if self.success_file.exists():
-            with open(self.success_file) as f:
-                existing["success"] = json.load(f)
-
-        return existing
-
     def save_results(self, new_data: dict):
         """Sauvegarde les résultats"""
 
-        # Charger existants
-        existing = self.load_existing()
-
         console.print("[cyan]Fusion avec données existantes...\n")
 
-        # Merger rugs (éviter doublons)
-        existing_rug_mints = {t.get("mint") for t in existing["rugs"] if t.get("mint")}
-        new_rugs = [t for t in new_data["rugs"] if t.get("mint") not in existing_rug_mints]
-        all_rugs = existing["rugs"] + new_rugs
-
-        # Merger success
-        existing_success_mints = {t.get("mint") for t in existing["success"] if t.get("mint")}
-        new_successes = [t for t in new_data["success"] if t.get("mint") not in existing_success_mints]
-        all_successes = existing["success"] + new_successes
-
-        # Sauvegarder
-        with open(self.rugs_file, "w") as f:
-            json.dump(all_rugs, f, indent=2)
-
-        with open(self.success_file, "w") as f:
-            json.dump(all_successes, f, indent=2)
+        # Ajout incrémental : seuls les mints absents de l'index sont écrits
+        before = {name: self.store.count(name) for name in ("rugs", "success")}
+        added = save_labeled(new_data, self.store)
+        new_rugs, new_successes = added["rugs"], added["success"]
+        total_rugs = before["rugs"] + len(new_rugs)
+        total_successes = before["success"] + len(new_successes)
 
         # Afficher
         console.print("[bold green]✓ Fichiers Sauvegardés !")
-        console.print(f"  [red]rugs.json : {len(existing['rugs'])} → {len(all_rugs)} (+{len(new_rugs)})")
-        console.print(f"  [green]success.json : {len(existing['success'])} → {len(all_successes)} (+{len(new_successes)})")
+        console.print(f"  [red]rugs.jsonl : {before['rugs']} → {total_rugs} (+{len(new_rugs)})")
+        console.print(f"  [green]success.jsonl : {before['success']} → {total_successes} (+{len(new_successes)})")
 
         # Exemples de nouveaux RUGS
         if new_rugs:
@@ -255,18 +177,18 @@ class SimpleCollectorV2:
 
         # Statistiques finales
         console.print(f"\n[bold cyan]📊 Dataset Total :")
-        console.print(f"  [red]RUGS : {len(all_rugs)}")
-        console.print(f"  [green]SUCCESS : {len(all_successes)}")
-        console.print(f"  [yellow]TOTAL : {len(all_rugs) + len(all_successes)} tokens")
+        console.print(f"  [red]RUGS : {total_rugs}")
+        console.print(f"  [green]SUCCESS : {total_successes}")
+        console.print(f"  [yellow]TOTAL : {total_rugs + total_successes} tokens")
 
         # Recommandations
-        if len(all_rugs) >= 50 and len(all_successes) >= 50:
+        if total_rugs >= 50 and total_successes >= 50:
             console.print(f"\n[bold green]✓ Vous avez assez de données ! (50+50)")
             console.print(f"[yellow]→ Vous pouvez entraîner maintenant :")
             console.print(f"[yellow]  python train_with_my_data.py")
         else:
-            needed_rugs = max(0, 50 - len(all_rugs))
-            needed_success = max(0, 50 - len(all_successes))
+            needed_rugs = max(0, 50 - total_rugs)
+            needed_success = max(0, 50 - total_successes)
             console.print(f"\n[yellow]📌 Pour un bon modèle, collectez encore :")
             if needed_rugs > 0:
                 console.print(f"  [red]• {needed_rugs} RUGS de plus")
@@ -7,11 +7,15 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 import requests
+import threading
 import time
-import pandas as pd
-from datetime import datetime
 import asyncio
-from feature_extractor import TokenFeatureExtractor
+from feature_store import FeatureStore
+from extraction_pipeline import DEFAULT_WORKERS, ExtractionPipeline
+
+# Concurrent requests to the local scan API used for labelling
+SCAN_API_CONCURRENCY = 4
+
 
 class TokenDataCollector:
     """Collects and labels real token data for ML training"""
@@ -20,7 +24,8 @@ class TokenDataCollector:
         self.api_url = "http://localhost:5000/api/scan"
         self.pump_api = "https://frontend-api.pump.fun"
         self.collected_data = []
-        self.extractor = TokenFeatureExtractor()
+        self.store = FeatureStore()
+        self.scan_slots = threading.BoundedSemaphore(SCAN_API_CONCURRENCY)
 
     def get_recent_tokens(self, limit=100):
         """Get recent tokens from Pump.fun"""
@@ -125,53 +130,44 @@ class TokenDataCollector:
             print(f"[X] Error labeling token: {e}")
             return -1, f"ERROR: {str(e)}"
 
-    async def collect_token_data(self, mint_address, token_data):
-        """Collect features for a single token"""
-        try:
-            print(f"\n[*] Processing {mint_address[:8]}...")
-
-            # Extract ML features
-            features = await self.extractor.extract_all_features(mint_address)
-
-            if not features:
-                print(f"[X] Could not extract features for {mint_address[:8]}")
-                return None
+    def scan_and_label(self, mint_address, token_data):
+        """
+        Label a token using the full scan from the local API (blocking)
 
-            # Get full scan result for labeling
-            try:
+        Returns:
+            (label, reason) or None if the token could not be labeled
+        """
+        # Get full scan result for labeling
+        try:
+            with self.scan_slots:
                 scan_response = requests.post(
                     self.api_url,
                     json={"mint_address": mint_address},
                     timeout=60
                 )
-                scan_result = scan_response.json() if scan_response.status_code == 200 else None
-            except:
-                scan_result = None
-
-            # Label the token
-            label, reason = self.label_token(token_data, scan_result)
+            scan_result = scan_response.json() if scan_response.status_code == 200 else None
+        except:
+            scan_result = None
 
-            if label == -1:
-                print(f"[X] Failed to label: {reason}")
-                return None
+        # Label the token
+        label, reason = self.label_token(token_data, scan_result)
 
-            # Add label and metadata
-            features['label'] = label
-            features['mint_address'] = mint_address
-            features['collected_at'] = datetime.now().isoformat()
-            features['label_reason'] = reason
-
-            label_text = "RUG" if label == 1 else "SAFE"
-            print(f"[OK] Labeled as {label_text}: {reason}")
+        if label == -1:
+            print(f"[X] Failed to label {mint_address[:8]}: {reason}")
+            return None
 
-            return features
+        label_text = "RUG" if label == 1 else "SAFE"
+        print(f"[OK] {mint_address[:8]} labeled as {label_text}: {reason}")
+        return label, reason
 
-        except Exception as e:
-            print(f"[X] Error collecting data for {mint_address}: {e}")
-            return None
+    async def collect_batch(self, num_tokens=100, max_age=None, workers=DEFAULT_WORKERS):
+        """
+        Collect a batch of tokens concurrently
 
-    async def collect_batch(self, num_tokens=100):
-        """Collect a batch of tokens"""
+        Tokens already in the feature store are skipped unless their latest
+        snapshot is older than max_age seconds. An interrupted batch can be
+        run again and resumes where it stopped.
+        """
         print(f"\n{'='*80}")
         print(f"COLLECTING {num_tokens} TOKENS FOR TRAINING")
         print(f"{'='*80}\n")
@@ -183,60 +179,27 @@ class TokenDataCollector:
             print("[X] No tokens fetched!")
             return
 
-        # Process each token
-        collected = []
-        rug_count = 0
-        safe_count = 0
-
-        for i, token in enumerate(tokens):
-            mint = token.get("mint")
-            if not mint:
-                continue
-
-            print(f"\nProgress: {i+1}/{len(tokens)}")
-
-            # Collect features
-            features = await self.collect_token_data(mint, token)
-
-            if features:
-                collected.append(features)
-
-                if features['label'] == 1:
-                    rug_count += 1
-                else:
-                    safe_count += 1
-
-            # Don't overwhelm the API
-            time.sleep(2)
-
-        # Save to CSV
-        if collected:
-            df = pd.DataFrame(collected)
+        token_data = {t["mint"]: t for t in tokens if t.get("mint")}
 
-            # Load existing data if any
-            csv_path = "dataset/features.csv"
-            try:
-                existing_df = pd.read_csv(csv_path)
-                # Combine with new data
-                df = pd.concat([existing_df, df], ignore_index=True)
-                # Remove duplicates by mint_address
-                df = df.drop_duplicates(subset=['mint_address'], keep='last')
-            except FileNotFoundError:
-                pass
+        pipeline = ExtractionPipeline(self.store, workers=workers, max_age=max_age)
+        stats = await pipeline.run(
+            token_data,
+            label_fn=lambda mint, features: self.scan_and_label(mint, token_data[mint])
+        )
+        print(f"[*] {stats.skipped} tokens already in the feature store or given up on")
 
-            # Save
-            df.to_csv(csv_path, index=False)
+        # Features and labels were written to the store as they were collected
+        if stats.labeled:
+            tokens_stored, labeled = self.store.count()
 
             print(f"\n{'='*80}")
             print(f"COLLECTION COMPLETE!")
             print(f"{'='*80}")
-            print(f"New tokens collected: {len(collected)}")
-            print(f"  - RUG: {rug_count}")
-            print(f"  - SAFE: {safe_count}")
-            print(f"\nTotal dataset size: {len(df)} tokens")
-            print(f"  - RUG: {(df['label']==1).sum()}")
-            print(f"  - SAFE: {(df['label']==0).sum()}")
-            print(f"\nSaved to: {csv_path}")
+            print(f"New tokens collected: {stats.labeled} in {stats.elapsed:.0f}s ({stats.rate:.0f}/min)")
+            print(f"  - RUG: {stats.labels.get(1, 0)}")
+            print(f"  - SAFE: {stats.labels.get(0, 0)}")
+            print(f"\nTotal dataset size: {labeled} labeled tokens ({tokens_stored} with features)")
+            print(f"\nSaved to: {self.store.db_file}")
             print(f"{'='*80}\n")
         else:
             print("\n[X] No tokens collected!")
@@ -250,13 +213,13 @@ if __name__ == "__main__":
     print("1. Fetch recent tokens from Pump.fun")
     print("2. Scan each token to extract features")
     print("3. Automatically label as RUG or SAFE")
-    print("4. Save to dataset/features.csv for ML training")
+    print("4. Save to the feature store (dataset/features.db) for ML training")
     print("\n" + "=" * 80)
 
     num_tokens = int(input("\nHow many tokens to collect? (recommended: 200-500): ") or "200")
 
     print(f"\n[OK] Starting collection of {num_tokens} tokens...")
-    print("[!] This will take a while (2-3 seconds per token)")
+    print("[!] Tokens are processed concurrently; an interrupted run can be restarted and resumes")
     print("[!] Make sure web_app.py is running on localhost:5000\n")
 
     collector = TokenDataCollector()
@@ -264,4 +227,4 @@ if __name__ == "__main__":
     # Run async collection (Python 3.14 compatible)
     asyncio.run(collector.collect_batch(num_tokens))
 
-    print("\n[OK] Collection finished! Now run train_with_my_data.py to retrain the model.")
+    print("\n[OK] Collection finished! Now run model_trainer.py to retrain the model.")
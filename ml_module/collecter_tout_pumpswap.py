@@ -5,16 +5,28 @@ Récupère TOUS les tokens depuis DexScreener PumpSwap
 
 import asyncio
 import httpx
-import json
 from datetime import datetime
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 
+from dataset_store import DatasetStore, save_labeled
+from token_discovery import Candidate, DexScreenerSearch, discover
+
 console = Console()
 
+# Recherche directe pumpswap puis variations de mots-clés
+SEARCH_QUERIES = [
+    "pumpswap",
+    "pump.fun",
+    "pump fun",
+    "pumpfun",
+    "solana pump",
+    "pump token",
+    "pump coin"
+]
+
 
 class CompletePumpSwapCollector:
     """Collecte TOUS les tokens PumpSwap"""
@@ -23,8 +35,7 @@ class CompletePumpSwapCollector:
         self.dataset_dir = Path(__file__).parent / "dataset"
         self.dataset_dir.mkdir(exist_ok=True)
 
-        self.rugs_file = self.dataset_dir / "rugs.json"
-        self.success_file = self.dataset_dir / "success.json"
+        self.store = DatasetStore(self.dataset_dir)
 
         self.client = httpx.AsyncClient(timeout=30.0)
 
@@ -32,89 +43,6 @@ class CompletePumpSwapCollector:
         self.success_mcap_min = 500_000  # 500K
         self.rug_mcap_max = 20_000       # 20K
 
-    async def fetch_all_pumpswap_tokens(self, max_pages: int = 20) -> list:
-        """
-        Récupère tous les tokens PumpSwap en utilisant l'API DexScreener
-        avec pagination
-        """
-        console.print("[cyan]Récupération de TOUS les tokens PumpSwap...")
-        console.print(f"[dim]Recherche jusqu'à {max_pages} pages\n")
-
-        all_tokens = []
-        seen_mints = set()
-
-        # Méthode 1 : Recherche par DEX
-        console.print("[yellow]Méthode 1 : Recherche directe pumpswap...")
-
-        try:
-            # L'API DexScreener permet de filtrer par DEX
-            response = await self.client.get(
-                "https://api.dexscreener.com/latest/dex/search",
-                params={"q": "pumpswap"}
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get("pairs", [])
-
-                for pair in pairs:
-                    if pair.get("chainId") == "solana":
-                        dex_id = str(pair.get("dexId", "")).lower()
-                        if "pump" in dex_id:
-                            mint = pair.get("baseToken", {}).get("address")
-                            if mint and mint not in seen_mints:
-                                all_tokens.append(pair)
-                                seen_mints.add(mint)
-
-                console.print(f"[green]✓ Trouvé {len(all_tokens)} tokens")
-
-            await asyncio.sleep(2)
-
-        except Exception as e:
-            console.print(f"[red]Erreur : {e}")
-
-        # Méthode 2 : Recherche par variations de mots-clés
-        keywords = [
-            "pump.fun",
-            "pump fun",
-            "pumpfun",
-            "solana pump",
-            "pump token",
-            "pump coin"
-        ]
-
-        console.print(f"\n[yellow]Méthode 2 : Recherche par mots-clés ({len(keywords)} recherches)...")
-
-        for keyword in keywords:
-            try:
-                response = await self.client.get(
-                    "https://api.dexscreener.com/latest/dex/search",
-                    params={"q": keyword}
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    pairs = data.get("pairs", [])
-
-                    for pair in pairs:
-                        if pair.get("chainId") == "solana":
-                            dex_id = str(pair.get("dexId", "")).lower()
-                            if "pump" in dex_id:
-                                mint = pair.get("baseToken", {}).get("address")
-                                if mint and mint not in seen_mints:
-                                    all_tokens.append(pair)
-                                    seen_mints.add(mint)
-
-                    console.print(f"[dim]  '{keyword}' → {len(pairs)} pairs (+{len(all_tokens)} uniques)")
-
-                await asyncio.sleep(1.5)  # Rate limiting
-
-            except Exception as e:
-                console.print(f"[red]Erreur '{keyword}': {e}")
-
-        console.print(f"\n[bold green]✓ Total : {len(all_tokens)} tokens PumpSwap uniques\n")
-        return all_tokens
-
     def classify_token(self, pair: dict) -> str:
         """Classifie un token"""
         market_cap = float(pair.get("marketCap", 0) or 0)
@@ -154,6 +82,15 @@ class CompletePumpSwapCollector:
             "collected_at": datetime.now().isoformat()
         }
 
+    def label_candidate(self, candidate: Candidate):
+        """Classe une paire découverte : ("rugs" | "success", token) ou None"""
+        classification = self.classify_token(candidate.pair)
+        if classification == "RUG":
+            return "rugs", self.format_token(candidate.pair, "RUG")
+        if classification == "SUCCESS":
+            return "success", self.format_token(candidate.pair, "SUCCESS")
+        return None
+
     async def collect_and_classify(self, max_pages: int = 20) -> dict:
         """Collecte et classifie"""
 
@@ -164,38 +101,24 @@ class CompletePumpSwapCollector:
             border_style="cyan"
         ))
 
-        # Récupérer tous les tokens
-        all_pairs = await self.fetch_all_pumpswap_tokens(max_pages)
+        # Recherche directe "pumpswap" et variations de mots-clés, toutes en
+        # parallèle (rythme fixé par les budgets de rate_limit)
+        console.print("[cyan]Récupération de TOUS les tokens PumpSwap...")
+        console.print(f"[dim]{len(SEARCH_QUERIES)} recherches en parallèle\n")
+        with console.status("Recherche et classification..."):
+            labeled, stats = await discover(
+                [DexScreenerSearch(SEARCH_QUERIES)], self.label_candidate,
+                store=self.store, client=self.client
+            )
 
-        if not all_pairs:
+        if not stats.discovered and not stats.known:
             console.print("[red]Aucun token trouvé!")
             return {"rugs": [], "success": []}
 
-        # Classifier
-        console.print("[cyan]Classification...\n")
-
-        results = {"rugs": [], "success": [], "skipped": 0}
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("Classification...", total=len(all_pairs))
-
-            for pair in all_pairs:
-                classification = self.classify_token(pair)
-
-                if classification == "SUCCESS":
-                    results["success"].append(self.format_token(pair, "SUCCESS"))
-                elif classification == "RUG":
-                    results["rugs"].append(self.format_token(pair, "RUG"))
-                else:
-                    results["skipped"] += 1
+        console.print(f"[bold green]✓ Total : {stats.discovered} nouveaux tokens PumpSwap uniques "
+                      f"({stats.known} déjà dans le dataset)\n")
 
-                progress.update(task, advance=1)
+        results = {"rugs": labeled["rugs"], "success": labeled["success"], "skipped": stats.skipped}
 
         # Résultats
         console.print(f"\n[bold cyan]Résultats :")
@@ -205,46 +128,20 @@ class CompletePumpSwapCollector:
 
         return results
 
-    def load_existing(self) -> dict:
-        """Charge existants"""
-        existing = {"rugs": [], "success": []}
-
-        if self.rugs_file.exists():
-            with open(self.rugs_file) as f:
-                existing["rugs"] = json.load(f)
-
-        if self.success_file.exists():
-            with open(self.success_file) as f:
-                existing["success"] = json.load(f)
-
-        return existing
-
     def save_results(self, new_data: dict):
         """Sauvegarde"""
 
-        # Charger existants
-        existing = self.load_existing()
-
-        # Merger
-        existing_rug_mints = {t.get("mint") for t in existing["rugs"]}
-        new_rugs = [t for t in new_data["rugs"] if t.get("mint") not in existing_rug_mints]
-        all_rugs = existing["rugs"] + new_rugs
-
-        existing_success_mints = {t.get("mint") for t in existing["success"]}
-        new_successes = [t for t in new_data["success"] if t.get("mint") not in existing_success_mints]
-        all_successes = existing["success"] + new_successes
-
-        # Sauvegarder
-        with open(self.rugs_file, "w") as f:
-            json.dump(all_rugs, f, indent=2)
-
-        with open(self.success_file, "w") as f:
-            json.dump(all_successes, f, indent=2)
+        # Ajout incrémental : seuls les mints absents de l'index sont écrits
+        before = {name: self.store.count(name) for name in ("rugs", "success")}
+        added = save_labeled(new_data, self.store)
+        new_rugs, new_successes = added["rugs"], added["success"]
+        total_rugs = before["rugs"] + len(new_rugs)
+        total_successes = before["success"] + len(new_successes)
 
         # Afficher
         console.print("[bold green]✓ Sauvegardé !")
-        console.print(f"  [red]rugs.json : {len(existing['rugs'])} → {len(all_rugs)} (+{len(new_rugs)})")
-        console.print(f"  [green]success.json : {len(existing['success'])} → {len(all_successes)} (+{len(new_successes)})")
+        console.print(f"  [red]rugs.jsonl : {before['rugs']} → {total_rugs} (+{len(new_rugs)})")
+        console.print(f"  [green]success.jsonl : {before['success']} → {total_successes} (+{len(new_successes)})")
 
         # Exemples
         if new_successes:
@@ -259,17 +156,17 @@ class CompletePumpSwapCollector:
 
         # Stats
         console.print(f"\n[bold cyan]📊 Dataset Total :")
-        console.print(f"  [red]RUGS : {len(all_rugs)}")
-        console.print(f"  [green]SUCCESS : {len(all_successes)}")
-        console.print(f"  [yellow]TOTAL : {len(all_rugs) + len(all_successes)}")
+        console.print(f"  [red]RUGS : {total_rugs}")
+        console.print(f"  [green]SUCCESS : {total_successes}")
+        console.print(f"  [yellow]TOTAL : {total_rugs + total_successes}")
 
         # Recommandation
-        if len(all_rugs) >= 50 and len(all_successes) >= 50:
+        if total_rugs >= 50 and total_successes >= 50:
             console.print(f"\n[bold green]✓ Vous avez assez de données !")
             console.print(f"[yellow]→ Entraînez maintenant : python train_with_my_data.py")
         else:
-            needed_rugs = max(0, 50 - len(all_rugs))
-            needed_success = max(0, 50 - len(all_successes))
+            needed_rugs = max(0, 50 - total_rugs)
+            needed_success = max(0, 50 - total_successes)
             if needed_rugs > 0 or needed_success > 0:
                 console.print(f"\n[yellow]📌 Objectif 50+50, encore besoin de :")
                 if needed_rugs > 0:
@@ -4,15 +4,15 @@ This script demonstrates the full ML pipeline for token classification
 """
 
 import asyncio
-import json
-import pandas as pd
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from data_collector import HistoricalDataCollector
+from dataset_store import DatasetStore, load_labeled
 from feature_extractor import TokenFeatureExtractor
+from feature_store import FeatureStore
+from extraction_pipeline import ExtractionPipeline
 from model_trainer import TokenClassifierTrainer
 from predictor import TokenPredictor
 
@@ -46,9 +46,16 @@ class MLWorkflowManager:
         finally:
             await collector.close()
 
-    async def step2_extract_features(self):
+    async def step2_extract_features(self, max_age: float = None):
         """
         Step 2: Extract features from collected tokens
+
+        Only tokens without a stored snapshot for the current feature version
+        (or with one older than max_age seconds) are extracted, concurrently.
+        Interrupted runs resume from the store and the pipeline checkpoint.
+
+        Args:
+            max_age: Re-extract snapshots older than this many seconds (None = never)
         """
         console.print(Panel.fit(
             "[bold cyan]STEP 2: Extracting Features[/]",
@@ -56,65 +63,34 @@ class MLWorkflowManager:
         ))
 
         # Load datasets
-        rugs_file = self.dataset_dir / "rugs.json"
-        success_file = self.dataset_dir / "success.json"
+        datasets = DatasetStore(self.dataset_dir)
 
-        if not rugs_file.exists() or not success_file.exists():
+        if not datasets.exists("rugs") or not datasets.exists("success"):
             console.print("[red]Error: Dataset files not found!")
             console.print("[yellow]Please run step 1 first: collect_data()")
             return
 
-        with open(rugs_file) as f:
-            rugs = json.load(f)
-        with open(success_file) as f:
-            successes = json.load(f)
+        labeled = load_labeled(datasets)
+        rugs, successes = labeled["rugs"], labeled["success"]
 
         console.print(f"[cyan]Loaded {len(rugs)} rugs and {len(successes)} successes")
 
-        # Extract features
-        extractor = TokenFeatureExtractor()
-        all_features = []
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task(
-                "Extracting features...",
-                total=len(rugs) + len(successes)
-            )
-
-            # Process rugs
-            for token in rugs:
-                mint = token.get("mint")
-                if mint:
-                    features = await extractor.extract_all_features(mint)
-                    if features:
-                        features["label"] = 0  # RUG
-                        all_features.append(features)
-                    progress.update(task, advance=1)
-                    await asyncio.sleep(0.3)  # Rate limiting
-
-            # Process successes
-            for token in successes:
-                mint = token.get("mint")
-                if mint:
-                    features = await extractor.extract_all_features(mint)
-                    if features:
-                        features["label"] = 2  # HIGH_POTENTIAL
-                        all_features.append(features)
-                    progress.update(task, advance=1)
-                    await asyncio.sleep(0.3)  # Rate limiting
-
-        await extractor.close()
-
-        # Save to CSV
-        if all_features:
-            df = pd.DataFrame(all_features)
-            features_file = self.dataset_dir / "features.csv"
-            df.to_csv(features_file, index=False)
-            console.print(f"[green]Saved {len(df)} feature sets to {features_file.name}")
+        # Labels are cheap and may change between runs, always refresh them
+        store = FeatureStore()
+        labels = {token.get("mint"): 0 for token in rugs if token.get("mint")}  # RUG
+        labels.update({token.get("mint"): 2 for token in successes if token.get("mint")})  # HIGH_POTENTIAL
+        store.set_labels([(mint, label, None) for mint, label in labels.items()])
+
+        # Concurrent extraction; already stored and repeatedly failing mints are skipped
+        pipeline = ExtractionPipeline(store, max_age=max_age)
+        stats = await pipeline.run(labels)
+        console.print(f"[cyan]{stats.skipped} tokens already in the feature store or given up on, "
+                      f"{stats.queued} queued for extraction")
+
+        _, labeled = store.count()
+        if stats.extracted or labeled:
+            console.print(f"[green]Extracted {stats.extracted} feature sets in {stats.elapsed:.0f}s "
+                          f"({stats.failed} failed), {labeled} labeled tokens in {Path(store.db_file).name}")
         else:
             console.print("[red]No features extracted!")
 
@@ -151,12 +127,9 @@ class MLWorkflowManager:
 
             # If no test mint provided, use a sample from dataset
             if test_mint is None:
-                rugs_file = self.dataset_dir / "rugs.json"
-                if rugs_file.exists():
-                    with open(rugs_file) as f:
-                        rugs = json.load(f)
-                        if rugs:
-                            test_mint = rugs[0].get("mint")
+                first_rug = next(DatasetStore(self.dataset_dir).iter_records("rugs"), None)
+                if first_rug:
+                    test_mint = first_rug.get("mint")
 
             if not test_mint:
                 console.print("[yellow]No test token available")
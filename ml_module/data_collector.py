@@ -3,7 +3,6 @@ Data Collector - Collects historical token data for ML training
 Fetches confirmed rugs and successful tokens from various sources
 """
 
-import json
 import httpx
 import asyncio
 from pathlib import Path
@@ -12,6 +11,8 @@ from typing import List, Dict
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from dataset_store import DatasetStore, load_labeled
+
 console = Console()
 
 
@@ -22,8 +23,7 @@ class HistoricalDataCollector:
         self.dataset_dir = Path(__file__).parent / "dataset"
         self.dataset_dir.mkdir(exist_ok=True)
 
-        self.rugs_file = self.dataset_dir / "rugs.json"
-        self.success_file = self.dataset_dir / "success.json"
+        self.store = DatasetStore(self.dataset_dir)
 
         self.client = httpx.AsyncClient(timeout=30.0)
 
@@ -169,37 +169,22 @@ class HistoricalDataCollector:
                 await asyncio.sleep(0.3)  # Rate limiting for DexScreener
 
         # Save to files
-        self._save_json(self.rugs_file, rugs)
-        self._save_json(self.success_file, successes)
+        self._save_dataset("rugs", rugs)
+        self._save_dataset("success", successes)
 
         console.print(f"\n[green]Classification Complete:")
         console.print(f"  [red]Rugs: {len(rugs)}")
         console.print(f"  [green]Success: {len(successes)}")
         console.print(f"  [yellow]Safe: {len(safe_tokens)}")
 
-    def _save_json(self, filepath: Path, data: List[Dict]):
-        """Save data to JSON file"""
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
-        console.print(f"[green]Saved {len(data)} tokens to {filepath.name}")
+    def _save_dataset(self, name: str, data: List[Dict]):
+        """Append new tokens to a dataset (mints already stored are skipped)"""
+        added = self.store.append(name, data)
+        console.print(f"[green]Saved {len(added)} new tokens to {self.store.path(name).name}")
 
     async def load_existing_datasets(self) -> Dict[str, List[Dict]]:
         """Load existing datasets"""
-        datasets = {}
-
-        if self.rugs_file.exists():
-            with open(self.rugs_file, "r") as f:
-                datasets["rugs"] = json.load(f)
-        else:
-            datasets["rugs"] = []
-
-        if self.success_file.exists():
-            with open(self.success_file, "r") as f:
-                datasets["success"] = json.load(f)
-        else:
-            datasets["success"] = []
-
-        return datasets
+        return load_labeled(self.store)
 
     async def collect_training_data(self, num_tokens: int = 500):
         """
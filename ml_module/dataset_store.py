@@ -0,0 +1,348 @@
+"""
+Dataset Store - Append-only JSON Lines storage for the labeled token lists
+Each dataset (rugs, success) is a .jsonl file with one token per line, plus a
+SQLite index of the mints it contains. Saving new tokens appends only the
+records whose mint is not indexed yet, so a save costs O(new records) and a
+crash can at worst leave a partial last line, which is dropped on the next
+open. compact() rewrites a file atomically (dedup, corrupt lines removed).
+
+Hand-written legacy rugs.json / success.json arrays are still honoured: they
+are imported whenever they change.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+DEFAULT_DATASET_DIR = Path(__file__).parent / "dataset"
+
+DATASETS = ("rugs", "success")
+
+# SQLite limits the number of bound parameters per statement
+_IN_CHUNK = 500
+
+
+class DatasetStore:
+    """Append-only JSONL datasets with a persistent mint index"""
+
+    def __init__(self, dataset_dir: Optional[Path] = None):
+        self.dataset_dir = Path(dataset_dir or os.getenv("DATASET_DIR") or DEFAULT_DATASET_DIR)
+        self.dataset_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.dataset_dir / "dataset_index.db"
+        self._local = threading.local()
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.index_file, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                dataset TEXT NOT NULL,
+                mint TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                PRIMARY KEY (dataset, mint)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                dataset TEXT PRIMARY KEY,
+                file_id TEXT,
+                indexed_bytes INTEGER NOT NULL DEFAULT 0,
+                legacy_mtime REAL
+            )
+        """)
+
+    def path(self, name: str) -> Path:
+        """JSON Lines file of a dataset"""
+        return self.dataset_dir / f"{name}.jsonl"
+
+    def legacy_path(self, name: str) -> Path:
+        """Legacy JSON array file of a dataset"""
+        return self.dataset_dir / f"{name}.json"
+
+    # ------------------------------------------------------------------
+    # Index maintenance (always called inside a BEGIN IMMEDIATE transaction,
+    # which also serializes writers across processes)
+    # ------------------------------------------------------------------
+
+    def _begin(self) -> sqlite3.Connection:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    @staticmethod
+    def _file_id(path: Path) -> Optional[str]:
+        return str(path.stat().st_ino) if path.exists() else None
+
+    def _sync(self, conn: sqlite3.Connection, name: str):
+        """Bring the index up to date with the file (and import a changed legacy file)"""
+        path = self.path(name)
+        row = conn.execute(
+            "SELECT file_id, indexed_bytes, legacy_mtime FROM files WHERE dataset = ?", (name,)
+        ).fetchone()
+        file_id, indexed, legacy_mtime = row if row else (None, 0, None)
+
+        size = path.stat().st_size if path.exists() else 0
+        if file_id != self._file_id(path) or size < indexed:
+            # File replaced (compaction) or rewritten outside the store: reindex
+            conn.execute("DELETE FROM records WHERE dataset = ?", (name,))
+            indexed = 0
+
+        if size > indexed:
+            indexed = self._index_tail(conn, name, indexed)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO files (dataset, file_id, indexed_bytes, legacy_mtime) VALUES (?, ?, ?, ?)",
+            (name, self._file_id(path), indexed, legacy_mtime)
+        )
+
+        legacy = self.legacy_path(name)
+        if legacy.exists() and legacy.stat().st_mtime != legacy_mtime:
+            try:
+                with open(legacy) as f:
+                    records = json.load(f)
+                added = self._append_locked(conn, name, records if isinstance(records, list) else [])
+                if added:
+                    print(f"[DATASET] Imported {len(added)} tokens from {legacy.name}")
+            except (OSError, ValueError) as e:
+                print(f"[DATASET] Could not import {legacy.name}: {e}")
+            conn.execute("UPDATE files SET legacy_mtime = ? WHERE dataset = ?", (legacy.stat().st_mtime, name))
+
+    def _index_tail(self, conn: sqlite3.Connection, name: str, start: int) -> int:
+        """Index lines written after `start` (e.g. by a run that crashed). Returns the new indexed size"""
+        path = self.path(name)
+        offset = start
+        rows = []
+        with open(path, "rb+") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partial last line from an interrupted write
+                    print(f"[DATASET] Dropping incomplete last line of {path.name}")
+                    f.truncate(offset)
+                    break
+                mint = self._mint_of(line)
+                if mint:
+                    rows.append((name, mint, offset))
+                offset += len(line)
+
+        conn.executemany("INSERT OR IGNORE INTO records (dataset, mint, offset) VALUES (?, ?, ?)", rows)
+        return offset
+
+    @staticmethod
+    def _mint_of(line: bytes) -> Optional[str]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record.get("mint") if isinstance(record, dict) else None
+
+    def _known(self, conn: sqlite3.Connection, name: str, mints: List[str]) -> Set[str]:
+        known = set()
+        for i in range(0, len(mints), _IN_CHUNK):
+            chunk = mints[i:i + _IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            known.update(r[0] for r in conn.execute(
+                f"SELECT mint FROM records WHERE dataset = ? AND mint IN ({placeholders})", (name, *chunk)
+            ))
+        return known
+
+    def _append_locked(self, conn: sqlite3.Connection, name: str, records: Iterable[Dict]) -> List[Dict]:
+        """Append records whose mint is new; returns them"""
+        batch = {}
+        for record in records:
+            mint = record.get("mint") if isinstance(record, dict) else None
+            if mint and mint not in batch:
+                batch[mint] = record
+        if not batch:
+            return []
+
+        known = self._known(conn, name, list(batch))
+        new = [record for mint, record in batch.items() if mint not in known]
+        if not new:
+            return []
+
+        path = self.path(name)
+        rows = []
+        with open(path, "ab") as f:
+            offset = f.tell()
+            for record in new:
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode()
+                f.write(line)
+                rows.append((name, record["mint"], offset))
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        conn.executemany("INSERT INTO records (dataset, mint, offset) VALUES (?, ?, ?)", rows)
+        conn.execute(
+            "UPDATE files SET file_id = ?, indexed_bytes = ? WHERE dataset = ?",
+            (self._file_id(path), offset, name)
+        )
+        return new
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def append(self, name: str, records: Iterable[Dict]) -> List[Dict]:
+        """
+        Add records to a dataset, skipping mints it already contains
+
+        Args:
+            name: Dataset name ("rugs" or "success")
+            records: Token dicts with a "mint" key (others are ignored)
+
+        Returns:
+            The records that were actually added
+        """
+        conn = self._begin()
+        try:
+            self._sync(conn, name)
+            new = self._append_locked(conn, name, records)
+            conn.execute("COMMIT")
+            return new
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def sync(self, name: str):
+        """Bring a dataset's index up to date with its file (one write transaction)"""
+        conn = self._begin()
+        try:
+            self._sync(conn, name)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def iter_records(self, name: str) -> Iterator[Dict]:
+        """Stream the records of a dataset (first record per mint, unreadable lines skipped)"""
+        self.sync(name)
+        path = self.path(name)
+        if not path.exists():
+            return
+        seen = set()
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                mint = record.get("mint") if isinstance(record, dict) else None
+                if mint in seen:
+                    continue
+                if mint:
+                    seen.add(mint)
+                yield record
+
+    def load(self, name: str) -> List[Dict]:
+        """All records of a dataset"""
+        return list(self.iter_records(name))
+
+    def contains(self, name: str, mints: Iterable[str], sync: bool = True) -> Set[str]:
+        """
+        Which of `mints` the dataset already contains
+
+        sync=False reads the index as of the last sync() (no write transaction),
+        for callers that check many mints one at a time
+        """
+        if sync:
+            self.sync(name)
+        return self._known(self._conn(), name, list(dict.fromkeys(m for m in mints if m)))
+
+    def count(self, name: str) -> int:
+        """Number of distinct mints in a dataset"""
+        self.sync(name)
+        return self._conn().execute("SELECT COUNT(*) FROM records WHERE dataset = ?", (name,)).fetchone()[0]
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists() or self.legacy_path(name).exists()
+
+    def compact(self, name: str) -> int:
+        """
+        Rewrite a dataset without duplicate mints or unreadable lines. The new
+        file replaces the old one atomically. Returns the number of records kept
+        """
+        conn = self._begin()
+        try:
+            self._sync(conn, name)
+            path = self.path(name)
+            if not path.exists():
+                conn.execute("COMMIT")
+                return 0
+
+            tmp = path.with_suffix(".jsonl.tmp")
+            rows = []
+            offset = 0
+            seen = set()
+            with open(path, "rb") as src, open(tmp, "wb") as dst:
+                for line in src:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    mint = record.get("mint") if isinstance(record, dict) else None
+                    if not mint or mint in seen:
+                        continue
+                    seen.add(mint)
+                    out = (json.dumps(record, ensure_ascii=False) + "\n").encode()
+                    dst.write(out)
+                    rows.append((name, mint, offset))
+                    offset += len(out)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp, path)
+
+            conn.execute("DELETE FROM records WHERE dataset = ?", (name,))
+            conn.executemany("INSERT INTO records (dataset, mint, offset) VALUES (?, ?, ?)", rows)
+            conn.execute(
+                "UPDATE files SET file_id = ?, indexed_bytes = ? WHERE dataset = ?",
+                (self._file_id(path), offset, name)
+            )
+            conn.execute("COMMIT")
+            return len(rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def export_json(self, name: str, path: Optional[Path] = None) -> Path:
+        """Write a dataset as a JSON array (for tools that expect the old format)"""
+        path = Path(path or self.dataset_dir / f"{name}_export.json")
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.load(name), f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+
+# ----------------------------------------------------------------------
+# Helpers shared by the collectors
+# ----------------------------------------------------------------------
+
+def load_labeled(store: Optional[DatasetStore] = None) -> Dict[str, List[Dict]]:
+    """{"rugs": [...], "success": [...]}"""
+    store = store or DatasetStore()
+    return {name: store.load(name) for name in DATASETS}
+
+
+def save_labeled(new_data: Dict[str, List[Dict]], store: Optional[DatasetStore] = None) -> Dict[str, List[Dict]]:
+    """
+    Append the "rugs" / "success" lists of a collector run
+
+    Returns:
+        The records actually added per dataset (already known mints are skipped)
+    """
+    store = store or DatasetStore()
+    return {name: store.append(name, new_data.get(name, [])) for name in DATASETS}
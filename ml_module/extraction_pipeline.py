@@ -0,0 +1,253 @@
+"""
+Extraction Pipeline - Concurrent feature extraction for training data collection
+A fixed pool of workers, each owning one TokenFeatureExtractor, pulls mints
+from a queue. Calls to each upstream are capped by shared per-provider
+semaphores, blocking analyzers run in a thread pool, and progress is
+checkpointed so an interrupted run resumes where it stopped.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scan_context import ScanContext
+from feature_costs import DEFAULT_REPORT_FILE, CostMeter, instrument_http
+from feature_extractor import TokenFeatureExtractor
+from feature_store import TRAINING, FeatureStore
+
+# Concurrent calls per upstream across all workers (override with EXTRACT_LIMIT_<NAME>)
+PROVIDER_LIMITS = {
+    "dexscreener": 8,
+    "pumpfun": 8,
+    "rpc": 16,
+}
+
+DEFAULT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "16"))
+DEFAULT_CHECKPOINT = Path(__file__).parent / "dataset" / "extraction_checkpoint.json"
+
+# Mints that failed this many times are skipped on resume
+MAX_ATTEMPTS = 3
+
+# Checkpoint after this many finished mints
+CHECKPOINT_EVERY = 25
+
+# Optional labelling hook: (mint, features) -> (label, reason) or None
+LabelFn = Callable[[str, Dict], Optional[Tuple[int, Optional[str]]]]
+
+
+@dataclass
+class PipelineStats:
+    """Outcome of one pipeline run"""
+    queued: int = 0
+    extracted: int = 0
+    failed: int = 0
+    skipped: int = 0
+    labeled: int = 0
+    elapsed: float = 0.0
+    labels: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def rate(self) -> float:
+        """Extracted tokens per minute"""
+        return self.extracted / self.elapsed * 60 if self.elapsed else 0.0
+
+
+class Checkpoint:
+    """Failed-attempt counts persisted between runs (successes live in the feature store)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.failures: Dict[str, int] = {}
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self.failures = json.load(f).get("failures", {})
+            except (OSError, ValueError) as e:
+                print(f"[PIPELINE] Ignoring unreadable checkpoint {self.path}: {e}")
+
+    def exhausted(self, mint: str) -> bool:
+        return self.failures.get(mint, 0) >= MAX_ATTEMPTS
+
+    def record(self, mint: str, ok: bool):
+        if ok:
+            self.failures.pop(mint, None)
+        else:
+            self.failures[mint] = self.failures.get(mint, 0) + 1
+
+    def save(self):
+        # Write-then-rename so an interrupted run never leaves a truncated file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"failures": self.failures, "updated_at": time.time()}, f)
+        os.replace(tmp, self.path)
+
+
+class ExtractionPipeline:
+    """Extracts features for many mints concurrently into a FeatureStore"""
+
+    def __init__(
+        self,
+        store: Optional[FeatureStore] = None,
+        workers: int = DEFAULT_WORKERS,
+        max_age: Optional[float] = None,
+        checkpoint_file: Optional[Path] = DEFAULT_CHECKPOINT,
+        cost_report_file: Optional[Path] = DEFAULT_REPORT_FILE
+    ):
+        """
+        Args:
+            store: Feature store to write to (and to check for existing snapshots)
+            workers: Mints extracted at the same time
+            max_age: Re-extract snapshots older than this many seconds (None = never)
+            checkpoint_file: Where failed attempts are recorded (None = no checkpoint)
+            cost_report_file: Where the per-feature-group cost report is written
+                              after each run (None = only printed)
+        """
+        self.store = store or FeatureStore()
+        self.workers = max(1, workers)
+        self.max_age = max_age
+        self.checkpoint = Checkpoint(checkpoint_file) if checkpoint_file else None
+        # Calls and time per feature group, summed over all workers and runs
+        self.costs = CostMeter()
+        self.cost_report_file = cost_report_file
+        # Thread pool of the current run (analyzer and label_fn calls)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def pending(self, mints: Iterable[str], need_labels: bool = False) -> Tuple[List[str], int]:
+        """Mints that still need extraction (or labelling), and how many were skipped"""
+        mints = list(dict.fromkeys(m for m in mints if m))
+        todo = set(self.store.missing_or_stale(mints, self.max_age))
+        if need_labels:
+            todo.update(self.store.unlabeled(mints))
+        todo = [m for m in mints if m in todo]
+        if self.checkpoint:
+            todo = [m for m in todo if not self.checkpoint.exhausted(m)]
+        return todo, len(mints) - len(todo)
+
+    async def run(self, mints: Iterable[str], label_fn: Optional[LabelFn] = None) -> PipelineStats:
+        """
+        Extract (and optionally label) every mint that is missing or stale
+
+        Args:
+            mints: Mint addresses to process
+            label_fn: Called in a worker thread with (mint, features); a returned
+                      (label, reason) is stored with the snapshot, None counts
+                      as a failed attempt. Stored but unlabeled mints are queued
+                      again for labelling only
+
+        Returns:
+            PipelineStats
+        """
+        todo, skipped = self.pending(mints, need_labels=label_fn is not None)
+        stats = PipelineStats(queued=len(todo), skipped=skipped)
+        if not todo:
+            return stats
+
+        # Per-group HTTP call counts in the cost report
+        instrument_http()
+
+        # Each worker can have one call per analyzer in flight. The pool belongs
+        # to this run (not the event loop) and is shut down when it ends
+        self._pool = ThreadPoolExecutor(max_workers=self.workers * 5, thread_name_prefix="extract")
+
+        limits = {
+            name: asyncio.Semaphore(int(os.getenv(f"EXTRACT_LIMIT_{name.upper()}", limit)))
+            for name, limit in PROVIDER_LIMITS.items()
+        }
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for mint in todo:
+            queue.put_nowait(mint)
+
+        started = time.monotonic()
+        done = 0
+
+        async def worker():
+            nonlocal done
+            extractor = TokenFeatureExtractor(limits=limits, costs=self.costs, executor=self._pool)
+            try:
+                while True:
+                    try:
+                        mint = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+
+                    ok = await self._process(extractor, mint, label_fn, stats)
+                    if self.checkpoint:
+                        self.checkpoint.record(mint, ok)
+
+                    done += 1
+                    if done % CHECKPOINT_EVERY == 0 or done == len(todo):
+                        if self.checkpoint:
+                            self.checkpoint.save()
+                        stats.elapsed = time.monotonic() - started
+                        print(f"[PIPELINE] {done}/{len(todo)} done, {stats.extracted} extracted, "
+                              f"{stats.failed} failed ({stats.rate:.0f}/min)")
+            finally:
+                await extractor.close()
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.workers, len(todo)))))
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            if self.checkpoint:
+                self.checkpoint.save()
+            stats.elapsed = time.monotonic() - started
+            self._report_costs()
+
+        return stats
+
+    def _report_costs(self):
+        """Print the feature cost report and save it"""
+        if not self.costs.tokens:
+            return
+        print(f"[PIPELINE] {self.costs.format_report()}")
+        if self.cost_report_file:
+            try:
+                self.costs.save(self.cost_report_file)
+            except OSError as e:
+                print(f"[PIPELINE] Could not save the cost report: {e}")
+
+    async def _process(self, extractor: TokenFeatureExtractor, mint: str,
+                       label_fn: Optional[LabelFn], stats: PipelineStats) -> bool:
+        """Extract, store and label one mint. Returns False on failure"""
+        # One context per mint so analyzers share pairs, holders and signatures
+        ctx = ScanContext(mint)
+        try:
+            # Queued only for labelling: reuse the stored training snapshot
+            features = self.store.get_latest(mint, self.max_age, source=TRAINING)
+            if features is None:
+                features = await extractor.extract_all_features(mint, ctx)
+                if not features:
+                    stats.failed += 1
+                    return False
+
+                self.store.put(mint, features)
+                stats.extracted += 1
+
+            if label_fn is not None:
+                labeled = await asyncio.get_running_loop().run_in_executor(self._pool, label_fn, mint, features)
+                if labeled is None:
+                    stats.failed += 1
+                    return False
+                label, reason = labeled
+                self.store.set_label(mint, label, reason)
+                stats.labeled += 1
+                stats.labels[label] = stats.labels.get(label, 0) + 1
+            return True
+
+        except Exception as e:
+            print(f"[PIPELINE] Error processing {mint[:8]}: {e}")
+            stats.failed += 1
+            return False
+        finally:
+            ctx.close()
@@ -0,0 +1,202 @@
+"""
+Feature Costs - Network calls and time spent per feature group
+TokenFeatureExtractor runs each analyzer inside CostMeter.track(group). Every
+HTTP request sent while a group is active is counted against it, whichever
+client sent it: the analyzers each create their own httpx clients, so the
+counting hooks into httpx (and requests, when installed) at send() level
+rather than on one client. That hook is process-wide, so it is only installed
+by an explicit instrument_http() call (the extraction pipeline makes it at the
+start of a run); until then a meter records times but no calls. Groups run
+concurrently, so their times overlap; the report also gives the wall time of
+a whole extraction.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from .models.feature_names import FAST_FEATURE_GROUPS, FEATURE_GROUPS
+except ImportError:
+    from models.feature_names import FAST_FEATURE_GROUPS, FEATURE_GROUPS
+
+DEFAULT_REPORT_FILE = Path(__file__).parent / "dataset" / "feature_costs.json"
+
+# Data shared by several groups (DexScreener pair, pump.fun coin, token data)
+BASE_GROUP = "base"
+
+# (meter, group) of the code running in this context. Copied into worker
+# threads by asyncio.to_thread and into tasks created by asyncio.gather
+_active: ContextVar[Optional[Tuple["CostMeter", str]]] = ContextVar("feature_cost_group", default=None)
+
+_instrumented = False
+_instrument_lock = threading.Lock()
+
+
+@dataclass
+class GroupCost:
+    """Accumulated cost of one feature group"""
+    runs: int = 0
+    calls: int = 0
+    seconds: float = 0.0
+    hosts: Dict[str, int] = field(default_factory=dict)
+
+
+class CostMeter:
+    """Thread-safe per-group counters, shared by any number of extractors"""
+
+    def __init__(self):
+        self.tokens = 0
+        self.seconds = 0.0  # Wall time of whole extractions
+        self.groups: Dict[str, GroupCost] = {}
+        self._lock = threading.Lock()
+
+    def _group(self, group: str) -> GroupCost:
+        cost = self.groups.get(group)
+        if cost is None:
+            cost = self.groups[group] = GroupCost()
+        return cost
+
+    @contextmanager
+    def track(self, group: str):
+        """Attribute the time and HTTP requests of the enclosed code to a group"""
+        token = _active.set((self, group))
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            _active.reset(token)
+            with self._lock:
+                cost = self._group(group)
+                cost.runs += 1
+                cost.seconds += elapsed
+
+    @contextmanager
+    def track_token(self):
+        """Count one extraction and its wall time"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.tokens += 1
+                self.seconds += time.perf_counter() - started
+
+    def record_call(self, group: str, host: str):
+        with self._lock:
+            cost = self._group(group)
+            cost.calls += 1
+            cost.hosts[host] = cost.hosts.get(host, 0) + 1
+
+    def report(self) -> Dict:
+        """Costs per extracted token, per group (feature groups first, in FEATURE_GROUPS order)"""
+        with self._lock:
+            tokens = max(self.tokens, 1)
+            groups = {}
+            for group in (BASE_GROUP, *FEATURE_GROUPS, *self.groups):
+                if group in groups:
+                    continue
+                cost = self.groups.get(group, GroupCost())
+                groups[group] = {
+                    "features": len(FEATURE_GROUPS.get(group, ())),
+                    "fast": group == BASE_GROUP or group in FAST_FEATURE_GROUPS,
+                    "calls_per_token": round(cost.calls / tokens, 3),
+                    "ms_per_token": round(cost.seconds / tokens * 1000, 1),
+                    "hosts": dict(sorted(cost.hosts.items(), key=lambda item: -item[1])),
+                }
+            return {
+                "tokens": self.tokens,
+                "ms_per_token": round(self.seconds / tokens * 1000, 1),
+                "calls_per_token": round(sum(c.calls for c in self.groups.values()) / tokens, 3),
+                "groups": groups,
+            }
+
+    def format_report(self) -> str:
+        """Plain text table of report()"""
+        report = self.report()
+        lines = [
+            f"Feature costs over {report['tokens']} tokens "
+            f"({report['ms_per_token']:.0f} ms, {report['calls_per_token']:.1f} calls per token)",
+            f"{'group':<12}{'features':>9}{'calls/token':>13}{'ms/token':>10}  fast  hosts",
+        ]
+        for group, cost in report["groups"].items():
+            hosts = ", ".join(f"{host} x{count}" for host, count in cost["hosts"].items())
+            lines.append(
+                f"{group:<12}{cost['features']:>9}{cost['calls_per_token']:>13.2f}"
+                f"{cost['ms_per_token']:>10.0f}  {'yes' if cost['fast'] else 'no':<4}  {hosts}"
+            )
+        return "\n".join(lines)
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Write report() as JSON (write-then-rename)"""
+        path = Path(path or DEFAULT_REPORT_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({**self.report(), "updated_at": time.time()}, f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+
+def _count_request(url):
+    active = _active.get()
+    if active is not None:
+        meter, group = active
+        meter.record_call(group, urlsplit(str(url)).hostname or "unknown")
+
+
+def instrument_http():
+    """
+    Count requests sent by httpx / requests clients against the active group
+
+    Patches the clients' send() for the whole process (idempotent); call it
+    from profiling entry points only, not from code every scan imports.
+    """
+    global _instrumented
+    with _instrument_lock:
+        if _instrumented:
+            return
+
+        import httpx
+
+        sync_send = httpx.Client.send
+        async_send = httpx.AsyncClient.send
+
+        @functools.wraps(sync_send)
+        def send(self, request, *args, **kwargs):
+            _count_request(request.url)
+            return sync_send(self, request, *args, **kwargs)
+
+        @functools.wraps(async_send)
+        async def send_async(self, request, *args, **kwargs):
+            _count_request(request.url)
+            return await async_send(self, request, *args, **kwargs)
+
+        httpx.Client.send = send
+        httpx.AsyncClient.send = send_async
+
+        try:
+            import requests
+        except ImportError:
+            requests = None
+
+        if requests is not None:
+            session_send = requests.Session.send
+
+            @functools.wraps(session_send)
+            def send_session(self, request, **kwargs):
+                _count_request(request.url)
+                return session_send(self, request, **kwargs)
+
+            requests.Session.send = send_session
+
+        _instrumented = True
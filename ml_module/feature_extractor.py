@@ -6,8 +6,12 @@ INTEGRATED WITH REAL ANALYZERS
 import json
 import httpx
 import asyncio
+import contextvars
+import functools
 import numpy as np
 import sys
+from concurrent.futures import Executor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
@@ -26,14 +30,43 @@ from volume_analyzer import VolumeAnalyzer
 from authority_checker import AuthorityChecker
 from onchain_analyzer import OnChainAnalyzer
 
+try:
+    from .feature_costs import BASE_GROUP, CostMeter
+except ImportError:
+    from feature_costs import BASE_GROUP, CostMeter
+
 console = Console()
 
 
 class TokenFeatureExtractor:
     """Extracts comprehensive features from token data using REAL analyzers"""
 
-    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com"):
+    def __init__(
+        self,
+        rpc_url: str = "https://api.mainnet-beta.solana.com",
+        limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+        fast: bool = False,
+        costs: Optional[CostMeter] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            rpc_url: Solana RPC endpoint
+            limits: Optional per-provider semaphores ("dexscreener", "pumpfun",
+                    "rpc") shared by several extractors to cap concurrent calls
+            fast: Skip the holder, sniper and authority analyzers, which need
+                  Solana RPC calls, and leave their features out (the other
+                  groups are FAST_FEATURE_GROUPS in models/feature_names.py)
+            costs: Meter recording calls and time per feature group (may be
+                   shared by several extractors; a new one by default)
+            executor: Thread pool for the blocking analyzer calls (default:
+                      the event loop's default executor)
+        """
         self.rpc_url = rpc_url
+        self.limits = limits or {}
+        self.fast = fast
+        self.costs = costs or CostMeter()
+        self.executor = executor
         self.client = httpx.AsyncClient(timeout=30.0)
 
         # Initialize real analyzers
@@ -45,79 +78,85 @@ class TokenFeatureExtractor:
         self.authority_checker = AuthorityChecker()
         self.onchain_analyzer = OnChainAnalyzer()
 
-    async def extract_all_features(self, token_mint: str) -> Optional[Dict]:
+    async def extract_all_features(self, token_mint: str, ctx=None) -> Optional[Dict]:
         """
         Extract all 75+ features from a token using REAL analyzers
 
         Args:
             token_mint: Token mint address
+            ctx: Optional ScanContext of a scan already running for this token,
+                 so pairs, holders and signatures are not fetched again
 
         Returns:
             Dictionary of features or None if failed
         """
+        with self.costs.track_token():
+            return await self._extract(token_mint, ctx)
+
+    async def _extract(self, token_mint: str, ctx) -> Optional[Dict]:
+        """extract_all_features() without the cost accounting of the whole token"""
         try:
             # Fetch basic data
-            dex_data = await self._fetch_dexscreener_data(token_mint)
+            if ctx is not None:
+                pairs = await self._timed(BASE_GROUP, self._run("dexscreener", ctx.pairs))
+                dex_data = pairs[0] if pairs else None
+            else:
+                dex_data = await self._timed(BASE_GROUP, self._fetch_dexscreener_data(token_mint))
             if not dex_data:
                 return None
 
-            pump_data = await self._fetch_pump_fun_data(token_mint)
-
-            # Get token data for analyzers
-            token_data = self.liquidity_analyzer.get_token_data(token_mint)
+            # Analyzers are blocking: they run in worker threads, independent ones concurrently
+            pump_data, token_data = await self._timed(BASE_GROUP, asyncio.gather(
+                self._fetch_pump_fun_data(token_mint),
+                self._run("dexscreener", self.liquidity_analyzer.get_token_data, token_mint, ctx)
+            ))
             if not token_data:
                 return None
 
-            # Run REAL analyzers
-            liquidity_analysis = self.liquidity_analyzer.analyze_liquidity(token_mint)
-
-            # Onchain data (holders)
-            onchain_data = None
-            try:
-                onchain_data = self.onchain_analyzer.get_token_holders(token_mint)
-            except:
-                pass
-
-            # Sniper analysis
-            sniper_analysis = None
-            try:
-                token_creation_time = token_data.get("created_timestamp")
-                sniper_analysis = self.sniper_detector.analyze_snipers(token_mint, token_creation_time)
-            except:
-                pass
-
-            # Volume analysis
+            # Each analyzer is timed as its feature group; the RPC-heavy ones
+            # are skipped in fast mode
+            analyses = {
+                "liquidity": self._run("dexscreener", self.liquidity_analyzer.analyze_liquidity, token_mint, ctx),
+                "pump_dump": self._run_optional(
+                    None, self.pump_dump_detector.analyze_pump_dump, token_mint, token_data
+                ),
+            }
+            if not self.fast:
+                analyses.update({
+                    "holder": self._run_optional("rpc", self.onchain_analyzer.get_token_holders, token_mint, ctx),
+                    "sniper": self._run_optional(
+                        "rpc", self.sniper_detector.analyze_snipers,
+                        token_mint, token_data.get("created_timestamp"), ctx
+                    ),
+                    "authority": self._run_optional("rpc", self.authority_checker.check_authority, token_mint, ctx),
+                })
+            results = dict(zip(analyses, await asyncio.gather(
+                *(self._timed(group, analysis) for group, analysis in analyses.items())
+            )))
+            liquidity_analysis = results["liquidity"]
+
+            # Volume analysis (no network calls)
             volume_analysis = None
-            try:
-                liquidity = liquidity_analysis.liquidity_usd if liquidity_analysis else 0
-                volume_analysis = self.volume_analyzer.analyze_volume(token_data, liquidity)
-            except:
-                pass
-
-            # Pump & dump analysis
-            pump_dump_analysis = None
-            try:
-                pump_dump_analysis = self.pump_dump_detector.analyze_pump_dump(token_mint, token_data)
-            except:
-                pass
-
-            # Authority check
-            authority_analysis = None
-            try:
-                authority_analysis = self.authority_checker.check_authority(token_mint)
-            except:
-                pass
+            with self.costs.track("trading"):
+                try:
+                    liquidity = liquidity_analysis.liquidity_usd if liquidity_analysis else 0
+                    volume_analysis = self.volume_analyzer.analyze_volume(token_data, liquidity)
+                except:
+                    pass
 
             # Extract features from REAL analyses
             features = {}
 
-            features.update(self._extract_holder_features_real(onchain_data))
+            if not self.fast:
+                features.update(self._extract_holder_features_real(results["holder"]))
             features.update(self._extract_trading_features_real(volume_analysis, dex_data))
-            features.update(self._extract_sniper_features_real(sniper_analysis))
-            features.update(self._extract_pump_dump_features_real(pump_dump_analysis))
+            if not self.fast:
+                features.update(self._extract_sniper_features_real(results["sniper"]))
+                features.update(self._extract_authority_features_real(results["authority"]))
+            features.update(self._extract_pump_dump_features_real(results["pump_dump"]))
             features.update(self._extract_liquidity_features_real(liquidity_analysis))
-            features.update(self._extract_authority_features_real(authority_analysis))
-            features.update(self._extract_temporal_features(dex_data, pump_data))
+            with self.costs.track("temporal"):
+                features.update(self._extract_temporal_features(dex_data, pump_data))
 
             # Add metadata
             features["token_mint"] = token_mint
@@ -131,12 +170,40 @@ class TokenFeatureExtractor:
             traceback.print_exc()
             return None
 
+    async def _timed(self, group: str, awaitable):
+        """Await within the cost accounting of a feature group"""
+        with self.costs.track(group):
+            return await awaitable
+
+    def _limit(self, provider: Optional[str]):
+        """Concurrency limit for a provider (no limit when none is configured)"""
+        return self.limits.get(provider) or nullcontext()
+
+    async def _run(self, provider: Optional[str], fn, *args):
+        """Run a blocking analyzer call in a worker thread within the provider limit"""
+        async with self._limit(provider):
+            if self.executor is None:
+                return await asyncio.to_thread(fn, *args)
+            # Same as to_thread: the call sees the current feature cost group
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, functools.partial(context.run, fn, *args)
+            )
+
+    async def _run_optional(self, provider: Optional[str], fn, *args):
+        """Like _run, but a failing analyzer gives None (its features fall back to defaults)"""
+        try:
+            return await self._run(provider, fn, *args)
+        except Exception:
+            return None
+
     async def _fetch_dexscreener_data(self, token_mint: str) -> Optional[Dict]:
         """Fetch token data from DexScreener"""
         try:
-            response = await self.client.get(
-                f"https://api.dexscreener.com/latest/dex/tokens/{token_mint}"
-            )
+            async with self._limit("dexscreener"):
+                response = await self.client.get(
+                    f"https://api.dexscreener.com/latest/dex/tokens/{token_mint}"
+                )
             if response.status_code == 200:
                 data = response.json()
                 return data.get("pairs", [{}])[0] if data.get("pairs") else None
@@ -147,9 +214,10 @@ class TokenFeatureExtractor:
     async def _fetch_pump_fun_data(self, token_mint: str) -> Optional[Dict]:
         """Fetch token data from Pump.fun"""
         try:
-            response = await self.client.get(
-                f"https://frontend-api-v2.pump.fun/coins/{token_mint}"
-            )
+            async with self._limit("pumpfun"):
+                response = await self.client.get(
+                    f"https://frontend-api-v2.pump.fun/coins/{token_mint}"
+                )
             if response.status_code == 200:
                 return response.json()
             return None
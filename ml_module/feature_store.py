@@ -0,0 +1,437 @@
+"""
+Feature Store - Versioned SQLite store of extracted token features
+Rows are keyed by (mint, feature_version, snapshot_time) so training and
+TokenPredictor read the same snapshots, only missing or stale tokens are
+extracted again, and training can load a subset of columns.
+Each row records its source: the extraction pipeline and CSV imports write
+training snapshots, live scans write inference snapshots. Training reads
+training snapshots only (a rescan after the outcome must not replace the
+row a token was labeled with), and inference snapshots are pruned after
+INFERENCE_RETENTION.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .models.feature_names import FEATURE_NAMES
+except ImportError:
+    from models.feature_names import FEATURE_NAMES
+
+# Bump when TokenFeatureExtractor changes the meaning of existing features,
+# so old snapshots are neither used for inference nor mixed into training
+FEATURE_VERSION = 1
+
+DEFAULT_STORE_FILE = Path(__file__).parent / "dataset" / "features.db"
+
+# Snapshot sources
+TRAINING = "training"
+INFERENCE = "inference"
+
+# Inference snapshots older than this many seconds are deleted, at most once
+# per PRUNE_INTERVAL per process
+INFERENCE_RETENTION = int(os.getenv("FEATURE_STORE_INFERENCE_RETENTION", str(24 * 3600)))
+PRUNE_INTERVAL = 3600
+
+# Non-feature keys produced by the extractor / collectors
+METADATA_KEYS = {"label", "token_mint", "mint_address", "timestamp", "label_reason", "collected_at",
+                 "snapshot_time"}
+
+_COLUMN_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# feature_rows columns that are not features
+_KEY_COLUMNS = ("mint", "feature_version", "snapshot_time", "source")
+
+# SQLite limits the number of bound parameters per statement
+_IN_CHUNK = 500
+
+# New columns are added in model feature order, then by name, so the table
+# layout does not depend on dict / set iteration order
+_FEATURE_ORDER = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+
+def _is_number(value) -> bool:
+    if isinstance(value, bool):
+        return True
+    try:
+        float(value)
+        return not isinstance(value, str)
+    except (TypeError, ValueError):
+        return False
+
+
+class FeatureStore:
+    """Wide SQLite table of feature snapshots plus a label table"""
+
+    def __init__(self, db_file: Optional[str] = None):
+        self.db_file = str(db_file or os.getenv("FEATURE_STORE_FILE") or DEFAULT_STORE_FILE)
+        Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._columns: Optional[List[str]] = None
+        self._last_prune = 0.0
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS feature_rows (
+                mint TEXT NOT NULL,
+                feature_version INTEGER NOT NULL,
+                snapshot_time REAL NOT NULL,
+                source TEXT NOT NULL DEFAULT 'training',
+                PRIMARY KEY (mint, feature_version, snapshot_time)
+            )
+        """)
+        # Stores created before snapshot sources: existing rows count as training
+        columns = [r[1] for r in conn.execute("PRAGMA table_info(feature_rows)").fetchall()]
+        if "source" not in columns:
+            try:
+                conn.execute("ALTER TABLE feature_rows ADD COLUMN source TEXT NOT NULL DEFAULT 'training'")
+            except sqlite3.OperationalError:
+                pass  # Added by another process
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_feature_rows_source ON feature_rows (source, snapshot_time)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS labels (
+                mint TEXT PRIMARY KEY,
+                label INTEGER NOT NULL,
+                label_reason TEXT,
+                labeled_at TEXT
+            )
+        """)
+        conn.commit()
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def feature_columns(self) -> List[str]:
+        """Feature columns currently in the store"""
+        if self._columns is None:
+            rows = self._conn().execute("PRAGMA table_info(feature_rows)").fetchall()
+            self._columns = [r[1] for r in rows if r[1] not in _KEY_COLUMNS]
+        return self._columns
+
+    def _ensure_columns(self, names: Iterable[str]):
+        missing = sorted(
+            (n for n in set(names) if n not in self.feature_columns()),
+            key=lambda n: (_FEATURE_ORDER.get(n, len(_FEATURE_ORDER)), n)
+        )
+        if not missing:
+            return
+        with self._schema_lock:
+            conn = self._conn()
+            for name in missing:
+                try:
+                    conn.execute(f'ALTER TABLE feature_rows ADD COLUMN "{name}" REAL')
+                except sqlite3.OperationalError:
+                    pass  # Added by another thread or process
+            conn.commit()
+            self._columns = None
+
+    @staticmethod
+    def _numeric_features(features: Dict) -> Dict[str, float]:
+        return {
+            k: float(v) for k, v in features.items()
+            if k not in METADATA_KEYS and _COLUMN_RE.match(k) and _is_number(v)
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(self, mint: str, features: Dict, snapshot_time: Optional[float] = None,
+            version: int = FEATURE_VERSION, source: str = TRAINING):
+        """Store one feature snapshot (metadata and non-numeric keys are skipped)"""
+        self.put_many([(mint, features)], snapshot_time, version, source)
+
+    def put_many(self, rows: Sequence[Tuple[str, Dict]], snapshot_time: Optional[float] = None,
+                 version: int = FEATURE_VERSION, source: str = TRAINING):
+        """Store several snapshots in one transaction (source: TRAINING or INFERENCE)"""
+        snapshot_time = snapshot_time or time.time()
+        prepared = [(mint, self._numeric_features(features)) for mint, features in rows if features]
+        if not prepared:
+            return
+
+        self._ensure_columns({k for _, values in prepared for k in values})
+
+        conn = self._conn()
+        for mint, values in prepared:
+            names = list(values)
+            columns = ", ".join(f'"{n}"' for n in names)
+            placeholders = ", ".join("?" for _ in names)
+            conn.execute(
+                f"INSERT OR REPLACE INTO feature_rows (mint, feature_version, snapshot_time, source"
+                f"{', ' + columns if names else ''}) VALUES (?, ?, ?, ?{', ' + placeholders if names else ''})",
+                [mint, version, snapshot_time, source, *values.values()]
+            )
+        conn.commit()
+
+        if source == INFERENCE and time.time() - self._last_prune >= PRUNE_INTERVAL:
+            self._last_prune = time.time()
+            self.prune_inference()
+
+    def prune_inference(self, retention: int = INFERENCE_RETENTION) -> int:
+        """Delete inference snapshots older than retention seconds, returns the number deleted"""
+        conn = self._conn()
+        deleted = conn.execute(
+            "DELETE FROM feature_rows WHERE source = ? AND snapshot_time < ?",
+            (INFERENCE, time.time() - retention)
+        ).rowcount
+        conn.commit()
+        return deleted
+
+    def set_label(self, mint: str, label: int, reason: Optional[str] = None):
+        """Label a token for training (replaces any previous label)"""
+        self.set_labels([(mint, label, reason)])
+
+    def set_labels(self, labels: Sequence[Tuple[str, int, Optional[str]]]):
+        conn = self._conn()
+        now = datetime.now().isoformat()
+        conn.executemany(
+            "INSERT OR REPLACE INTO labels (mint, label, label_reason, labeled_at) VALUES (?, ?, ?, ?)",
+            [(mint, int(label), reason, now) for mint, label, reason in labels]
+        )
+        conn.commit()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_latest(self, mint: str, max_age: Optional[float] = None,
+                   version: int = FEATURE_VERSION, source: Optional[str] = None) -> Optional[Dict]:
+        """
+        Latest snapshot of a token as a features dict
+
+        Args:
+            mint: Token mint address
+            max_age: Ignore snapshots older than this many seconds
+            version: Feature version to read
+            source: Only snapshots from this source (None = training or inference)
+
+        Returns:
+            Features dict (with token_mint and snapshot_time) or None
+        """
+        return self.get_latest_many([mint], max_age, version, source).get(mint)
+
+    def get_latest_many(self, mints: Iterable[str], max_age: Optional[float] = None,
+                        version: int = FEATURE_VERSION, source: Optional[str] = None) -> Dict[str, Dict]:
+        """Latest snapshot of several tokens (same rules as get_latest), keyed by mint"""
+        mints = list(dict.fromkeys(m for m in mints if m))
+        sources = (source,) if source else (TRAINING, INFERENCE)
+        min_time = time.time() - max_age if max_age is not None else None
+        latest: Dict[str, Dict] = {}
+        conn = self._conn()
+
+        for i in range(0, len(mints), _IN_CHUNK):
+            chunk = mints[i:i + _IN_CHUNK]
+            cursor = conn.execute(
+                f"""
+                SELECT f.* FROM feature_rows f
+                JOIN (
+                    SELECT mint, MAX(snapshot_time) AS snapshot_time FROM feature_rows
+                    WHERE feature_version = ? AND source IN ({', '.join('?' for _ in sources)})
+                    AND mint IN ({', '.join('?' for _ in chunk)})
+                    GROUP BY mint
+                ) m ON m.mint = f.mint AND m.snapshot_time = f.snapshot_time
+                WHERE f.feature_version = ?
+                """,
+                [version, *sources, *chunk, version]
+            )
+            names = [d[0] for d in cursor.description]
+
+            for row in cursor.fetchall():
+                record = dict(zip(names, row))
+                if min_time is not None and record["snapshot_time"] < min_time:
+                    continue
+
+                features = {
+                    k: v for k, v in record.items()
+                    if k not in _KEY_COLUMNS and v is not None
+                }
+                features["token_mint"] = record["mint"]
+                features["snapshot_time"] = record["snapshot_time"]
+                latest[record["mint"]] = features
+
+        return latest
+
+    def missing_or_stale(self, mints: Iterable[str], max_age: Optional[float] = None,
+                         version: int = FEATURE_VERSION) -> List[str]:
+        """
+        Mints that need extraction: no training snapshot for this feature
+        version, or (when max_age is given) only ones older than max_age
+        seconds. Input order is preserved and duplicates are dropped.
+        """
+        mints = list(dict.fromkeys(m for m in mints if m))
+        latest: Dict[str, float] = {}
+        conn = self._conn()
+        for i in range(0, len(mints), _IN_CHUNK):
+            chunk = mints[i:i + _IN_CHUNK]
+            rows = conn.execute(
+                f"SELECT mint, MAX(snapshot_time) FROM feature_rows WHERE feature_version = ? "
+                f"AND source = ? AND mint IN ({', '.join('?' for _ in chunk)}) GROUP BY mint",
+                [version, TRAINING, *chunk]
+            ).fetchall()
+            latest.update(rows)
+
+        now = time.time()
+        return [
+            m for m in mints
+            if m not in latest or (max_age is not None and now - latest[m] > max_age)
+        ]
+
+    def unlabeled(self, mints: Iterable[str]) -> List[str]:
+        """Mints without a label (input order preserved)"""
+        mints = list(dict.fromkeys(m for m in mints if m))
+        labeled = set()
+        conn = self._conn()
+        for i in range(0, len(mints), _IN_CHUNK):
+            chunk = mints[i:i + _IN_CHUNK]
+            rows = conn.execute(
+                f"SELECT mint FROM labels WHERE mint IN ({', '.join('?' for _ in chunk)})", chunk
+            ).fetchall()
+            labeled.update(r[0] for r in rows)
+        return [m for m in mints if m not in labeled]
+
+    def read_frame(self, columns: Optional[Sequence[str]] = None, labeled_only: bool = True,
+                   version: int = FEATURE_VERSION):
+        """
+        Latest training snapshot per token as a DataFrame (token_mint, features..., label)
+
+        Args:
+            columns: Feature columns to read (default: all). Unknown columns
+                     come back as NaN so the frame shape matches the request
+            labeled_only: Only tokens with a label
+            version: Feature version to read
+
+        Returns:
+            pandas DataFrame
+        """
+        import pandas as pd
+
+        available = self.feature_columns()
+        wanted = list(columns) if columns is not None else available
+        select = ", ".join(
+            f'f."{c}" AS "{c}"' if c in available else f'NULL AS "{c}"'
+            for c in wanted if _COLUMN_RE.match(c)
+        )
+
+        sql = f"""
+            SELECT f.mint AS token_mint{', ' + select if select else ''}, l.label AS label
+            FROM feature_rows f
+            JOIN (
+                SELECT mint, MAX(snapshot_time) AS snapshot_time
+                FROM feature_rows WHERE feature_version = ? AND source = ? GROUP BY mint
+            ) latest ON latest.mint = f.mint AND latest.snapshot_time = f.snapshot_time
+            {'JOIN' if labeled_only else 'LEFT JOIN'} labels l ON l.mint = f.mint
+            WHERE f.feature_version = ? AND f.source = ?
+            ORDER BY f.mint
+        """
+        df = pd.read_sql_query(sql, self._conn(), params=(version, TRAINING, version, TRAINING))
+        # Columns that are NULL for every row come back as object dtype
+        feature_cols = [c for c in df.columns if c not in ("token_mint", "label")]
+        df[feature_cols] = df[feature_cols].apply(pd.to_numeric)
+        return df
+
+    def count(self, version: int = FEATURE_VERSION) -> Tuple[int, int]:
+        """(tokens with a training snapshot, labeled tokens with a training snapshot)"""
+        conn = self._conn()
+        tokens = conn.execute(
+            "SELECT COUNT(DISTINCT mint) FROM feature_rows WHERE feature_version = ? AND source = ?",
+            (version, TRAINING)
+        ).fetchone()[0]
+        labeled = conn.execute(
+            "SELECT COUNT(DISTINCT f.mint) FROM feature_rows f JOIN labels l ON l.mint = f.mint "
+            "WHERE f.feature_version = ? AND f.source = ?", (version, TRAINING)
+        ).fetchone()[0]
+        return tokens, labeled
+
+    # ------------------------------------------------------------------
+    # CSV migration / export
+    # ------------------------------------------------------------------
+
+    def import_csv(self, csv_path, version: int = FEATURE_VERSION) -> int:
+        """
+        One-time import of a legacy features.csv (token_mint or mint_address
+        column, optional label / label_reason). Returns the number of rows imported
+        """
+        import pandas as pd
+
+        df = pd.read_csv(csv_path)
+
+        rows, labels = [], []
+        for record in df.to_dict("records"):
+            mint = next((m for m in (record.get("token_mint"), record.get("mint_address"))
+                         if isinstance(m, str) and m), None)
+            if mint is None:
+                continue
+
+            stamp = record.get("timestamp") or record.get("collected_at")
+            try:
+                snapshot_time = datetime.fromisoformat(str(stamp)).timestamp()
+            except ValueError:
+                snapshot_time = os.path.getmtime(csv_path)
+
+            features = {k: v for k, v in record.items() if not pd.isna(v)}
+            self.put(mint, features, snapshot_time, version)
+            rows.append(mint)
+
+            label = record.get("label")
+            if label is not None and not pd.isna(label):
+                reason = record.get("label_reason")
+                labels.append((mint, int(label), reason if isinstance(reason, str) else None))
+
+        if labels:
+            self.set_labels(labels)
+        return len(rows)
+
+    def export_csv(self, csv_path, columns: Optional[Sequence[str]] = None,
+                   version: int = FEATURE_VERSION) -> int:
+        """Write the labeled training frame to CSV for scripts that still read features.csv"""
+        df = self.read_frame(columns, labeled_only=True, version=version)
+        df.to_csv(csv_path, index=False)
+        return len(df)
+
+
+async def load_or_extract(extractor, mint: str, store: FeatureStore, max_age: Optional[float] = None,
+                          ctx=None) -> Optional[Dict]:
+    """
+    Stored snapshot if fresh enough, otherwise extract and store a new one
+    (as an inference snapshot, kept out of training)
+
+    Args:
+        extractor: TokenFeatureExtractor
+        mint: Token mint address
+        store: FeatureStore to read from / write to
+        max_age: Maximum snapshot age in seconds (None = any stored snapshot)
+        ctx: Optional ScanContext passed to the extractor
+
+    Returns:
+        Features dict or None if extraction failed
+    """
+    features = store.get_latest(mint, max_age)
+    if features is not None:
+        return features
+
+    features = await extractor.extract_all_features(mint, ctx)
+    if features:
+        try:
+            store.put(mint, features, source=INFERENCE)
+        except sqlite3.Error as e:
+            print(f"[FEATURES] Error storing features for {mint[:8]}: {e}")
+    return features
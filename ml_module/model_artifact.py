@@ -0,0 +1,253 @@
+"""
+Model Artifact - Compact, memory-mappable format for the trained classifier
+A trained RandomForest / GradientBoosting model and its StandardScaler are
+flattened into plain NumPy arrays (one .npy file each) plus a small JSON
+header. Loading needs neither pickle nor scikit-learn: the arrays are opened
+with mmap_mode="r", so loading takes milliseconds and every worker process
+shares the same pages through the OS page cache.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from .tree_engine import TreeEngine
+except ImportError:
+    from tree_engine import TreeEngine
+
+FORMAT_VERSION = 1
+
+# Directory suffix next to the pickle it was exported from
+ARTIFACT_SUFFIX = ".arrays"
+
+# Arrays stored in an artifact directory
+ARRAY_NAMES = (
+    "tree_offsets",  # (n_trees + 1,) first node of each tree
+    "children_left",  # (n_nodes,) global node index, -1 for leaves
+    "children_right",
+    "feature",  # (n_nodes,) feature index of the split
+    "threshold",  # (n_nodes,) go left when x <= threshold
+    "value",  # (n_nodes, n_values) leaf output
+    "tree_class",  # (n_trees,) class column a tree adds to (gradient boosting)
+    "scaler_mean",
+    "scaler_scale",
+)
+
+
+def artifact_path(pickle_path) -> Path:
+    """Artifact directory for a model pickle (models/x_latest.pkl -> models/x_latest.arrays)"""
+    pickle_path = Path(pickle_path)
+    return pickle_path.with_name(pickle_path.stem + ARTIFACT_SUFFIX)
+
+
+class ArrayScaler:
+    """StandardScaler.transform over stored mean / scale arrays"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
+class ModelArtifact:
+    """
+    Flattened tree ensemble with the predict_proba / classes_ interface used
+    by TokenPredictor
+    """
+
+    def __init__(self, meta: Dict, arrays: Dict[str, np.ndarray]):
+        self.meta = meta
+        self.kind = meta["kind"]
+        self.classes_ = np.array(meta["classes"])
+        self.n_features_in_ = meta["n_features"]
+        self.arrays = arrays
+        self.scaler = ArrayScaler(arrays["scaler_mean"], arrays["scaler_scale"])
+        self._engine: Optional[TreeEngine] = None
+        self._version: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, feature_names: Optional[List[str]] = None) -> "ModelArtifact":
+        """
+        Flatten a fitted RandomForestClassifier or GradientBoostingClassifier
+
+        feature_names (the training columns, in order) are stored in the meta
+        so predictors build their input matrix in the same order.
+        """
+        kind = type(model).__name__
+        n_classes = len(model.classes_)
+
+        if kind == "RandomForestClassifier":
+            trees = [(est.tree_, 0) for est in model.estimators_]
+            meta_extra = {}
+        elif kind == "GradientBoostingClassifier":
+            trees = [
+                (model.estimators_[stage, k].tree_, k)
+                for stage in range(model.estimators_.shape[0])
+                for k in range(model.estimators_.shape[1])
+            ]
+            # The initial estimator predicts a constant (class prior) raw score
+            init_raw = model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0]
+            meta_extra = {
+                "learning_rate": float(model.learning_rate),
+                "init_raw": [float(v) for v in init_raw],
+            }
+        else:
+            raise ValueError(f"Unsupported model type: {kind}")
+
+        offsets = [0]
+        left, right, feature, threshold, value, tree_class = [], [], [], [], [], []
+        for tree, k in trees:
+            offset = offsets[-1]
+            is_leaf = tree.children_left == -1
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+
+            if kind == "RandomForestClassifier":
+                # Class fractions per node (what DecisionTreeClassifier.predict_proba returns)
+                counts = tree.value[:, 0, :]
+                totals = counts.sum(axis=1, keepdims=True)
+                totals[totals == 0] = 1
+                value.append(counts / totals)
+            else:
+                value.append(tree.value[:, 0, :1])
+
+            tree_class.append(k)
+            offsets.append(offset + tree.node_count)
+
+        n_features = int(model.n_features_in_)
+        mean = getattr(scaler, "mean_", None) if getattr(scaler, "with_mean", True) else None
+        scale = getattr(scaler, "scale_", None) if getattr(scaler, "with_std", True) else None
+
+        arrays = {
+            "tree_offsets": np.array(offsets, dtype=np.int64),
+            "children_left": np.concatenate(left).astype(np.int64),
+            "children_right": np.concatenate(right).astype(np.int64),
+            "feature": np.concatenate(feature).astype(np.int64),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "value": np.concatenate(value).astype(np.float64),
+            "tree_class": np.array(tree_class, dtype=np.int64),
+            "scaler_mean": np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64),
+            "scaler_scale": np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64),
+        }
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "kind": kind,
+            "classes": model.classes_.tolist(),
+            "n_classes": n_classes,
+            "n_features": n_features,
+            "n_trees": len(trees),
+            **meta_extra,
+        }
+        if feature_names is not None:
+            if len(feature_names) != n_features:
+                raise ValueError(f"{len(feature_names)} feature names for a model with {n_features} features")
+            meta["feature_names"] = list(feature_names)
+        return cls(meta, arrays)
+
+    def save(self, directory):
+        """
+        Write the artifact, replacing an existing one
+
+        The arrays are written to a uniquely named directory next to the
+        target and renamed into place, so several processes (e.g. gunicorn
+        workers exporting the same pickles at startup) can save at once: a
+        process that loses the rename race keeps the winner's artifact.
+        """
+        directory = Path(directory)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=directory.name + ".", suffix=".tmp", dir=directory.parent))
+
+        try:
+            for name in ARRAY_NAMES:
+                np.save(tmp / f"{name}.npy", np.ascontiguousarray(self.arrays[name]))
+            with open(tmp / "meta.json", "w") as f:
+                json.dump(self.meta, f, indent=2)
+
+            old = directory.with_name(f"{directory.name}.{uuid.uuid4().hex}.old")
+            try:
+                os.replace(directory, old)
+            except FileNotFoundError:
+                pass  # First save, or another process moved it aside
+            try:
+                os.replace(tmp, directory)
+            except OSError:
+                # Another process renamed its artifact into place first
+                pass
+            shutil.rmtree(old, ignore_errors=True)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory, mmap: bool = True) -> "ModelArtifact":
+        """Open an artifact (arrays memory-mapped read-only by default)"""
+        directory = Path(directory)
+        with open(directory / "meta.json") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact format: {meta.get('format_version')}")
+
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in ARRAY_NAMES
+        }
+        return cls(meta, arrays)
+
+    @property
+    def version(self) -> str:
+        """Content hash of the model (same whether exported in memory or loaded from disk)"""
+        if self._version is None:
+            h = hashlib.blake2b(digest_size=8)
+            h.update(json.dumps(self.meta, sort_keys=True).encode())
+            for name in ARRAY_NAMES:
+                h.update(np.ascontiguousarray(self.arrays[name]).tobytes())
+            self._version = h.hexdigest()
+        return self._version
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+
+    @property
+    def engine(self) -> TreeEngine:
+        """Vectorized evaluator over the artifact arrays (compiled on first use)"""
+        if self._engine is None:
+            self._engine = TreeEngine(self.meta, self.arrays)
+        return self._engine
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities for already-scaled rows (same as the scikit-learn model)"""
+        return self.engine.predict_proba(X)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def export_artifact(model, scaler, pickle_path, feature_names: Optional[List[str]] = None) -> Optional[Path]:
+    """Export the artifact next to a model pickle. Returns its path, or None if unsupported"""
+    try:
+        artifact = ModelArtifact.from_sklearn(model, scaler, feature_names)
+    except ValueError as e:
+        print(f"[ML] Artifact not exported: {e}")
+        return None
+    path = artifact_path(pickle_path)
+    artifact.save(path)
+    return path
@@ -3,14 +3,19 @@ Model Trainer - Trains ML models to classify tokens as rug/safe/high-potential
 """
 
 import json
+import math
 import pickle
+import sys
+import time
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional, Sequence
 from datetime import datetime
 
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import train_test_split, HalvingRandomSearchCV
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.metrics import (
@@ -26,13 +31,65 @@ from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from feature_store import FeatureStore
+from model_artifact import export_artifact
+from models.feature_names import FAST_FEATURE_NAMES, FEATURE_NAMES
+from training_cache import (
+    STATE_FILE, SplitCache, TrainingState, dataset_hash, is_test_sample, row_digests, split_key
+)
+
 console = Console()
 
+MODEL_TYPES = ("random_forest", "gradient_boosting")
+
+# Feature columns per feature set, in model input order (the same lists
+# TokenPredictor builds its matrix from). "fast" models only use the features
+# extracted without RPC calls, for low-latency scoring with
+# TokenFeatureExtractor(fast=True); they are saved as <type>_fast_*.pkl with
+# their own scaler and training state
+FEATURE_SETS = {
+    "full": FEATURE_NAMES,
+    "fast": FAST_FEATURE_NAMES,
+}
+
+# Search spaces for hyperparameter tuning (successive halving over random candidates)
+RF_PARAM_SPACE = {
+    'max_depth': [10, 20, 30, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 'log2']
+}
+GB_PARAM_SPACE = {
+    'learning_rate': [0.03, 0.05, 0.1, 0.2],
+    'max_depth': [3, 4, 5, 6],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'subsample': [0.7, 0.85, 1.0]
+}
+SEARCH_CANDIDATES = 48
+
+# Incremental updates: trees refitted per update (at least MIN_NEW_TREES, and
+# in proportion to the share of new training samples)
+MIN_NEW_TREES = 20
+# Boosting stages can only be appended; past this many a full retrain is done
+MAX_BOOSTING_STAGES = 400
+
 
 class TokenClassifierTrainer:
     """Trains ML models to classify tokens"""
 
-    def __init__(self):
+    def __init__(self, feature_set: str = "full"):
+        """
+        Args:
+            feature_set: "full" or "fast" (see FEATURE_SETS)
+        """
+        if feature_set not in FEATURE_SETS:
+            raise ValueError(f"Unknown feature set: {feature_set}")
+        self.feature_set = feature_set
+        # Suffix of the model, scaler and state files of this feature set
+        self.suffix = "" if feature_set == "full" else f"_{feature_set}"
+        self.state_file = STATE_FILE.with_name(f"training_state{self.suffix}.pkl")
+
         self.dataset_dir = Path(__file__).parent / "dataset"
         self.models_dir = Path(__file__).parent / "models"
         self.models_dir.mkdir(exist_ok=True)
@@ -40,6 +97,8 @@ class TokenClassifierTrainer:
         self.model = None
         self.scaler = None
         self.feature_names = None
+        self.sample_ids = None
+        self.split_cache = SplitCache()
 
         # Label mapping
         self.label_map = {
@@ -49,32 +108,37 @@ class TokenClassifierTrainer:
         }
         self.inverse_label_map = {v: k for k, v in self.label_map.items()}
 
-    def load_training_data(self) -> Tuple[pd.DataFrame, np.ndarray]:
+    def load_training_data(self, columns: List[str] = None) -> Tuple[pd.DataFrame, np.ndarray]:
         """
-        Load and prepare training data from dataset files
+        Load and prepare training data from the feature store
+
+        Args:
+            columns: Feature columns to load (default: all stored features)
 
         Returns:
             (features_df, labels_array)
         """
         console.print("[cyan]Loading training data...")
 
-        features_csv = self.dataset_dir / "features.csv"
+        store = FeatureStore()
+        _, labeled = store.count()
 
-        if not features_csv.exists():
-            console.print(f"[red]Error: {features_csv} not found!")
-            console.print("[yellow]Please run feature extraction first.")
-            return None, None
+        # First run after the switch to the feature store: migrate features.csv
+        features_csv = self.dataset_dir / "features.csv"
+        if labeled == 0 and features_csv.exists():
+            imported = store.import_csv(features_csv)
+            console.print(f"[cyan]Imported {imported} rows from {features_csv.name} into the feature store")
 
-        # Load features
-        df = pd.read_csv(features_csv)
+        df = store.read_frame(columns)
 
-        # Separate features and labels
-        if "label" not in df.columns:
-            console.print("[red]Error: 'label' column not found in dataset!")
+        if df.empty:
+            console.print(f"[red]Error: no labeled features in {store.db_file}!")
+            console.print("[yellow]Please run feature extraction first.")
             return None, None
 
-        X = df.drop(columns=["label", "token_mint", "timestamp"], errors="ignore")
+        X = df.drop(columns=["label", "token_mint"], errors="ignore").fillna(0)
         y = df["label"].values
+        self.sample_ids = df["token_mint"].tolist()
 
         console.print(f"[green]Loaded {len(df)} samples with {len(X.columns)} features")
 
@@ -101,36 +165,70 @@ class TokenClassifierTrainer:
         X: pd.DataFrame,
         y: np.ndarray,
         test_size: float = 0.2,
-        balance_classes: bool = True
+        balance_classes: bool = True,
+        ids: Optional[Sequence[str]] = None,
+        scaler: Optional[StandardScaler] = None
     ) -> Tuple:
         """
         Preprocess data: split, scale, balance
 
+        The result is cached under a hash of the dataset and these settings,
+        so an unchanged dataset is not split, scaled or balanced again.
+
         Args:
             X: Features dataframe
             y: Labels array
             test_size: Test set proportion
             balance_classes: Whether to use SMOTE for class balancing
+            ids: Mint of each sample. When given, the split is derived from the
+                 mint so samples keep their side as the dataset grows
+                 (otherwise a stratified random split is used)
+            scaler: Already fitted scaler to reuse (default: fit a new one)
 
         Returns:
             (X_train, X_test, y_train, y_test, scaler)
         """
         console.print("[cyan]Preprocessing data...")
 
-        # Train-test split
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y,
-            test_size=test_size,
-            random_state=42,
-            stratify=y
-        )
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(X, columns=self.feature_names)
+
+        key = split_key(dataset_hash(X, y, ids), test_size, balance_classes, scaler)
+        split = self.split_cache.get(key)
+        if split is not None:
+            console.print(f"[green]Using cached split {key} "
+                          f"({len(split['X_train'])} train / {len(split['X_test'])} test samples)")
+        else:
+            split = self._split_and_scale(X, y, test_size, balance_classes, ids, scaler)
+            self.split_cache.put(key, split)
+
+        self.scaler = split["scaler"]
+
+        return split["X_train"], split["X_test"], split["y_train"], split["y_test"]
+
+    def _split_and_scale(self, X: pd.DataFrame, y: np.ndarray, test_size: float,
+                         balance_classes: bool, ids: Optional[Sequence[str]],
+                         scaler: Optional[StandardScaler]) -> Dict:
+        """Uncached preprocessing behind preprocess_data()"""
+        if ids is not None:
+            in_test = np.array([is_test_sample(mint, test_size) for mint in ids])
+            X_train, X_test = X[~in_test], X[in_test]
+            y_train, y_test = y[~in_test], y[in_test]
+        else:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y,
+                test_size=test_size,
+                random_state=42,
+                stratify=y
+            )
 
         console.print(f"[green]Train set: {len(X_train)} samples")
         console.print(f"[green]Test set: {len(X_test)} samples")
 
         # Feature scaling
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
+        if scaler is None:
+            scaler = StandardScaler().fit(X_train)
+        X_train_scaled = scaler.transform(X_train)
         X_test_scaled = scaler.transform(X_test)
 
         # Class balancing with SMOTE
@@ -140,15 +238,20 @@ class TokenClassifierTrainer:
             X_train_scaled, y_train = smote.fit_resample(X_train_scaled, y_train)
             console.print(f"[green]Balanced train set: {len(X_train_scaled)} samples")
 
-        self.scaler = scaler
-
-        return X_train_scaled, X_test_scaled, y_train, y_test
+        return {
+            "X_train": X_train_scaled,
+            "X_test": X_test_scaled,
+            "y_train": np.asarray(y_train),
+            "y_test": np.asarray(y_test),
+            "scaler": scaler,
+        }
 
     def train_random_forest(
         self,
         X_train: np.ndarray,
         y_train: np.ndarray,
-        tune_hyperparameters: bool = False
+        tune_hyperparameters: bool = False,
+        params: Optional[Dict] = None
     ) -> RandomForestClassifier:
         """
         Train Random Forest classifier
@@ -157,50 +260,50 @@ class TokenClassifierTrainer:
             X_train: Training features
             y_train: Training labels
             tune_hyperparameters: Whether to perform hyperparameter tuning
+            params: Parameters overriding the defaults (e.g. from an earlier tuning run)
 
         Returns:
             Trained model
         """
         console.print("[cyan]Training Random Forest model...")
 
+        # Default parameters
+        model = RandomForestClassifier(
+            n_estimators=200,
+            max_depth=20,
+            min_samples_split=5,
+            min_samples_leaf=2,
+            max_features='sqrt',
+            random_state=42,
+            n_jobs=-1
+        )
+        model.set_params(**(params or {}))
+
         if tune_hyperparameters:
             console.print("[yellow]Performing hyperparameter tuning...")
 
-            param_grid = {
-                'n_estimators': [100, 200, 300],
-                'max_depth': [10, 20, 30, None],
-                'min_samples_split': [2, 5, 10],
-                'min_samples_leaf': [1, 2, 4],
-                'max_features': ['sqrt', 'log2']
-            }
-
-            rf = RandomForestClassifier(random_state=42)
-            grid_search = GridSearchCV(
-                rf,
-                param_grid,
+            # Successive halving: many candidates on small forests, only the
+            # best ones are refitted with more trees
+            search = HalvingRandomSearchCV(
+                model,
+                RF_PARAM_SPACE,
+                n_candidates=SEARCH_CANDIDATES,
+                resource='n_estimators',
+                min_resources=25,
+                max_resources=model.n_estimators,
+                factor=2,
                 cv=5,
                 scoring='f1_weighted',
-                n_jobs=-1,
+                random_state=42,
                 verbose=1
             )
 
-            grid_search.fit(X_train, y_train)
-            model = grid_search.best_estimator_
+            search.fit(X_train, y_train)
+            model = search.best_estimator_
 
-            console.print(f"[green]Best parameters: {grid_search.best_params_}")
+            console.print(f"[green]Best parameters: {search.best_params_}")
 
         else:
-            # Default parameters
-            model = RandomForestClassifier(
-                n_estimators=200,
-                max_depth=20,
-                min_samples_split=5,
-                min_samples_leaf=2,
-                max_features='sqrt',
-                random_state=42,
-                n_jobs=-1
-            )
-
             model.fit(X_train, y_train)
 
         console.print("[green]Model trained successfully!")
@@ -210,7 +313,9 @@ class TokenClassifierTrainer:
     def train_gradient_boosting(
         self,
         X_train: np.ndarray,
-        y_train: np.ndarray
+        y_train: np.ndarray,
+        tune_hyperparameters: bool = False,
+        params: Optional[Dict] = None
     ) -> GradientBoostingClassifier:
         """
         Train Gradient Boosting classifier
@@ -218,6 +323,8 @@ class TokenClassifierTrainer:
         Args:
             X_train: Training features
             y_train: Training labels
+            tune_hyperparameters: Whether to perform hyperparameter tuning
+            params: Parameters overriding the defaults (e.g. from an earlier tuning run)
 
         Returns:
             Trained model
@@ -232,13 +339,80 @@ class TokenClassifierTrainer:
             min_samples_leaf=2,
             random_state=42
         )
+        model.set_params(**(params or {}))
 
-        model.fit(X_train, y_train)
+        if tune_hyperparameters:
+            console.print("[yellow]Performing hyperparameter tuning...")
+
+            # Successive halving over training samples
+            search = HalvingRandomSearchCV(
+                model,
+                GB_PARAM_SPACE,
+                n_candidates=SEARCH_CANDIDATES,
+                factor=2,
+                cv=5,
+                scoring='f1_weighted',
+                random_state=42,
+                verbose=1
+            )
+
+            search.fit(X_train, y_train)
+            model = search.best_estimator_
+
+            console.print(f"[green]Best parameters: {search.best_params_}")
+
+        else:
+            model.fit(X_train, y_train)
 
         console.print("[green]Model trained successfully!")
 
         return model
 
+    def can_grow(self, model, y_train: np.ndarray, new_trees: int) -> bool:
+        """Whether grow_model() can update this model for the given training labels"""
+        if not isinstance(model, (RandomForestClassifier, GradientBoostingClassifier)):
+            return False
+        if not np.array_equal(model.classes_, np.unique(y_train)):
+            return False
+        if isinstance(model, GradientBoostingClassifier):
+            return model.n_estimators + new_trees <= MAX_BOOSTING_STAGES
+        return True
+
+    def grow_model(self, model, X_train: np.ndarray, y_train: np.ndarray, new_trees: int):
+        """
+        Update a trained model with new samples using warm start
+
+        Random forests replace their oldest trees with new_trees trees fitted on
+        the current training set, so the forest keeps its size. Gradient
+        boosting appends new_trees boosting stages fitted on the current set.
+
+        Args:
+            model: Model from an earlier run (trained with the same scaler)
+            X_train: Current training features (old and new samples)
+            y_train: Current training labels
+            new_trees: Trees / stages to fit
+
+        Returns:
+            Updated model
+        """
+        if isinstance(model, RandomForestClassifier):
+            console.print(f"[cyan]Refitting {new_trees} of {model.n_estimators} Random Forest trees...")
+            size = model.n_estimators
+            model.estimators_ = model.estimators_[new_trees:]
+            # New seeds, so the refitted trees do not repeat the ones kept
+            seed = model.random_state if isinstance(model.random_state, int) else 0
+            model.set_params(warm_start=True, n_estimators=size, random_state=seed + len(y_train))
+        else:
+            console.print(f"[cyan]Adding {new_trees} Gradient Boosting stages...")
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + new_trees)
+
+        model.fit(X_train, y_train)
+        model.set_params(warm_start=False)
+
+        console.print("[green]Model updated successfully!")
+
+        return model
+
     def evaluate_model(
         self,
         model,
@@ -331,7 +505,7 @@ class TokenClassifierTrainer:
 
         console.print(table)
 
-    def save_model(self, model, scaler, metrics: Dict, model_name: str = "token_classifier"):
+    def save_model(self, model, scaler, metrics: Dict, model_name: str = "token_classifier") -> Tuple[str, str]:
         """
         Save trained model and scaler
 
@@ -340,11 +514,14 @@ class TokenClassifierTrainer:
             scaler: Fitted scaler
             metrics: Evaluation metrics
             model_name: Name for saved model
+
+        Returns:
+            (model file name, scaler file name) of the timestamped copies
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         model_file = self.models_dir / f"{model_name}_{timestamp}.pkl"
-        scaler_file = self.models_dir / f"scaler_{timestamp}.pkl"
-        metrics_file = self.models_dir / f"metrics_{timestamp}.json"
+        scaler_file = self.models_dir / f"scaler{self.suffix}_{timestamp}.pkl"
+        metrics_file = self.models_dir / f"metrics_{model_name}_{timestamp}.json"
 
         # Save model
         with open(model_file, "wb") as f:
@@ -363,19 +540,27 @@ class TokenClassifierTrainer:
 
         # Save also as "latest" for easy loading
         latest_model = self.models_dir / f"{model_name}_latest.pkl"
-        latest_scaler = self.models_dir / "scaler_latest.pkl"
+        latest_scaler = self.models_dir / f"scaler{self.suffix}_latest.pkl"
 
         with open(latest_model, "wb") as f:
             pickle.dump(model, f)
         with open(latest_scaler, "wb") as f:
             pickle.dump(scaler, f)
 
+        # Flat array artifact, loaded by TokenPredictor without unpickling
+        artifact_dir = export_artifact(model, scaler, latest_model, self.feature_names)
+
         console.print(f"[green]Also saved as latest versions")
+        if artifact_dir:
+            console.print(f"[green]Exported fast-loading artifact to {artifact_dir.name}")
+
+        return model_file.name, scaler_file.name
 
     def train_full_pipeline(
         self,
         model_type: str = "random_forest",
-        tune_hyperparameters: bool = False
+        tune_hyperparameters: bool = False,
+        incremental: bool = True
     ):
         """
         Complete training pipeline
@@ -383,45 +568,191 @@ class TokenClassifierTrainer:
         Args:
             model_type: "random_forest" or "gradient_boosting"
             tune_hyperparameters: Whether to tune hyperparameters
+            incremental: Update the last trained model with new samples when possible
         """
-        console.print("[bold cyan]=== ML Model Training Pipeline ===[/]\n")
+        return self.train_models((model_type,), tune_hyperparameters, incremental)
 
-        # Load data
-        X, y = self.load_training_data()
-        if X is None:
-            return
+    def train_models(
+        self,
+        model_types: Sequence[str] = MODEL_TYPES,
+        tune_hyperparameters: bool = False,
+        incremental: bool = True,
+        test_size: float = 0.2
+    ) -> Optional[Dict[str, Dict]]:
+        """
+        Train several model types at once, each in its own process
 
-        # Preprocess
-        X_train, X_test, y_train, y_test = self.preprocess_data(X, y)
+        When the previous run's models were trained on a subset of the current
+        samples (nothing relabeled, same features), they are updated with the
+        new samples via warm start instead of being retrained from scratch.
 
-        # Train model
-        if model_type == "random_forest":
-            model = self.train_random_forest(X_train, y_train, tune_hyperparameters)
-        elif model_type == "gradient_boosting":
-            model = self.train_gradient_boosting(X_train, y_train)
-        else:
-            console.print(f"[red]Unknown model type: {model_type}")
-            return
+        Args:
+            model_types: Models to train ("random_forest", "gradient_boosting")
+            tune_hyperparameters: Whether to tune hyperparameters (forces a full retrain)
+            incremental: Update the last trained models with new samples when possible
+            test_size: Test set proportion
 
-        # Evaluate
-        metrics = self.evaluate_model(model, X_test, y_test)
+        Returns:
+            Evaluation metrics per model type, or None if there is nothing to train on
+        """
+        console.print(f"[bold cyan]=== ML Model Training Pipeline ({self.feature_set} feature set) ===[/]\n")
 
-        # Save
-        self.save_model(model, self.scaler, metrics, model_name=model_type)
+        unknown = [t for t in model_types if t not in MODEL_TYPES]
+        if unknown:
+            console.print(f"[red]Unknown model type: {', '.join(unknown)}")
+            return None
 
-        console.print("\n[bold green]=== Training Complete! ===[/]")
+        started = time.perf_counter()
 
+        # Load data
+        X, y = self.load_training_data(FEATURE_SETS[self.feature_set])
+        if X is None:
+            return None
+
+        ids = self.sample_ids
+        digests = row_digests(X, y, ids)
+
+        # Decide between an incremental update and a full retrain
+        state = TrainingState.load(self.state_file)
+        new_ids = None
+        if state and incremental and not tune_hyperparameters:
+            new_ids = state.new_samples(self.feature_names, digests, test_size)
+            if new_ids is None:
+                console.print("[yellow]Dataset changed beyond new samples, retraining from scratch")
+
+        warm_models = {}
+        scaler = None
+        if new_ids is not None:
+            if not new_ids and all(t in state.model_files for t in model_types):
+                console.print("[green]No new labeled samples since the last training run, models are up to date")
+                return {}
+            try:
+                scaler = self._load_pickle(state.scaler_file)
+                warm_models = {t: self._load_pickle(state.model_files[t])
+                               for t in model_types if t in state.model_files}
+            except Exception as e:
+                console.print(f"[yellow]Could not load the previous models ({e}), retraining from scratch")
+                new_ids, scaler, warm_models = None, None, {}
+
+        # Preprocess (reuses the previous scaler so updated models stay consistent)
+        X_train, X_test, y_train, y_test = self.preprocess_data(
+            X, y, test_size=test_size, ids=ids, scaler=scaler
+        )
 
-def main():
-    """Main entry point for model training"""
+        new_train = sum(1 for mint in new_ids or [] if not is_test_sample(mint, test_size))
+        if new_ids is not None:
+            console.print(f"[cyan]{len(new_ids)} new samples ({new_train} in the train set)")
+
+        params = state.params if state else {}
+        jobs = []
+        for model_type in model_types:
+            warm = warm_models.get(model_type)
+            new_trees = 0
+            if warm is not None:
+                new_trees = min(warm.n_estimators, max(
+                    MIN_NEW_TREES, math.ceil(warm.n_estimators * new_train / max(len(ids), 1))
+                ))
+                if not new_train:
+                    new_trees = 0
+                elif not self.can_grow(warm, y_train, new_trees):
+                    console.print(f"[yellow]{model_type} cannot be updated incrementally, retraining")
+                    warm = None
+            jobs.append((model_type, X_train, y_train, tune_hyperparameters,
+                         params.get(model_type), warm, new_trees, self.feature_names))
+
+        results = self._run_jobs(jobs)
+
+        # Evaluate and save
+        all_metrics = {}
+        model_files = {}
+        new_params = {}
+        scaler_file = None
+        for model_type, (model, elapsed) in results.items():
+            console.print(f"\n[bold cyan]=== {model_type} ({elapsed:.1f}s) ===[/]")
+            metrics = self.evaluate_model(model, X_test, y_test)
+            model_files[model_type], scaler_file = self.save_model(
+                model, self.scaler, metrics, model_name=model_type + self.suffix
+            )
+            new_params[model_type] = self._tuned_params(model_type, model)
+            all_metrics[model_type] = metrics
+
+        # Models of other types are only kept if they share this run's scaler
+        if state and scaler is not None:
+            model_files = {**state.model_files, **model_files}
+            new_params = {**state.params, **new_params}
+        TrainingState(
+            feature_names=self.feature_names,
+            test_size=test_size,
+            digests=digests,
+            scaler_file=scaler_file,
+            model_files=model_files,
+            params=new_params,
+        ).save(self.state_file)
+
+        console.print(f"\n[bold green]=== Training Complete in {time.perf_counter() - started:.1f}s! ===[/]")
+
+        return all_metrics
+
+    def _run_jobs(self, jobs: List[Tuple]) -> Dict[str, Tuple]:
+        """Run training jobs, in parallel processes when there is more than one"""
+        if len(jobs) == 1:
+            model_type, *_ = jobs[0]
+            return {model_type: _fit_job(*jobs[0])}
+
+        console.print(f"[cyan]Training {len(jobs)} models in parallel...")
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = {job[0]: pool.submit(_fit_job, *job) for job in jobs}
+            return {model_type: future.result() for model_type, future in futures.items()}
+
+    def _load_pickle(self, file_name: str):
+        with open(self.models_dir / file_name, "rb") as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def _tuned_params(model_type: str, model) -> Dict:
+        """Hyperparameters worth carrying over to the next full retrain"""
+        space = RF_PARAM_SPACE if model_type == "random_forest" else GB_PARAM_SPACE
+        model_params = model.get_params()
+        return {name: model_params[name] for name in space}
+
+
+def _fit_job(model_type: str, X_train: np.ndarray, y_train: np.ndarray, tune_hyperparameters: bool,
+             params: Optional[Dict], warm_model, new_trees: int, feature_names: List[str]):
+    """
+    Train (or update) one model. Module-level so it can run in a worker process
+
+    Returns:
+        (model, seconds)
+    """
+    started = time.perf_counter()
     trainer = TokenClassifierTrainer()
+    trainer.feature_names = feature_names
+
+    if warm_model is not None:
+        model = warm_model
+        if new_trees:
+            model = trainer.grow_model(warm_model, X_train, y_train, new_trees)
+    elif model_type == "random_forest":
+        model = trainer.train_random_forest(X_train, y_train, tune_hyperparameters, params)
+    else:
+        model = trainer.train_gradient_boosting(X_train, y_train, tune_hyperparameters, params)
+
+    return model, time.perf_counter() - started
 
-    # Train Random Forest (default)
-    trainer.train_full_pipeline(
-        model_type="random_forest",
-        tune_hyperparameters=False  # Set to True for hyperparameter tuning
+
+def main(feature_set: str = "full"):
+    """Main entry point for model training"""
+    trainer = TokenClassifierTrainer(feature_set)
+
+    # Train Random Forest and Gradient Boosting side by side; after the first
+    # run only the samples labeled since then are added
+    trainer.train_models(
+        model_types=MODEL_TYPES,
+        tune_hyperparameters=False,  # Set to True for hyperparameter tuning
+        incremental=True  # Set to False to retrain from scratch
     )
 
 
 if __name__ == "__main__":
-    main()
+    # --fast: train the low-latency models on FAST_FEATURE_NAMES only
+    main("fast" if "--fast" in sys.argv[1:] else "full")
@@ -63,3 +63,25 @@ FEATURE_NAMES = [
     'activity_decay_rate',
     'survival_probability'
 ]
+
+# Feature groups, each filled from one analyzer (slices of FEATURE_NAMES)
+FEATURE_GROUPS = {
+    'holder': FEATURE_NAMES[0:15],
+    'trading': FEATURE_NAMES[15:27],
+    'sniper': FEATURE_NAMES[27:37],
+    'pump_dump': FEATURE_NAMES[37:45],
+    'liquidity': FEATURE_NAMES[45:52],
+    'authority': FEATURE_NAMES[52:56],
+    'temporal': FEATURE_NAMES[56:61],
+}
+
+# Groups computed from the DexScreener / pump.fun payloads fetched for every
+# token anyway. holder, sniper and authority need Solana RPC calls per token
+# (see feature_costs.py for measured costs)
+FAST_FEATURE_GROUPS = ('trading', 'pump_dump', 'liquidity', 'temporal')
+
+# Features of the fast groups, in FEATURE_NAMES order
+FAST_FEATURE_NAMES = [
+    name for name in FEATURE_NAMES
+    if any(name in FEATURE_GROUPS[group] for group in FAST_FEATURE_GROUPS)
+]
@@ -0,0 +1,268 @@
+"""
+Prediction Cache - LRU cache of ML predictions shared by all worker processes
+Entries are keyed by (model version, kind, hash of the quantized feature
+vector) in a small SQLite table, so a token scanned again with the same
+features is answered from the cache whichever gunicorn worker handles it.
+Hit / miss counters are kept per process and added to the shared table
+every few seconds, and the recency of an entry is only rewritten once it is
+a while old, so most lookups are read-only.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_CACHE_FILE = Path(__file__).parent / "dataset" / "prediction_cache.db"
+
+# Entries kept across all model versions (least recently used are evicted)
+DEFAULT_MAXSIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "50000"))
+
+# Significant digits kept when hashing feature values, so float noise in the
+# extracted features does not defeat the cache
+QUANT_DIGITS = 6
+
+# Eviction runs after this many inserted entries
+TRIM_EVERY = 500
+
+# A hit only rewrites the entry's last_used once it is this old (seconds),
+# which is fine grained enough for LRU eviction
+TOUCH_AFTER = int(os.getenv("PREDICTION_CACHE_TOUCH_AFTER", "300"))
+
+# Seconds between flushes of this process' hit / miss counts to the shared table
+COUNTER_FLUSH_INTERVAL = int(os.getenv("PREDICTION_CACHE_COUNTER_FLUSH", "30"))
+
+# SQLite limits the number of bound parameters per statement
+_IN_CHUNK = 500
+
+
+def quantize(matrix: np.ndarray, digits: int = QUANT_DIGITS) -> np.ndarray:
+    """Round every value to `digits` significant digits (NaN and inf are kept)"""
+    values = np.asarray(matrix, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = np.floor(np.log10(np.abs(values)))
+        exponent[~np.isfinite(exponent)] = 0
+        scale = 10.0 ** (digits - 1 - exponent)
+        # + 0.0 turns -0.0 into 0.0 so both hash the same
+        rounded = np.round(values * scale) / scale + 0.0
+    # One NaN bit pattern for every missing value
+    rounded[np.isnan(values)] = np.nan
+    return rounded
+
+
+def vector_digests(matrix: np.ndarray) -> List[str]:
+    """Hash of each quantized row"""
+    rows = np.ascontiguousarray(quantize(np.atleast_2d(matrix)))
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in rows]
+
+
+class PredictionCache:
+    """SQLite-backed LRU of JSON payloads"""
+
+    def __init__(self, db_file: Optional[str] = None, maxsize: int = DEFAULT_MAXSIZE):
+        self.db_file = str(db_file or os.getenv("PREDICTION_CACHE_FILE") or DEFAULT_CACHE_FILE)
+        Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+        self.hits = 0  # This process
+        self.misses = 0
+        self._inserted = 0
+        # Counts not yet added to the shared counters
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS predictions (
+                model_version TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model_version, kind, digest)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        conn.execute("INSERT OR IGNORE INTO cache_counters (name, value) VALUES ('hits', 0), ('misses', 0)")
+        conn.commit()
+
+    def get_many(self, model_version: str, kind: str, digests: Iterable[str]) -> Dict[str, object]:
+        """
+        Cached payloads for the given digests (missing ones are left out)
+
+        Found entries not marked as used in the last TOUCH_AFTER seconds are
+        marked as recently used. The hit / miss counters are updated for every
+        digest asked for (the shared ones every COUNTER_FLUSH_INTERVAL seconds).
+        """
+        digests = list(dict.fromkeys(digests))
+        if not digests:
+            return {}
+
+        found = {}
+        stale = []
+        now = time.time()
+        try:
+            conn = self._conn()
+            for i in range(0, len(digests), _IN_CHUNK):
+                chunk = digests[i:i + _IN_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT digest, payload, last_used FROM predictions "
+                    f"WHERE model_version = ? AND kind = ? AND digest IN ({placeholders})",
+                    (model_version, kind, *chunk)
+                ).fetchall()
+                for digest, payload, last_used in rows:
+                    found[digest] = json.loads(payload)
+                    if now - last_used >= TOUCH_AFTER:
+                        stale.append(digest)
+
+            if stale:
+                conn.executemany(
+                    "UPDATE predictions SET last_used = ? WHERE model_version = ? AND kind = ? AND digest = ?",
+                    [(now, model_version, kind, digest) for digest in stale]
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[ML CACHE] Lookup failed: {e}")
+            self._conn().rollback()
+            found = {}
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(digests) - len(found)
+            self._pending_hits += len(found)
+            self._pending_misses += len(digests) - len(found)
+            flush = time.monotonic() - self._last_flush >= COUNTER_FLUSH_INTERVAL
+        if flush:
+            self.flush_counters()
+        return found
+
+    def flush_counters(self):
+        """Add this process' pending hit / miss counts to the shared counters"""
+        with self._lock:
+            hits, misses = self._pending_hits, self._pending_misses
+            self._pending_hits = self._pending_misses = 0
+            self._last_flush = time.monotonic()
+        if not hits and not misses:
+            return
+        try:
+            conn = self._conn()
+            conn.executemany(
+                "UPDATE cache_counters SET value = value + ? WHERE name = ?",
+                [(hits, "hits"), (misses, "misses")]
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[ML CACHE] Counter flush failed: {e}")
+            self._conn().rollback()
+            # Kept for the next flush
+            with self._lock:
+                self._pending_hits += hits
+                self._pending_misses += misses
+
+    def get(self, model_version: str, kind: str, digest: str) -> Optional[object]:
+        return self.get_many(model_version, kind, [digest]).get(digest)
+
+    def put_many(self, model_version: str, kind: str, payloads: Dict[str, object]):
+        """Store payloads (JSON-serializable) under their digests"""
+        if not payloads:
+            return
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.executemany(
+                "INSERT OR REPLACE INTO predictions (model_version, kind, digest, payload, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(model_version, kind, digest, json.dumps(payload), now)
+                 for digest, payload in payloads.items()]
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[ML CACHE] Store failed: {e}")
+            self._conn().rollback()
+            return
+
+        with self._lock:
+            self._inserted += len(payloads)
+            trim = self._inserted >= TRIM_EVERY
+            if trim:
+                self._inserted = 0
+        if trim:
+            self.trim()
+
+    def put(self, model_version: str, kind: str, digest: str, payload: object):
+        self.put_many(model_version, kind, {digest: payload})
+
+    def trim(self):
+        """Evict the least recently used entries beyond maxsize"""
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT last_used FROM predictions ORDER BY last_used DESC LIMIT 1 OFFSET ?",
+                (self.maxsize,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM predictions WHERE last_used <= ?", (row[0],))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[ML CACHE] Trim failed: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Entry count and hit / miss counters (shared across processes, and for this one)
+
+        If the database can't be read, the entry count is None and the shared
+        counters fall back to this process' ones.
+        """
+        self.flush_counters()
+        try:
+            conn = self._conn()
+            entries = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            counters = dict(conn.execute("SELECT name, value FROM cache_counters").fetchall())
+        except sqlite3.Error as e:
+            print(f"[ML CACHE] Stats failed: {e}")
+            entries, counters = None, {"hits": self.hits, "misses": self.misses}
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "process_hits": self.hits,
+            "process_misses": self.misses,
+        }
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        conn = self._conn()
+        conn.execute("DELETE FROM predictions")
+        conn.execute("UPDATE cache_counters SET value = 0")
+        conn.commit()
+        with self._lock:
+            self.hits = self.misses = 0
+            self._pending_hits = self._pending_misses = 0
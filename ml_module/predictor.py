@@ -2,52 +2,115 @@
 ML Predictor - Uses trained model to predict rug/safe/high-potential for tokens
 """
 
+import hashlib
 import pickle
+import threading
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 import numpy as np
 from rich.console import Console
-from .models.feature_names import FEATURE_NAMES
+from .models.feature_names import FAST_FEATURE_NAMES, FEATURE_NAMES
+from .feature_store import FeatureStore
+from .model_artifact import ModelArtifact, artifact_path
+from .prediction_cache import PredictionCache, vector_digests
 
 console = Console()
 
+# Features reported as risk factors by explain_prediction (risky when high)
+RISK_INDICATORS = (
+    "fresh_wallet_percentage",
+    "top_1_concentration",
+    "wash_trading_score",
+    "creator_rug_rate",
+    "instant_sniper_count",
+    "bot_holder_percentage",
+    "volume_to_mcap_ratio",
+    "price_volatility_24h",
+)
+
+
+@dataclass
+class MLPrediction:
+    """Prediction for one token"""
+    predicted_class: str
+    confidence: float  # Probability of the predicted class (0-100)
+    probabilities: Dict[str, float]  # Class name -> probability (0-100)
+    ml_score: int  # 0-100: 0 = RUG, 100 = SUCCESS
+    risk_level: str  # DANGER / MODERATE / SAFE
+
+    @property
+    def details(self) -> Dict:
+        """Same layout as the details returned by predict_with_score"""
+        return {
+            "predicted_class": self.predicted_class,
+            "confidence": round(self.confidence, 2),
+            "probabilities": {k: round(v, 2) for k, v in self.probabilities.items()},
+            "ml_score": self.ml_score,
+            "risk_level": self.risk_level
+        }
+
 
 class TokenPredictor:
     """Predicts token classification using trained ML model"""
 
-    def __init__(self, model_path: Optional[str] = None, scaler_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, scaler_path: Optional[str] = None,
+                 cache: Optional[PredictionCache] = None, fast: bool = False):
         """
         Initialize predictor with trained model
 
         Args:
             model_path: Path to trained model pickle file (defaults to latest)
             scaler_path: Path to fitted scaler pickle file (defaults to latest)
+            cache: Prediction cache to read and fill (None = no caching)
+            fast: Use the model trained on FAST_FEATURE_NAMES only
+                  (model_trainer.py --fast), for features extracted with
+                  TokenFeatureExtractor(fast=True)
+
+        The flat array artifact next to the model pickle (see model_artifact)
+        is used when it is up to date; otherwise the pickles are loaded and
+        the artifact is exported for the next start.
         """
         self.models_dir = Path(__file__).parent / "models"
 
-        # Load model
-        if model_path is None:
-            model_path = self.models_dir / "random_forest_latest.pkl"
-        else:
-            model_path = Path(model_path)
-
-        if not model_path.exists():
-            raise FileNotFoundError(f"Model not found: {model_path}")
-
-        with open(model_path, "rb") as f:
-            self.model = pickle.load(f)
-
-        # Load scaler
-        if scaler_path is None:
-            scaler_path = self.models_dir / "scaler_latest.pkl"
+        suffix = "_fast" if fast else ""
+        model_path = Path(model_path) if model_path else self.models_dir / f"random_forest{suffix}_latest.pkl"
+        scaler_path = Path(scaler_path) if scaler_path else self.models_dir / f"scaler{suffix}_latest.pkl"
+        # Model input columns, in order
+        self.feature_names = FAST_FEATURE_NAMES if fast else FEATURE_NAMES
+        artifact_dir = artifact_path(model_path)
+
+        if self._artifact_is_current(artifact_dir, model_path, scaler_path):
+            # Flat arrays, memory-mapped: no unpickling, no scikit-learn import
+            self.model = ModelArtifact.load(artifact_dir)
+            self.scaler = self.model.scaler
+            source = artifact_dir.name
         else:
-            scaler_path = Path(scaler_path)
-
-        if not scaler_path.exists():
-            raise FileNotFoundError(f"Scaler not found: {scaler_path}")
-
-        with open(scaler_path, "rb") as f:
-            self.scaler = pickle.load(f)
+            self.model, self.scaler = self._load_pickles(model_path, scaler_path)
+            source = model_path.name
+
+            # Export the fast format so the next start skips the pickles, and
+            # predict through the vectorized tree engine right away
+            try:
+                artifact = ModelArtifact.from_sklearn(self.model, self.scaler)
+                artifact.save(artifact_dir)
+                self.model, self.scaler = artifact, artifact.scaler
+            except Exception as e:
+                console.print(f"[yellow]Could not export model artifact: {e}")
+
+        # Models exported by the trainer carry their training columns
+        trained_names = getattr(self.model, "meta", {}).get("feature_names")
+        if trained_names:
+            self.feature_names = list(trained_names)
+        n_features = getattr(self.model, "n_features_in_", len(self.feature_names))
+        if n_features != len(self.feature_names):
+            raise ValueError(
+                f"Model expects {n_features} features, {len(self.feature_names)} feature names are known"
+            )
+
+        # Cache entries of another model are never reused
+        self.cache = cache
+        self.model_version = self._model_version(model_path, scaler_path)
 
         # Label mapping - detect from model's classes
         model_classes = self.model.classes_
@@ -65,7 +128,40 @@ class TokenPredictor:
                 2: "HIGH_POTENTIAL"
             }
 
-        console.print(f"[green]ML Model loaded successfully from {model_path.name}")
+        console.print(f"[green]ML Model loaded successfully from {source}")
+
+    @staticmethod
+    def _artifact_is_current(artifact_dir: Path, model_path: Path, scaler_path: Path) -> bool:
+        """Artifact exists and is not older than the pickles it was exported from"""
+        meta = artifact_dir / "meta.json"
+        if not meta.exists():
+            return False
+        exported = meta.stat().st_mtime
+        return all(not p.exists() or p.stat().st_mtime <= exported for p in (model_path, scaler_path))
+
+    def _model_version(self, model_path: Path, scaler_path: Path) -> str:
+        """Identifier of the loaded model + scaler, used in prediction cache keys"""
+        if isinstance(self.model, ModelArtifact):
+            return self.model.version
+        h = hashlib.blake2b(digest_size=8)
+        for path in (model_path, scaler_path):
+            stat = path.stat()
+            h.update(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def _load_pickles(model_path: Path, scaler_path: Path):
+        """Load the scikit-learn model and scaler pickles"""
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model not found: {model_path}")
+        if not scaler_path.exists():
+            raise FileNotFoundError(f"Scaler not found: {scaler_path}")
+
+        with open(model_path, "rb") as f:
+            model = pickle.load(f)
+        with open(scaler_path, "rb") as f:
+            scaler = pickle.load(f)
+        return model, scaler
 
     def predict(self, features: Dict) -> Tuple[str, float, Dict[str, float]]:
         """
@@ -77,29 +173,8 @@ class TokenPredictor:
         Returns:
             (predicted_class, confidence, class_probabilities)
         """
-        # Convert features dict to array (must match training feature order)
-        feature_vector = self._prepare_feature_vector(features)
-
-        # Scale features
-        feature_vector_scaled = self.scaler.transform([feature_vector])
-
-        # Predict
-        prediction = self.model.predict(feature_vector_scaled)[0]
-        probabilities = self.model.predict_proba(feature_vector_scaled)[0]
-
-        # Get class name and confidence
-        predicted_class = self.label_map[prediction]
-        # Find index of predicted class in model.classes_
-        pred_idx = list(self.model.classes_).index(prediction)
-        confidence = probabilities[pred_idx] * 100
-
-        # Create probability dict using actual model classes
-        prob_dict = {
-            self.label_map[class_label]: prob * 100
-            for class_label, prob in zip(self.model.classes_, probabilities)
-        }
-
-        return predicted_class, confidence, prob_dict
+        prediction = self.predict_batch([features])[0]
+        return prediction.predicted_class, prediction.confidence, prediction.probabilities
 
     def predict_with_score(self, features: Dict) -> Tuple[str, int, Dict]:
         """
@@ -111,36 +186,146 @@ class TokenPredictor:
         Returns:
             (risk_level, ml_score, details)
         """
-        predicted_class, confidence, probabilities = self.predict(features)
+        prediction = self.predict_batch([features])[0]
+        return prediction.risk_level, prediction.ml_score, prediction.details
 
-        # Convert to 0-100 score
+    def predict_batch(self, features: Union[Sequence[Dict], np.ndarray, "pandas.DataFrame"]) -> List[MLPrediction]:
+        """
+        Predict many tokens with one scaler transform and one predict_proba call
+
+        Args:
+            features: List of feature dicts, a DataFrame with feature columns,
+                      or a 2D array whose columns follow self.feature_names
+
+        Returns:
+            One MLPrediction per row, in input order
+        """
+        matrix = self._prepare_feature_matrix(features)
+        if len(matrix) == 0:
+            return []
+
+        results: List[Optional[MLPrediction]] = [None] * len(matrix)
+        if self.cache is not None:
+            digests = vector_digests(matrix)
+            cached = self.cache.get_many(self.model_version, "prediction", digests)
+            for i, digest in enumerate(digests):
+                if digest in cached:
+                    results[i] = MLPrediction(**cached[digest])
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            for i, prediction in zip(missing, self._predict_matrix(matrix[missing])):
+                results[i] = prediction
+            if self.cache is not None:
+                self.cache.put_many(self.model_version, "prediction",
+                                    {digests[i]: asdict(results[i]) for i in missing})
+
+        return results
+
+    def _predict_matrix(self, matrix: np.ndarray) -> List[MLPrediction]:
+        """Run the model on a feature matrix (no caching)"""
+        probabilities = self.model.predict_proba(self.scaler.transform(matrix)) * 100
+        class_names = [self.label_map[c] for c in self.model.classes_]
+        predicted = probabilities.argmax(axis=1)
+
+        results = []
+        for row, idx in zip(probabilities, predicted):
+            prob_dict = dict(zip(class_names, row.tolist()))
+            predicted_class = class_names[idx]
+            ml_score = self._ml_score(predicted_class, prob_dict)
+            results.append(MLPrediction(
+                predicted_class=predicted_class,
+                confidence=float(row[idx]),
+                probabilities=prob_dict,
+                ml_score=ml_score,
+                risk_level=self._risk_level(ml_score)
+            ))
+
+        return results
+
+    @staticmethod
+    def _ml_score(predicted_class: str, probabilities: Dict[str, float]) -> int:
+        """Convert class probabilities to a 0-100 score"""
         # RUG = 0-30, SAFE = 30-70, HIGH_POTENTIAL/SUCCESS = 70-100
         if predicted_class == "RUG":
-            ml_score = int(30 * (1 - probabilities["RUG"] / 100))
-        elif predicted_class == "SAFE":
-            ml_score = int(30 + 40 * (probabilities.get("SAFE", 0) / 100))
-        else:  # HIGH_POTENTIAL or SUCCESS
-            # For binary model, SUCCESS means high potential
-            success_prob = probabilities.get("SUCCESS", probabilities.get("HIGH_POTENTIAL", 100))
-            ml_score = int(70 + 30 * (success_prob / 100))
-
-        # Determine risk level
+            return int(30 * (1 - probabilities["RUG"] / 100))
+        if predicted_class == "SAFE":
+            return int(30 + 40 * (probabilities.get("SAFE", 0) / 100))
+        # For binary model, SUCCESS means high potential
+        success_prob = probabilities.get("SUCCESS", probabilities.get("HIGH_POTENTIAL", 100))
+        return int(70 + 30 * (success_prob / 100))
+
+    @staticmethod
+    def _risk_level(ml_score: int) -> str:
         if ml_score >= 70:
-            risk_level = "SAFE"
-        elif ml_score >= 30:
-            risk_level = "MODERATE"
-        else:
-            risk_level = "DANGER"
-
-        details = {
-            "predicted_class": predicted_class,
-            "confidence": round(confidence, 2),
-            "probabilities": {k: round(v, 2) for k, v in probabilities.items()},
-            "ml_score": ml_score,
-            "risk_level": risk_level
-        }
+            return "SAFE"
+        if ml_score >= 30:
+            return "MODERATE"
+        return "DANGER"
+
+    def predict_stored(
+        self,
+        token_mint: str,
+        max_age: Optional[float] = None,
+        store: Optional[FeatureStore] = None
+    ) -> Optional[Tuple[str, int, Dict]]:
+        """
+        Predict from the latest feature snapshot in the feature store
+
+        Args:
+            token_mint: Token mint address
+            max_age: Ignore snapshots older than this many seconds
+            store: Feature store to read (defaults to the shared store file)
+
+        Returns:
+            (risk_level, ml_score, details) or None if no usable snapshot
+        """
+        prediction = self.predict_stored_batch([token_mint], max_age, store).get(token_mint)
+        if prediction is None:
+            return None
+        return prediction.risk_level, prediction.ml_score, prediction.details
+
+    def predict_stored_batch(
+        self,
+        token_mints: Iterable[str],
+        max_age: Optional[float] = None,
+        store: Optional[FeatureStore] = None
+    ) -> Dict[str, MLPrediction]:
+        """
+        Predict every token that has a usable snapshot in the feature store
+
+        Returns:
+            Mint -> MLPrediction (tokens without a snapshot are left out)
+        """
+        snapshots = (store or FeatureStore()).get_latest_many(token_mints, max_age)
+        mints = list(snapshots)
+        return dict(zip(mints, self.predict_batch([snapshots[m] for m in mints])))
+
+    def _prepare_feature_matrix(self, features) -> np.ndarray:
+        """
+        Feature matrix in self.feature_names column order (missing features are 0)
+
+        Args:
+            features: List of feature dicts, DataFrame or 2D array
+
+        Returns:
+            2D float array (n_tokens, n_features)
+        """
+        if hasattr(features, "reindex"):  # DataFrame
+            return features.reindex(columns=self.feature_names, fill_value=0).fillna(0).to_numpy(dtype=float)
 
-        return risk_level, ml_score, details
+        if isinstance(features, np.ndarray):
+            matrix = np.asarray(features, dtype=float)
+            if matrix.ndim != 2 or matrix.shape[1] != len(self.feature_names):
+                raise ValueError(f"Expected a (n, {len(self.feature_names)}) feature matrix, got {matrix.shape}")
+            return matrix
+
+        # Use explicit feature names from trained model (61 features, 32 fast)
+        # This ensures we only use the features the model was trained on
+        return np.array(
+            [[f.get(name, 0) for name in self.feature_names] for f in features],
+            dtype=float
+        ).reshape(-1, len(self.feature_names))
 
     def _prepare_feature_vector(self, features: Dict) -> np.ndarray:
         """
@@ -152,17 +337,7 @@ class TokenPredictor:
         Returns:
             Numpy array of feature values
         """
-        # Use explicit feature names from trained model (61 features)
-        # This ensures we only use the features the model was trained on
-        expected_features = FEATURE_NAMES
-
-        # Extract values in correct order
-        feature_vector = []
-        for feature_name in expected_features:
-            value = features.get(feature_name, 0)  # Default to 0 if missing
-            feature_vector.append(value)
-
-        return np.array(feature_vector)
+        return self._prepare_feature_matrix([features])[0]
 
     def explain_prediction(self, features: Dict) -> str:
         """
@@ -174,6 +349,15 @@ class TokenPredictor:
         Returns:
             Explanation string
         """
+        # Risk factors may include features the model does not use
+        digest = None
+        if self.cache is not None:
+            values = [[features.get(name, 0) for name in (*self.feature_names, *RISK_INDICATORS)]]
+            digest = vector_digests(np.array(values, dtype=float))[0]
+            cached = self.cache.get(self.model_version, "explanation", digest)
+            if cached is not None:
+                return cached
+
         risk_level, ml_score, details = self.predict_with_score(features)
 
         explanation = f"\n[bold cyan]=== ML Prediction ===[/]\n"
@@ -194,6 +378,9 @@ class TokenPredictor:
             for factor, value in risk_factors[:5]:
                 explanation += f"  - {factor}: {value}\n"
 
+        if digest is not None:
+            self.cache.put(self.model_version, "explanation", digest, explanation)
+
         return explanation
 
     def _get_top_risk_factors(self, features: Dict) -> list:
@@ -207,16 +394,7 @@ class TokenPredictor:
             List of (feature_name, value) tuples sorted by risk
         """
         # Features that indicate risk when high
-        risk_indicators = {
-            "fresh_wallet_percentage": features.get("fresh_wallet_percentage", 0),
-            "top_1_concentration": features.get("top_1_concentration", 0),
-            "wash_trading_score": features.get("wash_trading_score", 0),
-            "creator_rug_rate": features.get("creator_rug_rate", 0),
-            "instant_sniper_count": features.get("instant_sniper_count", 0),
-            "bot_holder_percentage": features.get("bot_holder_percentage", 0),
-            "volume_to_mcap_ratio": features.get("volume_to_mcap_ratio", 0),
-            "price_volatility_24h": features.get("price_volatility_24h", 0)
-        }
+        risk_indicators = {name: features.get(name, 0) for name in RISK_INDICATORS}
 
         # Sort by value (descending)
         sorted_factors = sorted(
@@ -228,6 +406,39 @@ class TokenPredictor:
         return sorted_factors
 
 
+# fast -> predictor (None once loading failed)
+_shared_predictors: Dict[bool, Optional[TokenPredictor]] = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_cache() -> Optional[PredictionCache]:
+    """Prediction cache shared by every process using the default cache file"""
+    try:
+        return PredictionCache()
+    except Exception as e:
+        console.print(f"[yellow]ML prediction cache disabled: {e}")
+        return None
+
+
+def get_predictor(fast: bool = False) -> Optional[TokenPredictor]:
+    """
+    Process-wide predictor, loaded on first use (None if no trained model is available)
+
+    Args:
+        fast: The predictor of the fast feature set model (see TokenPredictor)
+    """
+    if fast not in _shared_predictors:
+        with _shared_lock:
+            if fast not in _shared_predictors:
+                predictor = None
+                try:
+                    predictor = TokenPredictor(cache=_shared_cache(), fast=fast)
+                except Exception as e:
+                    console.print(f"[yellow]ML predictor unavailable: {e}")
+                _shared_predictors[fast] = predictor
+    return _shared_predictors[fast]
+
+
 def main():
     """Test predictor"""
     console.print("[cyan]Testing ML Predictor...\n")
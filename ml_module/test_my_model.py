@@ -4,12 +4,13 @@ Teste votre modèle entraîné sur quelques tokens
 """
 
 import asyncio
-import json
+from itertools import islice
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+from dataset_store import DatasetStore
 from predictor import TokenPredictor
 from feature_extractor import TokenFeatureExtractor
 
@@ -44,35 +45,19 @@ async def test_model():
         return
 
     # Charger quelques tokens de test
-    dataset_dir = Path(__file__).parent / "dataset"
-    rugs_file = dataset_dir / "rugs.json"
-    success_file = dataset_dir / "success.json"
+    store = DatasetStore()
 
     test_tokens = []
 
-    # Prendre 3 rugs
-    if rugs_file.exists():
-        with open(rugs_file) as f:
-            rugs = json.load(f)
-            for token in rugs[:3]:
-                if token.get("mint"):
-                    test_tokens.append({
-                        "mint": token["mint"],
-                        "name": token.get("name", "Unknown"),
-                        "expected": "RUG"
-                    })
-
-    # Prendre 3 succès
-    if success_file.exists():
-        with open(success_file) as f:
-            successes = json.load(f)
-            for token in successes[:3]:
-                if token.get("mint"):
-                    test_tokens.append({
-                        "mint": token["mint"],
-                        "name": token.get("name", "Unknown"),
-                        "expected": "HIGH_POTENTIAL"
-                    })
+    # Prendre 3 rugs et 3 succès
+    for name, expected in (("rugs", "RUG"), ("success", "HIGH_POTENTIAL")):
+        for token in islice(store.iter_records(name), 3):
+            if token.get("mint"):
+                test_tokens.append({
+                    "mint": token["mint"],
+                    "name": token.get("name", "Unknown"),
+                    "expected": expected
+                })
 
     if not test_tokens:
         console.print("[yellow]Aucun token de test trouvé")
@@ -80,17 +65,15 @@ async def test_model():
 
     console.print(f"[cyan]Test sur {len(test_tokens)} tokens...\n")
 
-    # Tester chaque token
+    # Extraire les features de chaque token
     extractor = TokenFeatureExtractor()
-    results = []
+    extracted = []
 
     for i, token in enumerate(test_tokens, 1):
         console.print(f"[cyan]--- Token {i}/{len(test_tokens)} : {token['name']} ---")
         console.print(f"[dim]Mint: {token['mint'][:16]}...")
-        console.print(f"[dim]Attendu: {token['expected']}")
 
         try:
-            # Extraire features
             console.print("[yellow]Extraction features...")
             features = await extractor.extract_all_features(token['mint'])
 
@@ -98,43 +81,51 @@ async def test_model():
                 console.print("[red][X] Échec extraction features\n")
                 continue
 
-            # Prédire
-            console.print("[yellow]Prédiction...")
-            risk_level, ml_score, details = predictor.predict_with_score(features)
-
-            # Afficher résultat
-            console.print(f"\n[bold]PRÉDICTION :")
-            console.print(f"  Score ML : [yellow]{ml_score}/100")
-            console.print(f"  Classe : [{'green' if details['predicted_class'] == token['expected'] else 'red'}]{details['predicted_class']}")
-            console.print(f"  Confiance : [yellow]{details['confidence']:.1f}%")
-
-            # Probabilités
-            console.print(f"\n  Probabilités :")
-            for classe, prob in details['probabilities'].items():
-                color = "green" if prob > 50 else "yellow" if prob > 20 else "dim"
-                bar = "█" * int(prob / 5)
-                console.print(f"    [{color}]{classe:15} {prob:5.1f}% {bar}")
-
-            # Résultat
-            correct = details['predicted_class'] == token['expected']
-            if correct:
-                console.print(f"\n[green][OK] CORRECT\n")
-            else:
-                console.print(f"\n[red][X] INCORRECT (attendu: {token['expected']})\n")
-
-            results.append({
-                "name": token['name'],
-                "expected": token['expected'],
-                "predicted": details['predicted_class'],
-                "confidence": details['confidence'],
-                "correct": correct
-            })
+            extracted.append((token, features))
 
         except Exception as e:
             console.print(f"[red][X] Erreur : {e}\n")
 
     await extractor.close()
 
+    # Prédire tous les tokens en un seul appel
+    console.print(f"\n[yellow]Prédiction de {len(extracted)} tokens...\n")
+    predictions = predictor.predict_batch([features for _, features in extracted])
+    results = []
+
+    for (token, _), prediction in zip(extracted, predictions):
+        details = prediction.details
+        console.print(f"[cyan]--- {token['name']} ---")
+        console.print(f"[dim]Attendu: {token['expected']}")
+
+        # Afficher résultat
+        console.print(f"\n[bold]PRÉDICTION :")
+        console.print(f"  Score ML : [yellow]{prediction.ml_score}/100")
+        console.print(f"  Classe : [{'green' if details['predicted_class'] == token['expected'] else 'red'}]{details['predicted_class']}")
+        console.print(f"  Confiance : [yellow]{details['confidence']:.1f}%")
+
+        # Probabilités
+        console.print(f"\n  Probabilités :")
+        for classe, prob in details['probabilities'].items():
+            color = "green" if prob > 50 else "yellow" if prob > 20 else "dim"
+            bar = "█" * int(prob / 5)
+            console.print(f"    [{color}]{classe:15} {prob:5.1f}% {bar}")
+
+        # Résultat
+        correct = details['predicted_class'] == token['expected']
+        if correct:
+            console.print(f"\n[green][OK] CORRECT\n")
+        else:
+            console.print(f"\n[red][X] INCORRECT (attendu: {token['expected']})\n")
+
+        results.append({
+            "name": token['name'],
+            "expected": token['expected'],
+            "predicted": details['predicted_class'],
+            "confidence": details['confidence'],
+            "correct": correct
+        })
+
     # Résumé
     if results:
         console.print("\n" + "="*60)
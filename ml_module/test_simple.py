@@ -4,8 +4,8 @@ Test rapide pour verifier que le modele fonctionne
 """
 
 import asyncio
-import json
 from pathlib import Path
+from dataset_store import load_labeled
 from predictor import TokenPredictor
 from feature_extractor import TokenFeatureExtractor
 
@@ -27,12 +27,8 @@ async def test_simple():
         return
 
     # Charger quelques tokens
-    dataset_dir = Path(__file__).parent / "dataset"
-
-    with open(dataset_dir / "rugs.json") as f:
-        rugs = json.load(f)
-    with open(dataset_dir / "success.json") as f:
-        successes = json.load(f)
+    labeled = load_labeled()
+    rugs, successes = labeled["rugs"], labeled["success"]
 
     # Prendre 2 rugs et 2 success
     test_tokens = [
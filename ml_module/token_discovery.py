@@ -0,0 +1,452 @@
+"""
+Token Discovery - Concurrent multi-source discovery for the dataset collectors
+Every source (DexScreener search queries, Pump.fun listing pages, a fixed list
+of mints) runs at the same time, each request paced by the shared per-upstream
+token buckets of rate_limit.py instead of fixed sleeps. Mints are deduplicated
+across sources as they stream in and handed to the labelling workers through a
+bounded queue, so discovery never runs far ahead of labelling. Candidates
+without market data are enriched in batches of up to 30 mints per DexScreener
+call.
+
+Run on its own it combines the collectors' sources in a single pass:
+    python ml_module/token_discovery.py [max_pumpfun_tokens]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rate_limit import get_bucket
+from dataset_store import DATASETS, DatasetStore, save_labeled
+
+DEXSCREENER_SEARCH_URL = "https://api.dexscreener.com/latest/dex/search"
+DEXSCREENER_TOKENS_URL = "https://api.dexscreener.com/latest/dex/tokens/{}"
+PUMPFUN_COINS_URL = "https://frontend-api-v2.pump.fun/coins"
+
+# Requests in flight per upstream (override with DISCOVERY_LIMIT_<NAME>); the
+# request rate itself comes from rate_limit.RATE_BUDGETS
+PROVIDER_LIMITS = {
+    "dexscreener": 4,
+    "pumpfun": 4,
+}
+
+# Candidates waiting for a labelling worker
+DEFAULT_QUEUE_SIZE = int(os.getenv("DISCOVERY_QUEUE_SIZE", "200"))
+DEFAULT_WORKERS = int(os.getenv("DISCOVERY_WORKERS", "4"))
+
+# Addresses per DexScreener /tokens call (API maximum)
+ENRICH_BATCH = 30
+
+# Attempts per request when the upstream answers 429 / 5xx
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class Candidate:
+    """A mint found by a source, with whatever data the source returned"""
+    mint: str
+    source: str
+    pair: Optional[Dict] = None   # DexScreener pair
+    token: Optional[Dict] = None  # Pump.fun coin
+
+
+# Labelling hook: candidate -> (dataset name, record) or None to skip it
+LabelFn = Callable[[Candidate], Optional[Tuple[str, Dict]]]
+
+
+@dataclass
+class DiscoveryStats:
+    """Outcome of one discovery run"""
+    discovered: int = 0
+    duplicates: int = 0
+    known: int = 0
+    no_market_data: int = 0
+    skipped: int = 0
+    requests: int = 0
+    elapsed: float = 0.0
+    by_source: Dict[str, int] = field(default_factory=dict)
+    labeled: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rate(self) -> float:
+        """Candidates processed per minute"""
+        return self.discovered / self.elapsed * 60 if self.elapsed else 0.0
+
+
+class Upstream:
+    """Paced HTTP access to one provider: token bucket + in-flight cap + 429 backoff"""
+
+    def __init__(self, name: str, client: httpx.AsyncClient, stats: DiscoveryStats):
+        self.name = name
+        self.client = client
+        self.stats = stats
+        self.bucket = get_bucket(name)
+        limit = int(os.getenv(f"DISCOVERY_LIMIT_{name.upper()}", PROVIDER_LIMITS.get(name, 4)))
+        self._slots = asyncio.Semaphore(limit)
+        self._paused_until = 0.0
+
+    async def get_json(self, url: str, params: Optional[Dict] = None):
+        """GET a JSON document, or None when the request keeps failing"""
+        for attempt in range(MAX_ATTEMPTS):
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            await self.bucket.acquire_async()
+
+            async with self._slots:
+                self.stats.requests += 1
+                try:
+                    response = await self.client.get(url, params=params)
+                except httpx.HTTPError as e:
+                    print(f"[DISCOVERY] {self.name} request failed: {e}")
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+
+            if response.status_code == 429 or response.status_code >= 500:
+                # Every request to this upstream waits out the backoff
+                try:
+                    delay = float(response.headers.get("Retry-After", 2 ** attempt))
+                except ValueError:
+                    delay = 2 ** attempt
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                continue
+            if response.status_code != 200:
+                print(f"[DISCOVERY] {self.name} returned {response.status_code} for {url}")
+                return None
+            try:
+                return response.json()
+            except ValueError:
+                return None
+
+        print(f"[DISCOVERY] {self.name} gave up on {url} after {MAX_ATTEMPTS} attempts")
+        return None
+
+
+# ----------------------------------------------------------------------
+# Sources
+# ----------------------------------------------------------------------
+
+class Source:
+    """Streams candidates; `provider` names the upstream whose budget it uses"""
+    name = "source"
+    provider = ""
+
+    def stream(self, upstream: Optional[Upstream]) -> AsyncIterator[Candidate]:
+        raise NotImplementedError
+
+
+class DexScreenerSearch(Source):
+    """Solana pairs returned by DexScreener search queries (all queries in flight at once)"""
+    provider = "dexscreener"
+
+    def __init__(self, queries: Sequence[str], dex_filter: Optional[str] = "pump",
+                 name: str = "dexscreener_search"):
+        """
+        Args:
+            queries: Search strings
+            dex_filter: Keep pairs whose dexId contains this (None = every Solana pair)
+            name: Label used in the stats
+        """
+        self.queries = list(dict.fromkeys(queries))
+        self.dex_filter = dex_filter
+        self.name = name
+
+    def _keep(self, pair: Dict) -> bool:
+        if pair.get("chainId") != "solana":
+            return False
+        return self.dex_filter is None or self.dex_filter in str(pair.get("dexId", "")).lower()
+
+    async def stream(self, upstream: Upstream) -> AsyncIterator[Candidate]:
+        pending = {asyncio.ensure_future(upstream.get_json(DEXSCREENER_SEARCH_URL, {"q": query}))
+                   for query in self.queries}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for search in done:
+                    for pair in (search.result() or {}).get("pairs") or []:
+                        mint = (pair.get("baseToken") or {}).get("address")
+                        if mint and self._keep(pair):
+                            yield Candidate(mint, self.name, pair=pair)
+        finally:
+            for search in pending:
+                search.cancel()
+
+
+class PumpFunListing(Source):
+    """Pump.fun coins, newest first; pages are fetched concurrently"""
+    name = "pumpfun"
+    provider = "pumpfun"
+
+    def __init__(self, max_tokens: int = 1000, batch_size: int = 50, extra_params: Optional[Dict] = None):
+        self.max_tokens = max_tokens
+        self.batch_size = batch_size
+        self.extra_params = extra_params or {}
+
+    async def _page(self, upstream: Upstream, offset: int) -> Tuple[int, List[Dict]]:
+        params = {"offset": offset, "limit": self.batch_size,
+                  "sort": "created_timestamp", "order": "DESC", **self.extra_params}
+        data = await upstream.get_json(PUMPFUN_COINS_URL, params)
+        return offset, data if isinstance(data, list) else []
+
+    async def stream(self, upstream: Upstream) -> AsyncIterator[Candidate]:
+        offsets = {asyncio.ensure_future(self._page(upstream, offset)): offset
+                   for offset in range(0, self.max_tokens, self.batch_size)}
+        pending = set(offsets)
+        end = self.max_tokens
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for page in done:
+                    offset, coins = page.result()
+                    if offset >= end:
+                        continue
+                    if not coins:
+                        # End of the listing: later pages are empty too
+                        end = offset
+                        continue
+                    for coin in coins[:end - offset]:
+                        if coin.get("mint"):
+                            yield Candidate(coin["mint"], self.name, token=coin)
+                # Drop requests for pages past the end
+                for page in [p for p in pending if offsets[p] >= end]:
+                    page.cancel()
+                    pending.discard(page)
+        finally:
+            for page in pending:
+                page.cancel()
+
+
+class MintList(Source):
+    """A fixed list of mint addresses (e.g. tokens to verify by hand)"""
+    name = "mint_list"
+
+    def __init__(self, mints: Iterable[str]):
+        self.mints = [m.strip() for m in mints if m and m.strip()]
+
+    async def stream(self, upstream: Optional[Upstream]) -> AsyncIterator[Candidate]:
+        for mint in self.mints:
+            yield Candidate(mint, self.name)
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+
+class DiscoveryEngine:
+    """Runs sources concurrently and labels the unique mints they find"""
+
+    def __init__(
+        self,
+        sources: Sequence[Source],
+        label_fn: LabelFn,
+        store: Optional[DatasetStore] = None,
+        enrich: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        """
+        Args:
+            sources: Where to look for mints
+            label_fn: Called once per unique mint; returns ("rugs" | "success", record) or None
+            store: Skip mints this dataset store already contains (None = label everything)
+            enrich: Fetch the DexScreener pair of candidates that have none before labelling
+                    (candidates without market data are then counted, not labelled)
+            client: HTTP client to reuse (one is created otherwise)
+            workers: Labelling workers
+            queue_size: Bound of the discovery -> labelling queue
+        """
+        self.sources = list(sources)
+        self.label_fn = label_fn
+        self.store = store
+        self.enrich = enrich
+        self.client = client
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+
+    async def run(self) -> Tuple[Dict[str, List[Dict]], DiscoveryStats]:
+        """
+        Returns:
+            ({"rugs": [...], "success": [...]}, DiscoveryStats)
+        """
+        stats = DiscoveryStats()
+        results: Dict[str, List[Dict]] = {name: [] for name in DATASETS}
+        own_client = self.client is None
+        client = self.client or httpx.AsyncClient(timeout=30.0)
+        upstreams: Dict[str, Upstream] = {}
+
+        def upstream(name: str) -> Upstream:
+            if name not in upstreams:
+                upstreams[name] = Upstream(name, client, stats)
+            return upstreams[name]
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        seen = set()
+        started = time.monotonic()
+
+        def sync_store():
+            for name in DATASETS:
+                self.store.sync(name)
+
+        def is_known(mint: str) -> bool:
+            # Read-only index lookups (the datasets are synced once per run)
+            return any(self.store.contains(name, [mint], sync=False) for name in DATASETS)
+
+        async def produce(source: Source):
+            try:
+                async for candidate in source.stream(upstream(source.provider) if source.provider else None):
+                    if candidate.mint in seen:
+                        stats.duplicates += 1
+                        continue
+                    seen.add(candidate.mint)
+                    if self.store is not None and await asyncio.to_thread(is_known, candidate.mint):
+                        stats.known += 1
+                        continue
+                    stats.discovered += 1
+                    stats.by_source[source.name] = stats.by_source.get(source.name, 0) + 1
+                    # Blocks while the labelling workers are behind
+                    await queue.put(candidate)
+            except Exception as e:
+                print(f"[DISCOVERY] Source {source.name} failed: {e}")
+
+        async def label(candidates: List[Candidate]):
+            if self.enrich:
+                await self._enrich(upstream("dexscreener"), [c for c in candidates if c.pair is None])
+            for candidate in candidates:
+                if self.enrich and candidate.pair is None:
+                    stats.no_market_data += 1
+                    continue
+                try:
+                    labeled = self.label_fn(candidate)
+                except Exception as e:
+                    print(f"[DISCOVERY] Error labelling {candidate.mint[:8]}: {e}")
+                    labeled = None
+                if labeled is None:
+                    stats.skipped += 1
+                    continue
+                name, record = labeled
+                results[name].append(record)
+                stats.labeled[name] = stats.labeled.get(name, 0) + 1
+
+        async def worker():
+            while True:
+                candidate = await queue.get()
+                if candidate is None:
+                    return
+                batch = [candidate]
+                # Drain what is already queued so one enrichment call covers several mints
+                while self.enrich and len(batch) < ENRICH_BATCH and not queue.empty():
+                    nxt = queue.get_nowait()
+                    if nxt is None:
+                        await label(batch)
+                        return
+                    batch.append(nxt)
+                await label(batch)
+
+        try:
+            if self.store is not None:
+                await asyncio.to_thread(sync_store)
+            workers = [asyncio.create_task(worker()) for _ in range(self.workers)]
+            await asyncio.gather(*(produce(source) for source in self.sources))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            stats.elapsed = time.monotonic() - started
+            if own_client:
+                await client.aclose()
+
+        print(f"[DISCOVERY] {stats.discovered} new mints ({stats.duplicates} duplicates, "
+              f"{stats.known} already in the dataset) from {stats.requests} requests "
+              f"in {stats.elapsed:.1f}s ({stats.rate:.0f}/min)")
+        return results, stats
+
+    async def _enrich(self, upstream: Upstream, candidates: List[Candidate]):
+        """Attach the first DexScreener pair of each mint (one call per ENRICH_BATCH mints)"""
+        for i in range(0, len(candidates), ENRICH_BATCH):
+            chunk = candidates[i:i + ENRICH_BATCH]
+            data = await upstream.get_json(DEXSCREENER_TOKENS_URL.format(",".join(c.mint for c in chunk)))
+            first_pair = {}
+            for pair in (data or {}).get("pairs") or []:
+                mint = (pair.get("baseToken") or {}).get("address")
+                if mint and mint not in first_pair:
+                    first_pair[mint] = pair
+            for candidate in chunk:
+                candidate.pair = first_pair.get(candidate.mint)
+
+
+async def discover(sources: Sequence[Source], label_fn: LabelFn, **kwargs) -> Tuple[Dict[str, List[Dict]], DiscoveryStats]:
+    """Shortcut for DiscoveryEngine(sources, label_fn, **kwargs).run()"""
+    return await DiscoveryEngine(sources, label_fn, **kwargs).run()
+
+
+# ----------------------------------------------------------------------
+# All collector sources in one run
+# ----------------------------------------------------------------------
+
+# Union of the search queries used by the individual collectors
+SEARCH_QUERIES = [
+    "pump", "pump.fun", "pumpswap", "pumpfun", "pump fun",
+    "sol pump", "solana pump", "pump token", "pump coin",
+]
+
+SUCCESS_MCAP_MIN = 500_000
+RUG_MCAP_MAX = 20_000
+
+
+def label_by_market_cap(candidate: Candidate) -> Optional[Tuple[str, Dict]]:
+    """Market cap rule of the v2 collectors: >= 500K success, <= 20K rug, grey zone skipped"""
+    pair = candidate.pair or {}
+    market_cap = float(pair.get("marketCap", 0) or 0)
+    if market_cap >= SUCCESS_MCAP_MIN:
+        classification = "SUCCESS"
+    elif 0 < market_cap <= RUG_MCAP_MAX:
+        classification = "RUG"
+    else:
+        return None
+
+    base_token = pair.get("baseToken") or {}
+    token = candidate.token or {}
+    created_at = pair.get("pairCreatedAt") or token.get("created_timestamp")
+    record = {
+        "mint": candidate.mint,
+        "name": base_token.get("name") or token.get("name", "Unknown"),
+        "symbol": base_token.get("symbol") or token.get("symbol", "???"),
+        "creator": token.get("creator"),
+        "market_cap": market_cap,
+        "price_change_24h": (pair.get("priceChange") or {}).get("h24", 0),
+        "liquidity": (pair.get("liquidity") or {}).get("usd", 0),
+        "age_hours": (time.time() - created_at / 1000) / 3600 if created_at else None,
+        "dex_url": pair.get("url", ""),
+        "dex_id": pair.get("dexId", ""),
+        "source": candidate.source,
+        "classification": classification,
+        "collected_at": datetime.now().isoformat()
+    }
+    return ("success" if classification == "SUCCESS" else "rugs"), record
+
+
+async def main(max_pumpfun_tokens: int = 1000):
+    """DexScreener search and the Pump.fun listing together, saved to the dataset store"""
+    store = DatasetStore()
+    results, stats = await discover(
+        [DexScreenerSearch(SEARCH_QUERIES), PumpFunListing(max_tokens=max_pumpfun_tokens)],
+        label_by_market_cap, store=store, enrich=True
+    )
+    added = save_labeled(results, store)
+    print(f"[DISCOVERY] Per source: {stats.by_source}")
+    print(f"[DISCOVERY] Saved {len(added['rugs'])} rugs and {len(added['success'])} successes "
+          f"({stats.skipped} in the grey zone, {stats.no_market_data} without market data)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -4,7 +4,6 @@ Utilise VOS données (rugs.json + success.json) pour entraîner le modèle ML
 """
 
 import asyncio
-import json
 import pandas as pd
 from pathlib import Path
 from rich.console import Console
@@ -12,6 +11,7 @@ from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.prompt import Confirm
 
+from dataset_store import DatasetStore, load_labeled
 from feature_extractor import TokenFeatureExtractor
 from model_trainer import TokenClassifierTrainer
 
@@ -23,8 +23,7 @@ class SimpleTrainer:
 
     def __init__(self):
         self.dataset_dir = Path(__file__).parent / "dataset"
-        self.rugs_file = self.dataset_dir / "rugs.json"
-        self.success_file = self.dataset_dir / "success.json"
+        self.store = DatasetStore(self.dataset_dir)
         self.features_file = self.dataset_dir / "features.csv"
 
     def check_files_exist(self) -> bool:
@@ -36,25 +35,14 @@ class SimpleTrainer:
 
         files_ok = True
 
-        # Vérifier rugs.json
-        if self.rugs_file.exists():
-            with open(self.rugs_file) as f:
-                rugs = json.load(f)
-            console.print(f"[green][OK] rugs.json trouvé : {len(rugs)} tokens")
-        else:
-            console.print(f"[red][X] rugs.json NON TROUVÉ")
-            console.print(f"[yellow]  Créez le fichier : {self.rugs_file}")
-            files_ok = False
-
-        # Vérifier success.json
-        if self.success_file.exists():
-            with open(self.success_file) as f:
-                successes = json.load(f)
-            console.print(f"[green][OK] success.json trouvé : {len(successes)} tokens")
-        else:
-            console.print(f"[red][X] success.json NON TROUVÉ")
-            console.print(f"[yellow]  Créez le fichier : {self.success_file}")
-            files_ok = False
+        # Vérifier rugs et success (rugs.jsonl, ou rugs.json écrit à la main)
+        for name in ("rugs", "success"):
+            if self.store.exists(name):
+                console.print(f"[green][OK] {name} trouvé : {self.store.count(name)} tokens")
+            else:
+                console.print(f"[red][X] {name}.json NON TROUVÉ")
+                console.print(f"[yellow]  Créez le fichier : {self.store.legacy_path(name)}")
+                files_ok = False
 
         if not files_ok:
             console.print("\n[red]ERREUR : Fichiers manquants![/]")
@@ -72,10 +60,8 @@ class SimpleTrainer:
         ))
 
         # Charger les données
-        with open(self.rugs_file) as f:
-            rugs = json.load(f)
-        with open(self.success_file) as f:
-            successes = json.load(f)
+        labeled = load_labeled(self.store)
+        rugs, successes = labeled["rugs"], labeled["success"]
 
         total_tokens = len(rugs) + len(successes)
         console.print(f"[cyan]Total à traiter : {total_tokens} tokens")
@@ -0,0 +1,141 @@
+"""
+Training Cache - Reusable preprocessing and incremental training state
+Preprocessed splits (scaled and SMOTE-balanced) are cached on disk under a
+hash of the dataset and the preprocessing settings, so an unchanged dataset is
+never split or balanced twice. TrainingState records which samples the saved
+models were trained on, so the trainer can grow them with newly labeled
+samples instead of starting from scratch.
+"""
+
+import hashlib
+import pickle
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SPLIT_CACHE_DIR = Path(__file__).parent / "dataset" / "cache"
+STATE_FILE = Path(__file__).parent / "models" / "training_state.pkl"
+
+# Cached splits kept on disk (oldest are removed first)
+MAX_CACHED_SPLITS = 5
+
+
+def dataset_hash(X: pd.DataFrame, y: np.ndarray, ids: Optional[Sequence[str]] = None) -> str:
+    """Content hash of a training set (feature names, values, labels and sample ids)"""
+    h = hashlib.sha1()
+    h.update("\0".join(map(str, X.columns)).encode())
+    h.update(np.ascontiguousarray(X.to_numpy(dtype=np.float64)).tobytes())
+    h.update(np.ascontiguousarray(np.asarray(y, dtype=np.int64)).tobytes())
+    if ids is not None:
+        h.update("\0".join(ids).encode())
+    return h.hexdigest()
+
+
+def row_digests(X: pd.DataFrame, y: np.ndarray, ids: Sequence[str]) -> Dict[str, int]:
+    """Per-sample digest of features + label, used to detect new and changed samples"""
+    frame = X.reset_index(drop=True).assign(__label=np.asarray(y))
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return {mint: int(digest) for mint, digest in zip(ids, hashes)}
+
+
+def is_test_sample(mint: str, test_size: float) -> bool:
+    """
+    Deterministic train/test assignment from the mint address, so a sample
+    stays on the same side of the split when new samples are added
+    """
+    bucket = int(hashlib.sha1(mint.encode()).hexdigest()[:8], 16) % 10000
+    return bucket < test_size * 10000
+
+
+def split_key(data_hash: str, test_size: float, balance_classes: bool, scaler=None) -> str:
+    """Cache key of a preprocessed split (a given scaler is part of the key)"""
+    h = hashlib.sha1(f"{data_hash}:{test_size}:{balance_classes}".encode())
+    if scaler is not None:
+        h.update(np.asarray(scaler.mean_, dtype=np.float64).tobytes())
+        h.update(np.asarray(scaler.scale_, dtype=np.float64).tobytes())
+    return h.hexdigest()[:16]
+
+
+class SplitCache:
+    """Preprocessed train/test splits on disk, keyed by split_key()"""
+
+    def __init__(self, cache_dir: Path = SPLIT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"split_{key}.pkl"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                split = pickle.load(f)
+            path.touch()
+            return split
+        except Exception as e:
+            print(f"[TRAIN] Ignoring unreadable split cache {path.name}: {e}")
+            return None
+
+    def put(self, key: str, split: Dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(key).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(split, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self._path(key))
+
+        cached = sorted(self.cache_dir.glob("split_*.pkl"), key=lambda p: p.stat().st_mtime)
+        for old in cached[:-MAX_CACHED_SPLITS]:
+            old.unlink(missing_ok=True)
+
+
+@dataclass
+class TrainingState:
+    """What the latest saved models were trained on"""
+    feature_names: List[str]
+    test_size: float
+    digests: Dict[str, int] = field(default_factory=dict)
+    scaler_file: Optional[str] = None
+    model_files: Dict[str, str] = field(default_factory=dict)
+    params: Dict[str, Dict] = field(default_factory=dict)
+
+    def new_samples(self, feature_names: List[str], digests: Dict[str, int],
+                    test_size: float) -> Optional[List[str]]:
+        """
+        Samples added since the last training run
+
+        Returns:
+            List of new mints (empty if nothing changed), or None when the
+            models cannot be updated incrementally (feature set or split
+            changed, or existing samples were relabeled or removed)
+        """
+        if feature_names != self.feature_names or test_size != self.test_size:
+            return None
+        for mint, digest in self.digests.items():
+            if digests.get(mint) != digest:
+                return None
+        return [mint for mint in digests if mint not in self.digests]
+
+    def save(self, path: Path = STATE_FILE):
+        path = Path(path)
+        tmp = path.with_suffix(".tmp")
+        # Stored as a plain dict so the file loads whichever way the module was imported
+        with open(tmp, "wb") as f:
+            pickle.dump(asdict(self), f)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = STATE_FILE) -> Optional["TrainingState"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                return cls(**pickle.load(f))
+        except Exception as e:
+            print(f"[TRAIN] Ignoring unreadable training state {path.name}: {e}")
+            return None
@@ -0,0 +1,181 @@
+"""
+Tree Engine - Vectorized inference for flattened tree ensembles
+Evaluates every tree of a RandomForest / GradientBoosting model for a whole
+batch at once: one gather per tree level over all (row, tree) pairs,
+instead of scikit-learn's per-estimator calls with input validation. Works on
+the arrays of a ModelArtifact (memory-mapped or in memory).
+
+Meant for live scoring (single scans, watchlist and creator batches): on one
+core it beats scikit-learn up to a few thousand rows (about 2x at 1,000,
+even near 5,000, 0.8x at 10,000; see bench_tree_engine.py). Offline scoring
+of larger batches is faster with the scikit-learn model itself.
+
+The node tables are recompiled at load so a level step is two gathers and a
+few integer operations:
+- nodes are renumbered level by level, so a right child directly follows
+  its left child (next node = left child + went right)
+- inputs are replaced by their rank among the split thresholds of their
+  feature, which gives the same comparisons as float32 input vs float64
+  threshold (as in scikit-learn)
+- threshold rank, left child and feature of a node are packed in one int64
+  (rank on top: code - (input rank << shift) is negative when going right)
+- leaves point to themselves, so steps past a leaf leave the pair there and
+  finished pairs are only dropped every few steps
+"""
+
+from typing import Dict
+
+import numpy as np
+
+# Rows evaluated per chunk (bounds the rows x trees working arrays; small
+# chunks keep them in cache)
+CHUNK_ROWS = 128
+
+# Level steps over every (row, tree) pair before finished pairs are first
+# dropped, then steps between later checks (a check costs about one step)
+FIRST_STEPS = 5
+STEPS_PER_CHECK = 2
+
+
+class TreeEngine:
+    """Compiled node tables of one tree ensemble"""
+
+    def __init__(self, meta: Dict, arrays: Dict[str, np.ndarray]):
+        self.kind = meta["kind"]
+        self.n_classes = meta["n_classes"]
+        self.n_features = meta["n_features"]
+        self.learning_rate = meta.get("learning_rate", 1.0)
+        self.init_raw = np.array(meta.get("init_raw", []), dtype=np.float64)
+
+        left = np.asarray(arrays["children_left"])
+        right = np.asarray(arrays["children_right"])
+        feature = np.asarray(arrays["feature"])
+        threshold = np.asarray(arrays["threshold"])
+        # Root of each tree in the artifact's node numbering
+        self.roots = np.asarray(arrays["tree_offsets"][:-1])
+        self.n_trees = len(self.roots)
+
+        # Level-by-level order with siblings adjacent: the roots (new ids
+        # 0..n_trees-1), then each level's children as (left, right) pairs
+        is_leaf = left == -1
+        levels = [self.roots]
+        frontier = self.roots
+        while len(frontier):
+            frontier = frontier[~is_leaf[frontier]]
+            frontier = np.column_stack([left[frontier], right[frontier]]).ravel()
+            levels.append(frontier)
+        # Artifact node id of each new id
+        self.node_ids = np.concatenate(levels)
+        new_ids = np.empty(len(self.node_ids), dtype=np.int64)
+        new_ids[self.node_ids] = np.arange(len(self.node_ids))
+
+        self.is_leaf = is_leaf[self.node_ids]
+        child = np.where(self.is_leaf, np.arange(len(self.node_ids)), new_ids[left[self.node_ids]])
+        feature = np.where(self.is_leaf, 0, feature[self.node_ids])
+        threshold = threshold[self.node_ids]
+        # (class, node): the leaf values of a chunk are gathered and summed per class row
+        self.value = np.ascontiguousarray(np.asarray(arrays["value"])[self.node_ids].T)
+
+        # Sorted split thresholds per feature, and each split's rank among them
+        self.thresholds = []
+        rank = np.empty(len(self.node_ids), dtype=np.int64)
+        for f in range(self.n_features):
+            split = ~self.is_leaf & (feature == f)
+            values = np.unique(threshold[split])
+            self.thresholds.append(values)
+            rank[split] = np.searchsorted(values, threshold[split])
+        # Above every input rank: a leaf always "goes left" to itself
+        rank[self.is_leaf] = max(len(v) for v in self.thresholds) + 1
+
+        self.feature_bits = max(1, (self.n_features - 1).bit_length())
+        child_bits = len(self.node_ids).bit_length()
+        self.rank_shift = self.feature_bits + child_bits
+        if self.rank_shift + int(rank.max()).bit_length() > 63:
+            raise ValueError(f"Too many nodes or thresholds to pack: {len(self.node_ids)} nodes")
+        self.feature_mask = (1 << self.feature_bits) - 1
+        self.child_mask = (1 << child_bits) - 1
+        self.code = (rank << self.rank_shift) | (child << self.feature_bits) | feature
+
+    def _ranks(self, X: np.ndarray) -> np.ndarray:
+        """Rank of each input among its feature's split thresholds (x <= t iff rank(x) <= rank(t))"""
+        # Trees compare float32 inputs against float64 thresholds (as in scikit-learn)
+        columns = np.asarray(X, dtype=np.float32).T.astype(np.float64)
+        ranks = np.empty(columns.shape, dtype=np.int64)
+        for f, values in enumerate(self.thresholds):
+            ranks[f] = np.searchsorted(values, columns[f])
+        return ranks.T
+
+    def _leaves(self, X: np.ndarray):
+        """(start row, leaf new ids per (row, tree)) for each chunk of rows"""
+        ranks = self._ranks(X)
+        for start in range(0, len(X), CHUNK_ROWS):
+            yield start, self._apply_chunk(ranks[start:start + CHUNK_ROWS])
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf node index per (row, tree), like the estimators' apply()"""
+        leaves = np.empty((len(X), self.n_trees), dtype=np.int64)
+        for start, chunk in self._leaves(X):
+            leaves[start:start + len(chunk)] = self.node_ids[chunk]
+        return leaves
+
+    def _apply_chunk(self, ranks: np.ndarray) -> np.ndarray:
+        """Walk all (row, tree) pairs of a chunk down one level per step"""
+        n_rows = len(ranks)
+        values = ranks.ravel() << self.rank_shift
+        node = np.tile(np.arange(self.n_trees), n_rows)
+        # Offset of each pair's row in the flattened chunk
+        row_base = np.repeat(np.arange(n_rows) * self.n_features, self.n_trees)
+
+        current, base, active = node, row_base, None
+        steps = FIRST_STEPS
+        while True:
+            for _ in range(steps):
+                code = self.code[current]
+                index = code & self.feature_mask
+                index += base
+                # -1 where the input ranks above the split threshold, else 0
+                went_right = code - values[index]
+                went_right >>= 63
+                current = code >> self.feature_bits
+                current &= self.child_mask
+                current -= went_right
+
+            if active is None:
+                node = current
+            else:
+                node[active] = current
+
+            running = ~self.is_leaf[current]
+            if not running.any():
+                return node.reshape(n_rows, self.n_trees)
+            active = np.flatnonzero(running) if active is None else active[running]
+            current, base = node[active], row_base[active]
+            steps = STEPS_PER_CHECK
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities for scaled rows"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected (n, {self.n_features}) rows, got {X.shape}")
+
+        if self.kind == "RandomForestClassifier":
+            proba = np.empty((len(X), self.n_classes))
+            for start, leaves in self._leaves(X):
+                proba[start:start + len(leaves)] = np.take(self.value, leaves, axis=1).sum(axis=2).T
+            proba /= self.n_trees
+            return proba
+
+        # Trees are stored stage by stage, one per raw score column
+        n_columns = len(self.init_raw)
+        raw = np.tile(self.init_raw, (len(X), 1))
+        for start, leaves in self._leaves(X):
+            stages = self.value[0].take(leaves).reshape(len(leaves), -1, n_columns)
+            raw[start:start + len(leaves)] += self.learning_rate * stages.sum(axis=1)
+
+        if self.n_classes == 2:
+            p = 1 / (1 + np.exp(-raw[:, 0]))
+            return np.column_stack([1 - p, p])
+
+        raw -= raw.max(axis=1, keepdims=True)
+        exp = np.exp(raw)
+        return exp / exp.sum(axis=1, keepdims=True)
@@ -3,15 +3,15 @@ Script Simple : Vérifie les tokens dans tokens_a_verifier.txt
 """
 
 import asyncio
-import httpx
-import json
 from datetime import datetime
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.panel import Panel
 from rich.prompt import Confirm
 
+from dataset_store import DatasetStore, save_labeled
+from token_discovery import Candidate, MintList, discover
+
 console = Console()
 
 
@@ -43,83 +43,57 @@ async def verify_tokens():
 
     # Préparer résultats
     results = {"rugs": [], "success": [], "skipped": []}
-    client = httpx.AsyncClient(timeout=30.0)
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console
-    ) as progress:
-        task = progress.add_task("Vérification...", total=len(token_mints))
-
-        for mint in token_mints:
+
+    def label(candidate: Candidate):
+        pair = candidate.pair
+        base_token = pair.get("baseToken", {})
+        market_cap = float(pair.get("marketCap", 0) or 0)
+
+        # Calculer âge
+        created_at = pair.get("pairCreatedAt")
+        age_hours = None
+        if created_at:
             try:
-                # Récupérer données DexScreener
-                response = await client.get(
-                    f"https://api.dexscreener.com/latest/dex/tokens/{mint}"
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    pairs = data.get("pairs", [])
-
-                    if pairs:
-                        pair = pairs[0]
-                        base_token = pair.get("baseToken", {})
-                        market_cap = float(pair.get("marketCap", 0) or 0)
-
-                        # Calculer âge
-                        created_at = pair.get("pairCreatedAt")
-                        age_hours = None
-                        if created_at:
-                            try:
-                                created_dt = datetime.fromtimestamp(created_at / 1000)
-                                age_hours = (datetime.now() - created_dt).total_seconds() / 3600
-                            except:
-                                pass
-
-                        token_data = {
-                            "mint": base_token.get("address", mint),
-                            "name": base_token.get("name", "Unknown"),
-                            "symbol": base_token.get("symbol", "???"),
-                            "market_cap": market_cap,
-                            "price_change_24h": pair.get("priceChange", {}).get("h24", 0),
-                            "liquidity": pair.get("liquidity", {}).get("usd", 0),
-                            "age_hours": age_hours,
-                            "dex_url": pair.get("url", ""),
-                            "dex_id": pair.get("dexId", ""),
-                            "collected_at": datetime.now().isoformat()
-                        }
-
-                        # Classifier
-                        if market_cap >= 500_000:
-                            token_data["classification"] = "SUCCESS"
-                            results["success"].append(token_data)
-                            console.print(f"[green]✓ {token_data['name']} - ${market_cap:,.0f} - SUCCESS")
-
-                        elif market_cap <= 20_000:
-                            token_data["classification"] = "RUG"
-                            results["rugs"].append(token_data)
-                            console.print(f"[red]✓ {token_data['name']} - ${market_cap:,.0f} - RUG")
-
-                        else:
-                            results["skipped"].append(token_data)
-                            console.print(f"[yellow]◯ {token_data['name']} - ${market_cap:,.0f} - Zone grise")
-
-                    else:
-                        console.print(f"[red]✗ {mint[:16]}... - Pas de données")
-                else:
-                    console.print(f"[red]✗ {mint[:16]}... - Erreur API")
-
-            except Exception as e:
-                console.print(f"[red]✗ {mint[:16]}... - Erreur: {e}")
-
-            progress.update(task, advance=1)
-            await asyncio.sleep(0.5)  # Rate limiting
-
-    await client.aclose()
+                created_dt = datetime.fromtimestamp(created_at / 1000)
+                age_hours = (datetime.now() - created_dt).total_seconds() / 3600
+            except:
+                pass
+
+        token_data = {
+            "mint": base_token.get("address", candidate.mint),
+            "name": base_token.get("name", "Unknown"),
+            "symbol": base_token.get("symbol", "???"),
+            "market_cap": market_cap,
+            "price_change_24h": pair.get("priceChange", {}).get("h24", 0),
+            "liquidity": pair.get("liquidity", {}).get("usd", 0),
+            "age_hours": age_hours,
+            "dex_url": pair.get("url", ""),
+            "dex_id": pair.get("dexId", ""),
+            "collected_at": datetime.now().isoformat()
+        }
+
+        # Classifier
+        if market_cap >= 500_000:
+            token_data["classification"] = "SUCCESS"
+            console.print(f"[green]✓ {token_data['name']} - ${market_cap:,.0f} - SUCCESS")
+            return "success", token_data
+
+        if market_cap <= 20_000:
+            token_data["classification"] = "RUG"
+            console.print(f"[red]✓ {token_data['name']} - ${market_cap:,.0f} - RUG")
+            return "rugs", token_data
+
+        results["skipped"].append(token_data)
+        console.print(f"[yellow]◯ {token_data['name']} - ${market_cap:,.0f} - Zone grise")
+        return None
+
+    # Données DexScreener demandées par lots (une requête pour 30 tokens)
+    with console.status("Vérification..."):
+        labeled, stats = await discover([MintList(token_mints)], label, enrich=True)
+    results["rugs"], results["success"] = labeled["rugs"], labeled["success"]
+
+    if stats.no_market_data:
+        console.print(f"[red]✗ {stats.no_market_data} tokens - Pas de données")
 
     # Résumé
     console.print("\n" + "="*60)
@@ -131,48 +105,21 @@ async def verify_tokens():
     # Sauvegarder ?
     if results["rugs"] or results["success"]:
         console.print()
-        if Confirm.ask("Ajouter au dataset (rugs.json + success.json) ?"):
-            # Charger existants
-            dataset_dir = Path(__file__).parent / "dataset"
-            rugs_file = dataset_dir / "rugs.json"
-            success_file = dataset_dir / "success.json"
-
-            # Charger
-            existing_rugs = []
-            existing_success = []
-
-            if rugs_file.exists():
-                with open(rugs_file) as f:
-                    existing_rugs = json.load(f)
-
-            if success_file.exists():
-                with open(success_file) as f:
-                    existing_success = json.load(f)
-
-            # Merger
-            existing_rug_mints = {t.get("mint") for t in existing_rugs}
-            new_rugs = [t for t in results["rugs"] if t.get("mint") not in existing_rug_mints]
-            all_rugs = existing_rugs + new_rugs
-
-            existing_success_mints = {t.get("mint") for t in existing_success}
-            new_successes = [t for t in results["success"] if t.get("mint") not in existing_success_mints]
-            all_successes = existing_success + new_successes
-
-            # Sauvegarder
-            with open(rugs_file, "w") as f:
-                json.dump(all_rugs, f, indent=2)
-
-            with open(success_file, "w") as f:
-                json.dump(all_successes, f, indent=2)
+        if Confirm.ask("Ajouter au dataset (rugs.jsonl + success.jsonl) ?"):
+            # Ajout incrémental : seuls les mints absents de l'index sont écrits
+            store = DatasetStore()
+            added = save_labeled(results, store)
+            new_rugs, new_successes = added["rugs"], added["success"]
+            total_rugs, total_successes = store.count("rugs"), store.count("success")
 
             console.print(f"\n[bold green]✓ Sauvegardé !")
-            console.print(f"  [red]rugs.json : +{len(new_rugs)}")
-            console.print(f"  [green]success.json : +{len(new_successes)}")
+            console.print(f"  [red]rugs.jsonl : +{len(new_rugs)}")
+            console.print(f"  [green]success.jsonl : +{len(new_successes)}")
 
             console.print(f"\n[bold cyan]Dataset Total :")
-            console.print(f"  [red]RUGS : {len(all_rugs)}")
-            console.print(f"  [green]SUCCESS : {len(all_successes)}")
-            console.print(f"  [yellow]TOTAL : {len(all_rugs) + len(all_successes)}")
+            console.print(f"  [red]RUGS : {total_rugs}")
+            console.print(f"  [green]SUCCESS : {total_successes}")
+            console.print(f"  [yellow]TOTAL : {total_rugs + total_successes}")
 
 
 async def main():
@@ -6,6 +6,12 @@ import httpx
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from config import SOLANA_RPC_URL
+from account_inspector import AccountInspector, mint_info_cache, fetch_token_account_owners, holders_by_owner
+from holder_activity import analyze_selling_activity
+from holder_snapshots import selling_from_snapshots
+
+# Top holders checked for recent selling
+SELLING_CHECK_HOLDERS = 5
 
 
 @dataclass
@@ -40,6 +46,7 @@ class OnChainAnalyzer:
     def __init__(self, rpc_url: str = SOLANA_RPC_URL):
         self.rpc_url = rpc_url
         self.client = httpx.Client(timeout=60.0)
+        self.inspector = AccountInspector(rpc_url)
 
         # Known exchange addresses (for identifying legitimate large holders)
         self.known_exchanges = {
@@ -58,15 +65,17 @@ class OnChainAnalyzer:
             # Add more known addresses as needed
         }
 
-    def get_token_holders(self, mint_address: str) -> OnChainHolderAnalysis:
+    def get_token_holders(self, mint_address: str, ctx=None) -> OnChainHolderAnalysis:
         """
         Get token holders using InsightX API (best) or fallback to Helius RPC
+
+        With a ScanContext, supply and largest accounts are shared with other analyzers.
         """
         try:
             print(f"[ONCHAIN] Getting holders for {mint_address[:8]}...")
 
             # Try InsightX first (has total holder count + top holders)
-            insightx_data = self._get_holders_from_insightx(mint_address)
+            insightx_data = self._get_holders_from_insightx(mint_address, ctx)
             if insightx_data:
                 return insightx_data
 
@@ -75,7 +84,7 @@ class OnChainAnalyzer:
 
             # Get token supply first
             print(f"[ONCHAIN] Step 1: Getting token supply...")
-            supply = self._get_token_supply(mint_address)
+            supply = ctx.supply() if ctx is not None else self._get_token_supply(mint_address)
             print(f"[ONCHAIN] Supply: {supply}")
 
             if not supply:
@@ -103,18 +112,10 @@ class OnChainAnalyzer:
 
             # Get largest token holders using Helius (faster and more reliable)
             print(f"[ONCHAIN] Step 2: Getting largest token holders...")
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTokenLargestAccounts",
-                "params": [mint_address]
-            }
-
-            response = self.client.post(self.rpc_url, json=payload, timeout=30.0)
-            print(f"[ONCHAIN] Response status: {response.status_code}")
+            accounts, error = self._get_largest_accounts(mint_address, ctx)
 
-            if response.status_code != 200:
-                print(f"[ONCHAIN]  RPC error: {response.status_code}")
+            if accounts is None:
+                print(f"[ONCHAIN]  {error}")
                 return OnChainHolderAnalysis(
                     total_holders=0,
                     top_holder_percentage=0,
@@ -131,11 +132,9 @@ class OnChainAnalyzer:
                     risk_score=0,
                     red_flags=[],
                     can_analyze=False,
-                    error_message=f"RPC error: {response.status_code}"
+                    error_message=error
                 )
 
-            data = response.json()
-            accounts = data.get("result", {}).get("value", [])
             print(f"[ONCHAIN] Found {len(accounts)} largest holders")
 
             # Parse holders from getTokenLargestAccounts response
@@ -169,9 +168,17 @@ class OnChainAnalyzer:
             fresh_count_top10 = 0
             fresh_count_top20 = 0
             exchanges_count = 0
-            holders_selling = []
             holder_ages = []
 
+            # Recent selling of the top holders: balance deltas from stored
+            # snapshots, else one batched signature request
+            selling_addresses = [h["address"] for h in holders[:SELLING_CHECK_HOLDERS]]
+            selling = selling_from_snapshots(mint_address, selling_addresses)
+            if selling is None:
+                selling = analyze_selling_activity(
+                    self.client, self.rpc_url, mint_address, selling_addresses, ctx
+                )
+
             # Check top 20 for fresh wallets (faster than 50, more accurate than 10)
             for i, holder in enumerate(holders[:20]):
                 address = holder["address"]
@@ -198,22 +205,15 @@ class OnChainAnalyzer:
                     if is_exchange:
                         exchanges_count += 1
 
-                    # Check for selling patterns (for top 5 only - avoid too many RPC calls)
-                    if i < 5:
-                        has_sold, sell_pct = self._detect_selling_patterns(address, mint_address)
-                        holder["has_sold_recently"] = has_sold
-                        holder["sell_percentage"] = sell_pct
-
-                        if has_sold:
-                            holders_selling.append(holder)
-                    else:
-                        holder["has_sold_recently"] = False
-                        holder["sell_percentage"] = None
+                    activity = selling.holders.get(address) if i < SELLING_CHECK_HOLDERS else None
+                    holder["has_sold_recently"] = activity.has_sold_recently if activity else False
+                    # Only known from snapshot deltas (signatures don't give amounts)
+                    holder["sell_percentage"] = activity.sell_percentage if activity else None
 
             # NEW: Calculate selling metrics
-            holders_selling_count = len(holders_selling)
-            coordinated_exit = holders_selling_count >= 3  # 3+ top holders selling = coordinated
-            whale_dumping = any(h.get("has_sold_recently", False) for h in holders[:3])  # Top 3 selling
+            holders_selling_count = selling.holders_selling_count
+            coordinated_exit = selling.coordinated_exit_detected  # 3+ top holders selling = coordinated
+            whale_dumping = selling.whale_dumping_detected  # Top 3 selling
 
             # NEW: Calculate average holder age
             avg_age = sum(holder_ages) / len(holder_ages) if holder_ages else 30.0
@@ -273,6 +273,39 @@ class OnChainAnalyzer:
                 error_message=str(e)
             )
 
+    def _get_largest_accounts(self, mint_address: str, ctx=None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Get getTokenLargestAccounts value merged per owner wallet. Returns (holders, error message)
+
+        Wallet age, exchange and selling checks need the owner wallets,
+        not the token accounts.
+        """
+        if ctx is not None:
+            holders = ctx.largest_holders()
+            if holders is None:
+                return None, "RPC error: getTokenLargestAccounts failed"
+            return holders, None
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getTokenLargestAccounts",
+            "params": [mint_address]
+        }
+
+        response = self.client.post(self.rpc_url, json=payload, timeout=30.0)
+        print(f"[ONCHAIN] Response status: {response.status_code}")
+
+        if response.status_code != 200:
+            return None, f"RPC error: {response.status_code}"
+
+        data = response.json()
+        accounts = data.get("result", {}).get("value", [])
+        owners = fetch_token_account_owners(
+            self.client, self.rpc_url, [a.get("address") for a in accounts if a.get("address")]
+        )
+        return holders_by_owner(accounts, owners), None
+
     def _get_wallet_age_quick(self, wallet_address: str) -> Optional[int]:
         """Get wallet age quickly (limited signatures)"""
         try:
@@ -328,6 +361,11 @@ class OnChainAnalyzer:
 
     def _get_token_supply(self, mint_address: str) -> Optional[float]:
         """Get total token supply"""
+        # Decode supply from the mint account (shared with authority + metadata checks)
+        mint_info = mint_info_cache.get(mint_address) or self.inspector.inspect_mint(mint_address)
+        if mint_info and mint_info.supply:
+            return mint_info.ui_supply
+
         try:
             payload = {
                 "jsonrpc": "2.0",
@@ -352,51 +390,6 @@ class OnChainAnalyzer:
         """Check if address is a known exchange"""
         return address in self.known_exchanges
 
-    def _detect_selling_patterns(self, address: str, mint_address: str) -> Tuple[bool, Optional[float]]:
-        """
-        Detect if a holder has been selling recently
-        Returns: (has_sold_recently, sell_percentage)
-
-        NOTE: This requires recent transaction history analysis
-        For now, returns simplified estimation
-        """
-        try:
-            # Get recent signatures for this address
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getSignaturesForAddress",
-                "params": [
-                    address,
-                    {"limit": 20}  # Last 20 transactions
-                ]
-            }
-
-            response = self.client.post(self.rpc_url, json=payload, timeout=5.0)
-
-            if response.status_code == 200:
-                data = response.json()
-                signatures = data.get("result", [])
-
-                # Check for recent transactions (last 1 hour)
-                import time
-                current_time = time.time()
-                recent_txs = [
-                    sig for sig in signatures
-                    if sig.get("blockTime") and (current_time - sig.get("blockTime")) < 3600
-                ]
-
-                # If there are recent transactions, it might indicate selling
-                # (simplified - full implementation would parse transaction details)
-                if len(recent_txs) >= 3:
-                    # Multiple transactions in last hour = possible selling
-                    return True, None  # Can't determine exact % without parsing tx details
-
-            return False, None
-
-        except Exception:
-            return False, None
-
     def _calculate_risk_and_flags(
         self,
         holders: List[Dict],
@@ -473,7 +466,7 @@ class OnChainAnalyzer:
 
         return min(risk_score, 100), red_flags
 
-    def _get_holders_from_insightx(self, mint_address: str) -> Optional[OnChainHolderAnalysis]:
+    def _get_holders_from_insightx(self, mint_address: str, ctx=None) -> Optional[OnChainHolderAnalysis]:
         """Get holders from InsightX API (best source with total count)"""
         try:
             from insightx_api import InsightXAPI
@@ -496,7 +489,7 @@ class OnChainAnalyzer:
             print(f"[ONCHAIN] InsightX: Found {holder_count} total holders, {len(top_holders_data)} top holders")
 
             # Get token supply
-            supply = self._get_token_supply(mint_address)
+            supply = ctx.supply() if ctx is not None else self._get_token_supply(mint_address)
             if not supply:
                 supply = 1000000000  # Default 1B for percentage calculation
 
@@ -554,6 +547,18 @@ class OnChainAnalyzer:
                     if i < 10:
                         exchanges_count += 1
 
+            # Selling from stored holder snapshots (no RPC calls; nothing without history)
+            selling = selling_from_snapshots(
+                mint_address, [h["address"] for h in holders[:SELLING_CHECK_HOLDERS]]
+            )
+            if selling is not None:
+                for holder in holders[:SELLING_CHECK_HOLDERS]:
+                    activity = selling.holders.get(holder["address"])
+                    if activity and activity.has_sold_recently:
+                        holder["has_sold_recently"] = True
+                        holder["sell_percentage"] = activity.sell_percentage
+                        holders_selling.append(holder["address"])
+
             # Use default age since we can't check each wallet (would be too slow)
             avg_age = 30  # Assume average age
 
@@ -593,5 +598,6 @@ class OnChainAnalyzer:
             return None
 
     def close(self):
-        """Close HTTP client"""
+        """Close HTTP clients"""
         self.client.close()
+        self.inspector.close()
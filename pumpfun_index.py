@@ -0,0 +1,255 @@
+"""
+Local index of pump.fun launches and trades
+Filled by the live ingestion service (pumpfun_ingest.py) and read by
+analyzers, so tokens scanned minutes after launch already have their
+creation time, creator and early buyers on disk
+"""
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+DATA_DIR = os.getenv("DATA_DIR", ".")
+PUMPFUN_DB_FILE = os.path.join(DATA_DIR, "pumpfun.db")
+
+# Buys within this many seconds of the create event are early buys
+EARLY_BUYER_WINDOW = 60
+# Trades older than this are deleted by prune() (seconds); launches and
+# early buyers are small and kept
+TRADE_RETENTION = int(os.getenv("PUMPFUN_TRADE_RETENTION", str(3 * 24 * 3600)))
+
+
+@dataclass
+class CreateEvent:
+    """Decoded pump.fun CreateEvent"""
+    signature: str
+    slot: int
+    name: str
+    symbol: str
+    uri: str
+    mint: str
+    bonding_curve: str
+    user: str  # Creator wallet
+    timestamp: int  # Unix seconds
+
+
+@dataclass
+class TradeEvent:
+    """Decoded pump.fun TradeEvent"""
+    signature: str
+    slot: int
+    mint: str
+    sol_amount: int  # Lamports
+    token_amount: int  # Base units
+    is_buy: bool
+    user: str
+    timestamp: int  # Unix seconds
+
+
+class PumpfunIndex:
+    """SQLite tables for launches, trades and early buyers"""
+
+    def __init__(self, db_file: str = PUMPFUN_DB_FILE):
+        self.db_file = db_file
+        self._local = threading.local()
+        self._init_db()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the connection owned by the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """Initialize database with tables"""
+        conn = self._get_conn()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS launches (
+                    mint TEXT PRIMARY KEY,
+                    name TEXT,
+                    symbol TEXT,
+                    uri TEXT,
+                    creator TEXT NOT NULL,
+                    bonding_curve TEXT,
+                    created_timestamp INTEGER NOT NULL,
+                    signature TEXT,
+                    slot INTEGER
+                )
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_launches_creator ON launches(creator, created_timestamp DESC)
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS trades (
+                    signature TEXT NOT NULL,
+                    mint TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    is_buy INTEGER NOT NULL,
+                    sol_amount INTEGER NOT NULL,
+                    token_amount INTEGER NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    slot INTEGER,
+                    PRIMARY KEY (signature, mint, user, is_buy, token_amount)
+                )
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trades_mint ON trades(mint, timestamp)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS early_buyers (
+                    mint TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    seconds_after_create INTEGER NOT NULL,
+                    sol_amount INTEGER NOT NULL,
+                    token_amount INTEGER NOT NULL,
+                    signature TEXT,
+                    PRIMARY KEY (mint, user)
+                )
+            ''')
+
+    def record_events(self, creates: List[CreateEvent], trades: List[TradeEvent]) -> List[str]:
+        """
+        Store decoded events of one transaction in a single write
+
+        Returns the mints that were launched by these events.
+        """
+        conn = self._get_conn()
+        with conn:
+            conn.executemany('''
+                INSERT OR IGNORE INTO launches
+                (mint, name, symbol, uri, creator, bonding_curve, created_timestamp, signature, slot)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (e.mint, e.name, e.symbol, e.uri, e.user, e.bonding_curve, e.timestamp, e.signature, e.slot)
+                for e in creates
+            ])
+
+            conn.executemany('''
+                INSERT OR IGNORE INTO trades
+                (signature, mint, user, is_buy, sol_amount, token_amount, timestamp, slot)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (t.signature, t.mint, t.user, int(t.is_buy), t.sol_amount, t.token_amount, t.timestamp, t.slot)
+                for t in trades
+            ])
+
+            for trade in trades:
+                if trade.is_buy:
+                    self._record_early_buyer(conn, trade)
+
+        return [e.mint for e in creates]
+
+    def _record_early_buyer(self, conn: sqlite3.Connection, trade: TradeEvent):
+        """Add a buyer to early_buyers if the buy is inside the launch window"""
+        row = conn.execute(
+            'SELECT created_timestamp FROM launches WHERE mint = ?', (trade.mint,)
+        ).fetchone()
+        if not row:
+            return
+
+        seconds_after_create = trade.timestamp - row[0]
+        if seconds_after_create < 0 or seconds_after_create > EARLY_BUYER_WINDOW:
+            return
+
+        rank = conn.execute(
+            'SELECT COUNT(*) FROM early_buyers WHERE mint = ?', (trade.mint,)
+        ).fetchone()[0] + 1
+
+        conn.execute('''
+            INSERT OR IGNORE INTO early_buyers
+            (mint, user, rank, seconds_after_create, sol_amount, token_amount, signature)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (trade.mint, trade.user, rank, seconds_after_create,
+              trade.sol_amount, trade.token_amount, trade.signature))
+
+    def get_launch(self, mint: str) -> Optional[Dict]:
+        """Launch record of a mint, if it was ingested"""
+        row = self._get_conn().execute('''
+            SELECT mint, name, symbol, uri, creator, bonding_curve, created_timestamp, signature, slot
+            FROM launches WHERE mint = ?
+        ''', (mint,)).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            'mint': row[0],
+            'name': row[1],
+            'symbol': row[2],
+            'uri': row[3],
+            'creator': row[4],
+            'bonding_curve': row[5],
+            'created_timestamp': row[6],
+            'signature': row[7],
+            'slot': row[8]
+        }
+
+    def get_early_buyers(self, mint: str) -> List[Dict]:
+        """Early buyers of a mint in buy order"""
+        rows = self._get_conn().execute('''
+            SELECT user, rank, seconds_after_create, sol_amount, token_amount, signature
+            FROM early_buyers WHERE mint = ? ORDER BY rank
+        ''', (mint,)).fetchall()
+
+        return [
+            {
+                'wallet': row[0],
+                'rank': row[1],
+                'seconds_after_create': row[2],
+                'sol_amount': row[3] / 1e9,
+                'token_amount': row[4],
+                'signature': row[5]
+            }
+            for row in rows
+        ]
+
+    def get_trades(self, mint: str, limit: int = 1000) -> List[Dict]:
+        """Ingested trades of a mint, oldest first"""
+        rows = self._get_conn().execute('''
+            SELECT signature, user, is_buy, sol_amount, token_amount, timestamp
+            FROM trades WHERE mint = ? ORDER BY timestamp LIMIT ?
+        ''', (mint, limit)).fetchall()
+
+        return [
+            {
+                'signature': row[0],
+                'user': row[1],
+                'is_buy': bool(row[2]),
+                'sol_amount': row[3] / 1e9,
+                'token_amount': row[4],
+                'timestamp': row[5]
+            }
+            for row in rows
+        ]
+
+    def prune(self, retention: int = TRADE_RETENTION) -> int:
+        """Delete trades older than `retention` seconds. Returns number of rows deleted"""
+        conn = self._get_conn()
+        with conn:
+            cursor = conn.execute('DELETE FROM trades WHERE timestamp < ?', (int(time.time()) - retention,))
+        return cursor.rowcount
+
+
+_pumpfun_index: Optional[PumpfunIndex] = None
+_pumpfun_index_lock = threading.Lock()
+
+
+def get_pumpfun_index() -> PumpfunIndex:
+    """Process-wide pump.fun index (opened on first use)"""
+    global _pumpfun_index
+    if _pumpfun_index is None:
+        with _pumpfun_index_lock:
+            if _pumpfun_index is None:
+                _pumpfun_index = PumpfunIndex()
+    return _pumpfun_index
@@ -0,0 +1,348 @@
+"""
+Live pump.fun ingestion service
+Subscribes to logsSubscribe for the pump.fun program over websocket,
+decodes Anchor CreateEvent / TradeEvent logs and fills the local pump.fun
+index (launches, trades, early buyers) and the creator index as tokens launch
+
+Usage:
+    python pumpfun_ingest.py                          Ingest from SOLANA_WS_URL
+    python pumpfun_ingest.py --capture logs.jsonl     Also save raw notifications
+    python pumpfun_ingest.py --replay logs.jsonl      Serve captured logs as a local websocket
+    python pumpfun_ingest.py --ws ws://127.0.0.1:8900 Ingest from the local stand-in
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import websockets
+from solders.pubkey import Pubkey
+
+from config import PUMPFUN_PROGRAM_ID, SOLANA_WS_URL
+from pumpfun_index import PumpfunIndex, CreateEvent, TradeEvent, get_pumpfun_index
+from creator_index import CreatorIndex, IndexedToken, get_creator_index
+
+# Anchor event discriminators: first 8 bytes of sha256("event:<EventName>")
+CREATE_EVENT_DISCRIMINATOR = hashlib.sha256(b"event:CreateEvent").digest()[:8]
+TRADE_EVENT_DISCRIMINATOR = hashlib.sha256(b"event:TradeEvent").digest()[:8]
+
+PROGRAM_DATA_PREFIX = "Program data: "
+
+# Local stand-in defaults
+REPLAY_HOST = "127.0.0.1"
+REPLAY_PORT = 8900
+
+# Reconnect backoff (seconds)
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+# Old trades are pruned from the index this often (seconds)
+PRUNE_INTERVAL = 3600
+
+
+def _read_string(data: bytes, offset: int) -> Tuple[str, int]:
+    """Borsh string: u32 length + utf-8 bytes"""
+    length = int.from_bytes(data[offset:offset + 4], 'little')
+    offset += 4
+    value = data[offset:offset + length].decode('utf-8', errors='ignore')
+    return value, offset + length
+
+
+def _read_pubkey(data: bytes, offset: int) -> Tuple[str, int]:
+    return str(Pubkey.from_bytes(data[offset:offset + 32])), offset + 32
+
+
+def _read_u64(data: bytes, offset: int) -> Tuple[int, int]:
+    return int.from_bytes(data[offset:offset + 8], 'little'), offset + 8
+
+
+def _read_i64(data: bytes, offset: int) -> Tuple[int, int]:
+    return int.from_bytes(data[offset:offset + 8], 'little', signed=True), offset + 8
+
+
+def decode_create_event(data: bytes, signature: str, slot: int, received_at: int) -> Optional[CreateEvent]:
+    """
+    Decode CreateEvent (discriminator already checked)
+
+    Layout: name, symbol, uri (strings), mint, bonding_curve, user (pubkeys).
+    Newer program versions append creator (pubkey) and timestamp (i64);
+    the creator field wins over `user` when present.
+    """
+    try:
+        offset = 8
+        name, offset = _read_string(data, offset)
+        symbol, offset = _read_string(data, offset)
+        uri, offset = _read_string(data, offset)
+        mint, offset = _read_pubkey(data, offset)
+        bonding_curve, offset = _read_pubkey(data, offset)
+        user, offset = _read_pubkey(data, offset)
+
+        timestamp = received_at
+        if len(data) >= offset + 40:
+            user, offset = _read_pubkey(data, offset)
+            timestamp, offset = _read_i64(data, offset)
+
+        return CreateEvent(
+            signature=signature,
+            slot=slot,
+            name=name,
+            symbol=symbol,
+            uri=uri,
+            mint=mint,
+            bonding_curve=bonding_curve,
+            user=user,
+            timestamp=timestamp
+        )
+    except Exception as e:
+        print(f"[INGEST] CreateEvent decode error: {e}")
+        return None
+
+
+def decode_trade_event(data: bytes, signature: str, slot: int) -> Optional[TradeEvent]:
+    """
+    Decode TradeEvent (discriminator already checked)
+
+    Layout: mint (pubkey), sol_amount (u64), token_amount (u64), is_buy (bool),
+    user (pubkey), timestamp (i64), then reserves we do not need.
+    """
+    try:
+        offset = 8
+        mint, offset = _read_pubkey(data, offset)
+        sol_amount, offset = _read_u64(data, offset)
+        token_amount, offset = _read_u64(data, offset)
+        is_buy = data[offset] == 1
+        offset += 1
+        user, offset = _read_pubkey(data, offset)
+        timestamp, offset = _read_i64(data, offset)
+
+        return TradeEvent(
+            signature=signature,
+            slot=slot,
+            mint=mint,
+            sol_amount=sol_amount,
+            token_amount=token_amount,
+            is_buy=is_buy,
+            user=user,
+            timestamp=timestamp
+        )
+    except Exception as e:
+        print(f"[INGEST] TradeEvent decode error: {e}")
+        return None
+
+
+def decode_logs(logs: List[str], signature: str, slot: int,
+                received_at: int = None) -> Tuple[List[CreateEvent], List[TradeEvent]]:
+    """Decode all pump.fun events found in a transaction's log lines"""
+    received_at = received_at or int(time.time())
+    creates = []
+    trades = []
+
+    for line in logs:
+        if not line.startswith(PROGRAM_DATA_PREFIX):
+            continue
+
+        try:
+            data = base64.b64decode(line[len(PROGRAM_DATA_PREFIX):])
+        except Exception:
+            continue
+
+        discriminator = data[:8]
+        if discriminator == CREATE_EVENT_DISCRIMINATOR:
+            event = decode_create_event(data, signature, slot, received_at)
+            if event:
+                creates.append(event)
+        elif discriminator == TRADE_EVENT_DISCRIMINATOR:
+            event = decode_trade_event(data, signature, slot)
+            if event:
+                trades.append(event)
+
+    return creates, trades
+
+
+class PumpfunIngestService:
+    """Consumes logsNotification messages and writes them to the local indexes"""
+
+    def __init__(self, ws_url: str = SOLANA_WS_URL, index: PumpfunIndex = None,
+                 capture_path: Optional[str] = None, creators: CreatorIndex = None):
+        self.ws_url = ws_url
+        self.index = index or get_pumpfun_index()
+        self.creators = creators or get_creator_index()
+        self.capture_path = capture_path
+        self.launches = 0
+        self.trades = 0
+        # Start of the current subscription: every launch since then was seen
+        self.subscribed_at: Optional[float] = None
+        self.last_prune = 0.0
+
+    def handle_message(self, message: str):
+        """Process one websocket message (subscription confirmations are ignored)"""
+        payload = json.loads(message)
+        if payload.get("method") != "logsNotification":
+            return
+
+        result = payload.get("params", {}).get("result", {})
+        value = result.get("value", {})
+
+        # Failed transactions emit no state changes
+        if value.get("err") is not None:
+            return
+
+        creates, trades = decode_logs(
+            value.get("logs") or [],
+            value.get("signature"),
+            result.get("context", {}).get("slot", 0)
+        )
+
+        if not creates and not trades:
+            return
+
+        self.index.record_events(creates, trades)
+        self.launches += len(creates)
+        self.trades += len(trades)
+
+        for event in creates:
+            self._index_creator(event)
+
+        if time.time() - self.last_prune >= PRUNE_INTERVAL:
+            self.last_prune = time.time()
+            try:
+                pruned = self.index.prune()
+                if pruned:
+                    print(f"[INGEST] Pruned {pruned} old trades")
+            except Exception as e:
+                print(f"[INGEST] Prune error: {e}")
+
+    def _index_creator(self, event: CreateEvent):
+        """
+        Add a fresh launch to the creator index
+
+        If the creator's record was refreshed from pump.fun after this
+        subscription started, this launch is the only coin the record is
+        missing, so the record is marked refreshed and the next creator check
+        needs no pump.fun call. Unknown creators (or ones last refreshed while
+        the service was not listening) still get a refresh on their next check.
+        """
+        try:
+            record = self.creators.get_record(event.user)
+            complete = (
+                record is not None
+                and self.subscribed_at is not None
+                and record.last_refresh >= self.subscribed_at
+                and not record.needs_full_refresh()
+            )
+
+            self.creators.upsert_tokens(
+                event.user,
+                [IndexedToken(
+                    mint=event.mint,
+                    name=event.name,
+                    symbol=event.symbol,
+                    created_timestamp=event.timestamp * 1000,  # pump.fun uses milliseconds
+                    market_cap=0,
+                    still_active=True,
+                    potential_rug=False
+                )],
+                refreshed=complete
+            )
+        except Exception as e:
+            print(f"[INGEST] Creator index error: {e}")
+
+    async def run(self):
+        """Subscribe and ingest forever, reconnecting with backoff"""
+        delay = RECONNECT_MIN_DELAY
+        capture = open(self.capture_path, 'a') if self.capture_path else None
+
+        try:
+            while True:
+                try:
+                    async with websockets.connect(self.ws_url, ping_interval=20, max_size=None) as ws:
+                        await ws.send(json.dumps({
+                            "jsonrpc": "2.0",
+                            "id": 1,
+                            "method": "logsSubscribe",
+                            "params": [
+                                {"mentions": [PUMPFUN_PROGRAM_ID]},
+                                {"commitment": "confirmed"}
+                            ]
+                        }))
+                        print(f"[INGEST] Subscribed to pump.fun logs via {self.ws_url.split('?')[0]}")
+                        self.subscribed_at = time.time()
+                        delay = RECONNECT_MIN_DELAY
+
+                        async for message in ws:
+                            if capture:
+                                capture.write(message.strip() + "\n")
+                            try:
+                                self.handle_message(message)
+                            except Exception as e:
+                                print(f"[INGEST] Error handling message: {e}")
+
+                    self.subscribed_at = None
+                    print(f"[INGEST] Connection closed, reconnecting in {delay}s...")
+
+                except (OSError, websockets.WebSocketException) as e:
+                    self.subscribed_at = None
+                    print(f"[INGEST] Connection lost ({e}), reconnecting in {delay}s...")
+
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+        finally:
+            if capture:
+                capture.close()
+
+
+async def serve_replay(path: str, host: str = REPLAY_HOST, port: int = REPLAY_PORT, interval: float = 0.0):
+    """
+    Local websocket stand-in
+
+    Answers logsSubscribe like an RPC node, then replays captured
+    notifications from a JSONL file (one websocket message per line).
+    """
+    with open(path, 'r') as f:
+        messages = [line.strip() for line in f if line.strip()]
+
+    async def handler(ws):
+        request = json.loads(await ws.recv())
+        await ws.send(json.dumps({"jsonrpc": "2.0", "result": 1, "id": request.get("id")}))
+
+        for message in messages:
+            await ws.send(message)
+            if interval:
+                await asyncio.sleep(interval)
+
+        await ws.close()
+
+    async with websockets.serve(handler, host, port):
+        print(f"[REPLAY] Serving {len(messages)} captured messages on ws://{host}:{port}")
+        await asyncio.Future()
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(name: str) -> Optional[str]:
+        if name in args:
+            index = args.index(name)
+            if index + 1 < len(args):
+                return args[index + 1]
+        return None
+
+    replay_path = option("--replay")
+    if replay_path:
+        port = int(option("--port") or REPLAY_PORT)
+        asyncio.run(serve_replay(replay_path, port=port))
+        return
+
+    service = PumpfunIngestService(ws_url=option("--ws") or SOLANA_WS_URL, capture_path=option("--capture"))
+    try:
+        asyncio.run(service.run())
+    except KeyboardInterrupt:
+        print(f"\n[INGEST] Stopped: {service.launches} launches, {service.trades} trades ingested")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Process-wide request budgets
+Token buckets shared by all background workers so a large watchlist cannot
+exceed the request rate allowed by each upstream API
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: float = None) -> bool:
+        """Block until tokens are available. Returns False on timeout"""
+        # A request larger than the bucket could never be served
+        tokens = min(tokens, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        """Like acquire(), but waits without blocking the event loop"""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+# Requests per second per upstream (override with RATE_LIMIT_<NAME>)
+RATE_BUDGETS = {
+    "rpc": 10.0,
+    "dexscreener": 4.0,  # 300 requests / minute
+    "pumpfun": 5.0,
+    "insightx": 2.0,
+    "discord": 5.0,
+    "telegram": 20.0,
+}
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(name: str) -> TokenBucket:
+    """Shared bucket for an upstream (created on first use)"""
+    bucket = _buckets.get(name)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(name)
+            if bucket is None:
+                rate = float(os.getenv(f"RATE_LIMIT_{name.upper()}", RATE_BUDGETS.get(name, 5.0)))
+                bucket = TokenBucket(rate)
+                _buckets[name] = bucket
+    return bucket
+
+
+def acquire(name: str, tokens: float = 1.0, timeout: float = None) -> bool:
+    """Take tokens from the shared bucket of an upstream, blocking if needed"""
+    return get_bucket(name).acquire(tokens, timeout)
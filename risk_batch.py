@@ -0,0 +1,211 @@
+"""
+Vectorized risk scoring for many tokens at once
+Evaluates the same thresholds and weights as RiskScorer over columnar
+analyzer outputs (structured NumPy array or DataFrame), for batch scans,
+dataset labelling and large watchlists
+"""
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from risk_scorer import COMPONENTS
+
+# One row per token. Missing analyses are encoded as 0 / False, missing
+# token age as NaN (same meaning as None in the scalar path)
+BATCH_DTYPE = np.dtype([
+    # Component risk scores (0 when the analysis is missing)
+    ("distribution_score", np.int64),
+    ("creator_score", np.int64),
+    ("liquidity_score", np.int64),
+    ("social_score", np.int64),
+    ("wallet_score", np.int64),
+    ("sniper_score", np.int64),
+    ("volume_score", np.int64),
+    ("pump_dump_score", np.int64),
+    ("holder_score", np.int64),
+    # InsightX distribution metrics (0 = missing)
+    ("nakamoto", np.float64),
+    ("hhi", np.float64),
+    # On-chain holder data (only meaningful when has_onchain)
+    ("has_onchain", np.bool_),
+    ("fresh_wallet_count_top10", np.int64),
+    ("top_holder_percentage", np.float64),
+    # Market data
+    ("has_liquidity", np.bool_),
+    ("market_cap_usd", np.float64),
+    ("volume_24h", np.float64),
+    # Data availability (confidence)
+    ("token_age_hours", np.float64),
+    ("has_creator_history", np.bool_),
+    ("has_distribution", np.bool_),
+    ("has_social", np.bool_),
+    ("has_social_links", np.bool_),
+    # Pass-through for callers (not used by the score)
+    ("red_flags_count", np.int64),
+])
+
+# Weighted score columns, in RiskScorer aggregation order
+WEIGHTED_COLUMNS = {
+    "distribution": "distribution_score",
+    "creator": "creator_score",
+    "liquidity": "liquidity_score",
+    "social": "social_score",
+    "wallet": "wallet_score",
+    "sniper": "sniper_score",
+    "volume": "volume_score",
+    "insightx": "insightx_score",
+    "pump_dump": "pump_dump_score",
+    "holder": "holder_score",
+}
+
+
+def analyses_to_row(
+    distribution_analysis,
+    creator_analysis,
+    liquidity_analysis,
+    social_analysis,
+    wallet_analysis=None,
+    sniper_analysis=None,
+    volume_analysis=None,
+    distribution_metrics=None,
+    onchain_data=None,
+    pump_dump_analysis=None,
+    token_age_hours=None
+) -> tuple:
+    """Encode the arguments of RiskScorer.calculate_risk as one BATCH_DTYPE row"""
+    has_onchain = bool(onchain_data and onchain_data.can_analyze)
+    metrics = distribution_metrics or {}
+
+    red_flags_count = sum(
+        len(analysis.red_flags)
+        for analysis in (distribution_analysis, creator_analysis, liquidity_analysis, social_analysis,
+                         wallet_analysis, sniper_analysis, volume_analysis, pump_dump_analysis)
+        if analysis
+    ) + (len(onchain_data.red_flags) if has_onchain else 0)
+
+    return (
+        distribution_analysis.risk_score if distribution_analysis else 0,
+        creator_analysis.risk_score if creator_analysis else 0,
+        liquidity_analysis.risk_score if liquidity_analysis else 0,
+        social_analysis.risk_score if social_analysis else 0,
+        wallet_analysis.risk_score if wallet_analysis else 0,
+        sniper_analysis.risk_score if sniper_analysis else 0,
+        volume_analysis.risk_score if volume_analysis else 0,
+        pump_dump_analysis.risk_score if pump_dump_analysis else 0,
+        onchain_data.risk_score if has_onchain else 0,
+        metrics.get("nakamoto") or 0,
+        metrics.get("hhi") or 0,
+        has_onchain,
+        (onchain_data.fresh_wallet_count_top10 or 0) if has_onchain else 0,
+        (onchain_data.top_holder_percentage or 0) if has_onchain else 0,
+        bool(liquidity_analysis),
+        liquidity_analysis.market_cap_usd if liquidity_analysis else 0,
+        (liquidity_analysis.volume_24h or 0) if liquidity_analysis else 0,
+        np.nan if token_age_hours is None else token_age_hours,
+        bool(creator_analysis and creator_analysis.total_tokens_created > 0),
+        bool(distribution_analysis and distribution_analysis.total_holders > 0),
+        bool(social_analysis),
+        bool(social_analysis and (social_analysis.has_twitter or social_analysis.has_telegram
+                                  or social_analysis.has_website)),
+        red_flags_count,
+    )
+
+
+def build_batch(rows: Sequence[tuple]) -> np.ndarray:
+    """Structured array from analyses_to_row() rows"""
+    return np.array(list(rows), dtype=BATCH_DTYPE)
+
+
+def _ladder(conditions: List[np.ndarray], points: List[int]) -> np.ndarray:
+    """Points of the first matching condition per row (0 when none match)"""
+    return np.select(conditions, points, default=0).astype(np.int64)
+
+
+def score_batch(batch: Union[np.ndarray, "pandas.DataFrame"]) -> Dict[str, np.ndarray]:
+    """
+    Score every row of a batch
+
+    Accepts a BATCH_DTYPE structured array or a DataFrame with the same
+    columns. Returns arrays matching RiskReport fields: overall_risk_score,
+    risk_level, insightx_score, additional_risk, final_risk_score,
+    confidence_score and confidence_level.
+    """
+    col = {name: np.asarray(batch[name]) for name in BATCH_DTYPE.names}
+
+    has_onchain = col["has_onchain"].astype(bool)
+    has_liquidity = col["has_liquidity"].astype(bool)
+    nakamoto = col["nakamoto"]
+    hhi = col["hhi"]
+    fresh_top10 = np.where(has_onchain, col["fresh_wallet_count_top10"], 0)
+    top_holder = np.where(has_onchain, col["top_holder_percentage"], 0)
+    market_cap = col["market_cap_usd"]
+
+    # InsightX distribution score (RiskScorer._calculate_insightx_score)
+    nz_nakamoto = nakamoto != 0
+    insightx = (
+        _ladder([nz_nakamoto & (nakamoto < 10), nz_nakamoto & (nakamoto < 20), nz_nakamoto & (nakamoto < 50)],
+                [50, 30, 15])
+        + _ladder([hhi > 0.8, hhi > 0.5, hhi > 0.25], [40, 25, 10])
+        + _ladder([fresh_top10 >= 7, fresh_top10 >= 5, fresh_top10 >= 3], [40, 25, 15])
+        + _ladder([top_holder > 50, top_holder > 30, top_holder > 20], [30, 20, 10])
+    )
+    insightx = np.minimum(insightx, 100)
+
+    # Weighted aggregate, same term order as the scalar path
+    scores = dict(col)
+    scores["insightx_score"] = insightx
+    overall = np.zeros(len(insightx), dtype=np.float64)
+    for name, _, _, weight in COMPONENTS:
+        overall += scores[WEIGHTED_COLUMNS[name]] * weight / 100
+    overall = np.minimum(np.trunc(overall).astype(np.int64), 100)
+
+    risk_level = np.select(
+        [overall >= 75, overall >= 50, overall >= 25],
+        ["EXTREME", "HIGH", "MEDIUM"],
+        default="LOW"
+    )
+
+    # Penalties (RiskScorer.calculate_penalties)
+    additional = (
+        _ladder([fresh_top10 >= 8, fresh_top10 >= 5, fresh_top10 >= 3], [40, 25, 15])
+        + _ladder([has_liquidity & (market_cap < 50000), has_liquidity & (market_cap < 100000)],
+                  [20, 10])
+        + _ladder([top_holder > 30, top_holder > 20], [15, 10])
+    )
+
+    # Confidence score (RiskScorer.calculate_confidence)
+    age = col["token_age_hours"]
+    known_age = ~np.isnan(age)
+    confidence = (
+        100
+        - _ladder([known_age & (age < 0.5), known_age & (age < 2), known_age & (age < 12)], [30, 20, 10])
+        - np.where(has_liquidity & (market_cap > 0), 0, 15)
+        - np.where(col["has_creator_history"], 0, 10)
+        - np.where(col["has_distribution"], 0, 10)
+        - np.where(col["has_social"], 0, 5)
+        - np.where(has_liquidity & (col["volume_24h"] > 0), 0, 5)
+        - _ladder([has_liquidity & (market_cap < 1000), has_liquidity & (market_cap < 5000)], [10, 5])
+        - np.where(col["has_social_links"], 0, 5)
+    )
+    confidence = np.maximum(confidence, 0)
+
+    confidence_level = np.select(
+        [confidence >= 85, confidence >= 70, confidence >= 50, confidence >= 30],
+        ["VERY HIGH", "HIGH", "MEDIUM", "LOW"],
+        default="VERY LOW"
+    )
+
+    return {
+        "overall_risk_score": overall,
+        "risk_level": risk_level,
+        "insightx_score": insightx,
+        "additional_risk": additional,
+        "final_risk_score": np.minimum(overall + additional, 100),
+        "confidence_score": confidence,
+        "confidence_level": confidence_level,
+    }
+
+
+def score_analyses(analyses: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """Score a list of RiskScorer.calculate_risk keyword-argument dicts in one pass"""
+    return score_batch(build_batch([analyses_to_row(**kwargs) for kwargs in analyses]))
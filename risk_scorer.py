@@ -1,6 +1,6 @@
 """Calculate overall risk score and generate report"""
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
 from config import RISK_WEIGHTS
 
 
@@ -30,6 +30,213 @@ class RiskReport:
     confidence_level: str  # "VERY LOW", "LOW", "MEDIUM", "HIGH", "VERY HIGH"
     confidence_factors: List[str]  # Explanation of what affects confidence
 
+    # Penalties for red flags the weighted average underrates (not included in overall_risk_score)
+    additional_risk: int = 0
+
+    @property
+    def final_risk_score(self) -> int:
+        """Overall score plus penalties, capped at 100"""
+        return min(self.overall_risk_score + self.additional_risk, 100)
+
+
+@dataclass
+class ComponentResult:
+    """Contribution of one analysis to the report"""
+    score: int = 0
+    red_flags: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    confidence_penalty: int = 0
+    confidence_factors: List[Tuple[int, str]] = field(default_factory=list)  # (report section, factor)
+
+
+# Confidence factor sections, in report order
+CONFIDENCE_COMPLETENESS = 2
+CONFIDENCE_VOLUME = 3
+CONFIDENCE_MARKET_CAP = 4
+CONFIDENCE_METADATA = 5
+
+
+def _distribution_component(distribution_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if distribution_analysis:
+        result.score = distribution_analysis.risk_score
+        result.red_flags = list(distribution_analysis.red_flags)
+        if distribution_analysis.top_holder_percentage > 15:
+            result.recommendations.append("[!] Watch top holder wallets for dumps")
+
+    if distribution_analysis and distribution_analysis.total_holders > 0:
+        result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[+] Holder distribution analyzed"))
+    else:
+        result.confidence_penalty -= 10
+        result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[-] Holder distribution unavailable"))
+    return result
+
+
+def _creator_component(creator_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if creator_analysis:
+        result.score = creator_analysis.risk_score
+        result.red_flags = list(creator_analysis.red_flags)
+        if creator_analysis.rug_percentage > 30:
+            result.recommendations.append("[!!] Creator has history of rugs - avoid completely")
+
+    if creator_analysis and creator_analysis.total_tokens_created > 0:
+        result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[+] Creator history analyzed"))
+    else:
+        result.confidence_penalty -= 10
+        result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[-] No creator history available"))
+    return result
+
+
+def _liquidity_component(liquidity_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if liquidity_analysis:
+        result.score = liquidity_analysis.risk_score
+        result.red_flags = list(liquidity_analysis.red_flags)
+        if liquidity_analysis.liquidity_usd < 10000:
+            result.recommendations.append("[!] Low liquidity - expect high slippage")
+
+    if not (liquidity_analysis and liquidity_analysis.market_cap_usd > 0):
+        result.confidence_penalty -= 15
+        result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[!] Missing liquidity data - reducing confidence"))
+
+    if liquidity_analysis and liquidity_analysis.volume_24h is not None and liquidity_analysis.volume_24h > 0:
+        result.confidence_factors.append((CONFIDENCE_VOLUME, "[+] 24h volume data available"))
+    else:
+        result.confidence_penalty -= 5
+        result.confidence_factors.append((CONFIDENCE_VOLUME, "[-] No 24h volume data"))
+
+    if liquidity_analysis:
+        if liquidity_analysis.market_cap_usd < 1000:
+            result.confidence_penalty -= 10
+            result.confidence_factors.append((CONFIDENCE_MARKET_CAP, "[!] Very low market cap - data may be unreliable"))
+        elif liquidity_analysis.market_cap_usd < 5000:
+            result.confidence_penalty -= 5
+            result.confidence_factors.append((CONFIDENCE_MARKET_CAP, "[-] Low market cap - limited data reliability"))
+    return result
+
+
+def _social_component(social_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if social_analysis:
+        result.score = social_analysis.risk_score
+        result.red_flags = list(social_analysis.red_flags)
+        if not social_analysis.has_twitter:
+            result.recommendations.append("[!] No social presence - hard to verify legitimacy")
+        if social_analysis.has_twitter or social_analysis.has_telegram:
+            result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[+] Social media presence verified"))
+    else:
+        result.confidence_penalty -= 5
+
+    if social_analysis and (social_analysis.has_twitter or social_analysis.has_telegram or social_analysis.has_website):
+        result.confidence_factors.append((CONFIDENCE_METADATA, "[+] Blockchain metadata retrieved successfully"))
+    else:
+        result.confidence_penalty -= 5
+        result.confidence_factors.append((CONFIDENCE_METADATA, "[-] Limited on-chain metadata"))
+    return result
+
+
+def _wallet_component(wallet_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if wallet_analysis:
+        result.score = wallet_analysis.risk_score
+        result.red_flags = list(wallet_analysis.red_flags)
+        if wallet_analysis.fresh_wallet_percentage > 50:
+            result.recommendations.append("[!!] Majority are fresh wallets - LIKELY FAKE HOLDERS")
+        if wallet_analysis.suspected_dev_wallets > 10:
+            result.recommendations.append("[!!] Many wallets controlled by dev - AVOID!")
+        if wallet_analysis.total_holders > 0:
+            result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[+] Fresh wallet analysis complete"))
+    return result
+
+
+def _sniper_component(sniper_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if sniper_analysis:
+        result.score = sniper_analysis.risk_score
+        result.red_flags = list(sniper_analysis.red_flags)
+        if sniper_analysis.sniper_percentage > 70:
+            result.recommendations.append("[!!] INSIDER TRADING DETECTED - Over 70% bought in first 10 seconds!")
+        elif sniper_analysis.sniper_percentage > 50:
+            result.recommendations.append("[!] High sniper activity - possible insider coordination")
+        if sniper_analysis.bundle_transactions > 5:
+            result.recommendations.append("[!!] Bundle buying detected - likely dev's multiple wallets")
+        result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[+] Sniper detection analyzed"))
+    return result
+
+
+def _volume_component(volume_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if volume_analysis:
+        result.score = volume_analysis.risk_score
+        result.red_flags = list(volume_analysis.red_flags)
+        if volume_analysis.is_fake_volume:
+            result.recommendations.append("[!!] FAKE VOLUME DETECTED - Volume numbers are impossible/fabricated")
+        elif volume_analysis.is_wash_trading:
+            result.recommendations.append("[!!] WASH TRADING DETECTED - Volume is artificially inflated")
+    return result
+
+
+def _insightx_component(distribution_metrics, onchain_data) -> ComponentResult:
+    result = ComponentResult(score=RiskScorer._calculate_insightx_score(distribution_metrics, onchain_data))
+    if distribution_metrics:
+        nakamoto = distribution_metrics.get("nakamoto")
+        if nakamoto and nakamoto < 10:
+            result.recommendations.append(f"[!!] EXTREME CENTRALIZATION - Only {nakamoto} wallets control 51%")
+        result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[+] On-chain distribution metrics available"))
+    return result
+
+
+def _pump_dump_component(pump_dump_analysis) -> ComponentResult:
+    result = ComponentResult()
+    if pump_dump_analysis:
+        result.score = pump_dump_analysis.risk_score
+        result.red_flags = list(pump_dump_analysis.red_flags)
+        if pump_dump_analysis.is_pump_dump:
+            result.recommendations.append("[!!] PUMP & DUMP PATTERN DETECTED - Price manipulation in progress!")
+        if pump_dump_analysis.price_volatility > 150:
+            result.recommendations.append("[!] Extreme price volatility - high risk of manipulation")
+        if pump_dump_analysis.current_vs_ath_percentage < 30:
+            result.recommendations.append("[!] Token has been heavily dumped from ATH - likely rugpulled")
+        if pump_dump_analysis.price_volatility > 0:
+            result.confidence_factors.append((CONFIDENCE_COMPLETENESS, "[+] Price history analyzed for pump & dump"))
+    return result
+
+
+def _holder_component(onchain_data) -> ComponentResult:
+    result = ComponentResult()
+    if onchain_data and onchain_data.can_analyze:
+        result.score = onchain_data.risk_score
+        result.red_flags = list(onchain_data.red_flags)
+        if onchain_data.fresh_wallet_count_top10 >= 7:
+            result.recommendations.append("[!!] Most top holders are fresh wallets (<7 days) - SYBIL ATTACK LIKELY")
+        elif onchain_data.fresh_wallet_count_top10 >= 5:
+            result.recommendations.append("[!] Many fresh wallets in top 10 - suspicious coordination")
+    return result
+
+
+# Weighted components: (name, input names, component function, weight)
+COMPONENTS: List[Tuple[str, Tuple[str, ...], Callable[..., ComponentResult], float]] = [
+    ("distribution", ("distribution_analysis",), _distribution_component,
+     RISK_WEIGHTS.get("whale_concentration", 15) + RISK_WEIGHTS.get("holder_distribution", 12)),
+    ("creator", ("creator_analysis",), _creator_component, RISK_WEIGHTS.get("creator_history", 15)),
+    ("liquidity", ("liquidity_analysis",), _liquidity_component, RISK_WEIGHTS.get("liquidity", 10)),
+    ("social", ("social_analysis",), _social_component, RISK_WEIGHTS.get("social_presence", 8)),
+    ("wallet", ("wallet_analysis",), _wallet_component, RISK_WEIGHTS.get("fresh_wallets", 20)),
+    ("sniper", ("sniper_analysis",), _sniper_component, RISK_WEIGHTS.get("sniper_detection", 25)),
+    ("volume", ("volume_analysis",), _volume_component, RISK_WEIGHTS.get("wash_trading", 15)),
+    ("insightx", ("distribution_metrics", "onchain_data"), _insightx_component,
+     RISK_WEIGHTS.get("distribution_metrics", 10)),
+    ("pump_dump", ("pump_dump_analysis",), _pump_dump_component, RISK_WEIGHTS.get("pump_dump", 18)),
+    ("holder", ("onchain_data",), _holder_component, RISK_WEIGHTS.get("holder_analysis", 15)),
+]
+
+# Report order of recommendations and confidence factors (red flags follow COMPONENTS)
+RECOMMENDATION_ORDER = ["distribution", "creator", "liquidity", "social", "wallet", "sniper",
+                        "volume", "pump_dump", "insightx", "holder"]
+CONFIDENCE_ORDER = ["liquidity", "creator", "distribution", "social", "wallet", "sniper",
+                    "volume", "insightx", "pump_dump"]
+
 
 class RiskScorer:
     """Calculates overall risk score from all analyses"""
@@ -52,6 +259,22 @@ class RiskScorer:
         Calculate confidence score (0-100) based on data availability and quality
         Returns: (confidence_score, confidence_level, confidence_factors)
         """
+        components = {
+            "liquidity": _liquidity_component(liquidity_analysis),
+            "creator": _creator_component(creator_analysis),
+            "distribution": _distribution_component(distribution_analysis),
+            "social": _social_component(social_analysis),
+            "wallet": _wallet_component(wallet_analysis),
+            "sniper": _sniper_component(sniper_analysis),
+            "volume": _volume_component(volume_analysis),
+            "insightx": _insightx_component(distribution_metrics, onchain_data),
+            "pump_dump": _pump_dump_component(pump_dump_analysis),
+        }
+        return RiskScorer._aggregate_confidence(token_age_hours, components)
+
+    @staticmethod
+    def _aggregate_confidence(token_age_hours, components: Dict[str, ComponentResult]) -> tuple:
+        """Combine the age factor with the confidence contributions of each component"""
         confidence = 100
         factors = []
 
@@ -69,79 +292,16 @@ class RiskScorer:
             else:
                 factors.append("[+] Token age sufficient for reliable analysis")
 
-        # 2. DATA COMPLETENESS - Check if major analyzers ran successfully
-        analyzers_available = 0
-        total_analyzers = 9
-
-        if liquidity_analysis and liquidity_analysis.market_cap_usd > 0:
-            analyzers_available += 1
-        else:
-            confidence -= 15
-            factors.append("[!] Missing liquidity data - reducing confidence")
-
-        if creator_analysis and creator_analysis.total_tokens_created > 0:
-            analyzers_available += 1
-            factors.append("[+] Creator history analyzed")
-        else:
-            confidence -= 10
-            factors.append("[-] No creator history available")
-
-        if distribution_analysis and distribution_analysis.total_holders > 0:
-            analyzers_available += 1
-            factors.append("[+] Holder distribution analyzed")
-        else:
-            confidence -= 10
-            factors.append("[-] Holder distribution unavailable")
-
-        if social_analysis:
-            analyzers_available += 1
-            if social_analysis.has_twitter or social_analysis.has_telegram:
-                factors.append("[+] Social media presence verified")
-        else:
-            confidence -= 5
-
-        if wallet_analysis and wallet_analysis.total_holders > 0:
-            analyzers_available += 1
-            factors.append("[+] Fresh wallet analysis complete")
-
-        if sniper_analysis:
-            analyzers_available += 1
-            factors.append("[+] Sniper detection analyzed")
-
-        if volume_analysis:
-            analyzers_available += 1
-
-        if distribution_metrics:
-            analyzers_available += 1
-            factors.append("[+] On-chain distribution metrics available")
+        # 2-5. DATA COMPLETENESS, VOLUME DATA, MARKET CAP SIZE, METADATA (per component)
+        sectioned = []
+        for name in CONFIDENCE_ORDER:
+            component = components[name]
+            confidence += component.confidence_penalty
+            sectioned.extend(component.confidence_factors)
 
-        if pump_dump_analysis:
-            analyzers_available += 1
-            if pump_dump_analysis.price_volatility > 0:
-                factors.append("[+] Price history analyzed for pump & dump")
-
-        # 3. VOLUME DATA QUALITY
-        if liquidity_analysis and liquidity_analysis.volume_24h is not None and liquidity_analysis.volume_24h > 0:
-            factors.append("[+] 24h volume data available")
-        else:
-            confidence -= 5
-            factors.append("[-] No 24h volume data")
-
-        # 4. MARKET CAP SIZE (affects reliability)
-        if liquidity_analysis:
-            if liquidity_analysis.market_cap_usd < 1000:
-                confidence -= 10
-                factors.append("[!] Very low market cap - data may be unreliable")
-            elif liquidity_analysis.market_cap_usd < 5000:
-                confidence -= 5
-                factors.append("[-] Low market cap - limited data reliability")
-
-        # 5. BLOCKCHAIN METADATA AVAILABILITY
-        if social_analysis and (social_analysis.has_twitter or social_analysis.has_telegram or social_analysis.has_website):
-            factors.append("[+] Blockchain metadata retrieved successfully")
-        else:
-            confidence -= 5
-            factors.append("[-] Limited on-chain metadata")
+        # Stable sort keeps component order inside each section
+        sectioned.sort(key=lambda item: item[0])
+        factors.extend(factor for _, factor in sectioned)
 
         # Ensure confidence doesn't go below 0
         confidence = max(confidence, 0)
@@ -160,6 +320,39 @@ class RiskScorer:
 
         return confidence, level, factors
 
+    @staticmethod
+    def calculate_penalties(onchain_data, liquidity_analysis) -> int:
+        """Additional risk for red flags the weighted average underrates"""
+        additional_risk = 0
+
+        # Penalty 1: Fresh wallets in top 10 (CRITICAL!)
+        if onchain_data and onchain_data.can_analyze:
+            fresh_top10 = onchain_data.fresh_wallet_count_top10
+            if fresh_top10 >= 8:
+                additional_risk += 40  # 80%+ fresh wallets = HUGE red flag!
+            elif fresh_top10 >= 5:
+                additional_risk += 25  # 50%+ fresh wallets = Major red flag
+            elif fresh_top10 >= 3:
+                additional_risk += 15  # 30%+ fresh wallets = Warning
+
+        # Penalty 2: Small market cap (< $100K = very risky on Pump.fun)
+        if liquidity_analysis:
+            mcap = liquidity_analysis.market_cap_usd
+            if mcap < 50000:
+                additional_risk += 20  # Under $50K = extreme risk
+            elif mcap < 100000:
+                additional_risk += 10  # Under $100K = high risk
+
+        # Penalty 3: High top holder concentration
+        if onchain_data and onchain_data.can_analyze:
+            top_holder_pct = onchain_data.top_holder_percentage
+            if top_holder_pct > 30:
+                additional_risk += 15  # One person controls 30%+
+            elif top_holder_pct > 20:
+                additional_risk += 10  # One person controls 20%+
+
+        return additional_risk
+
     @staticmethod
     def calculate_risk(
         distribution_analysis,
@@ -175,65 +368,35 @@ class RiskScorer:
         token_age_hours=None  # NEW: For confidence calculation
     ) -> RiskReport:
         """Calculate weighted overall risk score with confidence assessment"""
+        return IncrementalRiskScorer().update(
+            distribution_analysis,
+            creator_analysis,
+            liquidity_analysis,
+            social_analysis,
+            wallet_analysis,
+            sniper_analysis,
+            volume_analysis,
+            distribution_metrics,
+            onchain_data,
+            pump_dump_analysis,
+            token_age_hours
+        )
 
-        # Get individual scores
-        dist_score = distribution_analysis.risk_score if distribution_analysis else 0
-        creator_score = creator_analysis.risk_score if creator_analysis else 0
-        liq_score = liquidity_analysis.risk_score if liquidity_analysis else 0
-        social_score = social_analysis.risk_score if social_analysis else 0
-        wallet_score = wallet_analysis.risk_score if wallet_analysis else 0
-
-        # Sniper analysis score
-        sniper_score = sniper_analysis.risk_score if sniper_analysis else 0
-
-        # Volume analysis score
-        volume_score = volume_analysis.risk_score if volume_analysis else 0
-
-        # InsightX distribution metrics score
-        insightx_score = RiskScorer._calculate_insightx_score(distribution_metrics, onchain_data)
-
-        # NEW: Pump & Dump analysis score
-        pump_dump_score = pump_dump_analysis.risk_score if pump_dump_analysis else 0
-
-        # NEW: Holder analysis score (whale dumping, coordinated exits, exchange detection)
-        holder_score = onchain_data.risk_score if (onchain_data and onchain_data.can_analyze) else 0
+    @staticmethod
+    def _build_report(components: Dict[str, ComponentResult], additional_risk: int, token_age_hours) -> RiskReport:
+        """Weighted aggregate of component results"""
 
         # Calculate weighted average with OPTIMIZED weights for Pump.fun
-        overall_score = (
-            dist_score * (RISK_WEIGHTS.get("whale_concentration", 15) + RISK_WEIGHTS.get("holder_distribution", 12)) / 100 +
-            creator_score * RISK_WEIGHTS.get("creator_history", 15) / 100 +
-            liq_score * RISK_WEIGHTS.get("liquidity", 10) / 100 +
-            social_score * RISK_WEIGHTS.get("social_presence", 8) / 100 +
-            wallet_score * RISK_WEIGHTS.get("fresh_wallets", 20) / 100 +
-            sniper_score * RISK_WEIGHTS.get("sniper_detection", 25) / 100 +
-            volume_score * RISK_WEIGHTS.get("wash_trading", 15) / 100 +
-            insightx_score * RISK_WEIGHTS.get("distribution_metrics", 10) / 100 +
-            pump_dump_score * RISK_WEIGHTS.get("pump_dump", 18) / 100 +  # NEW
-            holder_score * RISK_WEIGHTS.get("holder_analysis", 15) / 100  # NEW: Whale/coordinated exit detection
-        )
+        overall_score = 0
+        for name, _, _, weight in COMPONENTS:
+            overall_score += components[name].score * weight / 100
 
         overall_score = min(int(overall_score), 100)
 
         # Collect all red flags
         all_flags = []
-        if distribution_analysis:
-            all_flags.extend(distribution_analysis.red_flags)
-        if creator_analysis:
-            all_flags.extend(creator_analysis.red_flags)
-        if liquidity_analysis:
-            all_flags.extend(liquidity_analysis.red_flags)
-        if social_analysis:
-            all_flags.extend(social_analysis.red_flags)
-        if wallet_analysis:
-            all_flags.extend(wallet_analysis.red_flags)
-        if sniper_analysis:
-            all_flags.extend(sniper_analysis.red_flags)
-        if volume_analysis:
-            all_flags.extend(volume_analysis.red_flags)
-        if pump_dump_analysis:  # NEW
-            all_flags.extend(pump_dump_analysis.red_flags)
-        if onchain_data and onchain_data.can_analyze:  # NEW: Holder analysis red flags
-            all_flags.extend(onchain_data.red_flags)
+        for name, _, _, _ in COMPONENTS:
+            all_flags.extend(components[name].red_flags)
 
         # Determine risk level and verdict
         if overall_score >= 75:
@@ -250,33 +413,11 @@ class RiskScorer:
             verdict = "[OK] LOW RISK - Relatively safe, but always DYOR (Do Your Own Research)."
 
         # Generate recommendations
-        recommendations = RiskScorer._generate_recommendations(
-            overall_score,
-            distribution_analysis,
-            creator_analysis,
-            liquidity_analysis,
-            social_analysis,
-            wallet_analysis,
-            sniper_analysis,
-            volume_analysis,
-            distribution_metrics,
-            onchain_data,
-            pump_dump_analysis  # NEW
-        )
+        recommendations = RiskScorer._generate_recommendations(overall_score, components)
 
         # NEW: Calculate confidence score
-        confidence_score, confidence_level, confidence_factors = RiskScorer.calculate_confidence(
-            token_age_hours,
-            liquidity_analysis,
-            creator_analysis,
-            distribution_analysis,
-            social_analysis,
-            wallet_analysis,
-            sniper_analysis,
-            volume_analysis,
-            distribution_metrics,
-            onchain_data,
-            pump_dump_analysis
+        confidence_score, confidence_level, confidence_factors = RiskScorer._aggregate_confidence(
+            token_age_hours, components
         )
 
         return RiskReport(
@@ -285,19 +426,20 @@ class RiskScorer:
             verdict=verdict,
             all_red_flags=all_flags,
             recommendations=recommendations,
-            distribution_score=dist_score,
-            creator_score=creator_score,
-            liquidity_score=liq_score,
-            social_score=social_score,
-            wallet_score=wallet_score,
-            sniper_score=sniper_score,
-            volume_score=volume_score,
-            insightx_score=insightx_score,
-            pump_dump_score=pump_dump_score,  # NEW
-            holder_score=holder_score,  # NEW
+            distribution_score=components["distribution"].score,
+            creator_score=components["creator"].score,
+            liquidity_score=components["liquidity"].score,
+            social_score=components["social"].score,
+            wallet_score=components["wallet"].score,
+            sniper_score=components["sniper"].score,
+            volume_score=components["volume"].score,
+            insightx_score=components["insightx"].score,
+            pump_dump_score=components["pump_dump"].score,  # NEW
+            holder_score=components["holder"].score,  # NEW
             confidence_score=confidence_score,  # NEW
             confidence_level=confidence_level,  # NEW
-            confidence_factors=confidence_factors  # NEW
+            confidence_factors=confidence_factors,  # NEW
+            additional_risk=additional_risk
         )
 
     @staticmethod
@@ -350,19 +492,7 @@ class RiskScorer:
         return min(score, 100)
 
     @staticmethod
-    def _generate_recommendations(
-        overall_score: int,
-        distribution_analysis,
-        creator_analysis,
-        liquidity_analysis,
-        social_analysis,
-        wallet_analysis=None,
-        sniper_analysis=None,
-        volume_analysis=None,
-        distribution_metrics=None,
-        onchain_data=None,
-        pump_dump_analysis=None  # NEW
-    ) -> List[str]:
+    def _generate_recommendations(overall_score: int, components: Dict[str, ComponentResult]) -> List[str]:
         """Generate actionable recommendations"""
 
         recommendations = []
@@ -375,65 +505,97 @@ class RiskScorer:
             recommendations.append("[OK] If you invest, only use money you can afford to lose")
             recommendations.append("[OK] Set a stop-loss at -20% to -30%")
 
-        if distribution_analysis and distribution_analysis.top_holder_percentage > 15:
-            recommendations.append("[!] Watch top holder wallets for dumps")
-
-        if creator_analysis and creator_analysis.rug_percentage > 30:
-            recommendations.append("[!!] Creator has history of rugs - avoid completely")
-
-        if liquidity_analysis and liquidity_analysis.liquidity_usd < 10000:
-            recommendations.append("[!] Low liquidity - expect high slippage")
-
-        if social_analysis and not social_analysis.has_twitter:
-            recommendations.append("[!] No social presence - hard to verify legitimacy")
-
-        if wallet_analysis:
-            if wallet_analysis.fresh_wallet_percentage > 50:
-                recommendations.append("[!!] Majority are fresh wallets - LIKELY FAKE HOLDERS")
-            if wallet_analysis.suspected_dev_wallets > 10:
-                recommendations.append("[!!] Many wallets controlled by dev - AVOID!")
-
-        # NEW: Sniper analysis recommendations
-        if sniper_analysis:
-            if sniper_analysis.sniper_percentage > 70:
-                recommendations.append("[!!] INSIDER TRADING DETECTED - Over 70% bought in first 10 seconds!")
-            elif sniper_analysis.sniper_percentage > 50:
-                recommendations.append("[!] High sniper activity - possible insider coordination")
-
-            if sniper_analysis.bundle_transactions > 5:
-                recommendations.append("[!!] Bundle buying detected - likely dev's multiple wallets")
-
-        # Volume analysis recommendations
-        if volume_analysis:
-            if volume_analysis.is_fake_volume:
-                recommendations.append("[!!] FAKE VOLUME DETECTED - Volume numbers are impossible/fabricated")
-            elif volume_analysis.is_wash_trading:
-                recommendations.append("[!!] WASH TRADING DETECTED - Volume is artificially inflated")
-
-        # NEW: Pump & Dump recommendations
-        if pump_dump_analysis:
-            if pump_dump_analysis.is_pump_dump:
-                recommendations.append("[!!] PUMP & DUMP PATTERN DETECTED - Price manipulation in progress!")
-            if pump_dump_analysis.price_volatility > 150:
-                recommendations.append("[!] Extreme price volatility - high risk of manipulation")
-            if pump_dump_analysis.current_vs_ath_percentage < 30:
-                recommendations.append("[!] Token has been heavily dumped from ATH - likely rugpulled")
-
-        # Distribution metrics recommendations
-        if distribution_metrics:
-            nakamoto = distribution_metrics.get("nakamoto")
-            if nakamoto and nakamoto < 10:
-                recommendations.append(f"[!!] EXTREME CENTRALIZATION - Only {nakamoto} wallets control 51%")
-
-        # On-chain fresh wallet recommendations
-        if onchain_data and onchain_data.can_analyze:
-            if onchain_data.fresh_wallet_count_top10 >= 7:
-                recommendations.append("[!!] Most top holders are fresh wallets (<7 days) - SYBIL ATTACK LIKELY")
-            elif onchain_data.fresh_wallet_count_top10 >= 5:
-                recommendations.append("[!] Many fresh wallets in top 10 - suspicious coordination")
+        for name in RECOMMENDATION_ORDER:
+            recommendations.extend(components[name].recommendations)
 
         # Always remind DYOR
         recommendations.append("[i] Always do your own research (DYOR)")
         recommendations.append("[i] Never invest more than you can afford to lose")
 
         return recommendations
+
+
+class IncrementalRiskScorer:
+    """
+    Risk scorer for repeated scoring of the same token
+
+    The caller stamps each analysis with a version (e.g. the time its stage
+    last ran). A component is reused only while the versions of all its
+    inputs are unchanged, so an update where only market data was refreshed
+    recomputes the liquidity and volume components plus the weighted
+    aggregate and reuses the rest. Without versions every component is
+    recomputed: analyses are not compared by content or identity, since
+    callers may mutate them in place.
+    """
+
+    def __init__(self):
+        self._memo: Dict[str, Tuple[tuple, object]] = {}  # name -> (input versions, result)
+        self.recomputed: List[str] = []  # Components recomputed by the last update
+        self.report: Optional[RiskReport] = None
+
+    def _component(self, name: str, function: Callable, inputs: tuple, versions: Optional[tuple]):
+        cached = self._memo.get(name)
+        if versions is not None and cached is not None and cached[0] == versions:
+            return cached[1]
+
+        result = function(*inputs)
+        if versions is not None:
+            self._memo[name] = (versions, result)
+        self.recomputed.append(name)
+        return result
+
+    def update(
+        self,
+        distribution_analysis,
+        creator_analysis,
+        liquidity_analysis,
+        social_analysis,
+        wallet_analysis=None,
+        sniper_analysis=None,
+        volume_analysis=None,
+        distribution_metrics=None,
+        onchain_data=None,
+        pump_dump_analysis=None,
+        token_age_hours=None,
+        versions: Optional[Dict[str, object]] = None
+    ) -> RiskReport:
+        """
+        Score the latest analyses, same arguments and result as RiskScorer.calculate_risk
+
+        `versions` maps argument names (e.g. "liquidity_analysis") to a stamp
+        that changes whenever that analysis changes; missing names count as
+        a constant version (the argument is always None, for example).
+        """
+        analyses = {
+            "distribution_analysis": distribution_analysis,
+            "creator_analysis": creator_analysis,
+            "liquidity_analysis": liquidity_analysis,
+            "social_analysis": social_analysis,
+            "wallet_analysis": wallet_analysis,
+            "sniper_analysis": sniper_analysis,
+            "volume_analysis": volume_analysis,
+            "distribution_metrics": distribution_metrics,
+            "onchain_data": onchain_data,
+            "pump_dump_analysis": pump_dump_analysis,
+        }
+
+        def stamps(inputs):
+            return None if versions is None else tuple(versions.get(i) for i in inputs)
+
+        self.recomputed = []
+        components = {
+            name: self._component(name, function, tuple(analyses[i] for i in inputs), stamps(inputs))
+            for name, inputs, function, _ in COMPONENTS
+        }
+        additional_risk = self._component(
+            "penalties", RiskScorer.calculate_penalties, (onchain_data, liquidity_analysis),
+            stamps(("onchain_data", "liquidity_analysis"))
+        )
+
+        self.report = RiskScorer._build_report(components, additional_risk, token_age_hours)
+        return self.report
+
+    def reset(self):
+        """Forget memoized components"""
+        self._memo.clear()
+        self.report = None
@@ -0,0 +1,183 @@
+"""
+Per-scan analysis context
+Holds upstream data shared by several analyzers (supply, largest accounts,
+DexScreener pairs, mint signatures, metadata) so each piece is fetched at
+most once per scan
+"""
+import httpx
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from config import SOLANA_RPC_URL
+from account_inspector import (
+    AccountInspector, MintAccountInfo, mint_info_cache, fetch_token_account_owners, holders_by_owner
+)
+from liquidity_analyzer import fetch_dexscreener_pairs
+
+# Largest signature page requested by any analyzer (SniperDetector)
+MINT_SIGNATURES_LIMIT = 1000
+
+# Marks a value that has not been loaded yet (None is a valid loaded value)
+_MISSING = object()
+
+
+class ScanContext:
+    """
+    Lazily loaded, memoized data for one token scan
+
+    Every accessor fetches on first use and returns the stored value after
+    that, including None for failed fetches, so a failing upstream is not
+    retried by every analyzer. Safe to share between threads of one scan.
+    """
+
+    def __init__(self, mint_address: str, rpc_url: str = SOLANA_RPC_URL):
+        self.mint_address = mint_address
+        self.rpc_url = rpc_url
+        self._values: Dict[str, object] = {}
+        self._locks: Dict[str, Lock] = {}
+        self._locks_lock = Lock()
+        self._client = None
+        self._inspector = None
+        self._metadata_fetcher = None
+
+    def memo(self, key: str, loader: Callable[[], object]):
+        """Return the value stored under `key`, loading it once if needed"""
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, Lock())
+
+        with lock:
+            value = self._values.get(key, _MISSING)
+            if value is _MISSING:
+                value = loader()
+                self._values[key] = value
+
+        return value
+
+    def seed(self, key: str, value):
+        """Store a value loaded elsewhere (e.g. by a batch prefetch) so it is not fetched again"""
+        self._values[key] = value
+
+    def peek(self, key: str):
+        """Return the value stored under `key` without loading it (None if not loaded)"""
+        value = self._values.get(key, _MISSING)
+        return None if value is _MISSING else value
+
+    @property
+    def client(self) -> httpx.Client:
+        """HTTP client for RPC calls made by the context"""
+        if self._client is None:
+            self._client = httpx.Client(timeout=30.0)
+        return self._client
+
+    def _rpc(self, method: str, params: list, timeout: float = 30.0):
+        """Call a JSON-RPC method, returning `result` or None"""
+        try:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": method,
+                "params": params
+            }
+
+            response = self.client.post(self.rpc_url, json=payload, timeout=timeout)
+
+            if response.status_code != 200:
+                print(f"[CONTEXT] {method} returned {response.status_code}")
+                return None
+
+            return response.json().get("result")
+
+        except Exception as e:
+            print(f"[CONTEXT] {method} error: {e}")
+            return None
+
+    def mint_info(self) -> Optional[MintAccountInfo]:
+        """Decoded mint account (also loads the metadata account)"""
+        def load():
+            info = mint_info_cache.get(self.mint_address)
+            if info is None:
+                if self._inspector is None:
+                    self._inspector = AccountInspector(self.rpc_url)
+                info = self._inspector.inspect_mint(self.mint_address)
+            return info
+
+        return self.memo("mint_info", load)
+
+    def supply(self) -> Optional[float]:
+        """Total supply in token units"""
+        def load():
+            info = self.mint_info()
+            if info and info.supply:
+                return info.ui_supply
+
+            result = self._rpc("getTokenSupply", [self.mint_address], timeout=10.0)
+            supply = (result or {}).get("value", {}).get("uiAmount")
+            return float(supply) if supply else None
+
+        return self.memo("supply", load)
+
+    def largest_accounts(self) -> Optional[List[Dict]]:
+        """getTokenLargestAccounts value (top 20 token accounts, sorted by balance)"""
+        def load():
+            result = self._rpc("getTokenLargestAccounts", [self.mint_address])
+            if result is None:
+                return None
+            return result.get("value", [])
+
+        return self.memo("largest_accounts", load)
+
+    def largest_holders(self) -> Optional[List[Dict]]:
+        """
+        Largest accounts merged per owner wallet ({"address": owner, "uiAmount"})
+
+        One getMultipleAccounts call resolves the owners of the token accounts.
+        """
+        def load():
+            accounts = self.largest_accounts()
+            if accounts is None:
+                return None
+            owners = fetch_token_account_owners(
+                self.client, self.rpc_url, [a.get("address") for a in accounts if a.get("address")]
+            )
+            return holders_by_owner(accounts, owners)
+
+        return self.memo("largest_holders", load)
+
+    def pairs(self) -> Optional[List[Dict]]:
+        """DexScreener pairs of the token"""
+        return self.memo("pairs", lambda: fetch_dexscreener_pairs(self.mint_address))
+
+    def signatures(self, limit: int = MINT_SIGNATURES_LIMIT) -> List[Dict]:
+        """Latest signatures of the mint address, newest first"""
+        def load():
+            result = self._rpc(
+                "getSignaturesForAddress",
+                [self.mint_address, {"limit": MINT_SIGNATURES_LIMIT}]
+            )
+            return result or []
+
+        # One page of the largest size serves every smaller request
+        return self.memo("signatures", load)[:limit]
+
+    def metadata(self) -> Optional[Dict]:
+        """On-chain metadata resolved with its URI JSON"""
+        def load():
+            from metadata_fetcher import MetadataFetcher
+
+            if self._metadata_fetcher is None:
+                self._metadata_fetcher = MetadataFetcher()
+            return self._metadata_fetcher.get_metadata(self.mint_address)
+
+        return self.memo("metadata", load)
+
+    def close(self):
+        """Close clients opened by the context"""
+        if self._client is not None:
+            self._client.close()
+        if self._inspector is not None:
+            self._inspector.close()
+        if self._metadata_fetcher is not None:
+            self._metadata_fetcher.close()
@@ -8,6 +8,7 @@ from datetime import datetime
 from collections import defaultdict
 from config import SOLANA_RPC_URL
 from helius_api import HeliusAPI
+from pumpfun_index import get_pumpfun_index
 
 
 @dataclass
@@ -38,17 +39,31 @@ class SniperDetector:
         self.client = httpx.Client(timeout=60.0)
         self.helius = HeliusAPI()
 
-    def analyze_snipers(self, mint_address: str, token_creation_time: Optional[int] = None) -> SniperAnalysis:
+    def analyze_snipers(self, mint_address: str, token_creation_time: Optional[int] = None,
+                        ctx=None) -> SniperAnalysis:
         """
         SIMPLIFIED: Analyze early transactions to detect sniping patterns
 
         Instead of identifying specific wallets, counts total transactions in early periods
         This works with basic RPC without needing transaction parsing
+        With a ScanContext, the mint signatures are shared with other analyzers.
         """
         try:
+            # Launch ingested live: creation time and early buyers are local
+            index = get_pumpfun_index()
+            launch = index.get_launch(mint_address)
+            early_buyers = index.get_early_buyers(mint_address) if launch else []
+
             # Get token creation time
+            if not token_creation_time and launch:
+                token_creation_time = launch["created_timestamp"]
+
             if not token_creation_time:
-                token_creation_time = self._get_token_creation_time(mint_address)
+                if ctx is not None:
+                    first = ctx.signatures(limit=1)
+                    token_creation_time = first[0].get("blockTime") if first else None
+                else:
+                    token_creation_time = self._get_token_creation_time(mint_address)
 
             if not token_creation_time:
                 return self._empty_analysis("Cannot determine token creation time")
@@ -58,7 +73,10 @@ class SniperDetector:
                 token_creation_time = token_creation_time // 1000
 
             # Get all transactions for this token address
-            transactions = self._get_token_transactions(mint_address, limit=1000)
+            if ctx is not None:
+                transactions = ctx.signatures(limit=1000)
+            else:
+                transactions = self._get_token_transactions(mint_address, limit=1000)
 
             if not transactions:
                 return self._empty_analysis("No transaction data available")
@@ -160,7 +178,7 @@ class SniperDetector:
                 cluster_wallets=0,
                 risk_score=min(risk_score, 100),
                 red_flags=red_flags,
-                early_buyers=[]
+                early_buyers=early_buyers
             )
 
         except Exception as e:
@@ -12,6 +12,18 @@ gunicorn --bind 0.0.0.0:$PORT --workers 2 --timeout 120 web_app:app &
 # Wait a bit for web app to start
 sleep 3
 
+# Start holder snapshot poller (single instance, shared by all web workers)
+echo "Starting Holder Snapshot Poller..."
+python holder_snapshots.py &
+
+# Start live pump.fun ingestion (fills local launch / trade / early buyer index)
+echo "Starting pump.fun Ingestion..."
+python pumpfun_ingest.py &
+
+# Start watchlist re-scoring scheduler (pushes score changes to bot channels)
+echo "Starting Watchlist Scheduler..."
+python watchlist.py &
+
 # Start Discord bot
 echo "Starting Discord Bot..."
 python discord_bot.py &
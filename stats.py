@@ -1,26 +1,87 @@
 """Simple statistics tracker for the scanner"""
 import json
 import os
+import sqlite3
+import atexit
+import threading
+from collections import deque
 from datetime import datetime
-from threading import Lock
 
+# Counters live in the scan database (same DATA_DIR as database.py)
+DATA_DIR = os.getenv("DATA_DIR", ".")
+DB_FILE = os.path.join(DATA_DIR, "scans.db")
+
+# Legacy counter file, imported once into SQLite
 STATS_FILE = "scanner_stats.json"
 
+# Pending increments are written to SQLite this often (seconds)
+STATS_FLUSH_INTERVAL = 2.0
+
+
 class StatsTracker:
-    def __init__(self):
-        self.lock = Lock()
-        self._load_stats()
+    """
+    Scan counter shared by all processes
+
+    increment_scan only appends to an in-memory deque (no lock, no I/O).
+    A background thread adds the pending increments to a single SQLite row
+    with `total_scans = total_scans + ?`, so concurrent gunicorn workers
+    never overwrite each other's counts.
+    """
+
+    def __init__(self, db_file: str = DB_FILE):
+        self.db_file = db_file
+        self._pending = deque()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._init_db()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="stats-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
 
-    def _load_stats(self):
-        """Load stats from file"""
+    def _init_db(self):
+        """Create the counter row, importing scanner_stats.json if present"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS tracker_stats (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        total_scans INTEGER NOT NULL DEFAULT 0,
+                        started_at TEXT NOT NULL,
+                        last_scan TEXT
+                    )
+                ''')
+
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                if conn.execute('SELECT 1 FROM tracker_stats WHERE id = 1').fetchone():
+                    return
+
+                stats = self._load_legacy_stats()
+                conn.execute(
+                    'INSERT INTO tracker_stats (id, total_scans, started_at, last_scan) VALUES (1, ?, ?, ?)',
+                    (stats["total_scans"], stats["started_at"], stats["last_scan"])
+                )
+        finally:
+            conn.close()
+
+    def _load_legacy_stats(self):
+        """Load stats from the old JSON file"""
         if os.path.exists(STATS_FILE):
             try:
                 with open(STATS_FILE, 'r') as f:
-                    self.stats = json.load(f)
+                    stats = json.load(f)
+                return {**self._default_stats(), **stats}
             except Exception:
-                self.stats = self._default_stats()
-        else:
-            self.stats = self._default_stats()
+                pass
+
+        return self._default_stats()
 
     def _default_stats(self):
         """Create default stats structure"""
@@ -30,26 +91,73 @@ class StatsTracker:
             "last_scan": None
         }
 
-    def _save_stats(self):
-        """Save stats to file"""
-        try:
-            with open(STATS_FILE, 'w') as f:
-                json.dump(self.stats, f, indent=2)
-        except Exception as e:
-            print(f"Error saving stats: {e}")
+    def _flush_loop(self):
+        """Flush pending increments until stopped"""
+        while not self._stop.wait(STATS_FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Write pending increments to SQLite (they stay pending if the write fails)"""
+        with self._flush_lock:
+            # Only increment_scan appends (on the right), so the first `count`
+            # entries stay in place until they are removed below
+            count = len(self._pending)
+            if not count:
+                return
+            last_scan = self._pending[count - 1]
+
+            try:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.execute(
+                            'UPDATE tracker_stats SET total_scans = total_scans + ?, '
+                            'last_scan = MAX(COALESCE(last_scan, \'\'), ?) WHERE id = 1',
+                            (count, last_scan)
+                        )
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Error saving stats: {e}")
+                return
+
+            for _ in range(count):
+                self._pending.popleft()
 
     def increment_scan(self):
         """Increment scan counter"""
-        with self.lock:
-            self.stats["total_scans"] += 1
-            self.stats["last_scan"] = datetime.now().isoformat()
-            self._save_stats()
-            return self.stats["total_scans"]
+        self._pending.append(datetime.now().isoformat())
 
     def get_stats(self):
-        """Get current stats"""
-        with self.lock:
-            return self.stats.copy()
+        """Get current stats (includes increments not yet flushed)"""
+        pending = list(self._pending)
+
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    'SELECT total_scans, started_at, last_scan FROM tracker_stats WHERE id = 1'
+                ).fetchone()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error loading stats: {e}")
+            row = None
+
+        stats = self._default_stats()
+        if row:
+            stats.update(total_scans=row[0], started_at=row[1], last_scan=row[2])
+
+        if pending:
+            stats["total_scans"] += len(pending)
+            stats["last_scan"] = max(stats["last_scan"] or "", pending[-1])
+
+        return stats
+
+    def close(self):
+        """Stop the background flusher and write pending increments"""
+        self._stop.set()
+        self.flush()
 
 # Global instance
 tracker = StatsTracker()
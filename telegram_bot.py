@@ -13,6 +13,7 @@ load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 API_URL = os.getenv("API_URL", "http://localhost:5000")
+WATCHLIST_HEADERS = {"X-API-Key": os.getenv("WATCHLIST_API_TOKEN", "")}
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     welcome_text = """🛡️ <b>SCAM AI - Solana Token Scanner V1</b>
@@ -34,6 +35,7 @@ Advanced Machine Learning model trained on 800+ real pump.fun tokens
 
 📋 <b>How to Use:</b>
 • /scan &lt;token_address&gt; - Scan a token
+• /watch &lt;token_address&gt; - Get alerts when its score changes
 • /help - Show commands
 • Or simply paste any Solana address!
 
@@ -363,6 +365,44 @@ async def scan_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     await scan_token(update, context.args[0])
 
+async def watch_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not context.args:
+        await update.message.reply_text("Please provide a token address!\n\nUsage: /watch <token_address>")
+        return
+    token_address = context.args[0]
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(f"{API_URL}/api/watchlist", headers=WATCHLIST_HEADERS, json={
+                "mint_address": token_address,
+                "platform": "telegram",
+                "channel_id": str(update.effective_chat.id)
+            })
+        if response.status_code == 200:
+            await update.message.reply_text(f"Watching {token_address[:8]}... - score changes will be posted here")
+        else:
+            await update.message.reply_text(f"Error: {response.json().get('error', 'Failed to watch token')}")
+    except Exception as e:
+        await update.message.reply_text(f"Error: {str(e)}")
+
+async def unwatch_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not context.args:
+        await update.message.reply_text("Usage: /unwatch <token_address>")
+        return
+    token_address = context.args[0]
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.request("DELETE", f"{API_URL}/api/watchlist", headers=WATCHLIST_HEADERS, json={
+                "mint_address": token_address,
+                "platform": "telegram",
+                "channel_id": str(update.effective_chat.id)
+            })
+        if response.status_code == 200:
+            await update.message.reply_text(f"Stopped watching {token_address[:8]}...")
+        else:
+            await update.message.reply_text(f"Error: {response.json().get('error', 'Failed to unwatch token')}")
+    except Exception as e:
+        await update.message.reply_text(f"Error: {str(e)}")
+
 async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = update.message.text
     solana_pattern = r'\b([1-9A-HJ-NP-Za-km-z]{32,44})\b'
@@ -382,6 +422,8 @@ def main():
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("scan", scan_command))
+    application.add_handler(CommandHandler("watch", watch_command))
+    application.add_handler(CommandHandler("unwatch", unwatch_command))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, message_handler))
 
     print("Telegram bot is ready!")
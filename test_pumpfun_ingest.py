@@ -0,0 +1,163 @@
+"""
+Ingestion tests: pump.fun log decoding, index writes and the replay stand-in
+Run: python -m pytest test_pumpfun_ingest.py   (or python test_pumpfun_ingest.py)
+"""
+import asyncio
+import base64
+import json
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+from solders.pubkey import Pubkey
+
+from creator_index import CreatorIndex
+from pumpfun_index import PumpfunIndex
+from pumpfun_ingest import (
+    CREATE_EVENT_DISCRIMINATOR, PROGRAM_DATA_PREFIX, TRADE_EVENT_DISCRIMINATOR,
+    PumpfunIngestService, serve_replay
+)
+
+MINT = str(Pubkey.new_unique())
+CURVE = str(Pubkey.new_unique())
+CREATOR = str(Pubkey.new_unique())
+BUYER = str(Pubkey.new_unique())
+
+
+def _string(value: str) -> bytes:
+    data = value.encode()
+    return len(data).to_bytes(4, 'little') + data
+
+
+def create_event_data(timestamp: int) -> bytes:
+    return (
+        CREATE_EVENT_DISCRIMINATOR + _string("Test") + _string("TST") + _string("https://x/y.json")
+        + bytes(Pubkey.from_string(MINT)) + bytes(Pubkey.from_string(CURVE))
+        + bytes(Pubkey.from_string(CREATOR)) + bytes(Pubkey.from_string(CREATOR))
+        + timestamp.to_bytes(8, 'little', signed=True)
+    )
+
+
+def trade_event_data(timestamp: int, user: str = BUYER, is_buy: bool = True) -> bytes:
+    return (
+        TRADE_EVENT_DISCRIMINATOR + bytes(Pubkey.from_string(MINT))
+        + (2 * 10 ** 9).to_bytes(8, 'little') + (5 * 10 ** 12).to_bytes(8, 'little')
+        + bytes([int(is_buy)]) + bytes(Pubkey.from_string(user))
+        + timestamp.to_bytes(8, 'little', signed=True)
+    )
+
+
+def notification(signature: str, *events: bytes, err=None) -> str:
+    logs = ["Program log: Instruction: Buy"] + [
+        PROGRAM_DATA_PREFIX + base64.b64encode(event).decode() for event in events
+    ]
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {"result": {
+            "context": {"slot": 123},
+            "value": {"signature": signature, "err": err, "logs": logs}
+        }, "subscription": 1}
+    })
+
+
+def make_service(tmp: Path) -> PumpfunIngestService:
+    return PumpfunIngestService(
+        ws_url="ws://unused",
+        index=PumpfunIndex(str(tmp / "pumpfun.db")),
+        creators=CreatorIndex(str(tmp / "creators.db"))
+    )
+
+
+def capture(now: int):
+    return [
+        json.dumps({"jsonrpc": "2.0", "result": 1, "id": 1}),
+        notification("sig-create", create_event_data(now), trade_event_data(now + 2)),
+        notification("sig-late", trade_event_data(now + 300, user=CREATOR)),
+        notification("sig-failed", trade_event_data(now + 3), err={"InstructionError": [0, "Custom"]}),
+    ]
+
+
+def test_handle_message_fills_indexes():
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(Path(tmp))
+        now = int(time.time())
+        for message in capture(now):
+            service.handle_message(message)
+
+        launch = service.index.get_launch(MINT)
+        assert launch["creator"] == CREATOR and launch["symbol"] == "TST"
+        assert launch["created_timestamp"] == now
+
+        # Failed transaction ignored, late buy is not an early buy
+        assert [t["signature"] for t in service.index.get_trades(MINT)] == ["sig-create", "sig-late"]
+        buyers = service.index.get_early_buyers(MINT)
+        assert [(b["wallet"], b["rank"], b["seconds_after_create"]) for b in buyers] == [(BUYER, 1, 2)]
+        assert buyers[0]["sol_amount"] == 2.0
+
+        record = service.creators.get_record(CREATOR)
+        assert record.total_tokens == 1
+        # Unknown creator: its pump.fun history is still fetched on the next check
+        assert not record.is_fresh()
+
+
+def test_known_creator_stays_fresh_while_subscribed():
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(Path(tmp))
+        service.subscribed_at = time.time() - 1
+        service.creators.upsert_tokens(CREATOR, [], full_refresh=True)
+
+        service.handle_message(notification("sig-create", create_event_data(int(time.time()))))
+
+        record = service.creators.get_record(CREATOR)
+        assert record.total_tokens == 1 and record.is_fresh()
+
+
+def test_prune_drops_old_trades_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(Path(tmp))
+        now = int(time.time())
+        service.handle_message(notification("sig-create", create_event_data(now), trade_event_data(now)))
+        service.handle_message(notification("sig-old", trade_event_data(now - 10 * 24 * 3600)))
+
+        assert service.index.prune(retention=24 * 3600) == 1
+        assert [t["signature"] for t in service.index.get_trades(MINT)] == ["sig-create"]
+        assert service.index.get_launch(MINT) is not None
+
+
+def test_replay_stand_in_feeds_the_service():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        now = int(time.time())
+        path = tmp / "logs.jsonl"
+        path.write_text("\n".join(capture(now)[1:]) + "\n")
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        service = make_service(tmp)
+        service.ws_url = f"ws://127.0.0.1:{port}"
+
+        async def run():
+            server = asyncio.create_task(serve_replay(str(path), port=port))
+            await asyncio.sleep(0.2)
+            try:
+                await asyncio.wait_for(service.run(), timeout=0.5)
+            except asyncio.TimeoutError:
+                pass
+            server.cancel()
+
+        asyncio.run(run())
+
+        assert service.launches >= 1
+        assert service.index.get_launch(MINT)["creator"] == CREATOR
+        assert len(service.index.get_trades(MINT)) == 2
+
+
+if __name__ == "__main__":
+    for test in (test_handle_message_fills_indexes, test_known_creator_stays_fresh_while_subscribed,
+                 test_prune_drops_old_trades_only, test_replay_stand_in_feeds_the_service):
+        test()
+    print("OK")
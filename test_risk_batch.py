@@ -0,0 +1,112 @@
+"""
+Parity tests: vectorized batch scorer vs scalar RiskScorer
+Run: python -m pytest test_risk_batch.py   (or python test_risk_batch.py)
+"""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from risk_batch import BATCH_DTYPE, analyses_to_row, build_batch, score_analyses, score_batch
+from risk_scorer import RiskScorer
+
+# Values on and around every threshold used by the scorer
+MARKET_CAPS = [0, 500, 999.99, 1000, 4999, 5000, 49999.5, 50000, 99999, 100000, 250000]
+PERCENTAGES = [0, 10, 15, 20, 20.01, 30, 30.5, 50, 50.01, 80]
+NAKAMOTO = [None, 0, 1, 9, 10, 19, 20, 49, 50, 200]
+HHI = [None, 0, 0.1, 0.25, 0.26, 0.5, 0.51, 0.8, 0.81]
+AGES = [None, 0, 0.49, 0.5, 1.99, 2, 11.99, 12, 500]
+
+
+def _flags(rng):
+    return [f"[!] flag {rng.randint(0, 99)}" for _ in range(rng.randint(0, 3))]
+
+
+def _maybe(rng, build):
+    return None if rng.random() < 0.2 else build()
+
+
+def random_analyses(rng: random.Random) -> dict:
+    """Random calculate_risk arguments (attribute-compatible stand-ins for analyzer outputs)"""
+    return dict(
+        distribution_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng),
+            top_holder_percentage=rng.choice(PERCENTAGES), total_holders=rng.randint(0, 2))),
+        creator_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng),
+            rug_percentage=rng.choice(PERCENTAGES), total_tokens_created=rng.randint(0, 2))),
+        liquidity_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng), liquidity_usd=rng.uniform(0, 20000),
+            market_cap_usd=rng.choice(MARKET_CAPS), volume_24h=rng.choice([None, 0, 0.01, 5000.0]))),
+        social_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng), has_twitter=rng.random() < 0.5,
+            has_telegram=rng.random() < 0.5, has_website=rng.random() < 0.5)),
+        wallet_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng), fresh_wallet_percentage=rng.uniform(0, 100),
+            suspected_dev_wallets=rng.randint(0, 20), total_holders=rng.randint(0, 2))),
+        sniper_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng), sniper_percentage=rng.uniform(0, 100),
+            bundle_transactions=rng.randint(0, 10))),
+        volume_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng),
+            is_fake_volume=rng.random() < 0.3, is_wash_trading=rng.random() < 0.3)),
+        distribution_metrics=_maybe(rng, lambda: {"nakamoto": rng.choice(NAKAMOTO), "hhi": rng.choice(HHI)}),
+        onchain_data=_maybe(rng, lambda: SimpleNamespace(
+            can_analyze=rng.random() < 0.8, risk_score=rng.randint(0, 100), red_flags=_flags(rng),
+            fresh_wallet_count_top10=rng.randint(0, 10), top_holder_percentage=rng.choice(PERCENTAGES))),
+        pump_dump_analysis=_maybe(rng, lambda: SimpleNamespace(
+            risk_score=rng.randint(0, 100), red_flags=_flags(rng), is_pump_dump=rng.random() < 0.3,
+            price_volatility=rng.choice([0, 50, 150, 151]), current_vs_ath_percentage=rng.uniform(0, 100))),
+        token_age_hours=rng.choice(AGES),
+    )
+
+
+def _assert_parity(cases, result):
+    for i, kwargs in enumerate(cases):
+        report = RiskScorer.calculate_risk(**kwargs)
+        assert result["overall_risk_score"][i] == report.overall_risk_score, i
+        assert result["risk_level"][i] == report.risk_level, i
+        assert result["insightx_score"][i] == report.insightx_score, i
+        assert result["additional_risk"][i] == report.additional_risk, i
+        assert result["final_risk_score"][i] == report.final_risk_score, i
+        assert result["confidence_score"][i] == report.confidence_score, i
+        assert result["confidence_level"][i] == report.confidence_level, i
+
+
+def test_random_parity():
+    rng = random.Random(40)
+    cases = [random_analyses(rng) for _ in range(5000)]
+    _assert_parity(cases, score_analyses(cases))
+
+
+def test_all_missing():
+    cases = [dict(distribution_analysis=None, creator_analysis=None, liquidity_analysis=None, social_analysis=None)]
+    _assert_parity(cases, score_analyses(cases))
+
+
+def test_dataframe_input():
+    rng = random.Random(41)
+    cases = [random_analyses(rng) for _ in range(500)]
+    batch = build_batch([analyses_to_row(**kwargs) for kwargs in cases])
+    _assert_parity(cases, score_batch(pd.DataFrame(batch)))
+
+
+def test_red_flag_count():
+    rng = random.Random(42)
+    cases = [random_analyses(rng) for _ in range(500)]
+    batch = build_batch([analyses_to_row(**kwargs) for kwargs in cases])
+    for i, kwargs in enumerate(cases):
+        assert batch["red_flags_count"][i] == len(RiskScorer.calculate_risk(**kwargs).all_red_flags)
+
+
+def test_empty_batch():
+    result = score_batch(np.zeros(0, dtype=BATCH_DTYPE))
+    assert len(result["overall_risk_score"]) == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
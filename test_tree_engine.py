@@ -0,0 +1,129 @@
+"""
+Parity tests: vectorized tree engine vs scikit-learn predict_proba
+Run: python -m pytest test_tree_engine.py   (or python test_tree_engine.py)
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from ml_module import tree_engine
+from ml_module.model_artifact import ModelArtifact
+
+MODELS_DIR = Path(__file__).parent / "ml_module" / "models"
+
+
+def _dataset(n_classes: int, n_rows: int = 600, n_features: int = 12, seed: int = 0):
+    """Skewed, partly discrete features like the extracted token features"""
+    rng = np.random.default_rng(seed)
+    X = rng.lognormal(size=(n_rows, n_features))
+    X[:, ::3] = rng.integers(0, 4, size=(n_rows, len(range(0, n_features, 3))))
+    y = (X[:, 0] + X[:, 1] * rng.uniform(0.5, 1.5, n_rows)).astype(int) % n_classes
+    return X, y
+
+
+def _fit(model, n_classes: int):
+    X, y = _dataset(n_classes)
+    scaler = StandardScaler().fit(X)
+    model.fit(scaler.transform(X), y)
+    # Fresh rows, including values exactly on split thresholds
+    X_test, _ = _dataset(n_classes, n_rows=1500, seed=1)
+    X_test = scaler.transform(X_test)
+    X_test[:50, 0] = np.ravel(model.estimators_)[0].tree_.threshold[0]
+    return model, scaler, X_test
+
+
+def test_random_forest_parity():
+    for n_classes in (2, 3):
+        model, scaler, X = _fit(RandomForestClassifier(n_estimators=40, random_state=0), n_classes)
+        artifact = ModelArtifact.from_sklearn(model, scaler)
+        # Leaf values are summed in one reduction, not tree by tree
+        assert np.allclose(artifact.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+        assert np.array_equal(artifact.predict(X), model.predict(X))
+
+
+def test_random_forest_apply():
+    model, scaler, X = _fit(RandomForestClassifier(n_estimators=10, random_state=0), 3)
+    engine = ModelArtifact.from_sklearn(model, scaler).engine
+    offsets = engine.roots
+    expected = np.column_stack([est.apply(X.astype(np.float32)) for est in model.estimators_]) + offsets
+    assert np.array_equal(engine.apply(X), expected)
+
+
+def test_gradient_boosting_parity():
+    for n_classes in (2, 3):
+        model, scaler, X = _fit(GradientBoostingClassifier(n_estimators=60, random_state=0), n_classes)
+        artifact = ModelArtifact.from_sklearn(model, scaler)
+        proba = artifact.predict_proba(X)
+        # expit vs 1 / (1 + exp(-x)) can differ in the last bit
+        assert np.allclose(proba, model.predict_proba(X), rtol=0, atol=1e-12)
+        assert np.array_equal(artifact.predict(X), model.predict(X))
+
+
+def test_chunk_boundaries_and_step_schedule():
+    model, scaler, X = _fit(RandomForestClassifier(n_estimators=15, random_state=0), 3)
+    engine = ModelArtifact.from_sklearn(model, scaler).engine
+    expected = engine.apply(X)
+    saved = tree_engine.CHUNK_ROWS, tree_engine.FIRST_STEPS, tree_engine.STEPS_PER_CHECK
+    try:
+        # Finished pairs dropped after every step, mid-tree, or never (deeper than any tree)
+        for chunk_rows, first_steps, steps_per_check in (
+            (1, 1, 1), (7, 3, 2), (512, 5, 2), (len(X) + 1, 64, 1)
+        ):
+            tree_engine.CHUNK_ROWS = chunk_rows
+            tree_engine.FIRST_STEPS = first_steps
+            tree_engine.STEPS_PER_CHECK = steps_per_check
+            assert np.array_equal(engine.apply(X), expected), chunk_rows
+    finally:
+        tree_engine.CHUNK_ROWS, tree_engine.FIRST_STEPS, tree_engine.STEPS_PER_CHECK = saved
+
+
+def test_memory_mapped_round_trip():
+    model, scaler, X = _fit(GradientBoostingClassifier(n_estimators=20, random_state=0), 3)
+    names = [f"f{i}" for i in range(X.shape[1])]
+    artifact = ModelArtifact.from_sklearn(model, scaler, names)
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact.save(Path(tmp) / "model.arrays")
+        loaded = ModelArtifact.load(Path(tmp) / "model.arrays", mmap=True)
+        assert np.array_equal(loaded.predict_proba(X), artifact.predict_proba(X))
+        assert np.array_equal(loaded.scaler.transform(X), scaler.transform(X))
+        assert loaded.meta["feature_names"] == names
+
+
+def test_empty_and_bad_shape():
+    model, scaler, X = _fit(RandomForestClassifier(n_estimators=5, random_state=0), 3)
+    artifact = ModelArtifact.from_sklearn(model, scaler)
+    assert artifact.predict_proba(X[:0]).shape == (0, 3)
+    try:
+        artifact.predict_proba(X[:, :-1])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for wrong feature count")
+
+
+def test_shipped_model_parity():
+    """The trained risk model in ml_module/models (when it loads with this scikit-learn)"""
+    import joblib
+
+    try:
+        model = joblib.load(MODELS_DIR / "random_forest_latest.pkl")
+        scaler = joblib.load(MODELS_DIR / "scaler_latest.pkl")
+    except Exception as e:
+        print(f"[SKIP] shipped model not loadable: {e}")
+        return
+
+    rng = np.random.default_rng(2)
+    n = model.n_features_in_
+    X = scaler.transform(rng.normal(size=(2000, n)) * rng.choice([0, 1, 10, 1000], size=(2000, n)))
+    artifact = ModelArtifact.from_sklearn(model, scaler)
+    assert np.allclose(artifact.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
@@ -7,6 +7,7 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 from solders.pubkey import Pubkey
 from solana.rpc.api import Client
+from holder_activity import analyze_selling_activity
 import time
 
 
@@ -77,7 +78,7 @@ class TopHoldersAnalyzer:
             # Add more exchange addresses
         }
 
-    def analyze_top_holders(self, mint_address: str, token_data: Dict = None) -> TopHoldersAnalysis:
+    def analyze_top_holders(self, mint_address: str, token_data: Dict = None, ctx=None) -> TopHoldersAnalysis:
         """
         Analyze top holders of a token for suspicious patterns
 
@@ -86,14 +87,23 @@ class TopHoldersAnalyzer:
         - Coordinated exits (multiple top holders selling)
         - Fresh wallets in top positions
         - Concentration of holdings
+
+        With a ScanContext, largest accounts and supply already loaded for
+        the scan are used before falling back to Solscan.
         """
         try:
             # Get top holders
-            holders = self._get_top_holders(mint_address)
+            holders = self._get_top_holders(mint_address, ctx)
 
             if not holders or len(holders) == 0:
                 return self._create_empty_analysis("Could not fetch holder data")
 
+            # Recent selling of the top 10 (one batched signature request)
+            selling = analyze_selling_activity(
+                self.http_client, self.rpc_url, mint_address,
+                [holder.get("address") for holder in holders[:10]], ctx
+            )
+
             # Analyze each holder
             analyzed_holders = []
             for holder in holders[:10]:  # Top 10
@@ -102,6 +112,11 @@ class TopHoldersAnalyzer:
                     holder.get("balance", 0),
                     holder.get("percentage", 0)
                 )
+
+                activity = selling.holders.get(holder_info.address)
+                if activity:
+                    holder_info.has_sold_recently = activity.has_sold_recently
+
                 analyzed_holders.append(holder_info)
 
             # Calculate concentration
@@ -123,8 +138,8 @@ class TopHoldersAnalyzer:
             # Detect coordinated exit (3+ top holders selling at same time)
             coordinated_exit = holders_selling_count >= 3
 
-            # Detect whale dumping (top holder sold >20% in recent time)
-            whale_dumping = any(
+            # Detect whale dumping (top holder sold >20% in recent time, or a top 3 holder is selling)
+            whale_dumping = selling.whale_dumping_detected or any(
                 h.sell_percentage and h.sell_percentage > 20
                 for h in analyzed_holders[:3]
             )
@@ -215,13 +230,16 @@ class TopHoldersAnalyzer:
             print(f"[ERROR] Top holders analysis failed: {e}")
             return self._create_empty_analysis(f"Analysis error: {str(e)}")
 
-    def _get_top_holders(self, mint_address: str) -> List[Dict]:
+    def _get_top_holders(self, mint_address: str, ctx=None) -> List[Dict]:
         """
         Get top token holders from various sources
-        Priority: DexScreener > Solana RPC
+        Priority: scan context > DexScreener > Solana RPC
         """
-        # Try DexScreener first (has holder data for some tokens)
-        holders = self._get_holders_from_dexscreener(mint_address)
+        if ctx is not None:
+            holders = self._get_holders_from_context(ctx)
+        else:
+            # Try DexScreener first (has holder data for some tokens)
+            holders = self._get_holders_from_dexscreener(mint_address)
 
         if holders and len(holders) > 0:
             return holders
@@ -231,6 +249,31 @@ class TopHoldersAnalyzer:
 
         return holders
 
+    def _get_holders_from_context(self, ctx) -> List[Dict]:
+        """
+        Build holders from the scan's largest accounts + supply
+
+        Token accounts are resolved to their owner wallets, the same
+        addresses the Solscan path returns.
+        """
+        accounts = ctx.largest_holders()
+        supply = ctx.supply()
+
+        if not accounts or not supply:
+            return []
+
+        holders = []
+        for account in accounts:
+            balance = float(account.get("uiAmount") or 0)
+            if balance > 0:
+                holders.append({
+                    "address": account.get("address", ""),
+                    "balance": balance,
+                    "percentage": balance / supply * 100
+                })
+
+        return holders
+
     def _get_holders_from_dexscreener(self, mint_address: str) -> List[Dict]:
         """Try to get holder data from DexScreener"""
         try:
@@ -290,13 +333,10 @@ class TopHoldersAnalyzer:
         # Get transaction count
         tx_count = self._get_transaction_count(address)
 
-        # Check recent selling (simplified - would need transaction history)
+        # Recent selling is filled in by analyze_top_holders (batched for all holders)
         has_sold_recently = False
         sell_percentage = None
 
-        # In a full implementation, you'd check recent transactions
-        # For now, we'll estimate based on other data
-
         return HolderInfo(
             address=address,
             balance=balance,
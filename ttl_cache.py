@@ -0,0 +1,62 @@
+"""Small thread-safe in-process cache with per-entry expiry"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+
+class TTLCache:
+    """LRU cache whose entries expire `ttl` seconds after being stored"""
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.lock = Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value if present and not expired"""
+        with self.lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Get all present, non-expired values for `keys`"""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def pop(self, key: Hashable):
+        """Remove a key"""
+        with self.lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all keys"""
+        with self.lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self.lock:
+            return len(self._data)
@@ -0,0 +1,749 @@
+"""
+Watchlist re-scoring scheduler
+Keeps watched mints in a priority queue ordered by their next due time
+(sooner for young or volatile tokens), re-runs only the analyzers whose
+inputs went stale and pushes score changes to subscribed Discord and
+Telegram channels
+
+Run standalone: python watchlist.py
+"""
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+import httpx
+
+from liquidity_analyzer import LiquidityAnalyzer
+from creator_checker import CreatorChecker
+from social_checker import SocialChecker
+from wallet_analyzer import WalletAnalyzer
+from onchain_analyzer import OnChainAnalyzer
+from sniper_detector import SniperDetector
+from volume_analyzer import VolumeAnalyzer
+from insightx_api import InsightXAPI
+from pump_dump_detector import PumpDumpDetector
+from authority_checker import AuthorityChecker
+from risk_scorer import IncrementalRiskScorer
+from scan_context import ScanContext
+from holder_snapshots import snapshot_store
+from rate_limit import get_bucket
+from ml_module.predictor import get_predictor
+from config import ML_FEATURE_MAX_AGE
+
+DATA_DIR = os.getenv("DATA_DIR", ".")
+WATCHLIST_DB_FILE = os.path.join(DATA_DIR, "watchlist.db")
+
+# Shared worker pool size
+WATCHLIST_WORKERS = int(os.getenv("WATCHLIST_WORKERS", "8"))
+# Re-scoring interval bounds (seconds)
+MIN_RESCORE_INTERVAL = 60
+MAX_RESCORE_INTERVAL = 6 * 3600
+# Re-read the watchlist table for mints added by other processes (seconds)
+STORE_SYNC_INTERVAL = 30
+# Batch ML predictions for all watched mints from stored feature snapshots (seconds)
+ML_REFRESH_INTERVAL = 300
+# Push a delta when the safety score moves at least this much (or the level changes)
+SCORE_DELTA_THRESHOLD = 5
+# Watchlist size limits (every watched mint costs background requests)
+MAX_WATCHED_MINTS = int(os.getenv("WATCHLIST_MAX_MINTS", "500"))
+MAX_CHANNEL_SUBSCRIPTIONS = int(os.getenv("WATCHLIST_MAX_PER_CHANNEL", "25"))
+
+# Base interval by token age: (max age in hours, interval in seconds)
+AGE_INTERVALS = [
+    (1, 60),
+    (6, 300),
+    (24, 900),
+    (24 * 7, 3600),
+]
+OLD_TOKEN_INTERVAL = 3 * 3600
+
+# Analyzer stages in run order: how long their inputs stay fresh (seconds),
+# which request budget they spend, and which stages feed them
+STAGES = {
+    "market": {"ttl": 120, "budget": "dexscreener", "cost": 1, "depends": []},
+    "volume": {"ttl": 120, "budget": None, "cost": 0, "depends": ["market"]},
+    "pump_dump": {"ttl": 300, "budget": "dexscreener", "cost": 1, "depends": []},
+    "holders": {"ttl": 300, "budget": "rpc", "cost": 8, "depends": []},
+    "wallet": {"ttl": 900, "budget": "pumpfun", "cost": 1, "depends": []},
+    "distribution": {"ttl": 1800, "budget": "insightx", "cost": 1, "depends": []},
+    "creator": {"ttl": 3600, "budget": "pumpfun", "cost": 2, "depends": []},
+    "social": {"ttl": 24 * 3600, "budget": None, "cost": 0, "depends": []},
+    "sniper": {"ttl": 6 * 3600, "budget": "rpc", "cost": 2, "depends": []},
+    "authority": {"ttl": 6 * 3600, "budget": "rpc", "cost": 1, "depends": []},
+}
+
+# IncrementalRiskScorer argument fed by each stage (versioned by its refresh time).
+# The authority stage is not scored (as in the web API): its red flags are
+# pushed with the score delta
+SCORER_ARGUMENTS = {
+    "creator": "creator_analysis",
+    "market": "liquidity_analysis",
+    "social": "social_analysis",
+    "wallet": "wallet_analysis",
+    "sniper": "sniper_analysis",
+    "volume": "volume_analysis",
+    "distribution": "distribution_metrics",
+    "holders": "onchain_data",
+    "pump_dump": "pump_dump_analysis",
+}
+
+
+@dataclass
+class WatchedToken:
+    """In-memory state of one watched mint"""
+    mint: str
+    added_at: float
+    created_timestamp: Optional[float] = None  # Unix seconds
+    last_score: Optional[int] = None  # Safety score (100 = safe)
+    last_risk_level: Optional[str] = None
+    score_volatility: float = 0.0  # Moving average of absolute score changes
+    pushed_red_flags: List[str] = field(default_factory=list)  # Red flags at the last pushed delta
+    results: Dict[str, object] = field(default_factory=dict)
+    refreshed: Dict[str, float] = field(default_factory=dict)
+    scorer: IncrementalRiskScorer = field(default_factory=IncrementalRiskScorer)
+    ml_score: Optional[int] = None  # From the latest stored feature snapshot
+
+    @property
+    def token_data(self) -> Optional[Dict]:
+        market = self.results.get("market")
+        return market[0] if market else None
+
+
+@dataclass
+class ScoreDelta:
+    """Score change of a watched mint, pushed to subscribers"""
+    mint: str
+    name: str
+    symbol: str
+    old_score: Optional[int]
+    new_score: int
+    old_risk_level: Optional[str]
+    new_risk_level: str
+    rerun_stages: List[str]
+    new_red_flags: List[str]
+    ml_score: Optional[int] = None
+
+    @property
+    def change(self) -> int:
+        return self.new_score - (self.old_score if self.old_score is not None else self.new_score)
+
+
+def safety_level(safety_score: int) -> str:
+    """Same thresholds as the web API"""
+    if safety_score >= 70:
+        return "SAFE"
+    if safety_score >= 30:
+        return "MODERATE"
+    return "DANGER"
+
+
+class WatchlistStore:
+    """SQLite table of watched mints and their channel subscriptions"""
+
+    def __init__(self, db_file: str = WATCHLIST_DB_FILE):
+        self.db_file = db_file
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_db(self):
+        """Initialize database with tables"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS watchlist (
+                        mint TEXT PRIMARY KEY,
+                        added_at REAL NOT NULL,
+                        last_score INTEGER,
+                        last_risk_level TEXT,
+                        last_rescored REAL
+                    )
+                ''')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS watch_subscriptions (
+                        mint TEXT NOT NULL,
+                        platform TEXT NOT NULL,
+                        channel_id TEXT NOT NULL,
+                        added_at REAL NOT NULL,
+                        PRIMARY KEY (mint, platform, channel_id)
+                    )
+                ''')
+        finally:
+            conn.close()
+
+    def add(self, mint: str, platform: Optional[str] = None, channel_id: Optional[str] = None) -> bool:
+        """
+        Watch a mint, optionally pushing its deltas to a channel
+
+        Returns False (and changes nothing) when the mint would exceed
+        MAX_WATCHED_MINTS or the channel MAX_CHANNEL_SUBSCRIPTIONS.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                known = conn.execute('SELECT 1 FROM watchlist WHERE mint = ?', (mint,)).fetchone()
+                if not known:
+                    watched = conn.execute('SELECT COUNT(*) FROM watchlist').fetchone()[0]
+                    if watched >= MAX_WATCHED_MINTS:
+                        return False
+
+                if platform and channel_id:
+                    subscribed = conn.execute(
+                        'SELECT 1 FROM watch_subscriptions WHERE mint = ? AND platform = ? AND channel_id = ?',
+                        (mint, platform, str(channel_id))
+                    ).fetchone()
+                    if not subscribed:
+                        count = conn.execute(
+                            'SELECT COUNT(*) FROM watch_subscriptions WHERE platform = ? AND channel_id = ?',
+                            (platform, str(channel_id))
+                        ).fetchone()[0]
+                        if count >= MAX_CHANNEL_SUBSCRIPTIONS:
+                            return False
+
+                conn.execute('INSERT OR IGNORE INTO watchlist (mint, added_at) VALUES (?, ?)', (mint, now))
+                if platform and channel_id:
+                    conn.execute(
+                        'INSERT OR IGNORE INTO watch_subscriptions (mint, platform, channel_id, added_at) '
+                        'VALUES (?, ?, ?, ?)',
+                        (mint, platform, str(channel_id), now)
+                    )
+        finally:
+            conn.close()
+
+        # Watched mints also get holder snapshots (balance deltas without extra calls)
+        snapshot_store.watch(mint)
+        return True
+
+    def remove(self, mint: str, platform: Optional[str] = None, channel_id: Optional[str] = None) -> bool:
+        """
+        Remove a channel subscription, or the whole mint when no channel is given
+
+        The mint stops being watched once its last subscription is removed.
+        Returns False when there was nothing to remove.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                if platform and channel_id:
+                    removed = conn.execute(
+                        'DELETE FROM watch_subscriptions WHERE mint = ? AND platform = ? AND channel_id = ?',
+                        (mint, platform, str(channel_id))
+                    ).rowcount > 0
+                    remaining = conn.execute(
+                        'SELECT COUNT(*) FROM watch_subscriptions WHERE mint = ?', (mint,)
+                    ).fetchone()[0]
+                    if remaining:
+                        return removed
+                else:
+                    removed = conn.execute('DELETE FROM watch_subscriptions WHERE mint = ?', (mint,)).rowcount > 0
+
+                mint_removed = conn.execute('DELETE FROM watchlist WHERE mint = ?', (mint,)).rowcount > 0
+        finally:
+            conn.close()
+
+        snapshot_store.unwatch(mint)
+        # A channel only removes its own subscription
+        return removed if platform and channel_id else removed or mint_removed
+
+    def get_watched(self) -> Dict[str, Dict]:
+        """All watched mints with their last known score"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT mint, added_at, last_score, last_risk_level, last_rescored FROM watchlist'
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return {
+            row[0]: {
+                'added_at': row[1],
+                'last_score': row[2],
+                'last_risk_level': row[3],
+                'last_rescored': row[4]
+            }
+            for row in rows
+        }
+
+    def get_subscriptions(self, mint: str) -> List[Dict]:
+        """Channels subscribed to a mint"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT platform, channel_id FROM watch_subscriptions WHERE mint = ?', (mint,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return [{'platform': row[0], 'channel_id': row[1]} for row in rows]
+
+    def get_channel_mints(self, platform: str, channel_id: str) -> List[Dict]:
+        """Mints a channel is subscribed to, with their last score"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT w.mint, w.last_score, w.last_risk_level, w.last_rescored
+                FROM watch_subscriptions s JOIN watchlist w ON w.mint = s.mint
+                WHERE s.platform = ? AND s.channel_id = ?
+                ORDER BY s.added_at
+            ''', (platform, str(channel_id))).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {'mint': row[0], 'last_score': row[1], 'last_risk_level': row[2], 'last_rescored': row[3]}
+            for row in rows
+        ]
+
+    def save_score(self, mint: str, score: int, risk_level: str):
+        """Record the latest score of a mint"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'UPDATE watchlist SET last_score = ?, last_risk_level = ?, last_rescored = ? WHERE mint = ?',
+                    (score, risk_level, time.time(), mint)
+                )
+        finally:
+            conn.close()
+
+
+class ChannelNotifier:
+    """Subscriber that posts score deltas to Discord and Telegram channels"""
+
+    def __init__(self, store: WatchlistStore,
+                 discord_token: Optional[str] = None, telegram_token: Optional[str] = None):
+        self.store = store
+        self.discord_token = discord_token or os.getenv("DISCORD_BOT_TOKEN")
+        self.telegram_token = telegram_token or os.getenv("TELEGRAM_BOT_TOKEN")
+        self.client = httpx.Client(timeout=15.0)
+
+    @staticmethod
+    def format_delta(delta: ScoreDelta) -> str:
+        """Plain-text alert"""
+        if delta.old_score is None:
+            change = f"{delta.new_score}/100"
+        else:
+            change = f"{delta.old_score} -> {delta.new_score}/100 ({delta.change:+d})"
+
+        lines = [
+            f"[WATCH] {delta.name} ({delta.symbol}) safety score {change}",
+            f"Level: {delta.old_risk_level or 'N/A'} -> {delta.new_risk_level}",
+            f"Token: {delta.mint}",
+        ]
+        if delta.ml_score is not None:
+            lines.insert(2, f"ML score: {delta.ml_score}/100")
+        for flag in delta.new_red_flags[:5]:
+            lines.append(f"  {flag}")
+        return "\n".join(lines)
+
+    def __call__(self, delta: ScoreDelta):
+        text = self.format_delta(delta)
+
+        for subscription in self.store.get_subscriptions(delta.mint):
+            platform = subscription['platform']
+            channel_id = subscription['channel_id']
+            try:
+                if platform == "discord" and self.discord_token:
+                    get_bucket("discord").acquire()
+                    self.client.post(
+                        f"https://discord.com/api/v10/channels/{channel_id}/messages",
+                        headers={"Authorization": f"Bot {self.discord_token}"},
+                        json={"content": text}
+                    )
+                elif platform == "telegram" and self.telegram_token:
+                    get_bucket("telegram").acquire()
+                    self.client.post(
+                        f"https://api.telegram.org/bot{self.telegram_token}/sendMessage",
+                        json={"chat_id": channel_id, "text": text}
+                    )
+            except Exception as e:
+                print(f"[WATCHLIST] Error notifying {platform} channel {channel_id}: {e}")
+
+    def close(self):
+        self.client.close()
+
+
+class WatchlistScheduler:
+    """
+    Priority-queue scheduler over watched mints
+
+    Each tick pops the mints that are due, re-runs their stale stages on a
+    shared worker pool (every stage spends from the global request budget
+    of its upstream) and schedules the next run from token age and
+    volatility.
+    """
+
+    def __init__(self, store: WatchlistStore = None, workers: int = WATCHLIST_WORKERS):
+        self.store = store or watchlist_store
+        self.workers = workers
+        self._tokens: Dict[str, WatchedToken] = {}
+        self._heap: List[tuple] = []
+        self._due: Dict[str, float] = {}  # Current due time per queued mint (older heap entries are skipped)
+        self._running: Set[str] = set()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._subscribers: List[Callable[[ScoreDelta], None]] = []
+        self._worker_state = threading.local()
+        self._worker_analyzers = []
+        self._last_sync = 0.0
+        self._last_ml_refresh = 0.0
+
+    def subscribe(self, callback: Callable[[ScoreDelta], None]):
+        """Call `callback(delta)` for every pushed score change"""
+        self._subscribers.append(callback)
+
+    def add(self, mint: str, due: Optional[float] = None):
+        """Track a mint (first run is due immediately)"""
+        with self._lock:
+            if mint not in self._tokens:
+                self._tokens[mint] = WatchedToken(mint=mint, added_at=time.time())
+            if mint not in self._running:
+                self._schedule(mint, due if due is not None else time.time())
+        self._wakeup.set()
+
+    def remove(self, mint: str):
+        """Stop tracking a mint (queued heap entries are skipped)"""
+        with self._lock:
+            self._tokens.pop(mint, None)
+            self._due.pop(mint, None)
+
+    def _schedule(self, mint: str, due: float):
+        """Queue a mint (caller holds the lock)"""
+        self._due[mint] = due
+        heapq.heappush(self._heap, (due, next(self._counter), mint))
+
+    def sync_store(self):
+        """Pick up mints added or removed through the store (other processes)"""
+        watched = self.store.get_watched()
+
+        for mint in set(self._tokens) - set(watched):
+            self.remove(mint)
+
+        for mint, row in watched.items():
+            if mint in self._tokens:
+                continue
+            self.add(mint)
+            with self._lock:
+                token = self._tokens[mint]
+                token.added_at = row['added_at']
+                token.last_score = row['last_score']
+                token.last_risk_level = row['last_risk_level']
+
+        self._last_sync = time.time()
+
+    def refresh_ml(self):
+        """
+        Predict all watched mints with a recent stored feature snapshot in one batch
+
+        Mints whose latest snapshot is older than ML_FEATURE_MAX_AGE get no
+        ML score rather than one computed from stale features.
+        """
+        predictor = get_predictor()
+        if predictor is not None:
+            with self._lock:
+                mints = list(self._tokens)
+            predictions = predictor.predict_stored_batch(mints, max_age=ML_FEATURE_MAX_AGE)
+            with self._lock:
+                for mint in mints:
+                    token = self._tokens.get(mint)
+                    if token is not None:
+                        prediction = predictions.get(mint)
+                        token.ml_score = prediction.ml_score if prediction else None
+
+        self._last_ml_refresh = time.time()
+
+    def next_interval(self, token: WatchedToken) -> float:
+        """Seconds until the next run: shorter for young and volatile tokens"""
+        interval = OLD_TOKEN_INTERVAL
+        if token.created_timestamp:
+            age_hours = (time.time() - token.created_timestamp) / 3600
+            for max_age, age_interval in AGE_INTERVALS:
+                if age_hours < max_age:
+                    interval = age_interval
+                    break
+
+        price_move = 0.0
+        token_data = token.token_data
+        if token_data:
+            changes = token_data.get("priceChange") or {}
+            price_move = max(abs(changes.get("m5", 0) or 0) * 4, abs(changes.get("h1", 0) or 0))
+
+        # 10 points of score movement or a 50% hourly move halve the interval
+        factor = 1 + token.score_volatility / 10 + price_move / 50
+        return max(MIN_RESCORE_INTERVAL, min(MAX_RESCORE_INTERVAL, interval / factor))
+
+    @staticmethod
+    def stale_stages(token: WatchedToken, now: float) -> List[str]:
+        """Stages whose inputs expired, plus stages fed by them"""
+        stale = []
+        for name, stage in STAGES.items():
+            refreshed = token.refreshed.get(name)
+            if (refreshed is None or now - refreshed >= stage["ttl"]
+                    or any(dep in stale for dep in stage["depends"])):
+                stale.append(name)
+        return stale
+
+    def _get_worker_analyzers(self) -> Dict:
+        """Get analyzers owned by the current worker thread"""
+        analyzers = getattr(self._worker_state, "analyzers", None)
+
+        if analyzers is None:
+            analyzers = {
+                "liquidity": LiquidityAnalyzer(),
+                "creator": CreatorChecker(),
+                "social": SocialChecker(),
+                "wallet": WalletAnalyzer(),
+                "onchain": OnChainAnalyzer(),
+                "sniper": SniperDetector(),
+                "insightx": InsightXAPI(),
+                "pump_dump": PumpDumpDetector(),
+                "authority": AuthorityChecker(),
+            }
+            self._worker_state.analyzers = analyzers
+            with self._lock:
+                self._worker_analyzers.append(analyzers)
+
+        return analyzers
+
+    def _close_worker_analyzers(self):
+        """Close analyzers created by worker threads"""
+        with self._lock:
+            for analyzers in self._worker_analyzers:
+                for analyzer in analyzers.values():
+                    try:
+                        analyzer.close()
+                    except Exception:
+                        pass
+            self._worker_analyzers = []
+
+    def _run_stage(self, name: str, token: WatchedToken, a: Dict, ctx: ScanContext):
+        """Run one analyzer stage and return its result"""
+        mint = token.mint
+        token_data = token.token_data
+
+        if name == "market":
+            data = a["liquidity"].get_token_data(mint, ctx)
+            if not data:
+                return None
+            return data, a["liquidity"].analyze_liquidity(mint, ctx)
+
+        # Every other stage needs market data
+        if not token_data:
+            return None
+
+        if name == "volume":
+            liquidity_analysis = token.results["market"][1]
+            liquidity = liquidity_analysis.liquidity_usd if liquidity_analysis else 0
+            return VolumeAnalyzer.analyze_volume(token_data, liquidity)
+        if name == "pump_dump":
+            return a["pump_dump"].analyze_pump_dump(mint, token_data)
+        if name == "holders":
+            return a["onchain"].get_token_holders(mint, ctx)
+        if name == "wallet":
+            response = a["wallet"].client.get(
+                f"https://frontend-api.pump.fun/coins/{mint}/holders",
+                timeout=10.0
+            )
+            holders_data = response.json() if response.status_code == 200 else None
+            if holders_data:
+                return a["wallet"].analyze_holders(holders_data, token_data.get("creator"), mint)
+            return None
+        if name == "distribution":
+            return a["insightx"].get_distribution_metrics(mint, network="sol")
+        if name == "creator":
+            creator = token_data.get("creator")
+            return a["creator"].analyze_creator(creator) if creator else None
+        if name == "social":
+            return a["social"].analyze_social(token_data)
+        if name == "sniper":
+            return a["sniper"].analyze_snipers(mint, token_data.get("created_timestamp"), ctx)
+        if name == "authority":
+            return a["authority"].check_authority(mint, ctx)
+        return None
+
+    def rescore(self, mint: str) -> Optional[ScoreDelta]:
+        """Re-run stale stages of a mint and return the delta if it should be pushed"""
+        token = self._tokens.get(mint)
+        if token is None:
+            return None
+
+        now = time.time()
+        stale = self.stale_stages(token, now)
+        a = self._get_worker_analyzers()
+        ctx = ScanContext(mint)
+
+        try:
+            for name in stale:
+                if name != "market" and not token.token_data:
+                    # Every other stage needs market data: leave them stale
+                    # (unmarked, no budget spent) until the token trades
+                    break
+                stage = STAGES[name]
+                if stage["budget"]:
+                    get_bucket(stage["budget"]).acquire(stage["cost"])
+                try:
+                    token.results[name] = self._run_stage(name, token, a, ctx)
+                except Exception as e:
+                    print(f"[WATCHLIST] {name} failed for {mint[:8]}: {e}")
+                    token.results.setdefault(name, None)
+                token.refreshed[name] = now
+        finally:
+            ctx.close()
+
+        token_data = token.token_data
+        if not token_data:
+            # Not trading (yet): retry market data on the next run
+            token.refreshed.pop("market", None)
+            return None
+
+        created = token_data.get("created_timestamp")
+        if created:
+            token.created_timestamp = created / 1000 if created > 10000000000 else created
+
+        token_age_hours = (now - token.created_timestamp) / 3600 if token.created_timestamp else None
+        r = token.results
+        # Only components whose stages re-ran since the last update are recomputed
+        versions = {arg: token.refreshed.get(name) for name, arg in SCORER_ARGUMENTS.items()}
+        risk_report = token.scorer.update(
+            None,  # distribution_analysis
+            r.get("creator"),
+            r["market"][1],
+            r.get("social"),
+            r.get("wallet"),
+            r.get("sniper"),
+            r.get("volume"),
+            r.get("distribution"),
+            r.get("holders"),
+            r.get("pump_dump"),
+            token_age_hours,
+            versions=versions
+        )
+
+        score = 100 - risk_report.final_risk_score
+        level = safety_level(score)
+        old_score, old_level = token.last_score, token.last_risk_level
+
+        if old_score is not None:
+            token.score_volatility = 0.7 * token.score_volatility + 0.3 * abs(score - old_score)
+
+        token.last_score = score
+        token.last_risk_level = level
+        self.store.save_score(mint, score, level)
+
+        if old_score is not None and abs(score - old_score) < SCORE_DELTA_THRESHOLD and level == old_level:
+            return None
+
+        authority = r.get("authority")
+        red_flags = risk_report.all_red_flags + (authority.red_flags if authority else [])
+        previous_flags = set(token.pushed_red_flags)
+        token.pushed_red_flags = red_flags
+
+        return ScoreDelta(
+            mint=mint,
+            name=token_data.get("name", "Unknown"),
+            symbol=token_data.get("symbol", "???"),
+            old_score=old_score,
+            new_score=score,
+            old_risk_level=old_level,
+            new_risk_level=level,
+            rerun_stages=stale,
+            new_red_flags=[f for f in red_flags if f not in previous_flags],
+            ml_score=token.ml_score
+        )
+
+    def _process(self, mint: str):
+        """Worker task: rescore, notify, reschedule"""
+        try:
+            delta = self.rescore(mint)
+            if delta is not None:
+                for callback in self._subscribers:
+                    try:
+                        callback(delta)
+                    except Exception as e:
+                        print(f"[WATCHLIST] Subscriber error: {e}")
+        except Exception as e:
+            print(f"[WATCHLIST] Error rescoring {mint[:8]}: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(mint)
+                token = self._tokens.get(mint)
+                if token is not None:
+                    self._schedule(mint, time.time() + self.next_interval(token))
+            self._wakeup.set()
+
+    def run(self):
+        """Dispatch due mints to the worker pool until stopped"""
+        max_in_flight = self.workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watchlist") as pool:
+            try:
+                while not self._stop.is_set():
+                    if time.time() - self._last_sync >= STORE_SYNC_INTERVAL:
+                        try:
+                            self.sync_store()
+                        except Exception as e:
+                            print(f"[WATCHLIST] Error reading watchlist: {e}")
+
+                    if time.time() - self._last_ml_refresh >= ML_REFRESH_INTERVAL:
+                        try:
+                            self.refresh_ml()
+                        except Exception as e:
+                            self._last_ml_refresh = time.time()
+                            print(f"[WATCHLIST] Error refreshing ML predictions: {e}")
+
+                    self._wakeup.clear()
+                    now = time.time()
+                    wait = STORE_SYNC_INTERVAL
+
+                    with self._lock:
+                        while self._heap and len(self._running) < max_in_flight:
+                            due, _, mint = self._heap[0]
+                            if self._due.get(mint) != due:
+                                heapq.heappop(self._heap)  # Rescheduled or removed
+                                continue
+                            if due > now:
+                                wait = min(wait, due - now)
+                                break
+                            heapq.heappop(self._heap)
+                            del self._due[mint]
+                            self._running.add(mint)
+                            pool.submit(self._process, mint)
+
+                    self._wakeup.wait(wait)
+            finally:
+                self._close_worker_analyzers()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+
+# Global store shared by the web API and the scheduler
+watchlist_store = WatchlistStore()
+
+
+if __name__ == "__main__":
+    scheduler = WatchlistScheduler()
+    notifier = ChannelNotifier(watchlist_store)
+    scheduler.subscribe(notifier)
+    scheduler.subscribe(lambda d: print(f"[WATCHLIST] {d.symbol}: {d.old_score} -> {d.new_score} ({', '.join(d.rerun_stages)})"))
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    finally:
+        notifier.close()
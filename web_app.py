@@ -3,6 +3,7 @@ SCAM AI - AI-Powered Solana Security Scanner
 Flask Web Application & API
 """
 from flask import Flask, render_template, request, jsonify, Response
+import hmac
 import json
 import sys
 from io import StringIO
@@ -19,6 +20,10 @@ from sniper_detector import SniperDetector
 from volume_analyzer import VolumeAnalyzer
 from risk_scorer import RiskScorer
 from insightx_api import InsightXAPI
+from scan_context import ScanContext
+from holder_snapshots import snapshot_store
+from watchlist import watchlist_store
+from config import ML_FEATURE_MAX_AGE, WATCHLIST_API_TOKEN
 from pump_dump_detector import PumpDumpDetector
 from authority_checker import AuthorityChecker
 from stats import tracker
@@ -26,20 +31,22 @@ from database import db
 
 # Import ML module
 import asyncio
-from ml_module.predictor import TokenPredictor
+from ml_module.predictor import get_predictor
 from ml_module.feature_extractor import TokenFeatureExtractor
+from ml_module.feature_store import FeatureStore, load_or_extract
 
 app = Flask(__name__)
 
-# Initialize ML predictor (once at startup)
+# Initialize ML components. The model loads in the background so startup is
+# not blocked; scans use it once it is ready
 try:
-    ml_predictor = TokenPredictor()
     ml_extractor = TokenFeatureExtractor()
+    ml_feature_store = FeatureStore()
     ml_enabled = True
-    print("[ML] Modele ML charge avec succes!")
+    threading.Thread(target=get_predictor, name="ml-model-loader", daemon=True).start()
 except Exception as e:
-    ml_predictor = None
     ml_extractor = None
+    ml_feature_store = None
     ml_enabled = False
     print(f"[ML] Erreur chargement modele ML: {e}")
 
@@ -81,10 +88,115 @@ def get_stats():
     """Get scan statistics"""
     # Use database stats instead of file-based tracker
     db_stats = db.get_stats()
-    db_stats['ml_enabled'] = ml_enabled  # Add ML status
+    ml_predictor = get_predictor() if ml_enabled else None
+    db_stats['ml_enabled'] = ml_predictor is not None  # Add ML status
+    if ml_predictor is not None and ml_predictor.cache is not None:
+        db_stats['ml_cache'] = ml_predictor.cache.stats()
     return jsonify(db_stats), 200
 
 
+@app.route('/api/result/<mint_address>', methods=['GET'])
+def get_latest_result(mint_address):
+    """
+    Get the latest stored scan result for a token (no rescan)
+    Query parameter: max_age (seconds, optional)
+    """
+    max_age = request.args.get('max_age', type=int)
+    latest = db.get_latest_result(mint_address.strip(), max_age=max_age)
+
+    if not latest:
+        return jsonify({"error": "No stored result for this token"}), 404
+
+    return jsonify(latest), 200
+
+
+@app.route('/api/history/<mint_address>', methods=['GET'])
+def get_result_history(mint_address):
+    """
+    Get past scan results for a token, newest first
+    Query parameter: limit (default 10, max 20)
+    """
+    limit = max(1, min(request.args.get('limit', 10, type=int), 20))
+    history = db.get_result_history(mint_address.strip(), limit=limit)
+
+    return jsonify({"mint_address": mint_address, "history": history}), 200
+
+
+def watchlist_authorized() -> bool:
+    """
+    Whether the request may change the watchlist
+
+    With WATCHLIST_API_TOKEN set, the X-API-Key header must match it;
+    otherwise only local requests (the bots on the same machine) are allowed.
+    """
+    if WATCHLIST_API_TOKEN:
+        return hmac.compare_digest(request.headers.get('X-API-Key', ''), WATCHLIST_API_TOKEN)
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+
+def parse_watchlist_request():
+    """(mint, platform, channel_id, error response) from a watchlist request body"""
+    data = request.get_json(silent=True) or {}
+    mint_address = str(data.get('mint_address') or '').strip()
+    platform = data.get('platform')
+    channel_id = str(data.get('channel_id') or '').strip()
+
+    if len(mint_address) < 32 or len(mint_address) > 44:
+        return None, None, None, (jsonify({"error": "Invalid Solana address format"}), 400)
+    if platform not in ("discord", "telegram"):
+        return None, None, None, (jsonify({"error": "Unsupported platform"}), 400)
+    if not channel_id or len(channel_id) > 64:
+        return None, None, None, (jsonify({"error": "channel_id is required"}), 400)
+
+    return mint_address, platform, channel_id, None
+
+
+@app.route('/api/watchlist', methods=['POST'])
+def add_to_watchlist():
+    """
+    Watch a token for a channel: it is re-scored in the background and
+    score changes are pushed to that channel
+
+    Request body:
+    {
+        "mint_address": "TOKEN_ADDRESS",
+        "platform": "discord" | "telegram",
+        "channel_id": "CHANNEL_OR_CHAT_ID"
+    }
+    """
+    if not watchlist_authorized():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    mint_address, platform, channel_id, error = parse_watchlist_request()
+    if error:
+        return error
+
+    if not watchlist_store.add(mint_address, platform, channel_id):
+        return jsonify({"error": "Watchlist limit reached"}), 429
+    return jsonify({"success": True, "mint_address": mint_address}), 200
+
+
+@app.route('/api/watchlist', methods=['DELETE'])
+def remove_from_watchlist():
+    """Stop watching a token for one channel (same body as POST)"""
+    if not watchlist_authorized():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    mint_address, platform, channel_id, error = parse_watchlist_request()
+    if error:
+        return error
+
+    if not watchlist_store.remove(mint_address, platform, channel_id):
+        return jsonify({"error": "This token is not watched in this channel"}), 404
+    return jsonify({"success": True, "mint_address": mint_address}), 200
+
+
+@app.route('/api/watchlist/<platform>/<channel_id>', methods=['GET'])
+def get_channel_watchlist(platform, channel_id):
+    """Tokens watched by a channel with their latest background score"""
+    return jsonify({"watchlist": watchlist_store.get_channel_mints(platform, channel_id)}), 200
+
+
 @app.route('/api/scan', methods=['POST'])
 def scan_token():
     """
@@ -127,7 +239,8 @@ def scan_token():
                 ai_score=ml_prediction.get("score"),
                 source="web",
                 user_agent=request.headers.get('User-Agent'),
-                ip_address=request.remote_addr
+                ip_address=request.remote_addr,
+                result=result
             )
 
         return jsonify(result), 200
@@ -173,7 +286,8 @@ def scan_token_get(mint_address):
                 ai_score=ml_prediction.get("score"),
                 source="web",
                 user_agent=request.headers.get('User-Agent'),
-                ip_address=request.remote_addr
+                ip_address=request.remote_addr,
+                result=result
             )
 
         return jsonify(result), 200
@@ -228,9 +342,15 @@ def analyze_token_api(mint_address: str) -> dict:
     pump_dump_detector = PumpDumpDetector()
     authority_checker = AuthorityChecker()
 
+    # Upstream data shared by all analyzers of this scan
+    ctx = ScanContext(mint_address)
+
     try:
+        # Load mint + metadata accounts in one request (reused by all analyzers)
+        ctx.mint_info()
+
         # Fetch token data
-        token_data = liq_analyzer.get_token_data(mint_address)
+        token_data = liq_analyzer.get_token_data(mint_address, ctx)
 
         if not token_data:
             return {
@@ -241,7 +361,7 @@ def analyze_token_api(mint_address: str) -> dict:
         creator_address = token_data.get("creator")
 
         # Run analyses
-        liquidity_analysis = liq_analyzer.analyze_liquidity(mint_address)
+        liquidity_analysis = liq_analyzer.analyze_liquidity(mint_address, ctx)
 
         creator_analysis = None
         if creator_address:
@@ -252,7 +372,7 @@ def analyze_token_api(mint_address: str) -> dict:
         # On-chain data (get this FIRST as it's most reliable)
         onchain_data = None
         try:
-            onchain_data = onchain_analyzer.get_token_holders(mint_address)
+            onchain_data = onchain_analyzer.get_token_holders(mint_address, ctx)
         except Exception:
             pass
 
@@ -301,7 +421,7 @@ def analyze_token_api(mint_address: str) -> dict:
         sniper_analysis = None
         try:
             token_creation_time = token_data.get("created_timestamp")
-            sniper_analysis = sniper_detector.analyze_snipers(mint_address, token_creation_time)
+            sniper_analysis = sniper_detector.analyze_snipers(mint_address, token_creation_time, ctx)
         except Exception:
             pass
 
@@ -330,26 +450,37 @@ def analyze_token_api(mint_address: str) -> dict:
         # Authority check (CRITICAL!)
         authority_analysis = None
         try:
-            authority_analysis = authority_checker.check_authority(mint_address)
+            authority_analysis = authority_checker.check_authority(mint_address, ctx)
         except Exception:
             pass
 
+        # Baseline holder snapshot for later balance deltas (no extra RPC call)
+        largest_holders = ctx.peek("largest_holders")
+        if largest_holders:
+            try:
+                snapshot_store.add_snapshot(mint_address, largest_holders)
+            except Exception as e:
+                print(f"[SNAPSHOTS] Error storing snapshot: {e}")
+
         # ML Prediction (NEW!)
         ml_prediction = None
-        if ml_enabled:
+        ml_predictor = get_predictor() if ml_enabled else None
+        if ml_predictor is not None:
             try:
                 print(f"[ML] Starting prediction for {mint_address[:8]}...")
-                # Extract features asynchronously
+                # Reuse a recent snapshot from the feature store, extract otherwise
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
-                features = loop.run_until_complete(ml_extractor.extract_all_features(mint_address))
+                features = loop.run_until_complete(load_or_extract(
+                    ml_extractor, mint_address, ml_feature_store, ML_FEATURE_MAX_AGE, ctx
+                ))
                 loop.close()
 
                 if features:
                     print(f"[ML] Features extracted successfully, making prediction...")
 
                     # Filter out non-numeric columns (metadata)
-                    exclude_cols = ['label', 'token_mint', 'timestamp', 'label_reason', 'collected_at']
+                    exclude_cols = ['label', 'token_mint', 'timestamp', 'label_reason', 'collected_at', 'snapshot_time']
                     clean_features = {k: v for k, v in features.items() if k not in exclude_cols}
 
                     # Make prediction
@@ -403,37 +534,8 @@ def analyze_token_api(mint_address: str) -> dict:
             token_age_hours  # NEW: Pass token age for confidence calculation
         )
 
-        # CRITICAL: Apply additional penalties for missed red flags
-        additional_risk = 0
-
-        # Penalty 1: Fresh wallets in top 10 (CRITICAL!)
-        if onchain_data and onchain_data.can_analyze:
-            fresh_top10 = onchain_data.fresh_wallet_count_top10
-            if fresh_top10 >= 8:
-                additional_risk += 40  # 80%+ fresh wallets = HUGE red flag!
-            elif fresh_top10 >= 5:
-                additional_risk += 25  # 50%+ fresh wallets = Major red flag
-            elif fresh_top10 >= 3:
-                additional_risk += 15  # 30%+ fresh wallets = Warning
-
-        # Penalty 2: Small market cap (< $100K = very risky on Pump.fun)
-        if liquidity_analysis:
-            mcap = liquidity_analysis.market_cap_usd
-            if mcap < 50000:
-                additional_risk += 20  # Under $50K = extreme risk
-            elif mcap < 100000:
-                additional_risk += 10  # Under $100K = high risk
-
-        # Penalty 3: High top holder concentration
-        if onchain_data and onchain_data.can_analyze:
-            top_holder_pct = onchain_data.top_holder_percentage
-            if top_holder_pct > 30:
-                additional_risk += 15  # One person controls 30%+
-            elif top_holder_pct > 20:
-                additional_risk += 10  # One person controls 20%+
-
-        # Apply additional risk (cap at 100)
-        final_risk_score = min(risk_report.overall_risk_score + additional_risk, 100)
+        # Weighted score plus penalties for critical red flags (fresh top holders, tiny market cap, whales)
+        final_risk_score = risk_report.final_risk_score
 
         # Convert risk score to safety score (INVERTED for better UX)
         # Risk: 0 = safe, 100 = danger
@@ -577,6 +679,7 @@ def analyze_token_api(mint_address: str) -> dict:
         insightx.close()
         pump_dump_detector.close()
         authority_checker.close()
+        ctx.close()
 
 
 if __name__ == '__main__':